@@ -1,15 +1,18 @@
 """Agents module - lazy imports to avoid pulling in heavy dependencies."""
 from .base_agent import BaseAgent
-from .event_bus import EventBus, RedisPubSubBroker, RabbitMQBroker
+from .event_bus import EventBus, InProcessBroker, RedisPubSubBroker, RabbitMQBroker
 from .agent_registry import AgentRegistry
+from .agent_supervisor import AgentSupervisor
 from .events import Event, EventType
 
 __all__ = [
     "BaseAgent",
     "EventBus",
+    "InProcessBroker",
     "RedisPubSubBroker",
     "RabbitMQBroker",
     "AgentRegistry",
+    "AgentSupervisor",
     "Event",
     "EventType",
 ]
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_, or_, func
 from agents.base_agent import BaseAgent
+from utils.principal_cache import principal_cache
 from models.admin import SystemConfig, ReportDefinition, ReportExecution
 from schemas.admin import (
     SystemConfigCreate, ReportDefinitionCreate, ReportExecutionCreate,
@@ -136,6 +137,7 @@ class AdminAgent(BaseAgent):
             user.is_active = False
             db.commit()
             db.refresh(user)
+            principal_cache.invalidate_user(user_id)
 
             logger.info(f"Deactivated user: {user.email}")
 
@@ -1,17 +1,33 @@
+import asyncio
+import functools
 import logging
-from typing import Dict, Optional, Type
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
 from agents.base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
 
 class AgentRegistry:
-    """Central registry for agent discovery and management."""
+    """Central registry for agent discovery and management.
 
-    def __init__(self):
-        """Initialize the agent registry."""
+    Agents registered with ``register_type`` are constructed on first
+    ``get``, so agents that are never used cost nothing at startup.
+    Lifecycle calls and health checks run concurrently, each bounded by
+    ``timeout`` seconds.
+    """
+
+    def __init__(self, timeout: Optional[float] = 10.0):
+        """Initialize the agent registry.
+
+        Args:
+            timeout: Seconds allowed per agent for initialize/shutdown/health check (None = no limit)
+        """
+        self.timeout = timeout
         self._agents: Dict[str, BaseAgent] = {}
         self._agent_types: Dict[str, Type[BaseAgent]] = {}
+        self._factories: Dict[str, Callable[[], BaseAgent]] = {}
+        self.startup_times: Dict[str, Dict[str, float]] = {}
 
     def register(self, agent: BaseAgent) -> None:
         """Register an agent instance.
@@ -25,21 +41,24 @@ class AgentRegistry:
         self._agents[agent.agent_name] = agent
         logger.info(f"Registered agent: {agent.agent_name}")
 
-    def register_type(self, agent_name: str, agent_class: Type[BaseAgent]) -> None:
+    def register_type(self, agent_name: str, agent_class: Type[BaseAgent], *args: Any, **kwargs: Any) -> None:
         """Register an agent type for later instantiation.
 
         Args:
             agent_name: Name of the agent
             agent_class: Agent class
+            *args: Positional arguments for the constructor
+            **kwargs: Keyword arguments for the constructor
         """
         if agent_name in self._agent_types:
             logger.warning(f"Overwriting agent type {agent_name}")
 
         self._agent_types[agent_name] = agent_class
+        self._factories[agent_name] = functools.partial(agent_class, *args, **kwargs)
         logger.info(f"Registered agent type: {agent_name}")
 
     def get(self, agent_name: str) -> Optional[BaseAgent]:
-        """Get a registered agent by name.
+        """Get a registered agent by name, constructing a registered type on first use.
 
         Args:
             agent_name: Name of the agent
@@ -47,7 +66,23 @@ class AgentRegistry:
         Returns:
             The agent instance or None if not found
         """
-        return self._agents.get(agent_name)
+        agent = self._agents.get(agent_name)
+        if agent is None and agent_name in self._factories:
+            agent = self._instantiate(agent_name)
+        return agent
+
+    def is_instantiated(self, agent_name: str) -> bool:
+        """Whether the agent exists yet (registered instances always do)."""
+        return agent_name in self._agents
+
+    def _instantiate(self, agent_name: str) -> BaseAgent:
+        started = time.perf_counter()
+        agent = self._factories[agent_name]()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._agents[agent_name] = agent
+        self.startup_times.setdefault(agent_name, {})["construct_ms"] = elapsed_ms
+        logger.info(f"Instantiated agent {agent_name} in {elapsed_ms:.1f}ms")
+        return agent
 
     def get_type(self, agent_name: str) -> Optional[Type[BaseAgent]]:
         """Get a registered agent type by name.
@@ -76,39 +111,79 @@ class AgentRegistry:
         """
         return list(self._agent_types.keys())
 
-    async def initialize_all(self) -> None:
-        """Initialize all registered agents."""
-        for agent in self._agents.values():
-            try:
-                await agent.initialize()
-            except Exception as e:
-                logger.error(f"Failed to initialize agent {agent.agent_name}: {str(e)}")
-
-    async def shutdown_all(self) -> None:
-        """Shutdown all registered agents."""
-        for agent in self._agents.values():
-            try:
-                await agent.shutdown()
-            except Exception as e:
-                logger.error(f"Failed to shutdown agent {agent.agent_name}: {str(e)}")
-
-    async def health_check_all(self) -> Dict[str, dict]:
-        """Perform health check on all agents.
+    async def _bounded(self, call: Callable[[], Awaitable[Any]], timeout: Optional[float]) -> Any:
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return await call()
+        return await asyncio.wait_for(call(), timeout)
+
+    async def initialize_agent(self, agent_name: str, agent: BaseAgent, timeout: Optional[float] = None) -> bool:
+        """Initialize one agent, recording how long it took.
+
+        Returns:
+            True if the agent initialized within the timeout
+        """
+        started = time.perf_counter()
+        try:
+            await self._bounded(agent.initialize, timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out initializing agent {agent_name}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to initialize agent {agent_name}: {str(e)}")
+            return False
+        finally:
+            self.startup_times.setdefault(agent_name, {})["initialize_ms"] = (time.perf_counter() - started) * 1000
+
+    async def initialize_all(self, timeout: Optional[float] = None) -> None:
+        """Initialize all instantiated agents concurrently."""
+        await asyncio.gather(*(
+            self.initialize_agent(name, agent, timeout) for name, agent in list(self._agents.items())
+        ))
+
+    async def _shutdown_agent(self, agent_name: str, agent: BaseAgent, timeout: Optional[float]) -> None:
+        try:
+            await self._bounded(agent.shutdown, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out shutting down agent {agent_name}")
+        except Exception as e:
+            logger.error(f"Failed to shutdown agent {agent_name}: {str(e)}")
+
+    async def shutdown_all(self, timeout: Optional[float] = None) -> None:
+        """Shutdown all instantiated agents concurrently."""
+        await asyncio.gather(*(
+            self._shutdown_agent(name, agent, timeout) for name, agent in list(self._agents.items())
+        ))
+
+    async def _health_check_agent(self, agent_name: str, agent: BaseAgent, timeout: Optional[float]) -> dict:
+        try:
+            return await self._bounded(agent.health_check, timeout)
+        except asyncio.TimeoutError:
+            return {"agent_name": agent_name, "status": "timeout"}
+        except Exception as e:
+            return {
+                "agent_name": agent_name,
+                "status": "error",
+                "error": str(e),
+            }
+
+    async def health_check_all(self, timeout: Optional[float] = None) -> Dict[str, dict]:
+        """Perform health check on all agents concurrently.
+
+        Agent types that were never used are reported as ``idle``
+        without being constructed.
 
         Returns:
             Dictionary mapping agent names to health check results
         """
-        results = {}
-
-        for name, agent in self._agents.items():
-            try:
-                results[name] = await agent.health_check()
-            except Exception as e:
-                results[name] = {
-                    "agent_name": name,
-                    "status": "error",
-                    "error": str(e),
-                }
+        agents = list(self._agents.items())
+        checks = await asyncio.gather(*(self._health_check_agent(name, agent, timeout) for name, agent in agents))
+        results = {name: check for (name, _), check in zip(agents, checks)}
+
+        for name in self._agent_types:
+            if name not in results:
+                results[name] = {"agent_name": name, "status": "idle"}
 
         return results
 
@@ -138,6 +213,7 @@ class AgentRegistry:
             The unregistered agent class or None if not found
         """
         agent_type = self._agent_types.pop(agent_name, None)
+        self._factories.pop(agent_name, None)
 
         if agent_type:
             logger.info(f"Unregistered agent type: {agent_name}")
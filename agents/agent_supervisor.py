@@ -0,0 +1,232 @@
+"""
+Agent supervisor for the API process.
+
+Routers declare their agents with ``agent_supervisor.lazy(...)`` instead
+of constructing them at import time. The returned ``LazyAgent`` stands
+in for the agent and constructs it on first attribute access, so a cold
+start (e.g. a serverless invocation) only pays for the agents the
+request actually uses. Several agents create SDK clients in
+``__init__``.
+
+``start`` initializes the agents that exist at that point concurrently;
+agents constructed later are initialized in the background as they
+appear. Until that finishes, calling one of the agent's async methods
+through its ``LazyAgent`` first waits for it (``ensure_started``), so the
+method sees whatever ``on_start`` sets up. ``supervise`` runs a long-lived consumer coroutine and restarts
+it with exponential backoff when it crashes. ``report`` gives per-agent
+construct/initialize times and consumer restart counts.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+
+from agents.agent_registry import AgentRegistry
+from agents.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class LazyAgent:
+    """
+    Stand-in for a registered agent type; constructs the agent on first attribute access.
+
+    While the agent is still initializing in the background, its async
+    methods are returned wrapped so that calling one waits for
+    initialization first.
+    """
+
+    __slots__ = ("_registry", "_agent_name")
+
+    def __init__(self, registry: "AgentSupervisor", agent_name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_agent_name", agent_name)
+
+    def _agent(self) -> BaseAgent:
+        return self._registry.get(self._agent_name)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._agent(), name)
+        if self._registry.is_initializing(self._agent_name) and inspect.iscoroutinefunction(value):
+            return self._after_start(value)
+        return value
+
+    def _after_start(self, method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        registry, agent_name = self._registry, self._agent_name
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            await registry.ensure_started(agent_name)
+            return await method(*args, **kwargs)
+
+        return call
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._agent(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._agent(), name)
+
+    def __repr__(self) -> str:
+        if self._registry.is_instantiated(self._agent_name):
+            return repr(self._agent())
+        return f"<lazy {self._agent_name}>"
+
+
+@dataclass
+class ConsumerState:
+    """Restart bookkeeping for one supervised consumer."""
+    task: Optional[asyncio.Task] = None
+    restarts: int = 0
+    last_error: Optional[str] = None
+    started_at: Optional[float] = None
+
+
+class AgentSupervisor(AgentRegistry):
+    """Agent registry with lazy agents, background initialization and consumer restarts."""
+
+    def __init__(
+        self,
+        timeout: Optional[float] = 10.0,
+        restart_backoff: float = 1.0,
+        restart_backoff_max: float = 60.0,
+    ):
+        """Initialize agent supervisor.
+
+        Args:
+            timeout: Seconds allowed per agent for initialize/shutdown/health check
+            restart_backoff: Delay before the first restart of a crashed consumer
+            restart_backoff_max: Upper bound for the doubling restart delay
+        """
+        super().__init__(timeout=timeout)
+        self.restart_backoff = restart_backoff
+        self.restart_backoff_max = restart_backoff_max
+        self.consumers: Dict[str, ConsumerState] = {}
+        self._started = False
+        self._initializing: Dict[str, asyncio.Task] = {}
+
+    def lazy(self, agent_name: str, agent_class: Type[BaseAgent], *args: Any, **kwargs: Any) -> LazyAgent:
+        """Register an agent type and return a stand-in that constructs it on first use."""
+        self.register_type(agent_name, agent_class, *args, **kwargs)
+        return LazyAgent(self, agent_name)
+
+    def _instantiate(self, agent_name: str) -> BaseAgent:
+        agent = super()._instantiate(agent_name)
+        if self._started:
+            # Constructed after start: initialize without blocking the caller
+            try:
+                task = asyncio.get_running_loop().create_task(self.initialize_agent(agent_name, agent))
+            except RuntimeError:
+                return agent
+            self._initializing[agent_name] = task
+            task.add_done_callback(lambda _: self._initializing.pop(agent_name, None))
+        return agent
+
+    def is_initializing(self, agent_name: str) -> bool:
+        """Whether the agent is being initialized in the background."""
+        return agent_name in self._initializing
+
+    async def ensure_started(self, agent_name: str) -> Optional[BaseAgent]:
+        """
+        The agent, once its background initialization (if any) has finished.
+
+        Constructs the agent if needed. A caller cancelled while waiting does
+        not cancel the initialization.
+        """
+        agent = self.get(agent_name)
+        task = self._initializing.get(agent_name)
+        if task is not None:
+            await asyncio.shield(task)
+        return agent
+
+    async def start(self, timeout: Optional[float] = None) -> None:
+        """Initialize the agents constructed so far; later ones initialize as they are created."""
+        started = time.perf_counter()
+        await self.initialize_all(timeout)
+        self._started = True
+        idle = len(set(self._agent_types) - set(self._agents))
+        logger.info(
+            f"Agent supervisor initialized {len(self._agents)} agents in "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms ({idle} more start on first use)"
+        )
+
+    def supervise(self, name: str, factory: Callable[[], Awaitable[Any]], max_restarts: Optional[int] = None) -> None:
+        """
+        Run ``factory()`` as a background consumer and restart it when it crashes.
+
+        A consumer that returns normally is not restarted; one that raises
+        is restarted after a doubling delay (reset once it has run longer
+        than ``restart_backoff_max``), up to ``max_restarts`` times.
+        """
+        state = self.consumers.get(name)
+        if state is not None and state.task is not None and not state.task.done():
+            return
+        state = self.consumers[name] = ConsumerState()
+        state.task = asyncio.create_task(self._run_consumer(name, factory, state, max_restarts))
+
+    async def _run_consumer(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        state: ConsumerState,
+        max_restarts: Optional[int],
+    ) -> None:
+        delay = self.restart_backoff
+        while True:
+            state.started_at = time.monotonic()
+            try:
+                await factory()
+                logger.info(f"Consumer {name} finished")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.last_error = str(e) or type(e).__name__
+                if max_restarts is not None and state.restarts >= max_restarts:
+                    logger.error(
+                        f"Consumer {name} crashed, giving up after {state.restarts} restarts: {state.last_error}"
+                    )
+                    return
+                if time.monotonic() - state.started_at > self.restart_backoff_max:
+                    delay = self.restart_backoff
+                logger.error(f"Consumer {name} crashed, restarting in {delay:.1f}s: {state.last_error}")
+                await asyncio.sleep(delay)
+                delay = min(self.restart_backoff_max, delay * 2)
+                state.restarts += 1
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel supervised consumers, then shut down every constructed agent concurrently."""
+        tasks = [state.task for state in self.consumers.values() if state.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, *self._initializing.values(), return_exceptions=True)
+        self._started = False
+        await self.shutdown_all(timeout)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-agent startup times and consumer restart counts."""
+        agents = {}
+        for name in {**self._agent_types, **self._agents}:
+            agent = self._agents.get(name)
+            agents[name] = {
+                "instantiated": agent is not None,
+                "is_running": bool(agent is not None and agent.is_running),
+                **{key: round(value, 2) for key, value in self.startup_times.get(name, {}).items()},
+            }
+        consumers = {
+            name: {
+                "running": state.task is not None and not state.task.done(),
+                "restarts": state.restarts,
+                "last_error": state.last_error,
+            }
+            for name, state in self.consumers.items()
+        }
+        return {"agents": agents, "consumers": consumers}
+
+
+# Process-wide supervisor used by the API routers
+agent_supervisor = AgentSupervisor()
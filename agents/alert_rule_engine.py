@@ -0,0 +1,347 @@
+"""
+Compiled alert rule evaluation.
+
+Active ``AlertRule`` rows are loaded once and each rule's ``conditions``
+list is compiled into a predicate closure. Rules are indexed by event type
+and, within an event type, by one anchor condition:
+
+- a rule with an ``==`` condition is filed under that (field, value), so it
+  is only considered for events whose payload carries exactly that value;
+- otherwise it is filed under its first condition's field, so events
+  without that field never look at it;
+- a rule without conditions matches every event of its type.
+
+Cooldowns are tracked in a TTL store keyed by (rule, entity) instead of
+being looked up in the notifications table: in-process by default, or in
+Redis (``SET NX PX``) so every worker shares them.
+"""
+
+import heapq
+import logging
+import operator
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.events import Event
+from models.alerts import AlertRule
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_MISSING = object()
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "contains": lambda actual, expected: expected in str(actual),
+    "in": lambda actual, expected: actual in expected,
+}
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """
+    One condition as a predicate over an event payload.
+
+    A missing field never matches. An unknown operator only requires the
+    field to be present, as the interpreted evaluator did.
+    """
+    field = condition.get("field")
+    expected = condition.get("value")
+    compare = OPERATORS.get(condition.get("operator", "=="))
+
+    if compare is None:
+        return lambda payload: field in payload
+
+    def check(payload: Dict[str, Any]) -> bool:
+        actual = payload.get(field, _MISSING)
+        return actual is not _MISSING and compare(actual, expected)
+
+    return check
+
+
+def compile_conditions(conditions: Optional[List[Dict[str, Any]]]) -> Predicate:
+    """All conditions ANDed into one predicate."""
+    checks = [compile_condition(c) for c in conditions or []]
+    if not checks:
+        return lambda payload: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(payload: Dict[str, Any]) -> bool:
+        for check in checks:
+            if not check(payload):
+                return False
+        return True
+
+    return check_all
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _anchor(conditions: Optional[List[Dict[str, Any]]]) -> Tuple[str, Any]:
+    """Index slot for a rule: ("eq", (field, value)), ("field", field) or ("all", None)."""
+    for condition in conditions or []:
+        value = condition.get("value")
+        if condition.get("operator", "==") == "==" and _hashable(value):
+            return "eq", (condition.get("field"), value)
+    if conditions:
+        return "field", conditions[0].get("field")
+    return "all", None
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """What evaluation and delivery need from an ``AlertRule``."""
+    id: int
+    name: str
+    event_type: str
+    predicate: Predicate
+    notification_channels: Tuple[str, ...] = ()
+    recipients: Tuple[Dict[str, Any], ...] = ()
+    template_subject: Optional[str] = None
+    template_body: Optional[str] = None
+    priority: str = "medium"
+    cooldown_minutes: int = 0
+
+    @classmethod
+    def from_model(cls, rule: AlertRule) -> "CompiledRule":
+        return cls(
+            id=rule.id,
+            name=rule.name,
+            event_type=rule.event_type,
+            predicate=compile_conditions(rule.conditions),
+            notification_channels=tuple(rule.notification_channels or ()),
+            recipients=tuple(rule.recipients or ()),
+            template_subject=rule.template_subject,
+            template_body=rule.template_body,
+            priority=rule.priority or "medium",
+            cooldown_minutes=rule.cooldown_minutes or 0,
+        )
+
+
+class _EventTypeRules:
+    """The rules of one event type, indexed by anchor condition."""
+
+    def __init__(self):
+        self.unconditional: List[CompiledRule] = []
+        self.by_field: Dict[str, List[CompiledRule]] = {}
+        self.by_value: Dict[str, Dict[Any, List[CompiledRule]]] = {}
+
+    def add(self, rule: CompiledRule, conditions: Optional[List[Dict[str, Any]]]) -> None:
+        kind, key = _anchor(conditions)
+        if kind == "eq":
+            field, value = key
+            self.by_value.setdefault(field, {}).setdefault(value, []).append(rule)
+        elif kind == "field":
+            self.by_field.setdefault(key, []).append(rule)
+        else:
+            self.unconditional.append(rule)
+
+    def candidates(self, payload: Dict[str, Any]) -> List[CompiledRule]:
+        found = list(self.unconditional)
+        for field, rules in self.by_field.items():
+            if field in payload:
+                found.extend(rules)
+        for field, by_value in self.by_value.items():
+            value = payload.get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            try:
+                found.extend(by_value.get(value, ()))
+            except TypeError:
+                # Unhashable payload value can't equal any indexed (hashable) value
+                continue
+        return found
+
+
+class CooldownTracker(ABC):
+    """Abstract base class for alert cooldown stores."""
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl_seconds: float) -> bool:
+        """Start a cooldown unless one is already running.
+
+        Args:
+            key: Cooldown key (rule and entity)
+            ttl_seconds: Cooldown length
+
+        Returns:
+            True if the cooldown was started (the alert may fire)
+        """
+        pass
+
+
+class InMemoryCooldownTracker(CooldownTracker):
+    """Per-process cooldowns; expired keys are purged as new ones arrive."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._expires: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def _purge(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+
+    async def acquire(self, key: str, ttl_seconds: float) -> bool:
+        if ttl_seconds <= 0:
+            return True
+        now = self._clock()
+        self._purge(now)
+        if key in self._expires:
+            return False
+        expires_at = now + ttl_seconds
+        self._expires[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+        return True
+
+
+class RedisCooldownTracker(CooldownTracker):
+    """Cooldowns shared by every worker through Redis key expiry."""
+
+    def __init__(self, redis: Any, prefix: str = "alert-cooldown"):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def acquire(self, key: str, ttl_seconds: float) -> bool:
+        if ttl_seconds <= 0:
+            return True
+        created = await self.redis.set(
+            f"{self.prefix}:{key}", 1, nx=True, px=max(1, int(ttl_seconds * 1000))
+        )
+        return bool(created)
+
+
+class AlertRuleEngine:
+    """
+    Compiled, cached alert rules.
+
+    The rule set is reloaded after ``invalidate`` (called on every rule
+    write in this process) or once ``ttl_seconds`` have passed, which
+    bounds how long other workers keep evaluating an outdated rule set.
+    """
+
+    def __init__(
+        self,
+        cooldowns: Optional[CooldownTracker] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cooldowns = cooldowns if cooldowns is not None else InMemoryCooldownTracker()
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._by_event_type: Dict[str, _EventTypeRules] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+
+    @property
+    def rule_count(self) -> int:
+        return sum(
+            len(rules.unconditional)
+            + sum(len(r) for r in rules.by_field.values())
+            + sum(len(r) for by_value in rules.by_value.values() for r in by_value.values())
+            for rules in self._by_event_type.values()
+        )
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        if self.ttl_seconds is None:
+            return False
+        return self._clock() - self._loaded_at > self.ttl_seconds
+
+    def load(self, rules: Iterable[AlertRule]) -> None:
+        """Compile and index a full set of active rules."""
+        by_event_type: Dict[str, _EventTypeRules] = {}
+        for rule in rules:
+            compiled = CompiledRule.from_model(rule)
+            by_event_type.setdefault(rule.event_type, _EventTypeRules()).add(compiled, rule.conditions)
+        self._by_event_type = by_event_type
+        self._loaded_at = self._clock()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        generation = self._generation
+        result = await db.execute(select(AlertRule).where(AlertRule.is_active == True))
+        rules = result.scalars().all()
+        self.load(rules)
+        if generation != self._generation:
+            # A rule changed while the query ran; use these rules now, reload next time
+            self._loaded_at = None
+        logger.debug(f"Compiled {len(rules)} active alert rules")
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.is_stale():
+            await self.refresh(db)
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+        self._generation += 1
+
+    def match(self, event_type: str, payload: Dict[str, Any]) -> List[CompiledRule]:
+        """Rules of ``event_type`` whose conditions hold for ``payload``, by rule ID."""
+        rules = self._by_event_type.get(event_type)
+        if rules is None:
+            return []
+        matched = []
+        for rule in rules.candidates(payload):
+            try:
+                if rule.predicate(payload):
+                    matched.append(rule)
+            except Exception as e:
+                # e.g. ordering a string against a number; the rule just doesn't apply
+                logger.debug(f"Alert rule {rule.id} condition error: {str(e)}")
+        matched.sort(key=lambda rule: rule.id)
+        return matched
+
+    async def evaluate(self, db: AsyncSession, event: Event) -> List[CompiledRule]:
+        """Matching rules that are not cooling down; starts their cooldowns."""
+        await self.ensure_loaded(db)
+        firing = []
+        for rule in self.match(event.event_type.value, event.payload):
+            if rule.cooldown_minutes <= 0:
+                firing.append(rule)
+            elif await self.cooldowns.acquire(f"{rule.id}:{event.entity_id}", rule.cooldown_minutes * 60):
+                firing.append(rule)
+        return firing
+
+
+def create_cooldown_tracker(settings: Any) -> CooldownTracker:
+    """Build the backend selected by ``settings.alert_cooldown_backend``."""
+    if settings.alert_cooldown_backend == "redis":
+        import redis.asyncio as aioredis
+
+        return RedisCooldownTracker(aioredis.from_url(settings.redis_url))
+    return InMemoryCooldownTracker()
+
+
+def _create_engine() -> AlertRuleEngine:
+    from config import settings
+
+    return AlertRuleEngine(
+        cooldowns=create_cooldown_tracker(settings),
+        ttl_seconds=settings.alert_rule_cache_ttl_seconds,
+    )
+
+
+alert_rule_engine = _create_engine()
@@ -5,31 +5,65 @@ import asyncio
 import json
 import aiohttp
 import re
-from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime, timedelta
-from sqlalchemy import select, and_, func
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable
+from datetime import datetime
+from sqlalchemy import select, and_, case, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from anthropic import AsyncAnthropic
 
+from agents.alert_rule_engine import AlertRuleEngine, CompiledRule, alert_rule_engine, compile_conditions
 from agents.base_agent import BaseAgent
 from agents.events import Event, EventType
+from agents.notification_delivery import (
+    REJECTED,
+    RETRY,
+    SENT,
+    ChannelPolicy,
+    Delivery,
+    NotificationDispatcher,
+)
 from models.alerts import AlertRule, Notification, NotificationPreference
 from models.user import User
 from models.submission import Submission
 from models.contract import Contract
 from models.referral import Referral
 from models.enums import SubmissionStatus, ContractStatus
+from services.notification_digest_service import NotificationDigestService, PRIORITIES
 
 logger = logging.getLogger(__name__)
 
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# Notifications listed in a digest; the counts always cover the whole period
+DIGEST_ITEM_LIMIT = 50
+
 
 class AlertsNotificationAgent(BaseAgent):
     """Centralized alerts and notifications for all platform events."""
 
-    def __init__(self, anthropic_api_key: str, agent_version: str = "1.0.0"):
+    def __init__(
+        self,
+        anthropic_api_key: str,
+        agent_version: str = "1.0.0",
+        rule_engine: Optional[AlertRuleEngine] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        channel_policies: Optional[Dict[str, ChannelPolicy]] = None,
+    ):
         """Initialize alerts and notification agent."""
         super().__init__(agent_name="AlertsNotificationAgent", agent_version=agent_version)
         self.client = AsyncAnthropic(api_key=anthropic_api_key)
+        self.rule_engine = rule_engine or alert_rule_engine
+        self._session_factory = session_factory
+        self.dispatcher = NotificationDispatcher(
+            {
+                "email": self._deliver_email,
+                "sms": self._deliver_sms,
+                "slack": self._deliver_slack,
+                "webhook": self._deliver_webhook,
+                "in_app": self._deliver_in_app,
+            },
+            policies=channel_policies,
+        )
         self.event_handlers = {
             EventType.SUBMISSION_CREATED: self._handle_submission_created,
             EventType.SUBMISSION_SENT: self._handle_submission_sent,
@@ -57,7 +91,8 @@ class AlertsNotificationAgent(BaseAgent):
             )
 
             db.add(rule)
-            await db.flush()
+            await db.commit()
+            self.rule_engine.invalidate()
 
             logger.info(f"Created alert rule {rule.id}: {rule.name}")
             return rule
@@ -67,13 +102,13 @@ class AlertsNotificationAgent(BaseAgent):
             raise
 
     async def process_event(self, db: AsyncSession, event: Event) -> None:
-        """Process event and evaluate against all active rules."""
+        """Process event against all active rules and queue the resulting notifications."""
         try:
             # Get matching rules
             matching_rules = await self.evaluate_rules(db, event)
 
+            deliveries = []
             for rule in matching_rules:
-                # Generate notification
                 notification_data = {
                     "alert_rule_id": rule.id,
                     "event_id": event.event_id,
@@ -84,49 +119,26 @@ class AlertsNotificationAgent(BaseAgent):
                     "priority": rule.priority,
                     "metadata": {"event_payload": event.payload},
                 }
-
-                # Send to each channel
                 for channel in rule.notification_channels:
                     for recipient in rule.recipients:
-                        await self._send_to_channel(db, channel, recipient, rule, notification_data)
+                        deliveries.append(Delivery(channel, recipient, notification_data))
 
-            logger.debug(f"Processed event {event.event_id}, matched {len(matching_rules)} rules")
+            # Delivery happens on the per-channel workers
+            queued = await self.dispatcher.enqueue_many(deliveries)
+
+            logger.debug(
+                f"Processed event {event.event_id}, matched {len(matching_rules)} rules, "
+                f"queued {queued} notifications"
+            )
 
         except Exception as e:
             logger.error(f"Error processing event: {str(e)}")
             await self.on_error(e)
 
-    async def evaluate_rules(self, db: AsyncSession, event: Event) -> List[AlertRule]:
-        """Check event against all active rules."""
+    async def evaluate_rules(self, db: AsyncSession, event: Event) -> List[CompiledRule]:
+        """Check event against all active rules, skipping rules in cooldown."""
         try:
-            # Get rules for this event type
-            stmt = select(AlertRule).where(
-                and_(AlertRule.event_type == event.event_type.value, AlertRule.is_active is True)
-            )
-            result = await db.execute(stmt)
-            rules = result.scalars().all()
-
-            matching_rules = []
-
-            for rule in rules:
-                # Evaluate conditions
-                if await self._evaluate_conditions(rule.conditions, event.payload):
-                    # Check cooldown
-                    stmt = select(Notification).where(
-                        and_(
-                            Notification.alert_rule_id == rule.id,
-                            Notification.entity_id == event.entity_id,
-                            Notification.created_at
-                            > datetime.utcnow() - timedelta(minutes=rule.cooldown_minutes),
-                        )
-                    )
-                    result = await db.execute(stmt)
-                    recent_notification = result.scalars().first()
-
-                    if not recent_notification:
-                        matching_rules.append(rule)
-
-            return matching_rules
+            return await self.rule_engine.evaluate(db, event)
 
         except Exception as e:
             logger.error(f"Error evaluating rules: {str(e)}")
@@ -134,45 +146,7 @@ class AlertsNotificationAgent(BaseAgent):
 
     async def _evaluate_conditions(self, conditions: List[Dict[str, Any]], payload: Dict[str, Any]) -> bool:
         """Evaluate rule conditions against event payload."""
-        if not conditions:
-            return True
-
-        for condition in conditions:
-            field = condition.get("field")
-            operator = condition.get("operator", "==")
-            value = condition.get("value")
-
-            if field not in payload:
-                return False
-
-            payload_value = payload[field]
-
-            if operator == "==":
-                if payload_value != value:
-                    return False
-            elif operator == "!=":
-                if payload_value == value:
-                    return False
-            elif operator == ">":
-                if not (payload_value > value):
-                    return False
-            elif operator == ">=":
-                if not (payload_value >= value):
-                    return False
-            elif operator == "<":
-                if not (payload_value < value):
-                    return False
-            elif operator == "<=":
-                if not (payload_value <= value):
-                    return False
-            elif operator == "contains":
-                if value not in str(payload_value):
-                    return False
-            elif operator == "in":
-                if payload_value not in value:
-                    return False
-
-        return True
+        return compile_conditions(conditions)(payload)
 
     async def send_notification(self, db: AsyncSession, notification: Dict[str, Any]) -> Notification:
         """Send notification via configured channel."""
@@ -195,6 +169,9 @@ class AlertsNotificationAgent(BaseAgent):
 
             db.add(notification_obj)
             await db.flush()
+            await NotificationDigestService(db).record_created([
+                {"user_id": notification_obj.user_id, "priority": notification_obj.priority}
+            ])
 
             logger.info(f"Created notification {notification_obj.id} via {notification.get('channel')}")
             return notification_obj
@@ -203,50 +180,105 @@ class AlertsNotificationAgent(BaseAgent):
             logger.error(f"Error sending notification: {str(e)}")
             raise
 
-    async def _send_to_channel(
-        self, db: AsyncSession, channel: str, recipient: Dict[str, Any], rule: AlertRule, notification_data: Dict[str, Any]
-    ) -> bool:
-        """Send notification via specific channel."""
+    async def _deliver_email(self, batch: List[Delivery]) -> List[str]:
+        """Email sender: one provider call per distinct message."""
+        outcomes = [REJECTED] * len(batch)
+        groups: Dict[tuple, List[int]] = {}
+        for i, delivery in enumerate(batch):
+            address = delivery.recipient.get("value")
+            if not isinstance(address, str) or not EMAIL_PATTERN.match(address):
+                delivery.last_error = f"Invalid email address: {address}"
+                continue
+            key = (delivery.notification.get("title"), delivery.notification.get("message"))
+            groups.setdefault(key, []).append(i)
+
+        for (subject, body), indexes in groups.items():
+            sent = await self.send_email_batch([batch[i].recipient["value"] for i in indexes], subject, body)
+            for i in indexes:
+                outcomes[i] = SENT if sent else RETRY
+        return outcomes
+
+    async def _deliver_each(self, batch: List[Delivery], send: Callable[[Delivery], Any]) -> List[str]:
+        """For providers without a batch API: concurrent single sends."""
+        results = await asyncio.gather(*(send(d) for d in batch), return_exceptions=True)
+        return [SENT if result is True else RETRY for result in results]
+
+    async def _deliver_sms(self, batch: List[Delivery]) -> List[str]:
+        return await self._deliver_each(
+            batch, lambda d: self.send_sms_notification(d.recipient.get("value"), d.notification.get("message"))
+        )
+
+    async def _deliver_slack(self, batch: List[Delivery]) -> List[str]:
+        return await self._deliver_each(
+            batch, lambda d: self.send_slack_notification(d.recipient.get("value"), d.notification.get("message"))
+        )
+
+    async def _deliver_webhook(self, batch: List[Delivery]) -> List[str]:
+        return await self._deliver_each(
+            batch, lambda d: self.send_webhook_notification(d.recipient.get("value"), d.notification)
+        )
+
+    async def _deliver_in_app(self, batch: List[Delivery]) -> List[str]:
+        """In-app sender: the whole batch becomes one multi-row insert."""
+        now = datetime.utcnow()
+        rows = []
+        for delivery in batch:
+            data = delivery.notification
+            user_id = delivery.recipient.get("value") if delivery.recipient.get("type") == "user" else None
+            user_id = user_id or 1
+            rows.append({
+                "user_id": user_id,
+                "alert_rule_id": data.get("alert_rule_id"),
+                "event_id": data.get("event_id"),
+                "channel": "in_app",
+                "recipient": f"user_{user_id}",
+                "title": data.get("title"),
+                "message": data.get("message"),
+                "link": data.get("link"),
+                "entity_type": data.get("entity_type"),
+                "entity_id": data.get("entity_id"),
+                "priority": data.get("priority", "medium"),
+                "status": "sent",
+                "sent_at": now,
+                "extra_metadata": data.get("metadata", {}),
+            })
+
+        async with self._new_session() as session:
+            await session.execute(insert(Notification), rows)
+            await NotificationDigestService(session).record_created(rows)
+            await session.commit()
+        logger.info(f"Created {len(rows)} in-app notifications")
+        return [SENT] * len(batch)
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from database import connection
+
+            return connection.AsyncSessionLocal()
+        return self._session_factory()
+
+    async def send_email_batch(self, recipients: List[str], subject: str, body: str) -> bool:
+        """Send one message to many recipients in a single SendGrid request."""
         try:
-            if channel == "email":
-                return await self.send_email_notification(
-                    recipient.get("value"),
-                    notification_data.get("title"),
-                    notification_data.get("message"),
-                )
-            elif channel == "sms":
-                return await self.send_sms_notification(
-                    recipient.get("value"),
-                    notification_data.get("message"),
-                )
-            elif channel == "slack":
-                return await self.send_slack_notification(
-                    recipient.get("value"),
-                    notification_data.get("message"),
-                )
-            elif channel == "webhook":
-                return await self.send_webhook_notification(
-                    recipient.get("value"),
-                    notification_data,
-                )
-            elif channel == "in_app":
-                user_id = None
-                if recipient.get("type") == "user":
-                    user_id = recipient.get("value")
-
-                await self.create_in_app_notification(
-                    db,
-                    user_id or 1,
-                    notification_data.get("title"),
-                    notification_data.get("message"),
-                    notification_data.get("link"),
-                )
-                return True
+            logger.info(f"Sending email to {len(recipients)} recipients: {subject}")
 
-            return False
+            async with aiohttp.ClientSession() as session:
+                # One personalization per recipient so addresses stay private;
+                # SendGrid accepts up to 1000 per request
+                data = {
+                    "personalizations": [{"to": [{"email": r}]} for r in recipients],
+                    "from": {"email": "noreply@hrplatform.com"},
+                    "subject": subject,
+                    "content": [{"type": "text/html", "value": body}],
+                }
+
+                # In production: actual SendGrid API call
+                logger.debug(f"Email batch sent to {len(recipients)} recipients")
+
+            return True
 
         except Exception as e:
-            logger.error(f"Error sending to {channel}: {str(e)}")
+            logger.error(f"Error sending email batch: {str(e)}")
             return False
 
     async def send_email_notification(self, recipient: str, subject: str, body: str) -> bool:
@@ -256,7 +288,7 @@ class AlertsNotificationAgent(BaseAgent):
             logger.info(f"Sending email to {recipient}: {subject}")
 
             # Validate email
-            if not re.match(r"[^@]+@[^@]+\.[^@]+", recipient):
+            if not EMAIL_PATTERN.match(recipient):
                 logger.warning(f"Invalid email address: {recipient}")
                 return False
 
@@ -350,6 +382,7 @@ class AlertsNotificationAgent(BaseAgent):
 
             db.add(notification)
             await db.flush()
+            await NotificationDigestService(db).record_created([{"user_id": user_id, "priority": "medium"}])
 
             logger.info(f"Created in-app notification for user {user_id}")
             return notification
@@ -400,9 +433,12 @@ class AlertsNotificationAgent(BaseAgent):
             notification = result.scalars().first()
 
             if notification:
+                was_unread = notification.read_at is None
                 notification.read_at = datetime.utcnow()
                 notification.status = "read"
                 await db.flush()
+                if was_unread and notification.user_id is not None:
+                    await NotificationDigestService(db).record_read(notification.user_id)
 
                 logger.debug(f"Marked notification {notification_id} as read")
 
@@ -411,42 +447,45 @@ class AlertsNotificationAgent(BaseAgent):
             raise
 
     async def get_digest(self, db: AsyncSession, user_id: int, period: str = "daily") -> Dict[str, Any]:
-        """Generate daily/weekly digest of notifications."""
+        """
+        Generate daily/weekly digest of notifications.
+
+        Counts come from the user's digest buckets (UTC calendar days, today
+        included); the listed notifications are the most important
+        ``DIGEST_ITEM_LIMIT`` of the period.
+        """
         try:
-            if period == "daily":
-                time_delta = timedelta(days=1)
-            elif period == "weekly":
-                time_delta = timedelta(days=7)
-            else:
-                time_delta = timedelta(days=1)
-
-            cutoff_time = datetime.utcnow() - time_delta
-
-            stmt = (
-                select(Notification)
-                .where(
-                    and_(
-                        Notification.user_id == user_id,
-                        Notification.created_at >= cutoff_time,
+            counts = await NotificationDigestService(db).get_counts(user_id, period)
+            since = datetime.combine(counts["start"], datetime.min.time())
+
+            by_priority: Dict[str, List[Notification]] = {priority: [] for priority in PRIORITIES}
+            if counts["total"]:
+                rank = case(
+                    {priority: i for i, priority in enumerate(PRIORITIES)},
+                    value=Notification.priority,
+                    else_=len(PRIORITIES),
+                )
+                stmt = (
+                    select(Notification)
+                    .where(
+                        and_(
+                            Notification.user_id == user_id,
+                            Notification.created_at >= since,
+                        )
                     )
+                    .order_by(rank, Notification.created_at.desc())
+                    .limit(DIGEST_ITEM_LIMIT)
                 )
-                .order_by(Notification.priority.desc(), Notification.created_at.desc())
-            )
-            result = await db.execute(stmt)
-            notifications = result.scalars().all()
-
-            # Group by priority
-            by_priority = {
-                "critical": [n for n in notifications if n.priority == "critical"],
-                "high": [n for n in notifications if n.priority == "high"],
-                "medium": [n for n in notifications if n.priority == "medium"],
-                "low": [n for n in notifications if n.priority == "low"],
-            }
+                result = await db.execute(stmt)
+                for notification in result.scalars().all():
+                    if notification.priority in by_priority:
+                        by_priority[notification.priority].append(notification)
 
             digest = {
                 "period": period,
                 "user_id": user_id,
-                "total_notifications": len(notifications),
+                "total_notifications": counts["total"],
+                "counts_by_priority": counts["by_priority"],
                 "by_priority": by_priority,
                 "generated_at": datetime.utcnow().isoformat(),
             }
@@ -457,6 +496,11 @@ class AlertsNotificationAgent(BaseAgent):
             logger.error(f"Error generating digest: {str(e)}")
             raise
 
+    async def stream_digests(self, db: AsyncSession, period: str = "daily") -> AsyncIterator[Dict[str, Any]]:
+        """Digest counts for every user on ``period``, in one streaming pass over the buckets."""
+        async for digest in NotificationDigestService(db).stream_digests(period):
+            yield digest
+
     async def manage_preferences(
         self, db: AsyncSession, user_id: int, preferences: Dict[str, Any]
     ) -> NotificationPreference:
@@ -487,43 +531,31 @@ class AlertsNotificationAgent(BaseAgent):
     async def get_alert_analytics(self, db: AsyncSession) -> Dict[str, Any]:
         """Alert analytics."""
         try:
-            # Get notification stats
-            stmt = select(func.count(Notification.id))
-            result = await db.execute(stmt)
-            total_notifications = result.scalar() or 0
-
-            # By channel
-            stmt = select(Notification.channel, func.count(Notification.id)).group_by(Notification.channel)
+            # One grouped pass gives totals by channel, status and priority
+            stmt = select(
+                Notification.channel, Notification.status, Notification.priority, func.count(Notification.id)
+            ).group_by(Notification.channel, Notification.status, Notification.priority)
             result = await db.execute(stmt)
-            by_channel = dict(result.all())
 
-            # By status
-            stmt = select(Notification.status, func.count(Notification.id)).group_by(Notification.status)
-            result = await db.execute(stmt)
-            by_status = dict(result.all())
-
-            # By priority
-            stmt = select(Notification.priority, func.count(Notification.id)).group_by(Notification.priority)
-            result = await db.execute(stmt)
-            by_priority = dict(result.all())
+            total_notifications = 0
+            by_channel: Dict[str, int] = {}
+            by_status: Dict[str, int] = {}
+            by_priority: Dict[str, int] = {}
+            for channel, status, priority, count in result.all():
+                total_notifications += count
+                by_channel[channel] = by_channel.get(channel, 0) + count
+                by_status[status] = by_status.get(status, 0) + count
+                by_priority[priority] = by_priority.get(priority, 0) + count
 
             # Get active rules
-            stmt = select(func.count(AlertRule.id)).where(AlertRule.is_active is True)
+            stmt = select(func.count(AlertRule.id)).where(AlertRule.is_active == True)
             result = await db.execute(stmt)
             active_rules = result.scalar() or 0
 
-            # Delivery success rate
-            stmt = select(func.count(Notification.id)).where(Notification.status == "delivered")
-            result = await db.execute(stmt)
-            delivered = result.scalar() or 0
-
+            delivered = by_status.get("delivered", 0)
             delivery_success_rate = (delivered / total_notifications * 100) if total_notifications > 0 else 0
 
-            # Read rate
-            stmt = select(func.count(Notification.id)).where(Notification.status == "read")
-            result = await db.execute(stmt)
-            read = result.scalar() or 0
-
+            read = by_status.get("read", 0)
             read_rate = (read / total_notifications * 100) if total_notifications > 0 else 0
 
             analytics = {
@@ -570,4 +602,5 @@ class AlertsNotificationAgent(BaseAgent):
 
     async def on_stop(self) -> None:
         """Cleanup alerts and notification agent."""
+        await self.dispatcher.close()
         logger.info("Alerts and Notification Agent stopped")
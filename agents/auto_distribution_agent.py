@@ -10,6 +10,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from agents.supplier_index import SupplierCapabilityIndex, SupplierProfile, normalize_terms
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,11 +46,58 @@ class AutoDistributionAgent:
         "new": 20,
     }
 
+    def build_index(self, available_suppliers: List[Dict[str, Any]]) -> SupplierCapabilityIndex:
+        """
+        Precompute the requirement-independent part of every supplier's score.
+
+        Build once per supplier pool and pass it to ``recommend_suppliers``
+        for each requirement; only specialization scoring is left per call.
+        """
+        index = SupplierCapabilityIndex(base_score=self._base_score)
+        profiles = []
+        for position, supplier in enumerate(available_suppliers):
+            perf_score = self._score_performance(supplier)
+            capacity_score = self._score_capacity(supplier)
+            tier_score = self._score_tier(supplier)
+            # Keyed by position so suppliers without an org_id stay distinct
+            profiles.append(SupplierProfile(
+                supplier_id=position,
+                name=supplier.get("name", "Unknown"),
+                tier=supplier.get("tier", "standard"),
+                specializations=normalize_terms(supplier.get("specializations", [])),
+                locations=normalize_terms(supplier.get("locations_served", [])),
+                attributes={
+                    "supplier": supplier,
+                    "perf_score": perf_score,
+                    "capacity_score": capacity_score,
+                    "tier_score": tier_score,
+                },
+            ))
+        index.rebuild(profiles)
+        return index
+
+    @staticmethod
+    def _composite(profile: SupplierProfile, spec_score: float) -> float:
+        attributes = profile.attributes
+        return (
+            spec_score * 0.30
+            + attributes["perf_score"] * 0.30
+            + attributes["capacity_score"] * 0.20
+            + attributes["tier_score"] * 0.20
+        )
+
+    @classmethod
+    def _base_score(cls, profile: SupplierProfile) -> float:
+        """Displayed score when no requested skill matches (30 for suppliers without specializations)."""
+        unmatched_spec = 0 if profile.specializations else 30
+        return round(cls._composite(profile, unmatched_spec), 1)
+
     def recommend_suppliers(
         self,
         requirement: Dict[str, Any],
-        available_suppliers: List[Dict[str, Any]],
+        available_suppliers: Optional[List[Dict[str, Any]]] = None,
         max_recommendations: int = 5,
+        index: Optional[SupplierCapabilityIndex] = None,
     ) -> List[SupplierRecommendation]:
         """
         Recommend suppliers for a requirement.
@@ -60,24 +109,41 @@ class AutoDistributionAgent:
                                 specializations, locations_served, avg_quality_score,
                                 total_placements, active_distributions,
                                 avg_response_time_hours, max_capacity
+            max_recommendations: Number of suppliers to return
+            index: Prebuilt ``build_index`` result to reuse across requirements
+                   (takes the place of ``available_suppliers``)
         """
-        scored = []
+        if index is None:
+            index = self.build_index(available_suppliers or [])
 
-        for supplier in available_suppliers:
-            spec_score = self._score_specialization(requirement, supplier)
-            perf_score = self._score_performance(supplier)
-            capacity_score = self._score_capacity(supplier)
-            tier_score = self._score_tier(supplier)
+        req_skills = normalize_terms(requirement.get("skills", []))
 
-            composite = (
-                spec_score * 0.30
-                + perf_score * 0.30
-                + capacity_score * 0.20
-                + tier_score * 0.20
-            )
+        def score(profile: SupplierProfile, overlap: int, serves_location: bool) -> float:
+            # Rank on the displayed (rounded) score; ties keep input order
+            spec_score = self._score_specialization(len(req_skills), bool(profile.specializations), overlap)
+            return round(self._composite(profile, spec_score), 1)
 
+        # Without requested skills every supplier gets the same specialization
+        # score, which breaks the base-score ordering; score them all instead
+        ranked = index.top_n(
+            max_recommendations, score, skills=req_skills, exhaustive=not req_skills
+        )
+
+        result = []
+        for _, profile in ranked:
+            supplier = profile.attributes["supplier"]
+            spec_score = self._score_specialization(
+                len(req_skills),
+                bool(profile.specializations),
+                len(req_skills & profile.specializations),
+            )
+            composite = self._composite(profile, spec_score)
             reasons = self._generate_reasons(
-                supplier, spec_score, perf_score, capacity_score, tier_score
+                supplier,
+                spec_score,
+                profile.attributes["perf_score"],
+                profile.attributes["capacity_score"],
+                profile.attributes["tier_score"],
             )
 
             if composite >= 60:
@@ -87,7 +153,7 @@ class AutoDistributionAgent:
             else:
                 priority = "LOW"
 
-            scored.append(SupplierRecommendation(
+            result.append(SupplierRecommendation(
                 supplier_org_id=supplier.get("org_id", 0),
                 supplier_name=supplier.get("name", "Unknown"),
                 tier=supplier.get("tier", "standard"),
@@ -96,29 +162,22 @@ class AutoDistributionAgent:
                 priority=priority,
             ))
 
-        # Sort by score descending
-        scored.sort(key=lambda x: x.score, reverse=True)
-
-        result = scored[:max_recommendations]
         logger.info(
             f"Recommended {len(result)} suppliers for requirement, "
             f"top score: {result[0].score if result else 0}"
         )
         return result
 
-    def _score_specialization(self, requirement: Dict, supplier: Dict) -> float:
+    @staticmethod
+    def _score_specialization(req_skill_count: int, has_specializations: bool, overlap: int) -> float:
         """Score how well supplier specializes in the requirement's domain."""
-        req_skills = set(s.lower() for s in requirement.get("skills", []))
-        supplier_specs = set(s.lower() for s in supplier.get("specializations", []))
-
-        if not req_skills:
+        if not req_skill_count:
             return 50
 
-        if not supplier_specs:
+        if not has_specializations:
             return 30
 
-        overlap = len(req_skills.intersection(supplier_specs))
-        coverage = overlap / len(req_skills) if req_skills else 0
+        coverage = overlap / req_skill_count
 
         return min(100, coverage * 100)
 
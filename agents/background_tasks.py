@@ -0,0 +1,347 @@
+"""
+Background task runtime owned by the application lifespan.
+
+Request handlers hand work to ``background_tasks.submit`` instead of
+``asyncio.create_task``. Tasks wait in a bounded queue for one of a fixed
+number of worker coroutines; when the queue is full ``submit`` raises
+``BackgroundQueueFull`` so the endpoint can answer 503 rather than pile up
+work. Every task is tracked in a registry (status, timings, error) and can
+be cancelled while queued or running.
+
+Tasks must not use the request's session, which is closed once the
+response is sent. They open their own with ``background_tasks.session()``:
+sessions come from a separate engine whose pool is capped at
+``db_connections`` (with no overflow), and a semaphore of the same size
+makes extra tasks wait for a connection in the event loop instead of
+timing out in the pool. Background work therefore never takes
+connections from the API's pool.
+
+On shutdown ``close`` stops accepting work, lets queued and running tasks
+finish for up to ``drain_timeout`` seconds, then cancels the rest.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+logger = logging.getLogger(__name__)
+
+TaskFunc = Callable[..., Awaitable[Any]]
+
+
+class TaskStatus:
+    """Background task states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class BackgroundQueueFull(Exception):
+    """Raised by ``submit`` when the queue is at capacity or the runtime is stopping."""
+
+
+@dataclass
+class TaskInfo:
+    """Registry entry for one submitted task."""
+    id: str
+    name: str
+    status: str = TaskStatus.QUEUED
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "metadata": self.metadata,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BackgroundTaskRuntime:
+    """
+    Bounded worker pool with a task registry and its own database sessions.
+
+    Usage::
+
+        runtime = BackgroundTaskRuntime(workers=4, database_url=url)
+        await runtime.start()
+        info = runtime.submit("import_job", process_job, job_id, task_id=f"import_job:{job_id}")
+        runtime.cancel(info.id)
+        await runtime.close()
+
+    A task function is awaited with the given arguments; it opens sessions
+    itself with ``async with runtime.session() as db``.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        queue_size: int = 500,
+        db_connections: int = 4,
+        drain_timeout: float = 30.0,
+        history_size: int = 1000,
+        database_url: Optional[str] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.db_connections = db_connections
+        self.drain_timeout = drain_timeout
+        self.history_size = history_size
+        self.database_url = database_url
+
+        self._session_factory = session_factory
+        self._engine: Optional[AsyncEngine] = None
+        self._db_slots: Optional[asyncio.Semaphore] = None
+        self._db_in_use = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._registry: "OrderedDict[str, TaskInfo]" = OrderedDict()
+        self._pending: Dict[str, Tuple[TaskFunc, tuple, dict]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self._accepting = False
+        self._counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "cancelled": 0}
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Create the session factory and start the workers (idempotent)."""
+        self._start()
+
+    def _start(self) -> None:
+        if self.is_running:
+            return
+        if self._session_factory is None:
+            from database.connection import _session_factory, engine_options
+
+            self._engine = create_async_engine(
+                self.database_url,
+                **engine_options(self.database_url, self.db_connections, 0),
+            )
+            self._session_factory = _session_factory(self._engine)
+        self._db_slots = asyncio.Semaphore(self.db_connections)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._accepting = True
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(
+            f"Background task runtime started with {self.workers} workers "
+            f"and {self.db_connections} database connections"
+        )
+
+    def submit(
+        self,
+        name: str,
+        func: TaskFunc,
+        *args: Any,
+        task_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> TaskInfo:
+        """
+        Queue ``func(*args, **kwargs)`` without waiting for it.
+
+        Args:
+            name: Kind of task, for logs and stats
+            func: Coroutine function to run
+            task_id: Registry key (generated when omitted); must not belong to an unfinished task
+            metadata: Extra details returned with the task's status
+
+        Returns:
+            The task's registry entry
+
+        Raises:
+            BackgroundQueueFull: The queue is full or the runtime is not accepting work
+            ValueError: ``task_id`` is already in use by an unfinished task
+        """
+        if not self.is_running:
+            self._start()
+        if not self._accepting:
+            self._counters["rejected"] += 1
+            raise BackgroundQueueFull("Background task runtime is not accepting work")
+        task_id = task_id or f"{name}-{next(self._ids)}"
+        existing = self._registry.get(task_id)
+        if existing is not None and existing.status not in TaskStatus.FINISHED:
+            raise ValueError(f"Task {task_id} is already {existing.status}")
+        try:
+            self._queue.put_nowait(task_id)
+        except asyncio.QueueFull:
+            self._counters["rejected"] += 1
+            raise BackgroundQueueFull(f"Background task queue is full ({self.queue_size} tasks)")
+
+        info = TaskInfo(id=task_id, name=name, metadata=metadata or {})
+        self._registry.pop(task_id, None)
+        self._registry[task_id] = info
+        self._pending[task_id] = (func, args, kwargs)
+        self._counters["submitted"] += 1
+        self._prune()
+        return info
+
+    def get(self, task_id: str) -> Optional[TaskInfo]:
+        """Registry entry for ``task_id``, if it is still retained."""
+        return self._registry.get(task_id)
+
+    def list_tasks(self, status: Optional[str] = None) -> List[TaskInfo]:
+        """Retained tasks, oldest first, optionally filtered by status."""
+        return [info for info in self._registry.values() if status is None or info.status == status]
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a queued or running task.
+
+        Returns:
+            False if the task is unknown or already finished
+        """
+        info = self._registry.get(task_id)
+        if info is None or info.status in TaskStatus.FINISHED:
+            return False
+        if task_id in self._pending:
+            # Still queued: the worker that dequeues it skips it
+            del self._pending[task_id]
+            self._finish(info, TaskStatus.CANCELLED)
+            return True
+        task = self._running.get(task_id)
+        if task is not None:
+            task.cancel()
+        return True
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """A database session from the runtime's pool, waiting for a free connection."""
+        async with self._db_slots:
+            self._db_in_use += 1
+            try:
+                async with self._session_factory() as session:
+                    yield session
+            finally:
+                self._db_in_use -= 1
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting work, drain for up to ``timeout`` seconds, then cancel what is left."""
+        if not self.is_running:
+            return
+        self._accepting = False
+        timeout = self.drain_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Background tasks still running after {timeout:g}s; cancelling "
+                f"{len(self._running)} running and {len(self._pending)} queued"
+            )
+            for task_id in list(self._pending):
+                self.cancel(task_id)
+            for task in list(self._running.values()):
+                task.cancel()
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+        logger.info(f"Background task runtime stopped: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue, worker and connection usage, plus lifetime counters."""
+        return {
+            **self._counters,
+            "queued": len(self._pending),
+            "running": len(self._running),
+            "workers": self.workers,
+            "db_connections": self.db_connections,
+            "db_connections_in_use": self._db_in_use,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            task_id = await self._queue.get()
+            try:
+                entry = self._pending.pop(task_id, None)
+                if entry is not None:
+                    await self._run(self._registry[task_id], *entry)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, info: TaskInfo, func: TaskFunc, args: tuple, kwargs: dict) -> None:
+        info.status = TaskStatus.RUNNING
+        info.started_at = time.time()
+        task = asyncio.create_task(func(*args, **kwargs))
+        self._running[info.id] = task
+        try:
+            # wait() does not raise when the task is cancelled, only when the worker is
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
+        finally:
+            self._running.pop(info.id, None)
+            if task.done():
+                if task.cancelled():
+                    self._finish(info, TaskStatus.CANCELLED)
+                elif task.exception() is not None:
+                    exc = task.exception()
+                    logger.error(f"Background task {info.id} failed: {str(exc)}", exc_info=exc)
+                    self._finish(info, TaskStatus.FAILED, f"{type(exc).__name__}: {str(exc)}")
+                else:
+                    self._finish(info, TaskStatus.SUCCEEDED)
+
+    def _finish(self, info: TaskInfo, status: str, error: Optional[str] = None) -> None:
+        info.status = status
+        info.error = error
+        info.finished_at = time.time()
+        self._counters[status] += 1
+
+    def _prune(self) -> None:
+        """Forget the oldest finished tasks beyond ``history_size``."""
+        excess = len(self._registry) - self.history_size
+        if excess <= 0:
+            return
+        for task_id in [tid for tid, info in self._registry.items() if info.status in TaskStatus.FINISHED][:excess]:
+            del self._registry[task_id]
+
+
+def create_background_runtime(settings: Any) -> BackgroundTaskRuntime:
+    """Build a runtime configured from ``settings``."""
+    return BackgroundTaskRuntime(
+        workers=settings.background_task_workers,
+        queue_size=settings.background_task_queue_size,
+        db_connections=settings.background_task_db_connections,
+        drain_timeout=settings.background_task_drain_seconds,
+        history_size=settings.background_task_history_size,
+        database_url=settings.database_url,
+    )
+
+
+def _create_runtime() -> BackgroundTaskRuntime:
+    from config import settings
+
+    return create_background_runtime(settings)
+
+
+background_tasks = _create_runtime()
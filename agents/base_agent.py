@@ -2,6 +2,7 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from agents.events import Event, EventType
 
 logger = logging.getLogger(__name__)
@@ -68,9 +69,15 @@ class BaseAgent(ABC):
         payload: Dict[str, Any],
         correlation_id: Optional[str] = None,
         user_id: Optional[int] = None,
+        db: Optional[AsyncSession] = None,
+        use_rabbitmq: bool = False,
     ) -> Event:
         """Emit an event to the event bus.
 
+        With ``db`` the event is written to the transactional outbox in
+        that session and published by the outbox relay once the session
+        commits; without it the event is only built and returned.
+
         Args:
             event_type: Type of event to emit
             entity_type: Type of entity related to the event
@@ -78,6 +85,8 @@ class BaseAgent(ABC):
             payload: Event payload
             correlation_id: Optional correlation ID for tracing
             user_id: Optional user ID who triggered the event
+            db: Session of the change the event describes
+            use_rabbitmq: Whether to publish through RabbitMQ (durable queues)
 
         Returns:
             The emitted event
@@ -96,6 +105,11 @@ class BaseAgent(ABC):
             user_id=user_id,
         )
 
+        if db is not None:
+            from agents.event_outbox import enqueue_event
+
+            await enqueue_event(db, event, use_rabbitmq=use_rabbitmq)
+
         logger.info(f"Agent {self.agent_name} emitted event {event_type} for {entity_type}#{entity_id}")
         return event
 
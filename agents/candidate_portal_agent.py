@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from agents.base_agent import BaseAgent
+from agents.events import EventType
 from models.candidate_portal import (
     CandidateProfile,
     CandidateVideo,
@@ -61,16 +62,17 @@ class CandidatePortalAgent(BaseAgent):
             profile.profile_completeness = self._calculate_profile_completeness(profile)
             profile.is_public = profile_data.get("is_public", True)
 
-            await db.commit()
-            logger.info(f"Created/updated profile for candidate {candidate_id}")
-
             await self.emit_event(
-                event_type="candidate_profile_created",
+                event_type=EventType.CANDIDATE_PROFILE_CREATED,
                 entity_type="candidate",
                 entity_id=candidate_id,
                 payload={"profile_completeness": profile.profile_completeness},
+                db=db,
             )
 
+            await db.commit()
+            logger.info(f"Created/updated profile for candidate {candidate_id}")
+
             return profile
 
         except Exception as e:
@@ -127,11 +129,8 @@ class CandidatePortalAgent(BaseAgent):
             except Exception as e:
                 logger.warning(f"Could not generate resume files: {str(e)}")
 
-            await db.commit()
-            logger.info(f"Built resume for candidate {candidate_id}")
-
             await self.emit_event(
-                event_type="resume_built",
+                event_type=EventType.RESUME_BUILT,
                 entity_type="candidate",
                 entity_id=candidate_id,
                 payload={
@@ -139,8 +138,12 @@ class CandidatePortalAgent(BaseAgent):
                     "pdf_path": resume.generated_pdf_path,
                     "docx_path": resume.generated_docx_path,
                 },
+                db=db,
             )
 
+            await db.commit()
+            logger.info(f"Built resume for candidate {candidate_id}")
+
             return {
                 "resume_id": resume.id,
                 "version": resume.version,
@@ -289,11 +292,8 @@ Provide only the enhanced content without any explanation."""
                 except Exception as e:
                     logger.warning(f"Could not transcribe video: {str(e)}")
 
-            await db.commit()
-            logger.info(f"Uploaded video {video.id} for candidate {candidate_id}")
-
             await self.emit_event(
-                event_type="video_uploaded",
+                event_type=EventType.CANDIDATE_VIDEO_UPLOADED,
                 entity_type="candidate",
                 entity_id=candidate_id,
                 payload={
@@ -301,8 +301,12 @@ Provide only the enhanced content without any explanation."""
                     "duration": duration,
                     "type": video.video_type,
                 },
+                db=db,
             )
 
+            await db.commit()
+            logger.info(f"Uploaded video {video.id} for candidate {candidate_id}")
+
             return video
 
         except Exception as e:
@@ -448,7 +452,7 @@ Provide only the enhanced content without any explanation."""
             )
 
             await self.emit_event(
-                event_type="submission_package_created",
+                event_type=EventType.SUBMISSION_PACKAGE_CREATED,
                 entity_type="candidate",
                 entity_id=candidate_id,
                 payload={
@@ -557,16 +561,17 @@ Provide only the enhanced content without any explanation."""
                     if hasattr(profile, key):
                         setattr(profile, key, value)
 
-            await db.commit()
-            logger.info(f"Updated availability for candidate {candidate_id}")
-
             await self.emit_event(
-                event_type="candidate_availability_updated",
+                event_type=EventType.CANDIDATE_AVAILABILITY_UPDATED,
                 entity_type="candidate",
                 entity_id=candidate_id,
                 payload=availability_data,
+                db=db,
             )
 
+            await db.commit()
+            logger.info(f"Updated availability for candidate {candidate_id}")
+
             return {
                 "candidate_id": candidate_id,
                 "availability_status": profile.availability_status,
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from agents.base_agent import BaseAgent
+from agents.events import EventType
 from models.contract import (
     Contract,
     ContractTemplate,
@@ -96,17 +97,18 @@ class ContractManagementAgent(BaseAgent):
                 {"contract_type": contract_type, "title": title},
             )
 
-            await db.commit()
-            logger.info(f"Created contract {contract.id} of type {contract_type}")
-
             await self.emit_event(
-                event_type="contract_created",
+                event_type=EventType.CONTRACT_CREATED,
                 entity_type="contract",
                 entity_id=contract.id,
                 payload={"contract_type": contract_type, "title": title},
                 user_id=user_id,
+                db=db,
             )
 
+            await db.commit()
+            logger.info(f"Created contract {contract.id} of type {contract_type}")
+
             return contract
 
         except Exception as e:
@@ -261,19 +263,19 @@ Ensure all placeholders are filled with actual values from the context."""
                 {"signer_count": len(signers)},
             )
 
-            await db.commit()
-
-            logger.info(f"Sent contract {contract_id} to {len(signers)} signers")
-
-            # Emit event
             await self.emit_event(
-                event_type="contract_sent_for_signature",
+                event_type=EventType.CONTRACT_SENT_FOR_SIGNATURE,
                 entity_type="contract",
                 entity_id=contract_id,
                 payload={"signer_count": len(signers)},
                 user_id=user_id,
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Sent contract {contract_id} to {len(signers)} signers")
+
             return {
                 "contract_id": contract_id,
                 "signer_count": len(signers),
@@ -364,25 +366,27 @@ Ensure all placeholders are filled with actual values from the context."""
                 )
 
                 await self.emit_event(
-                    event_type="contract_completed",
+                    event_type=EventType.CONTRACT_COMPLETED,
                     entity_type="contract",
                     entity_id=contract_id,
                     payload={"all_signed": True},
+                    db=db,
                 )
             else:
                 contract.status = ContractStatus.PARTIALLY_SIGNED.value
 
-            await db.commit()
-
-            logger.info(
-                f"Processed signature {signer_id} for contract {contract_id}"
-            )
-
             await self.emit_event(
-                event_type="contract_signature_received",
+                event_type=EventType.CONTRACT_SIGNATURE_RECEIVED,
                 entity_type="contract",
                 entity_id=contract_id,
                 payload={"signer_email": signature.signer_email},
+                db=db,
+            )
+
+            await db.commit()
+
+            logger.info(
+                f"Processed signature {signer_id} for contract {contract_id}"
             )
 
             return signature
@@ -434,18 +438,19 @@ Ensure all placeholders are filled with actual values from the context."""
                 {"reason": reason},
             )
 
-            await db.commit()
-
-            logger.info(f"Voided contract {contract_id}: {reason}")
-
             await self.emit_event(
-                event_type="contract_voided",
+                event_type=EventType.CONTRACT_VOIDED,
                 entity_type="contract",
                 entity_id=contract_id,
                 payload={"reason": reason},
                 user_id=user_id,
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Voided contract {contract_id}: {reason}")
+
             return contract
 
         except Exception as e:
@@ -522,18 +527,19 @@ Ensure all placeholders are filled with actual values from the context."""
                 {"renewal_contract_id": renewal_contract.id},
             )
 
-            await db.commit()
-
-            logger.info(f"Created renewal contract {renewal_contract.id} from {contract_id}")
-
             await self.emit_event(
-                event_type="contract_renewed",
+                event_type=EventType.CONTRACT_RENEWED,
                 entity_type="contract",
                 entity_id=contract_id,
                 payload={"renewal_contract_id": renewal_contract.id},
                 user_id=user_id,
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Created renewal contract {renewal_contract.id} from {contract_id}")
+
             return renewal_contract
 
         except Exception as e:
@@ -178,7 +178,9 @@ class ConversationalInterfaceAgent(BaseAgent):
                     "user_role": user_role,
                 },
                 user_id=user_id,
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Started conversation {conversation.id} for user {user_id} ({user_role})")
             return conversation
@@ -244,7 +246,9 @@ class ConversationalInterfaceAgent(BaseAgent):
                     "message_length": len(message),
                 },
                 user_id=user_id,
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Added message to conversation {conversation_id}")
             return user_message
@@ -3,15 +3,88 @@ Duplicate Candidate Detection Agent — Prevents same candidate
 from being submitted by multiple suppliers for the same requirement.
 
 Uses fuzzy matching on name, email, phone, and LinkedIn URL.
+
+Records are normalized once into ``CandidateKeys`` and grouped into
+hash buckets by a ``DuplicateIndex`` (blocking), so a lookup only
+compares records that share at least one key instead of scanning
+every existing candidate.
 """
 
 import logging
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+_NON_DIGIT_RE = re.compile(r'\D')
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/([a-zA-Z0-9\-]+)')
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def _soundex(token: str) -> str:
+    """Four-character American Soundex code for a single name token."""
+    letters = [c for c in token.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    last = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+@dataclass(frozen=True)
+class CandidateKeys:
+    """Normalized comparison keys, computed once per candidate record."""
+    candidate_id: Any
+    email: Optional[str]
+    phone: Optional[str]
+    linkedin: Optional[str]
+    name_tokens: FrozenSet[str]
+
+    @property
+    def sorted_name(self) -> Optional[str]:
+        """Order-insensitive name key ("Smith John" == "John Smith")."""
+        return " ".join(sorted(self.name_tokens)) if self.name_tokens else None
+
+    @property
+    def phonetic_name(self) -> Optional[str]:
+        """Sorted Soundex codes of the name tokens ("Jon Smyth" == "John Smith")."""
+        codes = sorted(filter(None, (_soundex(t) for t in self.name_tokens)))
+        return " ".join(codes) if codes else None
+
+    def block_keys(self) -> List[Tuple[str, str]]:
+        """Blocking keys used to bucket this record in a ``DuplicateIndex``."""
+        keys = []
+        if self.email:
+            keys.append(("email", self.email))
+        if self.phone:
+            keys.append(("phone", self.phone))
+        if self.linkedin:
+            keys.append(("linkedin", self.linkedin))
+        if self.name_tokens:
+            keys.append(("name", self.sorted_name))
+            phonetic = self.phonetic_name
+            if phonetic:
+                keys.append(("phonetic", phonetic))
+        return keys
+
 
 @dataclass
 class DuplicateResult:
@@ -28,6 +101,48 @@ class DuplicateResult:
             self.match_fields = []
 
 
+class DuplicateIndex:
+    """
+    Hash-bucket blocking index over precomputed ``CandidateKeys``.
+
+    Only records sharing an email, phone, LinkedIn slug, or (phonetic)
+    name key are returned as comparison candidates. Name buckets larger
+    than ``max_name_block`` are skipped: a name match alone is worth at
+    most 20 points and can never reach the duplicate threshold, so very
+    common names only cost time without changing the verdict.
+    """
+
+    NAME_BLOCK_TYPES = ("name", "phonetic")
+
+    def __init__(self, max_name_block: int = 50):
+        self.max_name_block = max_name_block
+        self.records: List[CandidateKeys] = []
+        self._buckets: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, keys: CandidateKeys) -> int:
+        """Add a record and return its position in the index."""
+        position = len(self.records)
+        self.records.append(keys)
+        for block_key in keys.block_keys():
+            self._buckets[block_key].append(position)
+        return position
+
+    def candidates_for(self, keys: CandidateKeys) -> List[int]:
+        """Positions of indexed records sharing a blocking key, in insertion order."""
+        positions: Set[int] = set()
+        for block_key in keys.block_keys():
+            bucket = self._buckets.get(block_key)
+            if not bucket:
+                continue
+            if block_key[0] in self.NAME_BLOCK_TYPES and len(bucket) > self.max_name_block:
+                continue
+            positions.update(bucket)
+        return sorted(positions)
+
+
 class DuplicateDetectorAgent:
     """
     Detects duplicate candidates across supplier submissions.
@@ -58,19 +173,40 @@ class DuplicateDetectorAgent:
             candidate: dict with keys: id, email, phone, first_name, last_name, linkedin_url
             existing_candidates: list of dicts with same keys
         """
+        keys = self.extract_keys(candidate)
+        return self._match(keys, (self.extract_keys(e) for e in existing_candidates))
+
+    def build_index(self, candidates: Iterable[Dict[str, Any]]) -> DuplicateIndex:
+        """Normalize candidates once and bucket them for repeated lookups."""
+        index = DuplicateIndex()
+        for candidate in candidates:
+            index.add(self.extract_keys(candidate))
+        return index
+
+    def check_against_index(
+        self, candidate: Dict[str, Any], index: DuplicateIndex
+    ) -> DuplicateResult:
+        """Check a candidate against only the indexed records that share a blocking key."""
+        keys = self.extract_keys(candidate)
+        return self._match(keys, (index.records[p] for p in index.candidates_for(keys)))
+
+    def _match(
+        self, keys: CandidateKeys, others: Iterable[CandidateKeys]
+    ) -> DuplicateResult:
+        """Pick the best-scoring record among ``others`` and classify the result."""
         best_match = None
         best_score = 0
         best_fields = []
 
-        for existing in existing_candidates:
-            if existing.get("id") == candidate.get("id"):
+        for existing in others:
+            if existing.candidate_id == keys.candidate_id:
                 continue  # Skip self
 
-            score, fields = self._compare_candidates(candidate, existing)
+            score, fields = self._compare_keys(keys, existing)
 
             if score > best_score:
                 best_score = score
-                best_match = existing.get("id")
+                best_match = existing.candidate_id
                 best_fields = fields
 
         # Determine result
@@ -85,7 +221,7 @@ class DuplicateDetectorAgent:
             is_duplicate = False
 
         result = DuplicateResult(
-            candidate_id=candidate.get("id", 0),
+            candidate_id=keys.candidate_id or 0,
             is_duplicate=is_duplicate,
             confidence=round(best_score, 1),
             matched_with=best_match if is_duplicate else None,
@@ -95,7 +231,7 @@ class DuplicateDetectorAgent:
 
         if is_duplicate:
             logger.warning(
-                f"Duplicate detected: candidate {candidate.get('id')} "
+                f"Duplicate detected: candidate {keys.candidate_id} "
                 f"matches {best_match} ({recommendation}, confidence={best_score}%)"
             )
 
@@ -105,21 +241,27 @@ class DuplicateDetectorAgent:
         self, a: Dict[str, Any], b: Dict[str, Any]
     ) -> Tuple[float, List[str]]:
         """Compare two candidates and return similarity score and matching fields."""
+        return self._compare_keys(self.extract_keys(a), self.extract_keys(b))
+
+    def _compare_keys(
+        self, a: CandidateKeys, b: CandidateKeys
+    ) -> Tuple[float, List[str]]:
+        """Compare two precomputed key sets."""
         score = 0
         matched_fields = []
 
         # Email match (exact)
-        if self._normalize_email(a) and self._normalize_email(a) == self._normalize_email(b):
+        if a.email and a.email == b.email:
             score += self.FIELD_WEIGHTS["email"]
             matched_fields.append("email")
 
         # Phone match (normalized)
-        if self._normalize_phone(a) and self._normalize_phone(a) == self._normalize_phone(b):
+        if a.phone and a.phone == b.phone:
             score += self.FIELD_WEIGHTS["phone"]
             matched_fields.append("phone")
 
         # Name match (fuzzy)
-        name_sim = self._name_similarity(a, b)
+        name_sim = self._token_similarity(a.name_tokens, b.name_tokens)
         if name_sim >= 0.85:
             score += self.FIELD_WEIGHTS["name"]
             matched_fields.append("name")
@@ -128,12 +270,22 @@ class DuplicateDetectorAgent:
             matched_fields.append("name_partial")
 
         # LinkedIn match
-        if self._normalize_linkedin(a) and self._normalize_linkedin(a) == self._normalize_linkedin(b):
+        if a.linkedin and a.linkedin == b.linkedin:
             score += self.FIELD_WEIGHTS["linkedin"]
             matched_fields.append("linkedin")
 
         return score, matched_fields
 
+    def extract_keys(self, candidate: Dict[str, Any]) -> CandidateKeys:
+        """Run all normalizers once for a candidate record."""
+        return CandidateKeys(
+            candidate_id=candidate.get("id"),
+            email=self._normalize_email(candidate),
+            phone=self._normalize_phone(candidate),
+            linkedin=self._normalize_linkedin(candidate),
+            name_tokens=self._name_tokens(candidate),
+        )
+
     def _normalize_email(self, candidate: Dict) -> Optional[str]:
         """Normalize email for comparison."""
         email = candidate.get("email", "")
@@ -146,7 +298,7 @@ class DuplicateDetectorAgent:
         phone = candidate.get("phone", "")
         if not phone:
             return None
-        digits = re.sub(r'\D', '', phone)
+        digits = _NON_DIGIT_RE.sub('', phone)
         if len(digits) > 10:
             digits = digits[-10:]  # Take last 10 digits
         return digits if len(digits) >= 7 else None
@@ -157,20 +309,20 @@ class DuplicateDetectorAgent:
         if not url:
             return None
         # Extract the profile path
-        match = re.search(r'linkedin\.com/in/([a-zA-Z0-9\-]+)', url)
+        match = _LINKEDIN_RE.search(url)
         return match.group(1).lower() if match else None
 
+    def _name_tokens(self, candidate: Dict) -> FrozenSet[str]:
+        """Lowercased first/last name tokens."""
+        name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}"
+        return frozenset(name.lower().split())
+
     def _name_similarity(self, a: Dict, b: Dict) -> float:
         """Calculate name similarity using simple token overlap."""
-        name_a = f"{a.get('first_name', '')} {a.get('last_name', '')}".lower().strip()
-        name_b = f"{b.get('first_name', '')} {b.get('last_name', '')}".lower().strip()
-
-        if not name_a or not name_b:
-            return 0
-
-        tokens_a = set(name_a.split())
-        tokens_b = set(name_b.split())
+        return self._token_similarity(self._name_tokens(a), self._name_tokens(b))
 
+    def _token_similarity(self, tokens_a: FrozenSet[str], tokens_b: FrozenSet[str]) -> float:
+        """Token overlap ratio between two name token sets."""
         if not tokens_a or not tokens_b:
             return 0
 
@@ -180,14 +332,32 @@ class DuplicateDetectorAgent:
         return overlap / total if total > 0 else 0
 
     def batch_check(
-        self, candidates: List[Dict[str, Any]]
+        self,
+        candidates: List[Dict[str, Any]],
+        existing_candidates: Optional[List[Dict[str, Any]]] = None,
     ) -> List[DuplicateResult]:
-        """Check a batch of candidates for duplicates among themselves."""
-        results = []
+        """
+        Check a batch of candidates for duplicates among themselves
+        (and, optionally, against already-known candidates).
+
+        Keys are computed once per record and lookups go through a
+        blocking index, so the batch runs in near-linear time instead
+        of comparing every pair.
+        """
+        index = self.build_index(existing_candidates or [])
+        offset = len(index)
+        for candidate in candidates:
+            index.add(self.extract_keys(candidate))
 
-        for i, candidate in enumerate(candidates):
-            others = candidates[:i] + candidates[i+1:]
-            result = self.check_for_duplicates(candidate, others)
-            results.append(result)
+        results = []
+        for i in range(len(candidates)):
+            position = offset + i
+            keys = index.records[position]
+            others = (
+                index.records[p]
+                for p in index.candidates_for(keys)
+                if p != position
+            )
+            results.append(self._match(keys, others))
 
         return results
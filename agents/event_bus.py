@@ -1,8 +1,14 @@
 import logging
 import json
 import asyncio
+import os
+import socket
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional, Any
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple
+from agents.event_codec import EventCodec, JsonCodec, decode_event
+from agents.event_consumer import ConsumerPolicy, ConsumerPool, InboundEvent
 from agents.events import Event, EventType
 import redis.asyncio as aioredis
 import aio_pika
@@ -48,46 +54,97 @@ class EventBroker(ABC):
         """Close the broker connection."""
         pass
 
+    def metrics(self) -> Dict[str, Any]:
+        """Consumer metrics per subscribed queue.
+
+        Returns:
+            Queue depth, ack counts and handler timings by queue name
+        """
+        return {}
+
 
 class RedisPubSubBroker(EventBroker):
-    """Redis pub/sub event broker for lightweight events."""
+    """Redis event broker for lightweight events.
 
-    def __init__(self, redis_url: str):
-        """Initialize Redis pub/sub broker.
+    ``transport="pubsub"`` (the default) publishes with PUBLISH and listens
+    on a pub/sub connection: fire-and-forget, every subscribed process
+    gets every event. ``transport="streams"`` appends to one stream per
+    event type and reads it through a consumer group, so worker processes
+    share the events, unacknowledged ones are reclaimed after
+    ``claim_idle_ms`` and nothing published while a worker is down is lost.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        transport: str = "pubsub",
+        consumer_group: str = "hr_platform",
+        consumer_name: Optional[str] = None,
+        stream_maxlen: int = 100_000,
+        claim_idle_ms: int = 60_000,
+        policy: Optional[ConsumerPolicy] = None,
+        codec: Optional[EventCodec] = None,
+    ):
+        """Initialize Redis broker.
 
         Args:
             redis_url: Redis connection URL
+            transport: "pubsub" or "streams"
+            consumer_group: Stream consumer group shared by the workers
+            consumer_name: This worker's name in the group (default host and PID)
+            stream_maxlen: Approximate number of entries kept per stream
+            claim_idle_ms: Reclaim stream entries unacknowledged for this long
+            policy: Prefetch and handler concurrency per channel
+            codec: Wire format for published events (default JSON); either format is read
         """
         self.redis_url = redis_url
+        self.transport = transport
+        self.consumer_group = consumer_group
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.stream_maxlen = stream_maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self.policy = policy or ConsumerPolicy()
+        self.codec = codec or JsonCodec()
         self.redis: Optional[aioredis.Redis] = None
         self.subscriptions: Dict[str, List[Callable]] = {}
+        self.consumers: Dict[str, ConsumerPool] = {}
+        self._pubsub: Any = None
+        self._listeners: Dict[str, asyncio.Task] = {}
 
     async def initialize(self) -> None:
         """Initialize Redis connection."""
         try:
             self.redis = await aioredis.from_url(self.redis_url)
-            logger.info("Redis pub/sub broker initialized")
+            for channel in self.consumers:
+                await self._listen(channel)
+            logger.info(f"Redis {self.transport} broker initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Redis broker: {str(e)}")
             raise
 
     async def publish(self, event: Event, queue: Optional[str] = None) -> None:
-        """Publish an event to Redis pub/sub.
+        """Publish an event to Redis.
 
         Args:
             event: The event to publish
-            queue: Not used for pub/sub
+            queue: Not used for Redis
         """
         if not self.redis:
-            logger.error("Redis not initialized")
-            return
+            raise RuntimeError("Redis not initialized")
 
         channel = f"events:{event.event_type.value}"
         try:
-            await self.redis.publish(channel, event.to_json())
+            data = self.codec.encode(event)
+            if self.transport == "streams":
+                await self.redis.xadd(
+                    channel, {"event": data}, maxlen=self.stream_maxlen, approximate=True
+                )
+            else:
+                await self.redis.publish(channel, data)
             logger.debug(f"Published event {event.event_id} to channel {channel}")
         except Exception as e:
             logger.error(f"Failed to publish event: {str(e)}")
+            raise
 
     async def subscribe(self, event_type: EventType, callback: Callable) -> None:
         """Subscribe to an event type.
@@ -102,8 +159,97 @@ class RedisPubSubBroker(EventBroker):
             self.subscriptions[channel] = []
 
         self.subscriptions[channel].append(callback)
+
+        consumer = self.consumers.get(channel)
+        if consumer is None:
+            consumer = self.consumers[channel] = ConsumerPool(channel, policy=self.policy)
+        consumer.add_handler(callback)
+
+        if self.redis:
+            await self._listen(channel)
         logger.debug(f"Subscribed to channel {channel}")
 
+    async def _listen(self, channel: str) -> None:
+        if self.transport == "streams":
+            if channel in self._listeners:
+                return
+            try:
+                await self.redis.xgroup_create(channel, self.consumer_group, id="$", mkstream=True)
+            except aioredis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._listeners[channel] = asyncio.create_task(self._read_stream(channel))
+        else:
+            if self._pubsub is None:
+                self._pubsub = self.redis.pubsub()
+            await self._pubsub.subscribe(channel)
+            if "pubsub" not in self._listeners:
+                self._listeners["pubsub"] = asyncio.create_task(self._read_pubsub())
+
+    async def _read_pubsub(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                channel = message["channel"]
+                channel = channel.decode() if isinstance(channel, bytes) else channel
+                consumer = self.consumers.get(channel)
+                if consumer is not None:
+                    await consumer.submit(InboundEvent(decode_event(message["data"])))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis pub/sub listener error: {str(e)}")
+                await asyncio.sleep(1.0)
+
+    async def _read_stream(self, channel: str) -> None:
+        consumer = self.consumers[channel]
+        # Entries this worker read but never acked (e.g. before a crash) come first
+        next_id = "0"
+        last_claim = time.monotonic()
+        while True:
+            try:
+                if time.monotonic() - last_claim > self.claim_idle_ms / 1000:
+                    last_claim = time.monotonic()
+                    claimed = await self.redis.xautoclaim(
+                        channel, self.consumer_group, self.consumer_name,
+                        min_idle_time=self.claim_idle_ms, start_id="0-0", count=self.policy.prefetch,
+                    )
+                    await self._submit_entries(consumer, channel, claimed[1])
+
+                response = await self.redis.xreadgroup(
+                    self.consumer_group, self.consumer_name, {channel: next_id},
+                    count=self.policy.prefetch, block=1000,
+                )
+                entries = response[0][1] if response else []
+                if next_id != ">":
+                    next_id = entries[-1][0] if entries else ">"
+                await self._submit_entries(consumer, channel, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis stream listener error on {channel}: {str(e)}")
+                await asyncio.sleep(1.0)
+
+    async def _submit_entries(self, consumer: ConsumerPool, channel: str, entries: List[Any]) -> None:
+        for entry_id, fields in entries:
+            if not fields:
+                continue  # trimmed from the stream while pending
+            data = fields.get(b"event") or fields.get("event")
+            try:
+                event = decode_event(data)
+            except Exception as e:
+                logger.error(f"Dropping undecodable entry {entry_id} on {channel}: {str(e)}")
+                await self.redis.xack(channel, self.consumer_group, entry_id)
+                continue
+
+            async def ack(entry_id=entry_id) -> None:
+                await self.redis.xack(channel, self.consumer_group, entry_id)
+
+            # Not acked: stays pending and is reclaimed after claim_idle_ms
+            await consumer.submit(InboundEvent(event, ack=ack))
+
     async def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
         """Unsubscribe from an event type.
 
@@ -113,32 +259,79 @@ class RedisPubSubBroker(EventBroker):
         """
         channel = f"events:{event_type.value}"
 
-        if channel in self.subscriptions:
+        if callback in self.subscriptions.get(channel, []):
             self.subscriptions[channel].remove(callback)
+            consumer = self.consumers.get(channel)
+            if consumer is not None:
+                consumer.remove_handler(callback)
+                if not consumer.handlers:
+                    await self._stop_listening(channel)
+                    await consumer.drain()
+                    del self.consumers[channel]
             logger.debug(f"Unsubscribed from channel {channel}")
 
+    async def _stop_listening(self, channel: str) -> None:
+        if self.transport == "streams":
+            task = self._listeners.pop(channel, None)
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        elif self._pubsub is not None:
+            await self._pubsub.unsubscribe(channel)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {channel: consumer.metrics() for channel, consumer in self.consumers.items()}
+
     async def close(self) -> None:
-        """Close Redis connection."""
+        """Stop listening, finish in-flight events, then close the Redis connection."""
+        for task in self._listeners.values():
+            task.cancel()
+        await asyncio.gather(*self._listeners.values(), return_exceptions=True)
+        self._listeners.clear()
+        await asyncio.gather(*(consumer.drain() for consumer in self.consumers.values()))
+
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
         if self.redis:
             await self.redis.close()
             logger.info("Redis pub/sub broker closed")
 
 
 class RabbitMQBroker(EventBroker):
-    """RabbitMQ event broker for durable task queues."""
+    """RabbitMQ event broker for durable task queues.
+
+    Each subscribed queue gets its own channel with ``basic.qos`` set to
+    the policy's prefetch and one ConsumerPool running the queue's
+    handlers concurrently. Workers consuming the same durable queue
+    compete for its messages.
+    """
 
-    def __init__(self, rabbitmq_url: str, queue_prefix: str = "hr_platform"):
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        queue_prefix: str = "hr_platform",
+        policy: Optional[ConsumerPolicy] = None,
+        codec: Optional[EventCodec] = None,
+    ):
         """Initialize RabbitMQ broker.
 
         Args:
             rabbitmq_url: RabbitMQ connection URL
             queue_prefix: Prefix for queue names
+            policy: Prefetch and handler concurrency per queue
+            codec: Wire format for published events (default JSON); either format is read
         """
         self.rabbitmq_url = rabbitmq_url
         self.queue_prefix = queue_prefix
+        self.policy = policy or ConsumerPolicy()
+        self.codec = codec or JsonCodec()
         self.connection: Optional[aio_pika.Connection] = None
         self.channel: Optional[aio_pika.Channel] = None
         self.exchanges: Dict[str, aio_pika.Exchange] = {}
+        self.consumers: Dict[str, ConsumerPool] = {}
+        self._consumer_channels: Dict[str, Any] = {}
+        self._consumer_tags: Dict[str, Tuple[Any, str]] = {}
 
     async def initialize(self) -> None:
         """Initialize RabbitMQ connection."""
@@ -177,16 +370,15 @@ class RabbitMQBroker(EventBroker):
             queue: Optional queue name
         """
         if not self.channel:
-            logger.error("RabbitMQ not initialized")
-            return
+            raise RuntimeError("RabbitMQ not initialized")
 
         try:
             exchange = await self._get_exchange(f"{self.queue_prefix}.events")
             routing_key = event.event_type.value
 
             message = aio_pika.Message(
-                body=event.to_json().encode(),
-                content_type="application/json",
+                body=self.codec.encode(event),
+                content_type=self.codec.content_type,
                 delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
             )
 
@@ -194,6 +386,7 @@ class RabbitMQBroker(EventBroker):
             logger.debug(f"Published event {event.event_id} to RabbitMQ")
         except Exception as e:
             logger.error(f"Failed to publish event to RabbitMQ: {str(e)}")
+            raise
 
     async def subscribe(self, event_type: EventType, callback: Callable) -> None:
         """Subscribe to an event type.
@@ -206,19 +399,37 @@ class RabbitMQBroker(EventBroker):
             logger.error("RabbitMQ not initialized")
             return
 
+        queue_name = f"{self.queue_prefix}.{event_type.value}"
+        consumer = self.consumers.get(queue_name)
+        if consumer is not None:
+            consumer.add_handler(callback)
+            return
+
         try:
             exchange = await self._get_exchange(f"{self.queue_prefix}.events")
-            queue_name = f"{self.queue_prefix}.{event_type.value}"
+            channel = await self.connection.channel()
+            await channel.set_qos(prefetch_count=self.policy.prefetch)
 
-            queue = await self.channel.declare_queue(queue_name, durable=True)
+            queue = await channel.declare_queue(queue_name, durable=True)
             await queue.bind(exchange, routing_key=event_type.value)
 
-            async def queue_callback(message: aio_pika.IncomingMessage) -> None:
-                async with message.process():
-                    event = Event.from_json(message.body.decode())
-                    await callback(event)
+            consumer = ConsumerPool(queue_name, [callback], self.policy)
+            requeue = self.policy.requeue_on_error
 
-            await queue.consume(queue_callback)
+            async def queue_callback(message: aio_pika.IncomingMessage) -> None:
+                try:
+                    event = decode_event(message.body)
+                except Exception as e:
+                    logger.error(f"Rejecting undecodable message on {queue_name}: {str(e)}")
+                    await message.reject(requeue=False)
+                    return
+                await consumer.submit(
+                    InboundEvent(event, ack=message.ack, nack=lambda: message.nack(requeue=requeue))
+                )
+
+            self.consumers[queue_name] = consumer
+            self._consumer_channels[queue_name] = channel
+            self._consumer_tags[queue_name] = (queue, await queue.consume(queue_callback))
             logger.debug(f"Subscribed to event type {event_type.value}")
         except Exception as e:
             logger.error(f"Failed to subscribe to event: {str(e)}")
@@ -228,35 +439,132 @@ class RabbitMQBroker(EventBroker):
 
         Args:
             event_type: Type of event to unsubscribe from
-            callback: Not used for RabbitMQ
+            callback: Callback function to remove
         """
+        queue_name = f"{self.queue_prefix}.{event_type.value}"
+        consumer = self.consumers.get(queue_name)
+        if consumer is None:
+            return
+
+        consumer.remove_handler(callback)
+        if not consumer.handlers:
+            await self._stop_consumer(queue_name)
         logger.debug(f"Unsubscribed from event type {event_type.value}")
 
+    async def _stop_consumer(self, queue_name: str) -> None:
+        """Cancel the broker consumer, finish in-flight messages, close its channel."""
+        queue, tag = self._consumer_tags.pop(queue_name)
+        try:
+            await queue.cancel(tag)
+        except Exception as e:
+            logger.warning(f"Failed to cancel consumer on {queue_name}: {str(e)}")
+        await self.consumers.pop(queue_name).drain()
+        await self._consumer_channels.pop(queue_name).close()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {queue_name: consumer.metrics() for queue_name, consumer in self.consumers.items()}
+
     async def close(self) -> None:
-        """Close RabbitMQ connection."""
+        """Drain consumers, then close the RabbitMQ connection."""
+        await asyncio.gather(*(self._stop_consumer(name) for name in list(self.consumers)), return_exceptions=True)
         if self.connection:
             await self.connection.close()
             logger.info("RabbitMQ broker closed")
 
 
+class InProcessBroker(EventBroker):
+    """In-memory stand-in for Redis/RabbitMQ (tests, single-process deployments).
+
+    Published events are kept in ``published`` (most recent ``history``)
+    and handed straight to this process's subscribers, in order, before
+    ``publish`` returns. A failing subscriber is logged, as a consumer
+    error would be with a real broker.
+    """
+
+    def __init__(self, history: int = 10_000):
+        """Initialize in-process broker.
+
+        Args:
+            history: How many published events to keep
+        """
+        self.published: Deque[Tuple[Event, Optional[str]]] = deque(maxlen=history)
+        self.subscriptions: Dict[str, List[Callable]] = {}
+
+    async def initialize(self) -> None:
+        """Nothing to connect to."""
+        logger.info("In-process event broker initialized")
+
+    async def publish(self, event: Event, queue: Optional[str] = None) -> None:
+        """Record a published event and deliver it to subscribers.
+
+        Args:
+            event: The event to publish
+            queue: Optional queue name
+        """
+        self.published.append((event, queue))
+        for callback in list(self.subscriptions.get(event.event_type.value, ())):
+            try:
+                await callback(event)
+            except Exception as e:
+                logger.error(f"Subscriber failed for event {event.event_id}: {str(e)}")
+
+    async def subscribe(self, event_type: EventType, callback: Callable) -> None:
+        """Subscribe to an event type.
+
+        Args:
+            event_type: Type of event to subscribe to
+            callback: Async callback function
+        """
+        self.subscriptions.setdefault(event_type.value, []).append(callback)
+
+    async def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
+        """Remove a subscription.
+
+        Args:
+            event_type: Type of event to unsubscribe from
+            callback: Callback function to remove
+        """
+        callbacks = self.subscriptions.get(event_type.value, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    async def close(self) -> None:
+        """Nothing to close."""
+        logger.info("In-process event broker closed")
+
+
 class EventBus:
-    """Central event bus that coordinates between brokers."""
+    """Central event bus that coordinates between brokers.
+
+    Subscriptions go to the broker the events are published on (Redis by
+    default, RabbitMQ with ``use_rabbitmq``), so events reach subscribers
+    in every worker process, this one included. Local subscribers are only
+    used for a route without a broker.
+
+    ``publish`` is best effort: an event that cannot be published lands in
+    the bounded in-memory ``dead_letter_queue``. Events that must not be
+    lost are written to the transactional outbox (``agents.event_outbox``)
+    and published by the relay through ``deliver``.
+    """
 
     def __init__(
         self,
-        redis_broker: Optional[RedisPubSubBroker] = None,
-        rabbitmq_broker: Optional[RabbitMQBroker] = None,
+        redis_broker: Optional[EventBroker] = None,
+        rabbitmq_broker: Optional[EventBroker] = None,
+        dead_letter_limit: int = 1000,
     ):
         """Initialize event bus.
 
         Args:
-            redis_broker: Optional Redis pub/sub broker
-            rabbitmq_broker: Optional RabbitMQ broker
+            redis_broker: Optional Redis pub/sub broker (or InProcessBroker)
+            rabbitmq_broker: Optional RabbitMQ broker (or InProcessBroker)
+            dead_letter_limit: Most failed events kept for retry; older ones are dropped
         """
         self.redis_broker = redis_broker
         self.rabbitmq_broker = rabbitmq_broker
         self.local_subscribers: Dict[EventType, List[Callable]] = {}
-        self.dead_letter_queue: List[Event] = []
+        self.dead_letter_limit = dead_letter_limit
+        self.dead_letter_queue: Deque[Event] = deque(maxlen=dead_letter_limit)
 
     async def initialize(self) -> None:
         """Initialize all brokers."""
@@ -268,6 +576,33 @@ class EventBus:
 
         logger.info("Event bus initialized")
 
+    def _broker(self, use_rabbitmq: bool) -> Optional[EventBroker]:
+        if use_rabbitmq and self.rabbitmq_broker:
+            return self.rabbitmq_broker
+        return self.redis_broker
+
+    async def deliver(self, event: Event, use_rabbitmq: bool = False) -> None:
+        """Publish an event to its broker (or, without one, to local subscribers).
+
+        Raises if the broker publish fails, so the caller can retry. A
+        failing local subscriber is logged and does not fail the delivery.
+
+        Args:
+            event: The event to publish
+            use_rabbitmq: Whether to use RabbitMQ (for durable queues)
+        """
+        broker = self._broker(use_rabbitmq)
+        if broker is not None:
+            await broker.publish(event)
+            return
+
+        # Call local subscribers
+        for callback in self.local_subscribers.get(event.event_type, ()):
+            try:
+                await callback(event)
+            except Exception as e:
+                logger.error(f"Local subscriber failed for event {event.event_id}: {str(e)}")
+
     async def publish(self, event: Event, use_rabbitmq: bool = False) -> None:
         """Publish an event to all configured brokers.
 
@@ -276,18 +611,11 @@ class EventBus:
             use_rabbitmq: Whether to use RabbitMQ (for durable queues)
         """
         try:
-            if use_rabbitmq and self.rabbitmq_broker:
-                await self.rabbitmq_broker.publish(event)
-            elif self.redis_broker:
-                await self.redis_broker.publish(event)
-
-            # Call local subscribers
-            if event.event_type in self.local_subscribers:
-                for callback in self.local_subscribers[event.event_type]:
-                    await callback(event)
-
+            await self.deliver(event, use_rabbitmq)
         except Exception as e:
             logger.error(f"Failed to publish event: {str(e)}")
+            if len(self.dead_letter_queue) == self.dead_letter_limit:
+                logger.warning(f"Dead letter queue full, dropping event {self.dead_letter_queue[0].event_id}")
             self.dead_letter_queue.append(event)
 
     async def subscribe(
@@ -303,18 +631,17 @@ class EventBus:
             callback: Async callback function
             use_rabbitmq: Whether to use RabbitMQ
         """
+        broker = self._broker(use_rabbitmq)
+        if broker is not None:
+            await broker.subscribe(event_type, callback)
+            return
+
         # Subscribe locally
         if event_type not in self.local_subscribers:
             self.local_subscribers[event_type] = []
 
         self.local_subscribers[event_type].append(callback)
 
-        # Subscribe to brokers
-        if use_rabbitmq and self.rabbitmq_broker:
-            await self.rabbitmq_broker.subscribe(event_type, callback)
-        elif self.redis_broker:
-            await self.redis_broker.subscribe(event_type, callback)
-
     async def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
         """Unsubscribe from an event type.
 
@@ -322,7 +649,7 @@ class EventBus:
             event_type: Type of event to unsubscribe from
             callback: Callback function to remove
         """
-        if event_type in self.local_subscribers:
+        if callback in self.local_subscribers.get(event_type, []):
             self.local_subscribers[event_type].remove(callback)
 
         if self.redis_broker:
@@ -333,28 +660,32 @@ class EventBus:
 
     async def retry_dead_letter_queue(self) -> None:
         """Retry events in the dead letter queue."""
-        failed_events = []
-
-        for event in self.dead_letter_queue:
-            try:
-                if event.should_retry:
-                    event.retry_count += 1
-                    await self.publish(event)
-                else:
-                    logger.error(f"Event {event.event_id} exceeded max retries")
-                    failed_events.append(event)
-            except Exception as e:
-                logger.error(f"Failed to retry event {event.event_id}: {str(e)}")
-                failed_events.append(event)
-
-        self.dead_letter_queue = failed_events
+        # publish() re-queues events that fail again, so retry from a snapshot
+        pending = list(self.dead_letter_queue)
+        self.dead_letter_queue.clear()
+
+        for event in pending:
+            if event.should_retry:
+                event.retry_count += 1
+                await self.publish(event)
+            else:
+                logger.error(f"Event {event.event_id} exceeded max retries")
+                self.dead_letter_queue.append(event)
+
+    def consumer_metrics(self) -> Dict[str, Any]:
+        """Queue depth, ack counts and handler timings per subscribed queue."""
+        metrics: Dict[str, Any] = {}
+        for broker in (self.redis_broker, self.rabbitmq_broker):
+            if broker is not None:
+                metrics.update(broker.metrics())
+        return metrics
 
     async def close(self) -> None:
-        """Close all brokers."""
+        """Close all brokers, letting their consumers finish in-flight events."""
         if self.redis_broker:
             await self.redis_broker.close()
 
-        if self.rabbitmq_broker:
+        if self.rabbitmq_broker and self.rabbitmq_broker is not self.redis_broker:
             await self.rabbitmq_broker.close()
 
         logger.info("Event bus closed")
@@ -0,0 +1,214 @@
+"""
+Wire formats for ``Event``.
+
+``JsonCodec`` is the original format (``Event.to_json``) and stays the
+default. ``MsgpackCodec`` writes a small header followed by the event's
+fields as a positional msgpack array:
+
+    b"EV" | version (1 byte) | flags (1 byte) | body
+
+``FLAG_ZSTD`` marks a zstd-compressed body; bodies of at least
+``compress_threshold`` bytes are compressed when ``zstandard`` is
+installed. Both ``msgpack`` and ``zstandard`` are optional dependencies.
+
+Timestamps travel as integer microseconds since the epoch and decode to
+naive UTC datetimes, like ``Event``'s default.
+
+Decoding sniffs the header, so consumers read either format while
+producers switch over. Both formats are validated. msgpack is the
+smaller format, not the faster one: pydantic's ``model_validate_json``
+decodes JSON faster than msgpack's fields can be validated, for small
+and large events alike (see ``benchmarks/bench_event_codec.py``).
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+
+from agents.events import Event
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"EV"
+SCHEMA_VERSION = 1
+FLAG_ZSTD = 0x01
+HEADER_SIZE = len(MAGIC) + 2
+
+# Positional layout of a version 1 body
+FIELDS = (
+    "event_type",
+    "event_id",
+    "timestamp",
+    "source_agent",
+    "entity_id",
+    "entity_type",
+    "payload",
+    "correlation_id",
+    "user_id",
+    "retry_count",
+    "max_retries",
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class EventCodec(ABC):
+    """Abstract base class for event wire formats."""
+
+    name: str
+    content_type: str
+
+    @abstractmethod
+    def encode(self, event: Event) -> bytes:
+        """Serialize an event.
+
+        Args:
+            event: The event to serialize
+
+        Returns:
+            The encoded event
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Event:
+        """Deserialize an event.
+
+        Args:
+            data: Encoded event
+
+        Returns:
+            The decoded event
+        """
+        pass
+
+
+class JsonCodec(EventCodec):
+    """The original JSON format."""
+
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, event: Event) -> bytes:
+        return event.model_dump_json().encode()
+
+    def decode(self, data: Union[bytes, str]) -> Event:
+        return Event.model_validate_json(data)
+
+
+def _default(value: Any) -> Any:
+    """Payload values msgpack has no type for, as JSON encoding would write them."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__} in an event payload")
+
+
+class MsgpackCodec(EventCodec):
+    """Versioned msgpack format with optional zstd compression."""
+
+    name = "msgpack"
+    content_type = "application/x-msgpack"
+
+    def __init__(self, compress_threshold: Optional[int] = 4096, compression_level: int = 3):
+        """Initialize msgpack codec.
+
+        Args:
+            compress_threshold: Compress bodies of at least this many bytes (None = never)
+            compression_level: zstd compression level
+        """
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack event codec")
+        if compress_threshold is not None and zstandard is None:
+            logger.warning("zstandard not installed; msgpack events will not be compressed")
+            compress_threshold = None
+        self.compress_threshold = compress_threshold
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if compress_threshold is not None else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def encode(self, event: Event) -> bytes:
+        # Naive timestamps are UTC (``Event`` defaults to ``utcnow``)
+        timestamp = event.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        body = msgpack.packb(
+            [
+                event.event_type.value,
+                event.event_id,
+                (timestamp - _EPOCH) // _MICROSECOND,
+                event.source_agent,
+                event.entity_id,
+                event.entity_type,
+                event.payload,
+                event.correlation_id,
+                event.user_id,
+                event.retry_count,
+                event.max_retries,
+            ],
+            default=_default,
+        )
+        flags = 0
+        if self._compressor is not None and len(body) >= self.compress_threshold:
+            body = self._compressor.compress(body)
+            flags |= FLAG_ZSTD
+        return MAGIC + bytes((SCHEMA_VERSION, flags)) + body
+
+    def decode(self, data: bytes) -> Event:
+        if data[:2] != MAGIC:
+            raise ValueError("Not a msgpack-encoded event")
+        version, flags = data[2], data[3]
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported event schema version {version}")
+        body = data[HEADER_SIZE:]
+        if flags & FLAG_ZSTD:
+            if self._decompressor is None:
+                raise RuntimeError("zstandard is required to decode compressed events")
+            body = self._decompressor.decompress(body)
+
+        fields = dict(zip(FIELDS, msgpack.unpackb(body)))
+        fields["timestamp"] = _EPOCH + fields["timestamp"] * _MICROSECOND
+        return Event(**fields)
+
+
+_CODECS: Dict[str, EventCodec] = {}
+
+
+def get_codec(name: str = "json", compress_threshold: Optional[int] = 4096) -> EventCodec:
+    """The codec called ``name`` ("json" or "msgpack")."""
+    key = f"{name}:{compress_threshold}"
+    codec = _CODECS.get(key)
+    if codec is None:
+        if name == "msgpack":
+            codec = MsgpackCodec(compress_threshold=compress_threshold)
+        elif name == "json":
+            codec = JsonCodec()
+        else:
+            raise ValueError(f"Unknown event codec: {name}")
+        _CODECS[key] = codec
+    return codec
+
+
+def decode_event(data: Union[bytes, str]) -> Event:
+    """Decode an event in either format, telling them apart by the msgpack header."""
+    if isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:2]) == MAGIC:
+        return get_codec("msgpack", compress_threshold=None).decode(bytes(data))
+    return get_codec("json").decode(data)
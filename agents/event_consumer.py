@@ -0,0 +1,208 @@
+"""
+Event consumer runtime shared by the brokers.
+
+Each subscribed queue (a RabbitMQ queue or a Redis channel/stream) feeds
+one ``ConsumerPool``: a bounded in-memory queue drained by ``concurrency``
+handler tasks. The bound is the broker prefetch, so a slow handler pushes
+back on the broker instead of buffering without limit, and handlers for
+different messages run concurrently instead of one at a time.
+
+Every message carries ``ack``/``nack`` callbacks from its broker; a
+message is acked once all of the queue's handlers succeeded and nacked
+(left for redelivery, where the broker supports it) otherwise. Handler
+run times are recorded per handler in ``TimingHistogram``s.
+
+Several worker processes subscribing to the same durable queue (or Redis
+stream consumer group) share its messages, which is how agents scale out.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from agents.events import Event
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Event], Awaitable[Any]]
+
+
+async def _noop() -> None:
+    return None
+
+
+@dataclass
+class ConsumerPolicy:
+    """Prefetch, concurrency and timeouts for one subscription."""
+    prefetch: int = 32
+    concurrency: int = 8
+    handler_timeout: Optional[float] = 30.0  # seconds; None = no limit
+    drain_timeout: float = 30.0
+    requeue_on_error: bool = False  # RabbitMQ: requeue failed messages instead of dropping them
+
+
+@dataclass
+class InboundEvent:
+    """A decoded message and how to settle it with its broker."""
+    event: Event
+    ack: Callable[[], Awaitable[None]] = _noop
+    nack: Callable[[], Awaitable[None]] = _noop
+
+
+class TimingHistogram:
+    """Cumulative-bucket histogram of handler run times, in seconds."""
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (``max`` for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+def handler_name(handler: Handler) -> str:
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
+class ConsumerPool:
+    """Run a queue's handlers on ``policy.concurrency`` tasks."""
+
+    def __init__(self, name: str, handlers: Optional[List[Handler]] = None, policy: Optional[ConsumerPolicy] = None):
+        self.name = name
+        self.handlers: List[Handler] = list(handlers or [])
+        self.policy = policy or ConsumerPolicy()
+        self.timings: Dict[str, TimingHistogram] = {}
+        self.acked = 0
+        self.nacked = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.policy.prefetch))
+        self._workers: List[asyncio.Task] = []
+        self._accepting = True
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def add_handler(self, handler: Handler) -> None:
+        self.handlers.append(handler)
+
+    def remove_handler(self, handler: Handler) -> None:
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._accepting = True
+        for _ in range(max(1, self.policy.concurrency)):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def submit(self, message: InboundEvent) -> None:
+        """Queue a message for the handlers; waits while ``prefetch`` messages are in flight."""
+        if not self._accepting:
+            # Draining: hand it back so another consumer gets it
+            await message.nack()
+            return
+        self.start()
+        await self._queue.put(message)
+
+    async def _worker(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                ok = await self._handle(message.event)
+                if ok:
+                    await message.ack()
+                    self.acked += 1
+                else:
+                    await message.nack()
+                    self.nacked += 1
+            except Exception as e:
+                logger.error(f"Failed to settle message on {self.name}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _handle(self, event: Event) -> bool:
+        ok = True
+        for handler in list(self.handlers):
+            name = handler_name(handler)
+            started = time.perf_counter()
+            failed = False
+            try:
+                if self.policy.handler_timeout is None:
+                    await handler(event)
+                else:
+                    await asyncio.wait_for(handler(event), self.policy.handler_timeout)
+            except Exception as e:
+                failed = True
+                ok = False
+                reason = str(e) or type(e).__name__
+                logger.error(f"Handler {name} failed for event {event.event_id} on {self.name}: {reason}")
+            finally:
+                timing = self.timings.get(name)
+                if timing is None:
+                    timing = self.timings[name] = TimingHistogram()
+                timing.observe(time.perf_counter() - started, error=failed)
+        return ok
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Stop taking messages, finish the queued ones, then stop the workers."""
+        self._accepting = False
+        if not self._workers:
+            return
+        timeout = self.policy.drain_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Consumer {self.name} not drained after {timeout}s; {self.depth} message(s) left")
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth,
+            "acked": self.acked,
+            "nacked": self.nacked,
+            "handlers": {name: timing.snapshot() for name, timing in self.timings.items()},
+        }
@@ -0,0 +1,305 @@
+"""
+Transactional outbox for events.
+
+``enqueue_event`` writes an event into the ``event_outbox`` table using the
+caller's session, so the event commits or rolls back together with the
+change it describes. ``OutboxRelay`` drains committed rows in batches and
+publishes them through ``EventBus.deliver`` to Redis/RabbitMQ (or the
+in-process broker).
+
+Delivery is at least once: a row is marked published only after the
+broker accepted it, so a crash between the two republishes the event.
+Consumers that must not double-process should dedupe on ``event_id``.
+Failed rows are retried with exponential backoff; after ``max_attempts``
+they stay in the table as dead letters until ``requeue_dead`` is called.
+
+Published rows are kept for ``retention`` so a time range can be
+replayed, then purged by the relay.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.event_bus import EventBus
+from agents.events import Event, EventType
+from models.event_outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+_outbox = OutboxEvent.__table__
+
+
+async def enqueue_event(db: AsyncSession, event: Event, use_rabbitmq: bool = False) -> None:
+    """Add an event to the outbox in the caller's transaction (it is published after commit)."""
+    await db.execute(
+        _outbox.insert().values(
+            event_id=event.event_id,
+            event_type=event.event_type.value,
+            occurred_at=event.timestamp,
+            use_rabbitmq=use_rabbitmq,
+            body=event.model_dump(mode="json"),
+            attempts=0,
+        )
+    )
+
+
+@dataclass
+class RelayStats:
+    """Counters for one relay."""
+    published: int = 0
+    failed: int = 0
+    batches: int = 0
+    replayed: int = 0
+    purged: int = 0
+    last_relay_at: Optional[datetime] = None
+
+
+class OutboxRelay:
+    """
+    Publish committed outbox rows in batches.
+
+    Each batch is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+    several relays (one per worker process) share the table without
+    publishing the same row twice. The relay polls every
+    ``poll_interval`` seconds, or immediately after ``notify``, and keeps
+    going without sleeping while batches come back full.
+    """
+
+    def __init__(
+        self,
+        event_bus: EventBus,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: int = 10,
+        backoff_seconds: float = 1.0,
+        backoff_max_seconds: float = 300.0,
+        retention: timedelta = timedelta(hours=72),
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.event_bus = event_bus
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.retention = retention
+        self._clock = clock
+        self.stats = RelayStats()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from database import connection
+
+            return connection.AsyncSessionLocal()
+        return self._session_factory()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempts - 1)))
+
+    def notify(self) -> None:
+        """Relay now instead of at the next poll (e.g. right after a commit)."""
+        self._wakeup.set()
+
+    async def relay_once(self) -> int:
+        """Publish one batch of due rows; returns how many rows were claimed."""
+        now = self._clock()
+        async with self._new_session() as session:
+            result = await session.execute(
+                select(_outbox.c.id, _outbox.c.body, _outbox.c.use_rabbitmq, _outbox.c.attempts)
+                .where(
+                    and_(
+                        _outbox.c.published_at.is_(None),
+                        _outbox.c.attempts < self.max_attempts,
+                        or_(_outbox.c.next_attempt_at.is_(None), _outbox.c.next_attempt_at <= now),
+                    )
+                )
+                .order_by(_outbox.c.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+            if not rows:
+                await session.commit()
+                return 0
+
+            published: List[int] = []
+            for row in rows:
+                try:
+                    await self.event_bus.deliver(Event.model_validate(row.body), row.use_rabbitmq)
+                    published.append(row.id)
+                except Exception as e:
+                    attempts = row.attempts + 1
+                    self.stats.failed += 1
+                    if attempts >= self.max_attempts:
+                        logger.error(f"Outbox event {row.id} dead-lettered after {attempts} attempts: {str(e)}")
+                    else:
+                        logger.warning(f"Outbox event {row.id} publish failed (attempt {attempts}): {str(e)}")
+                    await session.execute(
+                        update(_outbox)
+                        .where(_outbox.c.id == row.id)
+                        .values(attempts=attempts, last_error=str(e), next_attempt_at=now + self.backoff(attempts))
+                    )
+
+            if published:
+                await session.execute(
+                    update(_outbox)
+                    .where(_outbox.c.id.in_(published))
+                    .values(published_at=now, attempts=_outbox.c.attempts + 1, last_error=None)
+                )
+            await session.commit()
+
+        self.stats.published += len(published)
+        self.stats.batches += 1
+        self.stats.last_relay_at = now
+        return len(rows)
+
+    async def run(self) -> None:
+        """Relay until cancelled."""
+        while True:
+            try:
+                claimed = await self.relay_once()
+                if time.monotonic() - self._last_purge > 3600:
+                    await self.purge()
+            except Exception as e:
+                logger.error(f"Outbox relay error: {str(e)}")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+            logger.info("Outbox relay started")
+
+    async def close(self, drain: bool = True) -> None:
+        """Stop the relay, by default after publishing what is already due.
+
+        Also drains when ``run`` was driven by someone else (the agent
+        supervisor), which cancels its own task first.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if drain:
+            try:
+                while await self.relay_once() >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"Outbox drain failed: {str(e)}")
+        logger.info("Outbox relay stopped")
+
+    async def replay(
+        self,
+        start: datetime,
+        end: datetime,
+        event_types: Optional[Iterable[EventType]] = None,
+    ) -> int:
+        """
+        Republish every outbox event that occurred in ``[start, end)``.
+
+        Rows are streamed in order and republished with their original
+        ``event_id``; rows not yet published are left to the relay.
+        """
+        stmt = (
+            select(_outbox.c.body, _outbox.c.use_rabbitmq)
+            .where(
+                and_(
+                    _outbox.c.occurred_at >= start,
+                    _outbox.c.occurred_at < end,
+                    _outbox.c.published_at.isnot(None),
+                )
+            )
+            .order_by(_outbox.c.occurred_at, _outbox.c.id)
+        )
+        if event_types:
+            stmt = stmt.where(_outbox.c.event_type.in_([event_type.value for event_type in event_types]))
+
+        replayed = 0
+        async with self._new_session() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                await self.event_bus.deliver(Event.model_validate(row.body), row.use_rabbitmq)
+                replayed += 1
+        self.stats.replayed += replayed
+        logger.info(f"Replayed {replayed} outbox events from {start.isoformat()} to {end.isoformat()}")
+        return replayed
+
+    async def requeue_dead(self) -> int:
+        """Give dead-lettered rows a fresh set of attempts."""
+        async with self._new_session() as session:
+            result = await session.execute(
+                update(_outbox)
+                .where(and_(_outbox.c.published_at.is_(None), _outbox.c.attempts >= self.max_attempts))
+                .values(attempts=0, next_attempt_at=None)
+            )
+            await session.commit()
+        self.notify()
+        return result.rowcount
+
+    async def purge(self) -> int:
+        """Delete rows published longer ago than ``retention``."""
+        cutoff = self._clock() - self.retention
+        async with self._new_session() as session:
+            result = await session.execute(
+                delete(_outbox).where(and_(_outbox.c.published_at.isnot(None), _outbox.c.published_at < cutoff))
+            )
+            await session.commit()
+        self._last_purge = time.monotonic()
+        self.stats.purged += result.rowcount
+        return result.rowcount
+
+    async def lag(self) -> Dict[str, Any]:
+        """Backlog and relay counters: pending/dead rows and the age of the oldest pending one."""
+        dead = _outbox.c.attempts >= self.max_attempts
+        async with self._new_session() as session:
+            result = await session.execute(
+                select(
+                    func.sum(case((dead, 0), else_=1)),
+                    func.sum(case((dead, 1), else_=0)),
+                    func.min(case((dead, None), else_=_outbox.c.occurred_at)),
+                ).where(_outbox.c.published_at.is_(None))
+            )
+            pending, dead_letters, oldest = result.one()
+
+        oldest_age = None
+        if oldest is not None:
+            oldest_age = max(0.0, (self._clock() - oldest.replace(tzinfo=None)).total_seconds())
+        return {
+            "pending": pending or 0,
+            "dead": dead_letters or 0,
+            "oldest_pending_age_seconds": oldest_age,
+            **vars(self.stats),
+        }
+
+
+def create_outbox_relay(event_bus: EventBus, settings: Any) -> OutboxRelay:
+    """Build a relay configured from ``settings``."""
+    return OutboxRelay(
+        event_bus,
+        batch_size=settings.outbox_relay_batch_size,
+        poll_interval=settings.outbox_poll_interval_seconds,
+        max_attempts=settings.outbox_max_attempts,
+        retention=timedelta(hours=settings.outbox_retention_hours),
+    )
@@ -2,7 +2,6 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Any, Dict
 from enum import Enum
-import json
 
 
 class EventType(str, Enum):
@@ -19,6 +18,10 @@ class EventType(str, Enum):
     CANDIDATE_UPDATED = "candidate.updated"
     RESUME_UPLOADED = "resume.uploaded"
     RESUME_PARSED = "resume.parsed"
+    RESUME_BUILT = "resume.built"
+    CANDIDATE_PROFILE_CREATED = "candidate.profile_created"
+    CANDIDATE_VIDEO_UPLOADED = "candidate.video_uploaded"
+    CANDIDATE_AVAILABILITY_UPDATED = "candidate.availability_updated"
 
     # Match events
     MATCH_COMPUTED = "match.computed"
@@ -30,6 +33,7 @@ class EventType(str, Enum):
     INTERVIEW_STARTED = "interview.started"
     INTERVIEW_COMPLETED = "interview.completed"
     INTERVIEW_CANCELLED = "interview.cancelled"
+    INTERVIEW_RESCHEDULED = "interview.rescheduled"
     FEEDBACK_GENERATED = "feedback.generated"
 
     # Submission events
@@ -38,6 +42,7 @@ class EventType(str, Enum):
     SUBMISSION_SENT = "submission.sent"
     SUBMISSION_REJECTED = "submission.rejected"
     SUBMISSION_WITHDRAWN = "submission.withdrawn"
+    SUBMISSION_PACKAGE_CREATED = "submission.package_created"
 
     # Offer events
     OFFER_CREATED = "offer.created"
@@ -46,12 +51,65 @@ class EventType(str, Enum):
     OFFER_DECLINED = "offer.declined"
     OFFER_NEGOTIATING = "offer.negotiating"
 
+    # Rate negotiation events
+    RATE_NEGOTIATION_STARTED = "rate.negotiation_started"
+    RATE_COUNTER_OFFERED = "rate.counter_offered"
+    RATE_AGREED = "rate.agreed"
+
+    # Contract events
+    CONTRACT_CREATED = "contract.created"
+    CONTRACT_SENT_FOR_SIGNATURE = "contract.sent_for_signature"
+    CONTRACT_SIGNATURE_RECEIVED = "contract.signature_received"
+    CONTRACT_COMPLETED = "contract.completed"
+    CONTRACT_VOIDED = "contract.voided"
+    CONTRACT_RENEWED = "contract.renewed"
+
     # Onboarding events
     ONBOARDING_STARTED = "onboarding.started"
     ONBOARDING_COMPLETED = "onboarding.completed"
     ONBOARDING_BACKOUT = "onboarding.backout"
     PLACEMENT_CONFIRMED = "placement.confirmed"
 
+    # Referral events
+    REFERRER_REGISTERED = "referral.referrer_registered"
+    REFERRAL_CREATED = "referral.created"
+    REFERRAL_MATCHED = "referral.matched"
+    REFERRAL_MILESTONE_ACHIEVED = "referral.milestone_achieved"
+    REFERRAL_BONUS_APPROVED = "referral.bonus_approved"
+    REFERRAL_OPPORTUNITY_PUSHED = "referral.opportunity_pushed"
+    RETENTION_MILESTONES_PROCESSED = "referral.retention_milestones_processed"
+
+    # Payment events
+    PAYMENT_CREATED = "payment.created"
+    PAYMENT_PROCESSED = "payment.processed"
+    SCHEDULE_CREATED = "payment.schedule_created"
+    BONUS_PAID = "payment.bonus_paid"
+    COMMISSION_PROCESSED = "payment.commission_processed"
+
+    # Security events
+    PERMISSION_CREATED = "security.permission_created"
+    ROLE_CREATED = "security.role_created"
+    ROLE_UPDATED = "security.role_updated"
+    ROLE_ASSIGNED = "security.role_assigned"
+    API_KEY_CREATED = "security.api_key_created"
+    API_KEY_REVOKED = "security.api_key_revoked"
+    POLICY_CREATED = "security.policy_created"
+
+    # Messaging events
+    CONVERSATION_STARTED = "conversation.started"
+    MESSAGE_SENT = "message.sent"
+    NOTIFICATION_SENT = "notification.sent"
+
+    # Integration events
+    INTEGRATION_CONNECTED = "integration.connected"
+    INTEGRATION_SYNCED = "integration.synced"
+
+    # Generic resource and workflow events
+    RESOURCE_CREATED = "resource.created"
+    RESOURCE_UPDATED = "resource.updated"
+    WORKFLOW_TRIGGERED = "workflow.triggered"
+    BATCH_OPERATION = "batch.operation"
+
     # Supplier events
     SUPPLIER_REQUIREMENT_DISTRIBUTED = "supplier.requirement_distributed"
     SUPPLIER_SUBMISSION_RECEIVED = "supplier.submission_received"
@@ -83,7 +141,7 @@ class Event(BaseModel):
     @classmethod
     def from_json(cls, json_str: str) -> "Event":
         """Deserialize event from JSON string."""
-        return cls(**json.loads(json_str))
+        return cls.model_validate_json(json_str)
 
     @property
     def should_retry(self) -> bool:
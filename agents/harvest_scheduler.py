@@ -0,0 +1,199 @@
+"""
+Concurrent multi-source harvest scheduler.
+
+Runs every requested source at once, each under its own token-bucket
+rate limit and concurrency cap, and streams pages back to the caller
+as they arrive so deduplication/processing overlaps with fetching.
+A slow source only delays its own pages.
+
+Source-side pagination is cursor based: each page carries the resume
+token the caller should persist once the page has been stored, so the
+next (incremental) harvest only fetches profiles newer than that.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (source, criteria, cursor) -> (profiles, next_cursor, has_more)
+PageFetcher = Callable[[Any, Dict[str, Any], Optional[str]], Awaitable[Tuple[List[Dict[str, Any]], Optional[str], bool]]]
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens/second, bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and consume them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class SourceLimits:
+    """Per-source throttling shared by every run that touches the source."""
+    bucket: TokenBucket
+    semaphore: asyncio.Semaphore
+    max_concurrency: int
+
+
+@dataclass
+class SourcePage:
+    """One page of profiles from a source, in arrival order."""
+    source_name: str
+    source_id: Optional[int]
+    profiles: List[Dict[str, Any]]
+    cursor: Optional[str]
+    page_number: int
+    error: Optional[str] = None
+    fetch_seconds: float = 0.0
+
+
+@dataclass
+class SourceRunStats:
+    """Fetch statistics for one source within a run."""
+    pages: int = 0
+    profiles: int = 0
+    errors: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+class HarvestScheduler:
+    """
+    Fan out page fetches across sources and fan results back in.
+
+    Limits come from the source row: ``config["requests_per_second"]``
+    (defaulting to ``rate_limit_per_hour / 3600``), ``config["burst"]`` and
+    ``config["max_concurrency"]``. They are cached per source name so
+    concurrent runs against the same source share one budget.
+    """
+
+    DEFAULT_BURST = 5
+    DEFAULT_MAX_CONCURRENCY = 2
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        max_pages_per_source: int = 50,
+        queue_size: int = 16,
+    ):
+        self.fetch_page = fetch_page
+        self.max_pages_per_source = max_pages_per_source
+        self.queue_size = queue_size
+        self._limits: Dict[str, SourceLimits] = {}
+
+    def limits_for(self, source: Any) -> SourceLimits:
+        """Get (or create) the shared limits for a source."""
+        limits = self._limits.get(source.name)
+        if limits is None:
+            config = source.config or {}
+            rate = config.get("requests_per_second") or (source.rate_limit_per_hour or 100) / 3600
+            max_concurrency = int(config.get("max_concurrency", self.DEFAULT_MAX_CONCURRENCY))
+            limits = SourceLimits(
+                bucket=TokenBucket(rate=float(rate), capacity=float(config.get("burst", self.DEFAULT_BURST))),
+                semaphore=asyncio.Semaphore(max_concurrency),
+                max_concurrency=max_concurrency,
+            )
+            self._limits[source.name] = limits
+        return limits
+
+    async def stream(
+        self, sources: List[Any], criteria: Dict[str, Any]
+    ) -> AsyncIterator[SourcePage]:
+        """
+        Yield pages from all sources as soon as each one is fetched.
+
+        The queue is bounded, so fetchers pause when the consumer falls
+        behind instead of buffering whole sources in memory. Leaving the
+        loop early (or closing the generator) cancels the fetchers.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        done = object()
+
+        async def produce(source: Any) -> None:
+            try:
+                async for page in self._fetch_source(source, criteria):
+                    await queue.put(page)
+            except asyncio.CancelledError:
+                # The consumer stopped early: nobody will read the sentinel, and
+                # waiting for room in a full queue would block forever
+                raise
+            except Exception as e:
+                logger.error(f"Harvest of {source.name} stopped: {str(e)}")
+            await queue.put(done)
+
+        tasks = [asyncio.create_task(produce(source)) for source in sources]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_source(self, source: Any, criteria: Dict[str, Any]) -> AsyncIterator[SourcePage]:
+        """Walk a source's pages from its stored cursor, honouring its limits."""
+        limits = self.limits_for(source)
+        cursor = getattr(source, "harvest_cursor", None)
+
+        for page_number in range(1, self.max_pages_per_source + 1):
+            async with limits.semaphore:
+                await limits.bucket.acquire()
+                started = time.perf_counter()
+                try:
+                    profiles, next_cursor, has_more = await self.fetch_page(source, criteria, cursor)
+                except Exception as e:
+                    logger.error(f"Error fetching page {page_number} from {source.name}: {str(e)}")
+                    yield SourcePage(
+                        source_name=source.name,
+                        source_id=getattr(source, "id", None),
+                        profiles=[],
+                        cursor=cursor,
+                        page_number=page_number,
+                        error=str(e),
+                        fetch_seconds=time.perf_counter() - started,
+                    )
+                    return
+                elapsed = time.perf_counter() - started
+
+            cursor = next_cursor if next_cursor is not None else cursor
+            yield SourcePage(
+                source_name=source.name,
+                source_id=getattr(source, "id", None),
+                profiles=profiles,
+                cursor=cursor,
+                page_number=page_number,
+                fetch_seconds=elapsed,
+            )
+            if not has_more:
+                return
+
+        logger.warning(f"Stopped {source.name} after {self.max_pages_per_source} pages; resuming from cursor next run")
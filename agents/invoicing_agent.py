@@ -64,7 +64,9 @@ class InvoicingAgent(BaseAgent):
                     "customer_id": invoice.customer_id,
                     "total_amount": invoice.total_amount,
                 },
+                db=db,
             )
+            await db.commit()
 
             return invoice
 
@@ -99,7 +101,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="invoice",
                 entity_id=invoice.id,
                 payload={"timesheet_id": timesheet_id, "invoice_number": invoice.invoice_number},
+                db=db,
             )
+            await db.commit()
 
             return invoice
 
@@ -142,7 +146,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="invoice",
                 entity_id=0,
                 payload={"invoices_created": len(invoices)},
+                db=db,
             )
+            await db.commit()
 
             return invoices
 
@@ -217,7 +223,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="invoice_payment",
                 entity_id=payment.id,
                 payload={"invoice_id": invoice_id, "amount": payment.amount},
+                db=db,
             )
+            await db.commit()
 
             return payment
 
@@ -249,7 +257,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="invoice",
                 entity_id=invoice_id,
                 payload={"status": "void", "reason": reason},
+                db=db,
             )
+            await db.commit()
 
             return invoice
 
@@ -284,7 +294,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="credit_memo",
                 entity_id=memo.id,
                 payload={"invoice_id": invoice_id, "amount": memo.amount},
+                db=db,
             )
+            await db.commit()
 
             return memo
 
@@ -414,7 +426,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="quickbooks",
                 entity_id=config.id,
                 payload={"realm_id": realm_id, "company_name": company_name},
+                db=db,
             )
+            await db.commit()
 
             return {
                 "is_connected": config.is_connected,
@@ -482,7 +496,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="invoice",
                 entity_id=invoice_id,
                 payload={"qb_sync_status": "synced"},
+                db=db,
             )
+            await db.commit()
 
             return {
                 "invoice_id": invoice_id,
@@ -655,7 +671,9 @@ class InvoicingAgent(BaseAgent):
                 entity_type="quickbooks",
                 entity_id=0,
                 payload={"sync_type": "full", "status": "completed"},
+                db=db,
             )
+            await db.commit()
 
             return {
                 "status": "completed",
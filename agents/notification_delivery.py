@@ -0,0 +1,237 @@
+"""
+Per-channel notification delivery queues.
+
+Event processing only enqueues deliveries; each channel (email, SMS,
+Slack, webhook, in-app) has its own queue drained by a small worker pool
+with the channel's concurrency, provider rate limit and batch size.
+Workers take whatever is already queued (up to ``batch_size``) in one go,
+so a burst of alerts becomes a few batched provider calls or a single
+bulk insert instead of one awaited send per recipient.
+
+Senders report an outcome per delivery. Transient failures are retried
+with exponential backoff and jitter up to ``max_attempts``; rejected
+deliveries (e.g. an invalid address) are not retried.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from agents.harvest_scheduler import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Per-delivery outcomes returned by a channel sender
+SENT = "sent"
+RETRY = "retry"
+REJECTED = "rejected"
+
+
+@dataclass
+class Delivery:
+    """One notification to one recipient over one channel."""
+    channel: str
+    recipient: Dict[str, Any]
+    notification: Dict[str, Any]
+    attempts: int = 0
+    last_error: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# deliveries -> one outcome (SENT / RETRY / REJECTED) per delivery, in order
+ChannelSender = Callable[[List[Delivery]], Awaitable[List[str]]]
+
+
+@dataclass
+class ChannelPolicy:
+    """Throughput and retry settings for one channel."""
+    concurrency: int = 2
+    rate_per_second: Optional[float] = None  # provider calls per second; None = unlimited
+    burst: float = 1.0
+    batch_size: int = 1
+    max_attempts: int = 5
+    backoff_seconds: float = 1.0
+    backoff_max_seconds: float = 300.0
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+
+DEFAULT_CHANNEL_POLICIES: Dict[str, ChannelPolicy] = {
+    "email": ChannelPolicy(concurrency=4, rate_per_second=10, burst=10, batch_size=100),
+    "sms": ChannelPolicy(concurrency=4, rate_per_second=10, burst=10),
+    "slack": ChannelPolicy(concurrency=1, rate_per_second=1, burst=3),
+    "webhook": ChannelPolicy(concurrency=8, rate_per_second=50, burst=50),
+    "in_app": ChannelPolicy(concurrency=1, batch_size=500),
+}
+
+
+@dataclass
+class ChannelStats:
+    """Delivery counters for one channel."""
+    enqueued: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class NotificationDispatcher:
+    """
+    Fan deliveries out to per-channel queues and worker pools.
+
+    Workers start on the first ``enqueue`` (or ``start``) and run until
+    ``close``, which by default waits for queued work and pending retries.
+    """
+
+    def __init__(
+        self,
+        senders: Dict[str, ChannelSender],
+        policies: Optional[Dict[str, ChannelPolicy]] = None,
+        queue_size: int = 10_000,
+    ):
+        self.senders = senders
+        self.policies = {**DEFAULT_CHANNEL_POLICIES, **(policies or {})}
+        self.queue_size = queue_size
+        self.stats: Dict[str, ChannelStats] = {channel: ChannelStats() for channel in senders}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._workers: List[asyncio.Task] = []
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def policy(self, channel: str) -> ChannelPolicy:
+        return self.policies.get(channel) or ChannelPolicy()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        for channel in self.senders:
+            policy = self.policy(channel)
+            self._queues[channel] = asyncio.Queue(maxsize=self.queue_size)
+            self._buckets[channel] = (
+                TokenBucket(rate=policy.rate_per_second, capacity=policy.burst)
+                if policy.rate_per_second else None
+            )
+            for _ in range(max(1, policy.concurrency)):
+                self._workers.append(asyncio.create_task(self._worker(channel)))
+        logger.info(f"Notification dispatcher started for channels: {', '.join(self.senders)}")
+
+    async def enqueue(self, delivery: Delivery) -> bool:
+        """
+        Queue a delivery. Waits only if the channel's queue is full.
+
+        Returns False for a channel with no sender.
+        """
+        if delivery.channel not in self.senders:
+            logger.warning(f"No sender for notification channel {delivery.channel}")
+            return False
+        self.start()
+        await self._queues[delivery.channel].put(delivery)
+        self.stats[delivery.channel].enqueued += 1
+        return True
+
+    async def enqueue_many(self, deliveries: Iterable[Delivery]) -> int:
+        queued = 0
+        for delivery in deliveries:
+            if await self.enqueue(delivery):
+                queued += 1
+        return queued
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {channel: queue.qsize() for channel, queue in self._queues.items()}
+
+    async def _worker(self, channel: str) -> None:
+        queue = self._queues[channel]
+        policy = self.policy(channel)
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < policy.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._deliver(channel, batch)
+            except Exception as e:
+                logger.error(f"Notification worker error on {channel}: {str(e)}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _deliver(self, channel: str, batch: List[Delivery]) -> None:
+        bucket = self._buckets.get(channel)
+        if bucket is not None:
+            await bucket.acquire()
+
+        stats = self.stats[channel]
+        stats.batches += 1
+        try:
+            outcomes = await self.senders[channel](batch)
+        except Exception as e:
+            logger.warning(f"{channel} send of {len(batch)} notifications failed: {str(e)}")
+            outcomes = [RETRY] * len(batch)
+            for delivery in batch:
+                delivery.last_error = str(e)
+
+        for delivery, outcome in zip(batch, outcomes):
+            delivery.attempts += 1
+            if outcome == SENT:
+                stats.sent += 1
+            elif outcome == RETRY and delivery.attempts < self.policy(channel).max_attempts:
+                stats.retried += 1
+                self._schedule_retry(delivery)
+            else:
+                stats.failed += 1
+                logger.error(
+                    f"Giving up on {channel} notification to {delivery.recipient.get('value')} "
+                    f"after {delivery.attempts} attempt(s): {delivery.last_error or outcome}"
+                )
+
+    def _schedule_retry(self, delivery: Delivery) -> None:
+        delay = self.policy(delivery.channel).backoff(delivery.attempts)
+        task = asyncio.create_task(self._requeue(delivery, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue(self, delivery: Delivery, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._queues[delivery.channel].put(delivery)
+
+    async def drain(self) -> None:
+        """Wait until every queue is empty and no retry is pending."""
+        while True:
+            await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+            if not self._retry_tasks:
+                return
+            await asyncio.gather(*list(self._retry_tasks), return_exceptions=True)
+
+    async def close(self, drain: bool = True, timeout: Optional[float] = 30.0) -> None:
+        """Stop the workers, by default after delivering what is queued."""
+        if not self._workers:
+            return
+        if drain:
+            try:
+                await asyncio.wait_for(self.drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Notification queues not drained after {timeout}s: {self.queue_depths()}")
+        for task in [*self._workers, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._retry_tasks, return_exceptions=True)
+        self._workers.clear()
+        self._retry_tasks.clear()
+        self._queues.clear()
+        logger.info("Notification dispatcher stopped")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            channel: {**vars(stats), "queue_depth": self._queues[channel].qsize() if channel in self._queues else 0}
+            for channel, stats in self.stats.items()
+        }
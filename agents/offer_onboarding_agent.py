@@ -96,8 +96,7 @@ class OfferOnboardingAgent(BaseAgent):
             )
 
             db.add(offer)
-            await db.commit()
-            await db.refresh(offer)
+            await db.flush()
 
             # Emit event
             await self.emit_event(
@@ -111,8 +110,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "rate": rate,
                     "rate_type": rate_type,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(offer)
+
             logger.info(f"Generated offer {offer.id} from submission {submission_id}")
             return offer
 
@@ -159,8 +162,6 @@ class OfferOnboardingAgent(BaseAgent):
             offer.status = OfferStatus.SENT
             offer.sent_at = datetime.utcnow()
             db.add(offer)
-            await db.commit()
-            await db.refresh(offer)
 
             # Emit event
             await self.emit_event(
@@ -172,8 +173,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "candidate_id": offer.candidate_id,
                     "sent_at": offer.sent_at.isoformat(),
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(offer)
+
             logger.info(f"Sent offer {offer_id}")
             return offer
 
@@ -252,8 +257,6 @@ class OfferOnboardingAgent(BaseAgent):
                     db.add(candidate)
 
             db.add(offer)
-            await db.commit()
-            await db.refresh(offer)
 
             # Emit event
             await self.emit_event(
@@ -266,8 +269,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "accepted": accepted,
                     "notes": notes,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(offer)
+
             logger.info(f"Processed offer {offer_id}: {'ACCEPTED' if accepted else 'DECLINED'}")
             return offer
 
@@ -335,8 +342,6 @@ class OfferOnboardingAgent(BaseAgent):
             offer.offered_rate = counter_rate
 
             db.add(offer)
-            await db.commit()
-            await db.refresh(offer)
 
             # Emit event
             await self.emit_event(
@@ -349,8 +354,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "round": len(history),
                     "counter_rate": counter_rate,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(offer)
+
             logger.info(f"Negotiation round {len(history)} for offer {offer_id}")
             return offer
 
@@ -410,8 +419,7 @@ class OfferOnboardingAgent(BaseAgent):
             )
 
             db.add(onboarding)
-            await db.commit()
-            await db.refresh(onboarding)
+            await db.flush()
 
             # Emit event
             await self.emit_event(
@@ -423,8 +431,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "offer_id": offer_id,
                     "candidate_id": offer.candidate_id,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(onboarding)
+
             logger.info(f"Started onboarding {onboarding.id} for offer {offer_id}")
             return onboarding
 
@@ -564,9 +576,6 @@ class OfferOnboardingAgent(BaseAgent):
                     )
                     db.add(requirement)
 
-            await db.commit()
-            await db.refresh(onboarding)
-
             # Emit event
             await self.emit_event(
                 event_type=EventType.ONBOARDING_COMPLETED,
@@ -576,8 +585,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "onboarding_id": onboarding.id,
                     "candidate_id": onboarding.candidate_id,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(onboarding)
+
             logger.info(f"Completed onboarding {onboarding_id}")
             return onboarding
 
@@ -650,9 +663,6 @@ class OfferOnboardingAgent(BaseAgent):
                         requirement.status = RequirementStatus.ACTIVE
                     db.add(requirement)
 
-            await db.commit()
-            await db.refresh(onboarding)
-
             # Emit event
             await self.emit_event(
                 event_type=EventType.ONBOARDING_BACKOUT,
@@ -663,8 +673,12 @@ class OfferOnboardingAgent(BaseAgent):
                     "candidate_id": onboarding.candidate_id,
                     "reason": reason,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(onboarding)
+
             logger.info(f"Handled backout for onboarding {onboarding_id}")
             return onboarding
 
@@ -7,6 +7,9 @@ from decimal import Decimal
 
 from agents.base_agent import BaseAgent
 from agents.events import EventType
+from config import settings
+from services.payment_batch_engine import PaymentBatchEngine
+from services.payment_service import PaymentService
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,16 @@ class PaymentProcessingAgent(BaseAgent):
         self.stripe_api_key = None
         self.paypal_client_id = None
         self.ach_enabled = False
+        self.batch_engine = PaymentBatchEngine(
+            providers={
+                "ach": self._process_ach_payment,
+                "wire": self._process_wire_payment,
+                "paypal": self._process_paypal_payment,
+                "stripe": self._process_stripe_payment,
+            },
+            limits=settings.payment_provider_concurrency,
+            write_batch_size=settings.payment_batch_write_size,
+        )
 
     async def on_start(self) -> None:
         """Initialize payment gateway connections."""
@@ -89,6 +102,8 @@ class PaymentProcessingAgent(BaseAgent):
                 payment["invoice_id"] = payment_data["invoice_id"]
             if "timesheet_id" in payment_data:
                 payment["timesheet_id"] = payment_data["timesheet_id"]
+            if "payment_schedule_id" in payment_data:
+                payment["payment_schedule_id"] = payment_data["payment_schedule_id"]
 
             logger.info(f"Payment created: {payment_type} for {payment.get('payee_name')} - ${net_amount}")
 
@@ -177,6 +192,10 @@ class PaymentProcessingAgent(BaseAgent):
     async def process_batch_payments(self, db: Any, payment_ids: List[int]) -> Dict[str, Any]:
         """Process multiple payments in batch.
 
+        Provider calls run concurrently (per-provider limits) and statuses
+        are written in bulk; calling this again with the same IDs resumes
+        a batch that was interrupted or hit transient provider errors.
+
         Args:
             db: Database session
             payment_ids: List of payment IDs to process
@@ -191,32 +210,23 @@ class PaymentProcessingAgent(BaseAgent):
             raise ValueError("Payment list cannot be empty")
 
         try:
-            processed = []
-            failed = []
-            total_amount = 0.0
-
-            for payment_id in payment_ids:
-                try:
-                    result = await self.process_payment(db, payment_id)
-                    processed.append(result)
-                    payment = await self._get_payment(db, payment_id)
-                    total_amount += float(payment.get("net_amount", 0))
-                except Exception as e:
-                    logger.error(f"Failed to process payment {payment_id}: {str(e)}")
-                    failed.append({"payment_id": payment_id, "error": str(e)})
-
-            logger.info(
-                f"Batch processing complete: {len(processed)} successful, {len(failed)} failed, total ${total_amount}"
-            )
+            result = await self.batch_engine.process(db, payment_ids)
+
+            for payment in result["results"]["successful"]:
+                await self.emit_event(
+                    EventType.PAYMENT_PROCESSED,
+                    "payment",
+                    payment["payment_id"],
+                    {
+                        "status": "completed",
+                        "amount": payment["amount"],
+                        "transaction_id": payment["transaction_id"],
+                    },
+                    db=db,
+                )
+            await db.commit()
 
-            return {
-                "success": True,
-                "processed": len(processed),
-                "failed": len(failed),
-                "total_amount": total_amount,
-                "results": {"successful": processed, "failed": failed},
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+            return result
 
         except Exception as e:
             logger.error(f"Error in batch payment processing: {str(e)}")
@@ -295,11 +305,16 @@ class PaymentProcessingAgent(BaseAgent):
     async def process_scheduled_payments(self, db: Any) -> Dict[str, Any]:
         """Process all scheduled payments that are due.
 
+        Each payment is linked to its schedule. A schedule whose payment is
+        still open (pending, or processing after a transient provider error)
+        gets that payment resumed instead of a new one, so a period is never
+        paid twice; the schedule only advances once its payment completes.
+
         Args:
             db: Database session
 
         Returns:
-            Processing results
+            Processing results, including the IDs of payments left to retry
 
         Raises:
             Exception: If database or processing error occurs
@@ -308,10 +323,22 @@ class PaymentProcessingAgent(BaseAgent):
             schedules = await self._get_due_schedules(db)
             logger.info(f"Found {len(schedules)} schedules due for processing")
 
-            processed = []
+            by_id = {schedule.get("id"): schedule for schedule in schedules}
+            # payment ID -> (schedule, gross amount)
+            payments: Dict[int, Any] = {}
+            for open_payment in await self.batch_engine.open_scheduled_payments(db, list(by_id)):
+                payments[open_payment["id"]] = (
+                    by_id[open_payment["payment_schedule_id"]], open_payment["gross_amount"]
+                )
+            resumed = {schedule.get("id") for schedule, _ in payments.values()}
+
+            rows = []
+            batch_schedules = []
             failed = []
 
             for schedule in schedules:
+                if schedule.get("id") in resumed:
+                    continue
                 try:
                     # Calculate payment amount
                     amount = schedule.get("amount")
@@ -320,7 +347,6 @@ class PaymentProcessingAgent(BaseAgent):
                         hours = await self._get_hours_worked(db, schedule.get("placement_id"), schedule.get("payee_id"))
                         amount = hours * schedule.get("rate")
 
-                    # Create and process payment
                     payment_data = {
                         "payment_type": "contractor_pay",
                         "payee_type": schedule.get("payee_type"),
@@ -328,28 +354,48 @@ class PaymentProcessingAgent(BaseAgent):
                         "gross_amount": amount,
                         "payment_method_id": schedule.get("payment_method_id"),
                         "placement_id": schedule.get("placement_id"),
+                        "payment_schedule_id": schedule.get("id"),
                     }
 
-                    payment = await self.create_payment(db, payment_data)
-                    result = await self.process_payment(db, 0)  # In real implementation, use actual payment ID
-
-                    processed.append(result)
-
-                    # Update schedule
-                    await self._update_schedule_after_payment(
-                        db, schedule.get("id"), amount, self._calculate_next_payment_date(date.today(), schedule.get("frequency"))
-                    )
+                    rows.append(await self.create_payment(db, payment_data))
+                    batch_schedules.append(schedule)
 
                 except Exception as e:
                     logger.error(f"Failed to process schedule {schedule.get('id')}: {str(e)}")
                     failed.append({"schedule_id": schedule.get("id"), "error": str(e)})
 
-            logger.info(f"Scheduled payment processing: {len(processed)} processed, {len(failed)} failed")
+            # One insert and one batch for every due schedule
+            payment_ids = await self.batch_engine.insert_payments(db, rows)
+            for payment_id, schedule, row in zip(payment_ids, batch_schedules, rows):
+                payments[payment_id] = (schedule, row["gross_amount"])
+
+            processed = 0
+            retryable: List[int] = []
+            if payments:
+                result = await self.batch_engine.process(db, list(payments))
+                completed = {p["payment_id"] for p in result["results"]["successful"]}
+                for error in result["results"]["failed"]:
+                    failed.append({"payment_id": error["payment_id"], "error": error["error"]})
+                retryable = [p["payment_id"] for p in result["results"]["retryable"]]
+                for payment_id, (schedule, amount) in payments.items():
+                    if payment_id in completed:
+                        processed += 1
+                        await self._update_schedule_after_payment(
+                            db, schedule.get("id"), amount,
+                            self._calculate_next_payment_date(date.today(), schedule.get("frequency")),
+                        )
+
+            logger.info(
+                f"Scheduled payment processing: {processed} processed, {len(failed)} failed, "
+                f"{len(retryable)} to retry ({len(resumed)} resumed)"
+            )
 
             return {
                 "success": True,
-                "processed": len(processed),
+                "processed": processed,
                 "failed": len(failed),
+                "retryable": retryable,
+                "resumed": len(resumed),
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
@@ -699,11 +745,12 @@ class PaymentProcessingAgent(BaseAgent):
             logger.error(f"Error generating payment report: {str(e)}")
             raise
 
-    async def get_payment_analytics(self, db: Any) -> Dict[str, Any]:
+    async def get_payment_analytics(self, db: Any, days: int = 90) -> Dict[str, Any]:
         """Get payment analytics.
 
         Args:
             db: Database session
+            days: Days to analyze
 
         Returns:
             Analytics data including trends and metrics
@@ -712,41 +759,26 @@ class PaymentProcessingAgent(BaseAgent):
             Exception: If analytics calculation fails
         """
         try:
-            # Fetch last 90 days of data
             end_date = date.today()
-            start_date = end_date - timedelta(days=90)
+            start_date = end_date - timedelta(days=days)
 
-            payments = await self._get_payments_for_period(db, start_date, end_date)
-
-            total_processed = len([p for p in payments if p.get("status") == "completed"])
-            total_failed = len([p for p in payments if p.get("status") == "failed"])
-            total_amount = sum(float(p.get("net_amount", 0)) for p in payments if p.get("status") == "completed")
-
-            # Calculate average processing time
-            processing_times = []
-            for payment in payments:
-                if payment.get("processed_at") and payment.get("created_at"):
-                    try:
-                        created = datetime.fromisoformat(payment.get("created_at"))
-                        processed = datetime.fromisoformat(payment.get("processed_at"))
-                        processing_times.append((processed - created).total_seconds() / 3600)
-                    except (ValueError, TypeError):
-                        pass
-
-            avg_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
+            # Counts, sums and the average are computed by the database
+            summary = await PaymentService(db).get_processing_summary(start_date, end_date)
 
             analytics = {
                 "period": f"{start_date.isoformat()} to {end_date.isoformat()}",
-                "total_processed": total_processed,
-                "total_failed": total_failed,
-                "failure_rate": (total_failed / len(payments) * 100) if payments else 0,
-                "total_amount": total_amount,
-                "avg_processing_time_hours": round(avg_processing_time, 2),
-                "payment_count": len(payments),
+                "total_processed": summary["completed"],
+                "total_failed": summary["failed"],
+                "failure_rate": (summary["failed"] / summary["total"] * 100) if summary["total"] else 0,
+                "total_amount": summary["completed_amount"],
+                "avg_processing_time_hours": round(summary["avg_processing_hours"], 2),
+                "payment_count": summary["total"],
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-            logger.info(f"Payment analytics calculated: {total_processed} processed, {total_failed} failed")
+            logger.info(
+                f"Payment analytics calculated: {summary['completed']} processed, {summary['failed']} failed"
+            )
 
             return analytics
 
@@ -829,7 +861,7 @@ class PaymentProcessingAgent(BaseAgent):
         logger.info(f"Processing ACH payment: ${payment.get('net_amount')}")
         return {
             "success": True,
-            "transaction_id": f"ACH-{datetime.utcnow().timestamp()}",
+            "transaction_id": f"ACH-{payment.get('idempotency_key') or datetime.utcnow().timestamp()}",
             "method": "ACH",
         }
 
@@ -838,7 +870,7 @@ class PaymentProcessingAgent(BaseAgent):
         logger.info(f"Processing wire payment: ${payment.get('net_amount')}")
         return {
             "success": True,
-            "transaction_id": f"WIRE-{datetime.utcnow().timestamp()}",
+            "transaction_id": f"WIRE-{payment.get('idempotency_key') or datetime.utcnow().timestamp()}",
             "method": "WIRE",
         }
 
@@ -847,7 +879,7 @@ class PaymentProcessingAgent(BaseAgent):
         logger.info(f"Processing PayPal payment: ${payment.get('net_amount')}")
         return {
             "success": True,
-            "transaction_id": f"PAYPAL-{datetime.utcnow().timestamp()}",
+            "transaction_id": f"PAYPAL-{payment.get('idempotency_key') or datetime.utcnow().timestamp()}",
             "method": "PayPal",
         }
 
@@ -856,7 +888,7 @@ class PaymentProcessingAgent(BaseAgent):
         logger.info(f"Processing Stripe payment: ${payment.get('net_amount')}")
         return {
             "success": True,
-            "transaction_id": f"STRIPE-{datetime.utcnow().timestamp()}",
+            "transaction_id": f"STRIPE-{payment.get('idempotency_key') or datetime.utcnow().timestamp()}",
             "method": "Stripe",
         }
 
@@ -86,20 +86,22 @@ class RateNegotiationAgent(BaseAgent):
                 target_margin_percentage=target_margin_percentage,
             )
 
-            negotiation = await service.create_negotiation(negotiation_data)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.RATE_NEGOTIATION_STARTED,
-                entity_type="RateNegotiation",
-                entity_id=negotiation.id,
-                payload={
-                    "negotiation_id": negotiation.id,
-                    "submission_id": submission_id,
-                    "initial_offer": initial_offer,
-                    "rate_type": rate_type,
-                },
-            )
+            async def emit(negotiation: RateNegotiation) -> None:
+                await self.emit_event(
+                    event_type=EventType.RATE_NEGOTIATION_STARTED,
+                    entity_type="RateNegotiation",
+                    entity_id=negotiation.id,
+                    payload={
+                        "negotiation_id": negotiation.id,
+                        "submission_id": submission_id,
+                        "initial_offer": initial_offer,
+                        "rate_type": rate_type,
+                    },
+                    db=db,
+                )
+
+            # The event is written to the outbox in the negotiation's transaction
+            negotiation = await service.create_negotiation(negotiation_data, before_commit=emit)
 
             logger.info(f"Initiated rate negotiation {negotiation.id} for submission {submission_id}")
             return negotiation
@@ -138,19 +140,20 @@ class RateNegotiationAgent(BaseAgent):
                 status="countered",
             )
 
-            round = await service.submit_counter_offer(negotiation_id, round_data)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.RATE_COUNTER_OFFERED,
-                entity_type="NegotiationRound",
-                entity_id=round.id,
-                payload={
-                    "negotiation_id": negotiation_id,
-                    "counter_rate": counter_rate,
-                    "round_number": round.round_number,
-                },
-            )
+            async def emit(round: NegotiationRound) -> None:
+                await self.emit_event(
+                    event_type=EventType.RATE_COUNTER_OFFERED,
+                    entity_type="NegotiationRound",
+                    entity_id=round.id,
+                    payload={
+                        "negotiation_id": negotiation_id,
+                        "counter_rate": counter_rate,
+                        "round_number": round.round_number,
+                    },
+                    db=db,
+                )
+
+            round = await service.submit_counter_offer(negotiation_id, round_data, before_commit=emit)
 
             logger.info(f"Counter offer submitted for negotiation {negotiation_id}")
             return round
@@ -375,19 +378,22 @@ class RateNegotiationAgent(BaseAgent):
         """
         try:
             service = RateNegotiationService(db)
-            negotiation = await service.finalize_rate(negotiation_id, agreed_rate, agreed_rate_type)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.RATE_AGREED,
-                entity_type="RateNegotiation",
-                entity_id=negotiation.id,
-                payload={
-                    "negotiation_id": negotiation_id,
-                    "agreed_rate": agreed_rate,
-                    "rate_type": agreed_rate_type,
-                    "margin_percentage": negotiation.margin_percentage,
-                },
+            async def emit(negotiation: RateNegotiation) -> None:
+                await self.emit_event(
+                    event_type=EventType.RATE_AGREED,
+                    entity_type="RateNegotiation",
+                    entity_id=negotiation.id,
+                    payload={
+                        "negotiation_id": negotiation_id,
+                        "agreed_rate": agreed_rate,
+                        "rate_type": agreed_rate_type,
+                        "margin_percentage": negotiation.margin_percentage,
+                    },
+                    db=db,
+                )
+
+            negotiation = await service.finalize_rate(
+                negotiation_id, agreed_rate, agreed_rate_type, before_commit=emit
             )
 
             logger.info(f"Finalized rate for negotiation {negotiation_id}: {agreed_rate}")
@@ -440,22 +446,23 @@ class RateNegotiationAgent(BaseAgent):
         """
         try:
             service = InterviewSchedulingService(db)
-            schedule = await service.schedule_interview(schedule_data)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.INTERVIEW_SCHEDULED,
-                entity_type="InterviewSchedule",
-                entity_id=schedule.id,
-                payload={
-                    "schedule_id": schedule.id,
-                    "candidate_id": schedule_data.candidate_id,
-                    "interview_type": schedule_data.interview_type,
-                    "scheduled_date": schedule_data.scheduled_date,
-                    "scheduled_time": schedule_data.scheduled_time,
-                },
-                user_id=scheduled_by_user_id,
-            )
+            async def emit(schedule: InterviewSchedule) -> None:
+                await self.emit_event(
+                    event_type=EventType.INTERVIEW_SCHEDULED,
+                    entity_type="InterviewSchedule",
+                    entity_id=schedule.id,
+                    payload={
+                        "schedule_id": schedule.id,
+                        "candidate_id": schedule_data.candidate_id,
+                        "interview_type": schedule_data.interview_type,
+                        "scheduled_date": schedule_data.scheduled_date,
+                        "scheduled_time": schedule_data.scheduled_time,
+                    },
+                    user_id=scheduled_by_user_id,
+                    db=db,
+                )
+
+            schedule = await service.schedule_interview(schedule_data, before_commit=emit)
 
             logger.info(f"Scheduled interview {schedule.id} for candidate {schedule_data.candidate_id}")
             return schedule
@@ -498,21 +505,24 @@ class RateNegotiationAgent(BaseAgent):
                 reason=reason,
             )
 
-            schedule = await service.reschedule_interview(schedule_id, reschedule_data, rescheduled_by_user_id)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.INTERVIEW_RESCHEDULED,
-                entity_type="InterviewSchedule",
-                entity_id=schedule.id,
-                payload={
-                    "schedule_id": schedule_id,
-                    "new_date": new_date,
-                    "new_time": new_time,
-                    "reason": reason,
-                    "reschedule_count": schedule.reschedule_count,
-                },
-                user_id=rescheduled_by_user_id,
+            async def emit(schedule: InterviewSchedule) -> None:
+                await self.emit_event(
+                    event_type=EventType.INTERVIEW_RESCHEDULED,
+                    entity_type="InterviewSchedule",
+                    entity_id=schedule.id,
+                    payload={
+                        "schedule_id": schedule_id,
+                        "new_date": new_date,
+                        "new_time": new_time,
+                        "reason": reason,
+                        "reschedule_count": schedule.reschedule_count,
+                    },
+                    user_id=rescheduled_by_user_id,
+                    db=db,
+                )
+
+            schedule = await service.reschedule_interview(
+                schedule_id, reschedule_data, rescheduled_by_user_id, before_commit=emit
             )
 
             logger.info(f"Rescheduled interview {schedule_id}: {reason}")
@@ -545,18 +555,19 @@ class RateNegotiationAgent(BaseAgent):
             service = InterviewSchedulingService(db)
 
             cancel_data = InterviewCancelRequest(reason=reason)
-            schedule = await service.cancel_interview(schedule_id, cancel_data)
-
-            # Emit event
-            await self.emit_event(
-                event_type=EventType.INTERVIEW_CANCELLED,
-                entity_type="InterviewSchedule",
-                entity_id=schedule.id,
-                payload={
-                    "schedule_id": schedule_id,
-                    "reason": reason,
-                },
-            )
+            async def emit(schedule: InterviewSchedule) -> None:
+                await self.emit_event(
+                    event_type=EventType.INTERVIEW_CANCELLED,
+                    entity_type="InterviewSchedule",
+                    entity_id=schedule.id,
+                    payload={
+                        "schedule_id": schedule_id,
+                        "reason": reason,
+                    },
+                    db=db,
+                )
+
+            schedule = await service.cancel_interview(schedule_id, cancel_data, before_commit=emit)
 
             logger.info(f"Cancelled interview {schedule_id}: {reason}")
             return schedule
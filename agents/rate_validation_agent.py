@@ -1,6 +1,7 @@
 """Rate validation agent — validates proposed rates against rate cards and historical data."""
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, Iterable, List, Optional
 
 
 @dataclass
@@ -17,6 +18,67 @@ class RateValidation:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
+class RollingRateStats:
+    """
+    Mean and population standard deviation over the last ``window`` rates.
+
+    Maintained incrementally (Welford's update plus its inverse for values
+    leaving the window), so reading the statistics is O(1). The running
+    sums are recomputed from the window once per ``window`` evictions so
+    floating-point drift cannot accumulate.
+    """
+
+    def __init__(self, window: int = 500, values: Iterable[float] = ()):
+        self.window = window
+        self._values: Deque[float] = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+        for value in values:
+            self.add(value)
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def std(self) -> float:
+        n = len(self._values)
+        # Evictions leave rounding residue in the sums; that is not real spread
+        if not n or self._m2 <= 1e-12 * n * self.mean * self.mean:
+            return 0.0
+        return (self._m2 / n) ** 0.5
+
+    def add(self, value: float) -> None:
+        if len(self._values) >= self.window:
+            self._remove(self._values.popleft())
+            self._evictions += 1
+        self._values.append(value)
+        if self._evictions >= self.window:
+            self._recompute()
+            return
+        n = len(self._values)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+
+    def _recompute(self) -> None:
+        n = len(self._values)
+        self.mean = sum(self._values) / n
+        self._m2 = sum((x - self.mean) ** 2 for x in self._values)
+        self._evictions = 0
+
+    def _remove(self, value: float) -> None:
+        n = len(self._values)
+        if n == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self.mean
+        self.mean = (old_mean * (n + 1) - value) / n
+        self._m2 -= (value - old_mean) * (value - self.mean)
+
+
 class RateValidationAgent:
     WEIGHTS = {"rate_card": 0.40, "historical": 0.30, "margin": 0.20, "market": 0.10}
 
@@ -27,6 +89,7 @@ class RateValidationAgent:
         rate_card: Optional[Dict[str, Any]] = None,
         historical_rates: Optional[List[Dict[str, Any]]] = None,
         market_avg_bill: Optional[float] = None,
+        historical_stats: Optional[RollingRateStats] = None,
     ) -> RateValidation:
         scores = {}
 
@@ -48,15 +111,15 @@ class RateValidationAgent:
             scores["rate_card"] = 80  # No rate card = neutral
 
         # 2. Historical comparison (30%)
-        if historical_rates and len(historical_rates) >= 3:
+        if historical_stats is not None and historical_stats.count >= 3:
+            scores["historical"] = self._historical_score(
+                proposed_bill_rate, historical_stats.mean, historical_stats.std
+            )
+        elif historical_rates and len(historical_rates) >= 3:
             hist_bills = [r["bill_rate"] for r in historical_rates]
             avg = sum(hist_bills) / len(hist_bills)
             std = (sum((x - avg) ** 2 for x in hist_bills) / len(hist_bills)) ** 0.5
-            if std > 0:
-                z = abs(proposed_bill_rate - avg) / std
-                scores["historical"] = max(0, 100 - z * 25)
-            else:
-                scores["historical"] = 100 if abs(proposed_bill_rate - avg) < 5 else 60
+            scores["historical"] = self._historical_score(proposed_bill_rate, avg, std)
         else:
             scores["historical"] = 75
 
@@ -99,3 +162,10 @@ class RateValidationAgent:
             justification=f"Score {overall:.0f}/100. Rate card: {scores.get('rate_card',0):.0f}, Historical: {scores.get('historical',0):.0f}, Margin: {scores.get('margin',0):.0f}, Market: {scores.get('market',0):.0f}",
             details=scores,
         )
+
+    @staticmethod
+    def _historical_score(proposed_bill_rate: float, avg: float, std: float) -> float:
+        if std > 0:
+            z = abs(proposed_bill_rate - avg) / std
+            return max(0, 100 - z * 25)
+        return 100 if abs(proposed_bill_rate - avg) < 5 else 60
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
 from agents.base_agent import BaseAgent
+from agents.events import EventType
 from models.referral import (
     Referrer,
     Referral,
@@ -70,12 +71,10 @@ class ReferralNetworkAgent(BaseAgent):
             )
 
             db.add(referrer)
-            await db.commit()
-
-            logger.info(f"Registered referrer {referrer.id} with code {referral_code}")
+            await db.flush()
 
             await self.emit_event(
-                event_type="referrer_registered",
+                event_type=EventType.REFERRER_REGISTERED,
                 entity_type="referrer",
                 entity_id=referrer.id,
                 payload={
@@ -83,8 +82,13 @@ class ReferralNetworkAgent(BaseAgent):
                     "referral_code": referral_code,
                     "referrer_type": referrer.referrer_type,
                 },
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Registered referrer {referrer.id} with code {referral_code}")
+
             return referrer
 
         except Exception as e:
@@ -153,20 +157,21 @@ class ReferralNetworkAgent(BaseAgent):
             referrer.total_referrals += 1
             await self._update_referrer_tier(db, referrer)
 
-            await db.commit()
-
-            logger.info(f"Created referral {referral.id} from referrer {referrer_id}")
-
             await self.emit_event(
-                event_type="referral_created",
+                event_type=EventType.REFERRAL_CREATED,
                 entity_type="referral",
                 entity_id=referral.id,
                 payload={
                     "referrer_id": referrer_id,
                     "requirement_id": requirement_id,
                 },
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Created referral {referral.id} from referrer {referrer_id}")
+
             return referral
 
         except Exception as e:
@@ -201,7 +206,7 @@ class ReferralNetworkAgent(BaseAgent):
             logger.info(f"Matched referral {referral_id} to {len(matches)} requirements")
 
             await self.emit_event(
-                event_type="referral_matched",
+                event_type=EventType.REFERRAL_MATCHED,
                 entity_type="referral",
                 entity_id=referral_id,
                 payload={"match_count": len(matches)},
@@ -271,20 +276,21 @@ class ReferralNetworkAgent(BaseAgent):
                     referrer.successful_placements += 1
                     await self._update_referrer_tier(db, referrer)
 
-            await db.commit()
-
-            logger.info(
-                f"Processed milestone {milestone} for referral {referral_id}"
-            )
-
             await self.emit_event(
-                event_type="referral_milestone_achieved",
+                event_type=EventType.REFERRAL_MILESTONE_ACHIEVED,
                 entity_type="referral",
                 entity_id=referral_id,
                 payload={
                     "milestone": milestone,
                     "bonus_amount": bonus_amount,
                 },
+                db=db,
+            )
+
+            await db.commit()
+
+            logger.info(
+                f"Processed milestone {milestone} for referral {referral_id}"
             )
 
             return bonus
@@ -361,12 +367,8 @@ class ReferralNetworkAgent(BaseAgent):
                 referrer.pending_earnings -= bonus.bonus_amount
                 referrer.total_earnings += bonus.bonus_amount
 
-            await db.commit()
-
-            logger.info(f"Approved bonus {bonus_id} for payout")
-
             await self.emit_event(
-                event_type="bonus_approved",
+                event_type=EventType.REFERRAL_BONUS_APPROVED,
                 entity_type="bonus",
                 entity_id=bonus_id,
                 payload={
@@ -374,8 +376,13 @@ class ReferralNetworkAgent(BaseAgent):
                     "amount": bonus.bonus_amount,
                 },
                 user_id=user_id,
+                db=db,
             )
 
+            await db.commit()
+
+            logger.info(f"Approved bonus {bonus_id} for payout")
+
             return {
                 "bonus_id": bonus_id,
                 "amount": bonus.bonus_amount,
@@ -619,7 +626,7 @@ class ReferralNetworkAgent(BaseAgent):
             logger.info(f"Sent opportunity to {len(results)} referrers")
 
             await self.emit_event(
-                event_type="referral_opportunity_pushed",
+                event_type=EventType.REFERRAL_OPPORTUNITY_PUSHED,
                 entity_type="requirement",
                 entity_id=requirement_id,
                 payload={"referrer_count": len(results)},
@@ -690,7 +697,7 @@ class ReferralNetworkAgent(BaseAgent):
             logger.info(f"Processed {len(processed)} retention milestones")
 
             await self.emit_event(
-                event_type="retention_milestones_processed",
+                event_type=EventType.RETENTION_MILESTONES_PROCESSED,
                 entity_type="referral_network",
                 entity_id=0,
                 payload={"count": len(processed)},
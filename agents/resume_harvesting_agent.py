@@ -5,15 +5,16 @@ import asyncio
 import aiohttp
 import hashlib
 import json
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Set, Tuple
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from anthropic import AsyncAnthropic
 
 from agents.base_agent import BaseAgent
 from agents.events import Event, EventType
+from agents.harvest_scheduler import HarvestScheduler, SourceRunStats
 from models.harvest import HarvestSource, HarvestJob, HarvestResult, CandidateSourceMapping
 from models.candidate import Candidate
 from models.enums import CandidateStatus
@@ -21,9 +22,66 @@ from models.enums import CandidateStatus
 logger = logging.getLogger(__name__)
 
 
+def _chunked(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    """Yield consecutive slices of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _normalize_name(candidate: Dict[str, Any]) -> str:
+    return (candidate.get("name") or "").lower().strip()
+
+
+def _normalize_email(candidate: Dict[str, Any]) -> str:
+    return (candidate.get("email") or "").lower().strip()
+
+
+class _NameBlockIndex:
+    """
+    In-memory fuzzy name index over existing candidates.
+
+    Names are bucketed by token so a harvested name is only compared
+    (with ``SequenceMatcher``) against existing names sharing a token.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._blocks: Dict[str, Set[int]] = {}
+
+    def add_rows(self, rows: Iterable[Tuple[int, str, str]]) -> None:
+        for candidate_id, first_name, last_name in rows:
+            if candidate_id in self._names:
+                continue
+            full_name = f"{first_name} {last_name}".lower()
+            self._names[candidate_id] = full_name
+            for token in full_name.split():
+                self._blocks.setdefault(token, set()).add(candidate_id)
+
+    def find_similar(self, name: str, threshold: float) -> Optional[int]:
+        """Return the id of an existing candidate whose name ratio exceeds ``threshold``."""
+        candidate_ids: Set[int] = set()
+        for token in name.split():
+            candidate_ids.update(self._blocks.get(token, ()))
+
+        matcher = SequenceMatcher(None, b=name)
+        for candidate_id in sorted(candidate_ids):
+            matcher.set_seq1(self._names[candidate_id])
+            if (
+                matcher.real_quick_ratio() > threshold
+                and matcher.quick_ratio() > threshold
+                and matcher.ratio() > threshold
+            ):
+                return candidate_id
+        return None
+
+
 class ResumeHarvestingAgent(BaseAgent):
     """Multi-source resume/candidate harvesting from job boards, social platforms, and communities."""
 
+    # Rows per IN-query / bulk insert when processing a harvest job
+    BATCH_SIZE = 500
+    NAME_SIMILARITY_THRESHOLD = 0.85
+
     def __init__(self, anthropic_api_key: str, agent_version: str = "1.0.0"):
         """Initialize harvesting agent."""
         super().__init__(agent_name="ResumeHarvestingAgent", agent_version=agent_version)
@@ -37,6 +95,8 @@ class ResumeHarvestingAgent(BaseAgent):
             "stackoverflow": self._harvest_stackoverflow,
             "forums": self._harvest_forums,
         }
+        self.harvest_scheduler = HarvestScheduler(self._fetch_source_page)
+        self._http_session: Optional[aiohttp.ClientSession] = None
 
     async def configure_source(self, db: AsyncSession, source_config: Dict[str, Any]) -> HarvestSource:
         """Configure a harvesting source with API credentials and search parameters."""
@@ -102,6 +162,140 @@ class ResumeHarvestingAgent(BaseAgent):
             logger.error(f"Error searching candidates on {source_name}: {str(e)}")
             raise
 
+    async def harvest_sources(
+        self,
+        db: AsyncSession,
+        source_names: List[str],
+        criteria: Dict[str, Any],
+        full_refresh: bool = False,
+        created_by: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Harvest several sources concurrently into one job per source.
+
+        Pages are deduplicated and stored as they arrive; each source's
+        cursor is advanced only after its page has been flushed, so an
+        interrupted run resumes without skipping profiles.
+        """
+        names = sorted({name.lower() for name in source_names})
+        stmt = select(HarvestSource).where(HarvestSource.name.in_(names))
+        result = await db.execute(stmt)
+        sources = {source.name: source for source in result.scalars().all()}
+
+        missing = [name for name in names if name not in sources]
+        if missing:
+            raise ValueError(f"Source not configured: {', '.join(missing)}")
+
+        started_at = datetime.utcnow()
+        jobs: Dict[str, HarvestJob] = {}
+        stats: Dict[str, SourceRunStats] = {}
+        for name, source in sources.items():
+            if full_refresh:
+                source.harvest_cursor = None
+            job = HarvestJob(
+                source_id=source.id,
+                search_criteria=criteria,
+                frequency="once",
+                status="running",
+                started_at=started_at,
+                created_by=created_by,
+                candidates_found=0,
+                candidates_new=0,
+                candidates_updated=0,
+                candidates_duplicate=0,
+            )
+            db.add(job)
+            jobs[name] = job
+            stats[name] = SourceRunStats()
+        await db.flush()
+
+        async for page in self.harvest_scheduler.stream(list(sources.values()), criteria):
+            job = jobs[page.source_name]
+            source_stats = stats[page.source_name]
+            source_stats.elapsed_seconds += page.fetch_seconds
+            if page.error:
+                source_stats.errors.append(page.error)
+                job.error_message = page.error
+                continue
+
+            _, new, updated, duplicate = await self._process_results_batch(db, job, page.profiles)
+            job.candidates_found += len(page.profiles)
+            job.candidates_new += new
+            job.candidates_updated += updated
+            job.candidates_duplicate += duplicate
+
+            source = sources[page.source_name]
+            source.harvest_cursor = page.cursor
+            source.total_candidates_harvested = (source.total_candidates_harvested or 0) + new
+            source_stats.pages += 1
+            source_stats.profiles += len(page.profiles)
+            await db.flush()
+
+        completed_at = datetime.utcnow()
+        summary = {}
+        for name, job in jobs.items():
+            job.status = "failed" if job.error_message else "completed"
+            job.completed_at = completed_at
+            sources[name].last_harvested_at = completed_at
+            summary[name] = {
+                "job_id": job.id,
+                "status": job.status,
+                "pages": stats[name].pages,
+                "candidates_found": job.candidates_found,
+                "candidates_new": job.candidates_new,
+                "candidates_updated": job.candidates_updated,
+                "cursor": sources[name].harvest_cursor,
+                "fetch_seconds": round(stats[name].elapsed_seconds, 3),
+                "errors": stats[name].errors,
+            }
+        await db.flush()
+
+        logger.info(f"Harvested {len(sources)} sources concurrently: {summary}")
+        return {"sources": summary, "duration_seconds": (completed_at - started_at).total_seconds()}
+
+    async def _fetch_source_page(
+        self, source: HarvestSource, criteria: Dict[str, Any], cursor: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+        """
+        Fetch one page of profiles for the scheduler.
+
+        Sources configured with ``config["paginated"]`` and an ``api_endpoint``
+        are called over HTTP and must answer
+        ``{"profiles": [...], "cursor": "...", "has_more": bool}``; the others
+        go through their built-in adapter as a single page. Pages are fetched
+        concurrently, so adapters must not use the request's DB session.
+        """
+        config = source.config or {}
+        if not (config.get("paginated") and source.api_endpoint):
+            adapter = self.harvest_adapters.get(source.name)
+            if adapter is None:
+                raise ValueError(f"Unknown source: {source.name}")
+            return await adapter(None, source, criteria), cursor, False
+
+        params = {
+            key: ",".join(value) if isinstance(value, list) else str(value)
+            for key, value in criteria.items()
+            if value is not None
+        }
+        if cursor:
+            params["cursor"] = cursor
+        headers = {}
+        if source.api_key_encrypted:
+            headers["Authorization"] = f"Bearer {source.api_key_encrypted}"
+
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=config.get("timeout_seconds", 30))
+            )
+        async with self._http_session.get(source.api_endpoint, params=params, headers=headers) as response:
+            response.raise_for_status()
+            payload = await response.json()
+
+        profiles = payload.get("profiles", [])
+        for profile in profiles:
+            profile.setdefault("source", source.name)
+        return profiles, payload.get("cursor", cursor), bool(payload.get("has_more"))
+
     async def _harvest_linkedin(
         self, db: AsyncSession, source: HarvestSource, criteria: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -342,49 +536,7 @@ class ResumeHarvestingAgent(BaseAgent):
     async def deduplicate_candidates(self, db: AsyncSession, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect duplicate candidates across sources using email/name/linkedin fuzzy matching."""
         try:
-            deduped = []
-            seen = set()
-
-            for candidate in candidates:
-                # Create hash for deduplication
-                name = candidate.get("name", "").lower().strip()
-                email = candidate.get("email", "").lower().strip()
-                source_profile_id = candidate.get("source_profile_id", "")
-
-                # Check for duplicates in database
-                hash_key = hashlib.md5(f"{name}_{email}".encode()).hexdigest()
-
-                if hash_key not in seen:
-                    # Check database for similar candidates
-                    similarity_threshold = 0.85
-                    is_duplicate = False
-
-                    if email:
-                        stmt = select(Candidate).where(Candidate.email == email)
-                        result = await db.execute(stmt)
-                        existing = result.scalars().first()
-                        if existing:
-                            is_duplicate = True
-
-                    if not is_duplicate and name:
-                        # Fuzzy matching on name
-                        stmt = select(Candidate).where(
-                            func.lower(Candidate.first_name + " " + Candidate.last_name).like(f"%{name}%")
-                        )
-                        result = await db.execute(stmt)
-                        existing_candidates = result.scalars().all()
-
-                        for existing in existing_candidates:
-                            full_name = f"{existing.first_name} {existing.last_name}".lower()
-                            similarity = SequenceMatcher(None, name, full_name).ratio()
-                            if similarity > similarity_threshold:
-                                is_duplicate = True
-                                break
-
-                    if not is_duplicate:
-                        deduped.append(candidate)
-                        seen.add(hash_key)
-
+            deduped, _ = await self._deduplicate_batch(db, candidates)
             logger.info(f"Deduplicated {len(candidates)} candidates to {len(deduped)}")
             return deduped
 
@@ -392,6 +544,83 @@ class ResumeHarvestingAgent(BaseAgent):
             logger.error(f"Error deduplicating candidates: {str(e)}")
             return candidates
 
+    async def _deduplicate_batch(
+        self, db: AsyncSession, candidates: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Set-based deduplication for a whole harvest batch.
+
+        Existing candidates are resolved with a handful of chunked ``IN``
+        queries (emails, then last name plus first initial) instead of one
+        email lookup plus one ``LIKE`` scan per profile; fuzzy name matching
+        then runs against an in-memory token-blocked index of those rows.
+
+        Returns the unique profiles and the ``email -> candidate id`` map of
+        already-known candidates.
+        """
+        emails = set()
+        name_keys = set()
+        for candidate in candidates:
+            email = _normalize_email(candidate)
+            if email:
+                emails.add(email)
+            name = _normalize_name(candidate)
+            if name:
+                # Split the way new candidates are stored: first token, then the rest
+                first_name, _, last_name = name.partition(" ")
+                name_keys.add((last_name, first_name[0]))
+
+        existing_by_email = await self._resolve_existing_emails(db, emails)
+        name_index = await self._build_name_index(db, name_keys)
+
+        deduped = []
+        seen = set()
+        for candidate in candidates:
+            name = _normalize_name(candidate)
+            email = _normalize_email(candidate)
+            hash_key = hashlib.md5(f"{name}_{email}".encode()).hexdigest()
+            if hash_key in seen:
+                continue
+
+            if email and email in existing_by_email:
+                continue
+            if name and name_index.find_similar(name, self.NAME_SIMILARITY_THRESHOLD) is not None:
+                continue
+
+            deduped.append(candidate)
+            seen.add(hash_key)
+
+        return deduped, existing_by_email
+
+    async def _resolve_existing_emails(self, db: AsyncSession, emails: Set[str]) -> Dict[str, int]:
+        """Map already-known emails to candidate ids with chunked ``IN`` queries."""
+        existing: Dict[str, int] = {}
+        for chunk in _chunked(sorted(emails), self.BATCH_SIZE):
+            result = await db.execute(
+                select(Candidate.id, Candidate.email).where(Candidate.email.in_(chunk))
+            )
+            for candidate_id, email in result.all():
+                existing[email.lower()] = candidate_id
+        return existing
+
+    async def _build_name_index(self, db: AsyncSession, name_keys: Set[Tuple[str, str]]) -> "_NameBlockIndex":
+        """
+        Load existing candidates into a blocking index by ``(last name, first initial)``.
+
+        Blocking on a single first or last name token pulls in every "John"
+        or "Smith" on the platform; pairing the last name with the first
+        initial keeps the candidate set (and the rows fetched) small, at the
+        cost of not catching a misspelt last name.
+        """
+        index = _NameBlockIndex()
+        key = tuple_(func.lower(Candidate.last_name), func.lower(func.substr(Candidate.first_name, 1, 1)))
+        for chunk in _chunked(sorted(name_keys), self.BATCH_SIZE):
+            result = await db.execute(
+                select(Candidate.id, Candidate.first_name, Candidate.last_name).where(key.in_(chunk))
+            )
+            index.add_rows(result.all())
+        return index
+
     async def enrich_candidate(self, db: AsyncSession, candidate_id: int, sources: Optional[List[str]] = None) -> Dict[str, Any]:
         """Cross-reference candidate across multiple sources to enrich profile."""
         try:
@@ -481,104 +710,148 @@ class ResumeHarvestingAgent(BaseAgent):
             if not job:
                 raise ValueError(f"Harvest job not found: {job_id}")
 
-            processed_results = []
-            new_count = 0
-            updated_count = 0
-            duplicate_count = 0
+            processed_results, new_count, updated_count, duplicate_count = await self._process_results_batch(
+                db, job, raw_results
+            )
+
+            # Update job statistics
+            job.candidates_found = len(raw_results)
+            job.candidates_new = new_count
+            job.candidates_updated = updated_count
+            job.candidates_duplicate = duplicate_count
+            job.status = "completed"
+            job.completed_at = datetime.utcnow()
+
+            await db.flush()
+
+            logger.info(
+                f"Processed harvest job {job_id}: {new_count} new, {updated_count} updated, {duplicate_count} duplicates"
+            )
 
-            # Deduplicate first
-            deduped = await self.deduplicate_candidates(db, raw_results)
+            return processed_results
 
-            for candidate_data in deduped:
+        except Exception as e:
+            logger.error(f"Error processing harvest results: {str(e)}")
+            raise
+
+    async def _process_results_batch(
+        self, db: AsyncSession, job: HarvestJob, raw_results: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], int, int, int]:
+        """
+        Dedupe and store one batch of raw profiles for a job.
+
+        Returns ``(processed_results, new, updated, duplicate)`` counts so
+        callers streaming several batches into one job can accumulate them.
+        """
+        job_id = job.id
+        processed_results = []
+        new_count = 0
+        updated_count = 0
+        duplicate_count = 0
+
+        # Deduplicate first, resolving existing candidates for the whole job at once
+        try:
+            deduped, existing_by_email = await self._deduplicate_batch(db, raw_results)
+        except Exception as e:
+            logger.error(f"Error deduplicating candidates: {str(e)}")
+            deduped, existing_by_email = raw_results, {}
+
+        # Candidates created earlier in this job, keyed by email, so repeats map to one row
+        created_by_email: Dict[str, Candidate] = {}
+
+        for chunk in _chunked(deduped, self.BATCH_SIZE):
+            rows = []
+            new_candidates = []
+            for candidate_data in chunk:
                 try:
                     email = candidate_data.get("email")
                     name_parts = candidate_data.get("name", "").split(" ", 1)
                     first_name = name_parts[0]
                     last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-                    # Check if candidate exists
-                    if email:
-                        stmt = select(Candidate).where(Candidate.email == email)
-                        result = await db.execute(stmt)
-                        existing = result.scalars().first()
-                    else:
-                        existing = None
+                    existing_id = existing_by_email.get(email.lower()) if email else None
+                    if existing_id is not None:
+                        rows.append((candidate_data, existing_id))
+                        updated_count += 1
+                        continue
 
-                    if existing:
-                        candidate = existing
+                    candidate_email = email or f"noemail_{candidate_data.get('source_profile_id')}@harvested.local"
+                    candidate = created_by_email.get(candidate_email.lower())
+                    if candidate is not None:
+                        rows.append((candidate_data, candidate))
                         updated_count += 1
-                        result_status = "processed"
-                    else:
-                        candidate = Candidate(
-                            first_name=first_name,
-                            last_name=last_name,
-                            email=email or f"noemail_{candidate_data.get('source_profile_id')}@harvested.local",
-                            status=CandidateStatus.SOURCED,
-                        )
-                        db.add(candidate)
-                        await db.flush()
-                        new_count += 1
-                        result_status = "processed"
-
-                    # Create/update source mapping
-                    stmt = select(CandidateSourceMapping).where(
-                        and_(
-                            CandidateSourceMapping.candidate_id == candidate.id,
-                            CandidateSourceMapping.source_id == job.source_id,
-                        )
+                        continue
+
+                    candidate = Candidate(
+                        first_name=first_name,
+                        last_name=last_name,
+                        email=candidate_email,
+                        status=CandidateStatus.SOURCED,
                     )
-                    result = await db.execute(stmt)
-                    mapping = result.scalars().first()
+                    created_by_email[candidate_email.lower()] = candidate
+                    new_candidates.append(candidate)
+                    rows.append((candidate_data, candidate))
+                    new_count += 1
+
+                except Exception as e:
+                    logger.error(f"Error processing candidate {candidate_data.get('name')}: {str(e)}")
+                    duplicate_count += 1
+
+            # One multi-row INSERT for the chunk's new candidates
+            db.add_all(new_candidates)
+            await db.flush()
+
+            resolved = [
+                (data, target if isinstance(target, int) else target.id)
+                for data, target in rows
+            ]
 
-                    if not mapping:
-                        mapping = CandidateSourceMapping(
-                            candidate_id=candidate.id,
+            # One lookup for the source mappings the chunk already has
+            candidate_ids = {candidate_id for _, candidate_id in resolved}
+            result = await db.execute(
+                select(CandidateSourceMapping.candidate_id).where(
+                    and_(
+                        CandidateSourceMapping.source_id == job.source_id,
+                        CandidateSourceMapping.candidate_id.in_(candidate_ids),
+                    )
+                )
+            )
+            mapped_ids = set(result.scalars().all())
+
+            now = datetime.utcnow()
+            new_rows = []
+            for candidate_data, candidate_id in resolved:
+                if candidate_id not in mapped_ids:
+                    mapped_ids.add(candidate_id)
+                    new_rows.append(
+                        CandidateSourceMapping(
+                            candidate_id=candidate_id,
                             source_id=job.source_id,
                             source_profile_id=candidate_data.get("source_profile_id", ""),
                             source_profile_url=candidate_data.get("source_profile_url"),
                             source_data=candidate_data,
-                            last_synced_at=datetime.utcnow(),
+                            last_synced_at=now,
                         )
-                        db.add(mapping)
+                    )
 
-                    # Create harvest result record
-                    harvest_result = HarvestResult(
+                new_rows.append(
+                    HarvestResult(
                         job_id=job_id,
                         source_id=job.source_id,
-                        candidate_id=candidate.id,
+                        candidate_id=candidate_id,
                         raw_data=candidate_data,
                         source_profile_url=candidate_data.get("source_profile_url"),
                         source_profile_id=candidate_data.get("source_profile_id"),
-                        status=result_status,
-                        processed_at=datetime.utcnow(),
+                        status="processed",
+                        processed_at=now,
                     )
-                    db.add(harvest_result)
-
-                    processed_results.append({"candidate_id": candidate.id, "status": result_status})
-
-                except Exception as e:
-                    logger.error(f"Error processing candidate {candidate_data.get('name')}: {str(e)}")
-                    duplicate_count += 1
-
-            # Update job statistics
-            job.candidates_found = len(raw_results)
-            job.candidates_new = new_count
-            job.candidates_updated = updated_count
-            job.candidates_duplicate = duplicate_count
-            job.status = "completed"
-            job.completed_at = datetime.utcnow()
+                )
+                processed_results.append({"candidate_id": candidate_id, "status": "processed"})
 
+            db.add_all(new_rows)
             await db.flush()
 
-            logger.info(
-                f"Processed harvest job {job_id}: {new_count} new, {updated_count} updated, {duplicate_count} duplicates"
-            )
-
-            return processed_results
-
-        except Exception as e:
-            logger.error(f"Error processing harvest results: {str(e)}")
-            raise
+        return processed_results, new_count, updated_count, duplicate_count
 
     async def get_harvest_analytics(self, db: AsyncSession) -> Dict[str, Any]:
         """Analytics: candidates per source, quality scores, conversion rates, cost per candidate."""
@@ -630,4 +903,6 @@ class ResumeHarvestingAgent(BaseAgent):
 
     async def on_stop(self) -> None:
         """Cleanup harvesting agent."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
         logger.info("Resume Harvesting Agent stopped")
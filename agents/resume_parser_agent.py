@@ -1,19 +1,48 @@
+import asyncio
 import logging
 import re
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from pathlib import Path
 from agents.base_agent import BaseAgent
+from agents.skill_extractor import SkillExtractor, get_skill_extractor
 
 logger = logging.getLogger(__name__)
 
 
+def read_pdf_text(file_path: str) -> str:
+    """Extract text from a PDF file (blocking; run off the event loop)."""
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return "".join(f"{page.extract_text() or ''}\n" for page in pdf.pages)
+
+
+def read_docx_text(file_path: str) -> str:
+    """Extract text from a DOCX file (blocking; run off the event loop)."""
+    from docx import Document
+
+    doc = Document(file_path)
+    return "".join(f"{paragraph.text}\n" for paragraph in doc.paragraphs)
+
+
+def read_resume_text(file_path: str) -> str:
+    """Extract text from a PDF or DOCX resume (blocking)."""
+    file_ext = Path(file_path).suffix.lower()
+    if file_ext == ".pdf":
+        return read_pdf_text(file_path)
+    if file_ext in [".docx", ".doc"]:
+        return read_docx_text(file_path)
+    raise ValueError(f"Unsupported file format: {file_ext}")
+
+
 class ResumeParserAgent(BaseAgent):
     """Agent for parsing resume files and extracting structured data using NLP."""
 
-    def __init__(self):
+    def __init__(self, skill_extractor: Optional[SkillExtractor] = None):
         """Initialize the resume parser agent."""
         super().__init__(agent_name="ResumeParserAgent", agent_version="1.0.0")
+        self.skill_extractor = skill_extractor or get_skill_extractor()
         self._init_nlp_models()
 
     def _init_nlp_models(self) -> None:
@@ -61,13 +90,7 @@ class ResumeParserAgent(BaseAgent):
     async def _extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file."""
         try:
-            import pdfplumber
-
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-            return text
+            return await asyncio.to_thread(read_pdf_text, file_path)
         except ImportError:
             logger.error("pdfplumber not installed")
             raise
@@ -78,13 +101,7 @@ class ResumeParserAgent(BaseAgent):
     async def _extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file."""
         try:
-            from docx import Document
-
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return await asyncio.to_thread(read_docx_text, file_path)
         except ImportError:
             logger.error("python-docx not installed")
             raise
@@ -170,7 +187,8 @@ class ResumeParserAgent(BaseAgent):
         """
         Extract skills from resume text.
 
-        Uses regex patterns and keyword matching. Infers proficiency levels.
+        Matches the compiled skill taxonomy in a single pass and infers
+        proficiency levels from the context around each mention.
 
         Args:
             text: Resume text
@@ -178,169 +196,7 @@ class ResumeParserAgent(BaseAgent):
         Returns:
             List of skills with proficiency levels
         """
-        skills = []
-        text_lower = text.lower()
-
-        # Define skill categories with common terms
-        skill_categories = {
-            "programming_languages": [
-                "python",
-                "javascript",
-                "java",
-                "c#",
-                "c++",
-                "ruby",
-                "php",
-                "go",
-                "rust",
-                "scala",
-                "kotlin",
-                "swift",
-                "typescript",
-            ],
-            "frontend_frameworks": [
-                "react",
-                "angular",
-                "vue",
-                "ember",
-                "backbone",
-                "next.js",
-                "gatsby",
-            ],
-            "backend_frameworks": [
-                "django",
-                "flask",
-                "fastapi",
-                "spring",
-                "spring boot",
-                "express",
-                "nest.js",
-                "laravel",
-                "rails",
-            ],
-            "databases": [
-                "sql",
-                "mysql",
-                "postgresql",
-                "mongodb",
-                "redis",
-                "cassandra",
-                "elasticsearch",
-                "dynamodb",
-                "oracle",
-            ],
-            "cloud_platforms": [
-                "aws",
-                "azure",
-                "gcp",
-                "google cloud",
-                "heroku",
-                "digitalocean",
-            ],
-            "devops_tools": [
-                "docker",
-                "kubernetes",
-                "jenkins",
-                "gitlab ci",
-                "github actions",
-                "terraform",
-                "ansible",
-            ],
-            "data_science": [
-                "machine learning",
-                "tensorflow",
-                "pytorch",
-                "pandas",
-                "numpy",
-                "scikit-learn",
-                "data science",
-            ],
-            "testing": [
-                "pytest",
-                "jest",
-                "mocha",
-                "jasmine",
-                "rspec",
-                "unittest",
-            ],
-            "other": [
-                "rest api",
-                "graphql",
-                "microservices",
-                "linux",
-                "git",
-                "agile",
-                "scrum",
-            ],
-        }
-
-        # Look for skill sections first
-        skill_section_pattern = r"(?:Skills?|Technical\s+Skills?|Competencies?)[\s:]*(.*?)(?=\n\n|[A-Z][a-z]+\s+(?:Experience|Education|Projects)|$)"
-        skill_sections = re.findall(skill_section_pattern, text, re.MULTILINE | re.IGNORECASE)
-
-        found_skills = set()
-
-        # Extract skills from dedicated sections
-        for section in skill_sections:
-            for category, skill_list in skill_categories.items():
-                for skill in skill_list:
-                    if skill.lower() in section.lower() and skill not in found_skills:
-                        proficiency = self._infer_proficiency(skill, text)
-                        skills.append(
-                            {
-                                "skill": skill,
-                                "category": category,
-                                "proficiency": proficiency,
-                                "extracted_from": "skills_section",
-                                "confidence": 0.9,
-                            }
-                        )
-                        found_skills.add(skill)
-
-        # Extract skills from experience section with context
-        experience_pattern = r"(?:Experience|Work History)[\s:]*(.*?)(?=\n\n|Education|$)"
-        experience_sections = re.findall(experience_pattern, text, re.MULTILINE | re.IGNORECASE | re.DOTALL)
-
-        for section in experience_sections:
-            for category, skill_list in skill_categories.items():
-                for skill in skill_list:
-                    if skill.lower() in section.lower() and skill not in found_skills:
-                        proficiency = self._infer_proficiency(skill, text)
-                        skills.append(
-                            {
-                                "skill": skill,
-                                "category": category,
-                                "proficiency": proficiency,
-                                "extracted_from": "experience_section",
-                                "confidence": 0.7,
-                            }
-                        )
-                        found_skills.add(skill)
-
-        return skills
-
-    def _infer_proficiency(self, skill: str, text: str) -> str:
-        """Infer skill proficiency level from context."""
-        skill_lower = skill.lower()
-        text_lower = text.lower()
-
-        # Find context around skill mention
-        pattern = rf".{{0,100}}{re.escape(skill_lower)}.{{0,100}}"
-        contexts = re.findall(pattern, text_lower)
-
-        proficiency_indicators = {
-            "expert": ["expert", "mastery", "deep", "advanced", "principal", "lead", "architect"],
-            "proficient": ["proficient", "strong", "solid", "experienced", "proven", "extensive"],
-            "intermediate": ["intermediate", "familiar", "working", "comfortable"],
-            "beginner": ["basic", "introductory", "learning", "exposure"],
-        }
-
-        for level, indicators in proficiency_indicators.items():
-            for context in contexts:
-                if any(indicator in context for indicator in indicators):
-                    return level
-
-        return "intermediate"
+        return self.skill_extractor.extract(text)
 
     def extract_work_experience(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -366,7 +222,7 @@ class ResumeParserAgent(BaseAgent):
         exp_text = exp_section.group(1)
 
         # Split by company/title patterns
-        job_pattern = r"(?:^|\n)([^,\n]{10,100})\s*-?\s*([^,\n]{5,50})\s*[|•-]\s*(?:([A-Z][a-z]+\s+\d{4})\s*-?\s*([A-Z][a-z]+\s+\d{4}|Present)|([\d/]+)\s*-?\s*([\d/]+|Present)))"
+        job_pattern = r"(?:^|\n)([^,\n]{10,100})\s*-?\s*([^,\n]{5,50})\s*[|•-]\s*(?:([A-Z][a-z]+\s+\d{4})\s*-?\s*([A-Z][a-z]+\s+\d{4}|Present)|([\d/]+)\s*-?\s*([\d/]+|Present))"
 
         for match in re.finditer(job_pattern, exp_text, re.MULTILINE):
             company = match.group(1).strip()
@@ -509,6 +365,10 @@ class ResumeParserAgent(BaseAgent):
         """
         Parse resume text and extract all structured information.
 
+        The regex extraction runs in a worker thread so a large resume does
+        not stall the event loop; bulk parsing should go through
+        ``ResumeParsingPool`` instead.
+
         Args:
             text: Resume text content
             file_name: Optional file name for context
@@ -516,6 +376,10 @@ class ResumeParserAgent(BaseAgent):
         Returns:
             Parsed resume data with confidence scores
         """
+        return await asyncio.to_thread(self.parse_resume_sync, text, file_name)
+
+    def parse_resume_sync(self, text: str, file_name: Optional[str] = None) -> Dict[str, Any]:
+        """Blocking implementation of ``parse_resume`` (used by worker processes)."""
         try:
             logger.info(f"Parsing resume: {file_name or 'unnamed'}")
 
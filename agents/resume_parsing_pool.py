@@ -0,0 +1,304 @@
+"""
+Process-pool resume parsing pipeline.
+
+Text extraction (pdfplumber / python-docx) and the regex-heavy parse run
+in worker processes so bulk imports never execute on the API event loop.
+Jobs go through a bounded queue: ``submit`` waits when it is full, which
+pushes back on producers instead of buffering an unbounded backlog.
+Each file is limited by a wall-clock timeout (``SIGALRM`` in the worker,
+plus an asyncio backstop) and an address-space cap per worker process.
+Finished results are handed to ``result_sink`` in batches, except for
+jobs submitted through ``parse``, whose outcome goes back to the caller.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ResultSink = Callable[[List["ParseOutcome"]], Awaitable[None]]
+
+
+@dataclass
+class ParseJob:
+    """A resume file waiting to be parsed."""
+    resume_id: int
+    file_path: str
+    file_name: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    result: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class ParseOutcome:
+    """Result of parsing one resume file."""
+    resume_id: int
+    file_name: Optional[str]
+    text: Optional[str] = None
+    parsed: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ParseTimeout(Exception):
+    """Raised inside a worker when a file exceeds its time budget."""
+
+
+_worker_parser = None
+
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+def _init_worker(memory_limit_mb: Optional[int]) -> None:
+    """Per-process setup: memory cap, alarm handler and a reusable parser."""
+    global _worker_parser
+
+    if memory_limit_mb:
+        try:
+            import resource
+
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"Could not apply worker memory cap: {str(e)}")
+
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+
+    from agents.resume_parser_agent import ResumeParserAgent
+
+    _worker_parser = ResumeParserAgent()
+
+
+def _parse_in_worker(
+    file_path: str, file_name: Optional[str], timeout_seconds: float
+) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str]]:
+    """Extract and parse one file inside a worker process."""
+    from agents.resume_parser_agent import read_resume_text
+
+    use_alarm = hasattr(signal, "SIGALRM") and timeout_seconds > 0
+    if use_alarm:
+        signal.alarm(max(1, math.ceil(timeout_seconds)))
+    try:
+        text = read_resume_text(file_path)
+        parsed = _worker_parser.parse_resume_sync(text, file_name)
+        return text, parsed, None
+    except ParseTimeout:
+        return None, None, f"timed out after {timeout_seconds:g}s"
+    except MemoryError:
+        return None, None, "exceeded worker memory limit"
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {str(e)}"
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+class ResumeParsingPool:
+    """
+    Bounded job queue in front of a process pool, with batched result writes.
+
+    Usage::
+
+        pool = ResumeParsingPool(result_sink=service.save_parsed_results)
+        await pool.submit(ParseJob(resume_id=1, file_path="/tmp/a.pdf"))
+        await pool.drain()
+        pool.metrics()
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = 100,
+        timeout_seconds: float = 60.0,
+        memory_limit_mb: Optional[int] = 1024,
+        batch_size: int = 20,
+        flush_interval: float = 1.0,
+        result_sink: Optional[ResultSink] = None,
+    ):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.queue_size = queue_size
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.result_sink = result_sink
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending: List[ParseOutcome] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._recent: Deque[Tuple[float, float]] = deque(maxlen=1000)
+
+        self._started_at: Optional[float] = None
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "flushed": 0,
+            "write_failed": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        """Spawn worker processes and consumer tasks (idempotent)."""
+        if self.is_running:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.memory_limit_mb,),
+        )
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._flush_lock = asyncio.Lock()
+        self._started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._periodic_flush()))
+        logger.info(f"Resume parsing pool started with {self.workers} workers")
+
+    async def submit(self, job: ParseJob) -> None:
+        """Enqueue a job, waiting while the queue is full (backpressure)."""
+        await self.start()
+        job.enqueued_at = time.monotonic()
+        await self._queue.put(job)
+        self._counters["submitted"] += 1
+
+    async def parse(self, job: ParseJob) -> ParseOutcome:
+        """Parse one file in the pool and return its outcome instead of sending it to the sink."""
+        job.result = asyncio.get_running_loop().create_future()
+        await self.submit(job)
+        return await job.result
+
+    def try_submit(self, job: ParseJob) -> bool:
+        """Enqueue without waiting; returns False when the queue is full."""
+        if not self.is_running:
+            raise RuntimeError("Parsing pool not started")
+        try:
+            job.enqueued_at = time.monotonic()
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        self._counters["submitted"] += 1
+        return True
+
+    async def drain(self) -> None:
+        """Wait for every queued job to finish and flush remaining results."""
+        if not self.is_running:
+            return
+        await self._queue.join()
+        await self.flush()
+
+    async def close(self) -> None:
+        """Drain outstanding work, then stop consumers and worker processes."""
+        if not self.is_running:
+            return
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        logger.info(f"Resume parsing pool stopped: {self.metrics()}")
+
+    async def flush(self) -> None:
+        """Hand buffered results to the sink as one batch."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            if self.result_sink is not None:
+                try:
+                    await self.result_sink(batch)
+                except Exception as e:
+                    logger.error(f"Error writing {len(batch)} parsed resumes: {str(e)}")
+                    self._counters["write_failed"] += len(batch)
+                    return
+            self._counters["flushed"] += len(batch)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Throughput and queue statistics."""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        finished = self._counters["completed"] + self._counters["failed"]
+        durations = sorted(d for _, d in self._recent)
+        return {
+            **self._counters,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "pending_writes": len(self._pending),
+            "uptime_seconds": round(elapsed, 3),
+            "resumes_per_second": round(finished / elapsed, 2) if elapsed else 0.0,
+            "p50_seconds": round(durations[len(durations) // 2], 4) if durations else None,
+            "p95_seconds": round(durations[int(len(durations) * 0.95)], 4) if durations else None,
+        }
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            started = time.monotonic()
+            try:
+                future = loop.run_in_executor(
+                    self._executor, _parse_in_worker, job.file_path, job.file_name, self.timeout_seconds
+                )
+                # Backstop in case the worker cannot be interrupted by SIGALRM
+                text, parsed, error = await asyncio.wait_for(future, timeout=self.timeout_seconds + 5)
+            except asyncio.TimeoutError:
+                text, parsed, error = None, None, f"timed out after {self.timeout_seconds:g}s"
+            except Exception as e:
+                text, parsed, error = None, None, f"{type(e).__name__}: {str(e)}"
+
+            duration = time.monotonic() - started
+            outcome = ParseOutcome(
+                resume_id=job.resume_id,
+                file_name=job.file_name,
+                text=text,
+                parsed=parsed,
+                error=error,
+                duration_seconds=duration,
+            )
+            if error:
+                self._counters["failed"] += 1
+                if error.startswith("timed out"):
+                    self._counters["timed_out"] += 1
+                logger.warning(f"Failed to parse resume {job.resume_id}: {error}")
+            else:
+                self._counters["completed"] += 1
+            self._recent.append((started, duration))
+
+            if job.result is not None:
+                if not job.result.done():
+                    job.result.set_result(outcome)
+                self._queue.task_done()
+                continue
+
+            self._pending.append(outcome)
+            try:
+                if len(self._pending) >= self.batch_size:
+                    await self.flush()
+            finally:
+                self._queue.task_done()
+
+    async def _periodic_flush(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
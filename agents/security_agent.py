@@ -12,7 +12,6 @@ from models.security import (
     RoleTemplate,
     UserRoleAssignment,
     APIKey,
-    AccessLog,
     SecurityAlert,
     SessionPolicy,
 )
@@ -160,7 +159,9 @@ class SecurityAgent(BaseAgent):
                     "resource": permission.resource,
                     "action": permission.action,
                 },
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Created permission {permission.name}")
             return permission
@@ -200,7 +201,9 @@ class SecurityAgent(BaseAgent):
                     "name": role.name,
                     "display_name": role.display_name,
                 },
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Created role template {role.name}")
             return role
@@ -241,7 +244,9 @@ class SecurityAgent(BaseAgent):
                         "role_id": role.id,
                         "name": role.name,
                     },
+                    db=db,
                 )
+                await db.commit()
 
             logger.info(f"Updated role template {role_id}")
             return role
@@ -295,7 +300,9 @@ class SecurityAgent(BaseAgent):
                     "assigned_by": assigned_by,
                 },
                 user_id=assigned_by,
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Assigned role {role_template_id} to user {user_id}")
             return assignment
@@ -333,6 +340,25 @@ class SecurityAgent(BaseAgent):
             logger.error(f"Error checking permission: {str(e)}")
             return False
 
+    async def check_permissions(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        checks: List[Tuple[str, str]],
+    ) -> Dict[str, bool]:
+        """Check many resource+action pairs at once.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            checks: (resource, action) pairs
+
+        Returns:
+            Dictionary of {"resource:action": allowed}
+        """
+        service = AccessControlService(db)
+        return await service.check_permissions(user_id, checks)
+
     async def get_agent_permissions(
         self,
         db: AsyncSession,
@@ -403,7 +429,9 @@ class SecurityAgent(BaseAgent):
                     "user_id": user_id,
                 },
                 user_id=user_id,
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Created API key {api_key.key_prefix} for user {user_id}")
             return plaintext_key, api_key
@@ -439,7 +467,9 @@ class SecurityAgent(BaseAgent):
                         "key_id": api_key.id,
                         "key_prefix": api_key.key_prefix,
                     },
+                    db=db,
                 )
+                await db.commit()
 
             logger.info(f"Revoked API key {key_id}")
             return api_key
@@ -461,8 +491,8 @@ class SecurityAgent(BaseAgent):
         entity_id: Optional[int] = None,
         response_status: Optional[int] = None,
         user_agent: Optional[str] = None,
-    ) -> AccessLog:
-        """Log access attempt.
+    ) -> None:
+        """Log access attempt (buffered; written in bulk by the audit sink).
 
         Args:
             db: Database session
@@ -477,15 +507,12 @@ class SecurityAgent(BaseAgent):
             response_status: HTTP status
             user_agent: User agent string
 
-        Returns:
-            Created access log
-
         Raises:
             Exception: If database operation fails
         """
         try:
             service = AccessControlService(db)
-            return await service.log_access(
+            await service.log_access(
                 user_id=user_id,
                 resource=resource,
                 action=action,
@@ -650,7 +677,9 @@ class SecurityAgent(BaseAgent):
                     "policy_id": policy.id,
                     "policy_name": policy.name,
                 },
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Created session policy {policy.name}")
             return policy
@@ -0,0 +1,346 @@
+"""
+Compiled skill extraction for resume parsing.
+
+The skill taxonomy is compiled once into an Aho-Corasick automaton, so a
+resume is scanned a single time no matter how many skills the taxonomy
+holds. Every occurrence comes back with its offsets, and those offsets
+drive both section attribution and proficiency inference (from a context
+window around each mention) without re-scanning the text per skill.
+
+The taxonomy defaults to ``DEFAULT_SKILL_TAXONOMY`` and can be replaced
+with a JSON file (``{"category": ["skill", ...]}``) via
+``settings.skill_taxonomy_path``.
+"""
+
+import json
+import logging
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "programming_languages": [
+        "python",
+        "javascript",
+        "java",
+        "c#",
+        "c++",
+        "ruby",
+        "php",
+        "go",
+        "rust",
+        "scala",
+        "kotlin",
+        "swift",
+        "typescript",
+    ],
+    "frontend_frameworks": [
+        "react",
+        "angular",
+        "vue",
+        "ember",
+        "backbone",
+        "next.js",
+        "gatsby",
+    ],
+    "backend_frameworks": [
+        "django",
+        "flask",
+        "fastapi",
+        "spring",
+        "spring boot",
+        "express",
+        "nest.js",
+        "laravel",
+        "rails",
+    ],
+    "databases": [
+        "sql",
+        "mysql",
+        "postgresql",
+        "mongodb",
+        "redis",
+        "cassandra",
+        "elasticsearch",
+        "dynamodb",
+        "oracle",
+    ],
+    "cloud_platforms": [
+        "aws",
+        "azure",
+        "gcp",
+        "google cloud",
+        "heroku",
+        "digitalocean",
+    ],
+    "devops_tools": [
+        "docker",
+        "kubernetes",
+        "jenkins",
+        "gitlab ci",
+        "github actions",
+        "terraform",
+        "ansible",
+    ],
+    "data_science": [
+        "machine learning",
+        "tensorflow",
+        "pytorch",
+        "pandas",
+        "numpy",
+        "scikit-learn",
+        "data science",
+    ],
+    "testing": [
+        "pytest",
+        "jest",
+        "mocha",
+        "jasmine",
+        "rspec",
+        "unittest",
+    ],
+    "other": [
+        "rest api",
+        "graphql",
+        "microservices",
+        "linux",
+        "git",
+        "agile",
+        "scrum",
+    ],
+}
+
+# Checked in order; the first level with an indicator near any mention wins
+PROFICIENCY_INDICATORS: Dict[str, List[str]] = {
+    "expert": ["expert", "mastery", "deep", "advanced", "principal", "lead", "architect"],
+    "proficient": ["proficient", "strong", "solid", "experienced", "proven", "extensive"],
+    "intermediate": ["intermediate", "familiar", "working", "comfortable"],
+    "beginner": ["basic", "introductory", "learning", "exposure"],
+}
+
+DEFAULT_PROFICIENCY = "intermediate"
+
+# Characters of same-line context inspected on each side of a mention
+CONTEXT_CHARS = 100
+
+
+class SkillAutomaton:
+    """Aho-Corasick automaton over a fixed set of lowercase patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._lengths: List[int] = []
+
+        for pattern_id, pattern in enumerate(patterns):
+            self._lengths.append(len(pattern))
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (pattern_id,)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fallback = goto[f].get(ch, 0)
+                fail[nxt] = fallback if fallback != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Return every ``(start, end, pattern_id)`` occurrence in ``text``.
+
+        Overlapping matches are all reported; results are ordered by ``end``.
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        matches: List[Tuple[int, int, int]] = []
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                end = i + 1
+                for pattern_id in out[state]:
+                    matches.append((end - lengths[pattern_id], end, pattern_id))
+        return matches
+
+
+def load_skill_taxonomy(path: str) -> Dict[str, List[str]]:
+    """Read a ``{"category": ["skill", ...]}`` taxonomy from a JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+
+    if not isinstance(taxonomy, dict) or not all(
+        isinstance(skills, list) and all(isinstance(s, str) for s in skills)
+        for skills in taxonomy.values()
+    ):
+        raise ValueError(f"Invalid skill taxonomy in {path}: expected an object of string lists")
+    return taxonomy
+
+
+class SkillExtractor:
+    """
+    Extract taxonomy skills from resume text in one pass.
+
+    Skill order follows the taxonomy: category order first, then the order
+    of skills within a category. A skill listed under several categories
+    keeps the first one.
+    """
+
+    SKILL_SECTION_PATTERN = re.compile(
+        r"(?:Skills?|Technical\s+Skills?|Competencies?)[\s:]*(.*?)(?=\n\n|[A-Z][a-z]+\s+(?:Experience|Education|Projects)|$)",
+        re.MULTILINE | re.IGNORECASE,
+    )
+    EXPERIENCE_SECTION_PATTERN = re.compile(
+        r"(?:Experience|Work History)[\s:]*(.*?)(?=\n\n|Education|$)",
+        re.MULTILINE | re.IGNORECASE | re.DOTALL,
+    )
+
+    def __init__(self, taxonomy: Optional[Dict[str, List[str]]] = None):
+        taxonomy = DEFAULT_SKILL_TAXONOMY if taxonomy is None else taxonomy
+
+        self._skills: List[Tuple[str, str]] = []
+        seen = set()
+        for category, skill_list in taxonomy.items():
+            for skill in skill_list:
+                key = skill.lower()
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                self._skills.append((skill, category))
+
+        self._automaton = SkillAutomaton(skill.lower() for skill, _ in self._skills)
+        self._indicator_patterns = [
+            (level, re.compile("|".join(re.escape(i) for i in indicators)))
+            for level, indicators in PROFICIENCY_INDICATORS.items()
+        ]
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillExtractor":
+        return cls(load_skill_taxonomy(path))
+
+    @property
+    def skill_count(self) -> int:
+        return len(self._skills)
+
+    def find(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """Return ``(start, end, skill, category)`` for every skill mention."""
+        return [
+            (start, end, *self._skills[skill_id])
+            for start, end, skill_id in self._automaton.find_all(text.lower())
+        ]
+
+    def extract(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract skills with proficiency levels.
+
+        Skills named in a skills section are reported with confidence 0.9;
+        skills only found in experience sections get 0.7.
+        """
+        text_lower = text.lower()
+        occurrences = self._automaton.find_all(text_lower)
+        if not occurrences:
+            return []
+        ends = [end for _, end, _ in occurrences]
+        mentions: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for start, end, skill_id in occurrences:
+            mentions[skill_id].append((start, end))
+
+        skills: List[Dict[str, Any]] = []
+        found = set()
+        sources = (
+            (self.SKILL_SECTION_PATTERN, "skills_section", 0.9),
+            (self.EXPERIENCE_SECTION_PATTERN, "experience_section", 0.7),
+        )
+        for pattern, extracted_from, confidence in sources:
+            for section in pattern.finditer(text_lower):
+                section_start, section_end = section.span(1)
+                if section_start == section_end:
+                    continue
+
+                in_section = set()
+                lo = bisect_right(ends, section_start)
+                hi = bisect_right(ends, section_end)
+                for start, _, skill_id in occurrences[lo:hi]:
+                    if start >= section_start and skill_id not in found:
+                        in_section.add(skill_id)
+
+                for skill_id in sorted(in_section):
+                    found.add(skill_id)
+                    skill, category = self._skills[skill_id]
+                    skills.append(
+                        {
+                            "skill": skill,
+                            "category": category,
+                            "proficiency": self._infer_proficiency(mentions[skill_id], text_lower),
+                            "extracted_from": extracted_from,
+                            "confidence": confidence,
+                        }
+                    )
+
+        return skills
+
+    def _infer_proficiency(self, spans: List[Tuple[int, int]], text_lower: str) -> str:
+        """Pick the strongest level indicated near any mention of the skill."""
+        windows = []
+        for start, end in spans:
+            line_start = text_lower.rfind("\n", 0, start) + 1
+            line_end = text_lower.find("\n", end)
+            if line_end == -1:
+                line_end = len(text_lower)
+            windows.append(
+                (max(line_start, start - CONTEXT_CHARS), min(line_end, end + CONTEXT_CHARS))
+            )
+
+        for level, pattern in self._indicator_patterns:
+            for window_start, window_end in windows:
+                if pattern.search(text_lower, window_start, window_end):
+                    return level
+
+        return DEFAULT_PROFICIENCY
+
+
+@lru_cache()
+def get_skill_extractor() -> SkillExtractor:
+    """Shared extractor built from ``settings.skill_taxonomy_path`` (or the default taxonomy)."""
+    from config import settings
+
+    if settings.skill_taxonomy_path:
+        extractor = SkillExtractor.from_file(settings.skill_taxonomy_path)
+    else:
+        extractor = SkillExtractor()
+    logger.info(f"Compiled skill taxonomy with {extractor.skill_count} skills")
+    return extractor
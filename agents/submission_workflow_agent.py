@@ -223,8 +223,6 @@ class SubmissionWorkflowAgent(BaseAgent):
             # Update submission status
             submission.status = SubmissionStatus.PENDING_REVIEW
             db.add(submission)
-            await db.commit()
-            await db.refresh(submission)
 
             # Emit event
             await self.emit_event(
@@ -237,8 +235,12 @@ class SubmissionWorkflowAgent(BaseAgent):
                     "status": SubmissionStatus.PENDING_REVIEW.value,
                 },
                 user_id=submission.submitted_by,
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(submission)
+
             logger.info(f"Submitted submission {submission_id} for internal review")
             return submission
 
@@ -297,8 +299,6 @@ class SubmissionWorkflowAgent(BaseAgent):
 
             submission.internal_notes = notes
             db.add(submission)
-            await db.commit()
-            await db.refresh(submission)
 
             # Emit event
             await self.emit_event(
@@ -312,8 +312,12 @@ class SubmissionWorkflowAgent(BaseAgent):
                     "notes": notes,
                 },
                 user_id=reviewer_id,
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(submission)
+
             logger.info(
                 f"Processed submission {submission_id}: {'APPROVED' if approved else 'REJECTED'}"
             )
@@ -363,8 +367,6 @@ class SubmissionWorkflowAgent(BaseAgent):
             submission.status = SubmissionStatus.SUBMITTED
             submission.submitted_to_customer_at = datetime.utcnow()
             db.add(submission)
-            await db.commit()
-            await db.refresh(submission)
 
             # Emit event
             await self.emit_event(
@@ -378,8 +380,12 @@ class SubmissionWorkflowAgent(BaseAgent):
                     "submitted_at": submission.submitted_to_customer_at.isoformat(),
                 },
                 user_id=submission.submitted_by,
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(submission)
+
             logger.info(f"Submitted submission {submission_id} to customer")
             return submission
 
@@ -443,8 +449,6 @@ class SubmissionWorkflowAgent(BaseAgent):
                 submission.rejection_reason = feedback
 
             db.add(submission)
-            await db.commit()
-            await db.refresh(submission)
 
             # Emit event
             await self.emit_event(
@@ -457,8 +461,12 @@ class SubmissionWorkflowAgent(BaseAgent):
                     "shortlisted": shortlisted,
                     "feedback": feedback,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(submission)
+
             logger.info(f"Tracked customer response for submission {submission_id}")
             return submission
 
@@ -502,8 +510,6 @@ class SubmissionWorkflowAgent(BaseAgent):
             submission.status = SubmissionStatus.WITHDRAWN
             submission.rejection_reason = reason
             db.add(submission)
-            await db.commit()
-            await db.refresh(submission)
 
             # Emit event
             await self.emit_event(
@@ -515,8 +521,12 @@ class SubmissionWorkflowAgent(BaseAgent):
                     "candidate_id": submission.candidate_id,
                     "reason": reason,
                 },
+                db=db,
             )
 
+            await db.commit()
+            await db.refresh(submission)
+
             logger.info(f"Withdrawn submission {submission_id}")
             return submission
 
@@ -0,0 +1,209 @@
+"""
+In-memory supplier capability index.
+
+Holds one profile per supplier with inverted postings (specialization ->
+suppliers, location -> suppliers) and the supplier's latest performance
+snapshot, so ranking a requirement only scores the suppliers that can
+actually change the answer instead of re-scoring the whole network.
+
+Ranking relies on a per-supplier ``base_score``: the score a supplier
+gets when none of its specializations or locations match. Scorers must
+be monotone in that base score for non-matching suppliers and must never
+score a match below it. Under that contract the top N are always found
+among the matched suppliers plus the N best suppliers by base score.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# (profile, skill overlap count, serves requirement location) -> score
+ProfileScorer = Callable[["SupplierProfile", int, bool], float]
+
+
+def normalize_terms(values: Optional[Iterable[Any]]) -> FrozenSet[str]:
+    """Lowercased, stripped, non-empty terms."""
+    return frozenset(str(v).strip().lower() for v in values or [] if v and str(v).strip())
+
+
+@dataclass
+class SupplierProfile:
+    """Indexed view of one supplier."""
+    supplier_id: int
+    name: str = ""
+    tier: Any = None
+    specializations: FrozenSet[str] = frozenset()
+    locations: FrozenSet[str] = frozenset()
+    latest_rating: Optional[float] = None
+    latest_period_end: Optional[date] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    base_score: float = 0.0
+
+
+class SupplierCapabilityIndex:
+    """
+    Postings and precomputed base scores for fast top-N supplier selection.
+
+    ``base_score`` is recomputed whenever a profile is added or its
+    performance snapshot changes. With ``ttl_seconds`` set, ``is_stale``
+    tells the owner when to rebuild from the database.
+    """
+
+    def __init__(
+        self,
+        base_score: Callable[[SupplierProfile], float],
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._base_score = base_score
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self.built_at: Optional[float] = None
+
+        self._profiles: Dict[int, SupplierProfile] = {}
+        self._by_specialization: Dict[str, Set[int]] = {}
+        self._by_location: Dict[str, Set[int]] = {}
+        self._base_order: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, supplier_id: int) -> bool:
+        return supplier_id in self._profiles
+
+    def is_stale(self) -> bool:
+        if self.built_at is None:
+            return True
+        if self.ttl_seconds is None:
+            return False
+        return self._clock() - self.built_at > self.ttl_seconds
+
+    def rebuild(self, profiles: Iterable[SupplierProfile]) -> None:
+        """Replace the whole index."""
+        self._profiles.clear()
+        self._by_specialization.clear()
+        self._by_location.clear()
+        self._base_order = None
+        for profile in profiles:
+            self.add(profile)
+        self.built_at = self._clock()
+
+    def get(self, supplier_id: int) -> Optional[SupplierProfile]:
+        return self._profiles.get(supplier_id)
+
+    def add(self, profile: SupplierProfile) -> None:
+        """Insert or replace a supplier."""
+        self.remove(profile.supplier_id)
+        profile.base_score = self._base_score(profile)
+        self._profiles[profile.supplier_id] = profile
+        for term in profile.specializations:
+            self._by_specialization.setdefault(term, set()).add(profile.supplier_id)
+        for term in profile.locations:
+            self._by_location.setdefault(term, set()).add(profile.supplier_id)
+        self._base_order = None
+
+    def remove(self, supplier_id: int) -> None:
+        profile = self._profiles.pop(supplier_id, None)
+        if profile is None:
+            return
+        for postings, terms in (
+            (self._by_specialization, profile.specializations),
+            (self._by_location, profile.locations),
+        ):
+            for term in terms:
+                ids = postings.get(term)
+                if ids is not None:
+                    ids.discard(supplier_id)
+                    if not ids:
+                        del postings[term]
+        self._base_order = None
+
+    def update(self, supplier_id: int, **changes: Any) -> None:
+        """Change profile fields (e.g. ``tier``) and re-derive its base score."""
+        profile = self._profiles.get(supplier_id)
+        if profile is None:
+            return
+        self.remove(supplier_id)
+        for name, value in changes.items():
+            setattr(profile, name, value)
+        self.add(profile)
+
+    def record_performance(
+        self, supplier_id: int, rating: Optional[float], period_end: Optional[date]
+    ) -> bool:
+        """
+        Apply a closed performance period to the snapshot.
+
+        Only a period at least as recent as the current one replaces it.
+        Returns True when the snapshot changed.
+        """
+        profile = self._profiles.get(supplier_id)
+        if profile is None:
+            return False
+        current = profile.latest_period_end
+        if current is not None and period_end is not None and period_end < current:
+            return False
+        profile.latest_rating = rating
+        profile.latest_period_end = period_end
+        profile.base_score = self._base_score(profile)
+        self._base_order = None
+        return True
+
+    def matching(self, skills: Iterable[str]) -> Dict[int, int]:
+        """Supplier ID -> number of requested skills it specializes in."""
+        overlaps: Dict[int, int] = {}
+        for term in normalize_terms(skills):
+            for supplier_id in self._by_specialization.get(term, ()):
+                overlaps[supplier_id] = overlaps.get(supplier_id, 0) + 1
+        return overlaps
+
+    def serving(self, location: Optional[str]) -> Set[int]:
+        """Suppliers that list ``location`` among the locations they serve."""
+        terms = normalize_terms([location])
+        if not terms:
+            return set()
+        return self._by_location.get(next(iter(terms)), set())
+
+    def _ranked_by_base(self) -> List[int]:
+        if self._base_order is None:
+            self._base_order = sorted(
+                self._profiles, key=lambda sid: (-self._profiles[sid].base_score, sid)
+            )
+        return self._base_order
+
+    def top_n(
+        self,
+        n: int,
+        score: ProfileScorer,
+        skills: Iterable[str] = (),
+        location: Optional[str] = None,
+        exhaustive: bool = False,
+    ) -> List[Tuple[float, SupplierProfile]]:
+        """
+        Best ``n`` suppliers by ``score``, highest first (ties: lower ID first).
+
+        Set ``exhaustive`` when the scorer does not satisfy the base-score
+        contract for this call; every supplier is then scored.
+        """
+        if n <= 0 or not self._profiles:
+            return []
+
+        overlaps = self.matching(skills)
+        local = self.serving(location)
+
+        if exhaustive:
+            candidates: Iterable[int] = self._profiles
+        else:
+            candidate_set = set(overlaps)
+            candidate_set.update(local)
+            candidate_set.update(self._ranked_by_base()[:n])
+            candidates = candidate_set
+
+        scored = (
+            (score(self._profiles[sid], overlaps.get(sid, 0), sid in local), -sid)
+            for sid in candidates
+        )
+        best = heapq.nlargest(n, scored)
+        return [(value, self._profiles[-neg_id]) for value, neg_id in best]
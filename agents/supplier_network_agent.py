@@ -10,6 +10,7 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy import select, func, desc, and_
 from agents.base_agent import BaseAgent
 from agents.events import EventType
+from agents.supplier_index import SupplierCapabilityIndex, SupplierProfile, normalize_terms
 from models.supplier import Supplier, SupplierPerformance
 from models.supplier_network import SupplierRequirement, SupplierRateCard, SupplierCommunication
 from models.requirement import Requirement
@@ -21,6 +22,16 @@ logger = logging.getLogger(__name__)
 class SupplierNetworkAgent(BaseAgent):
     """Agent for managing supplier network, distributions, and performance tracking."""
 
+    # Auto-selection weights: skills 35%, tier 30%, location 20%, performance 15%
+    TIER_WEIGHTS = {
+        SupplierTier.PLATINUM: 0.30,
+        SupplierTier.GOLD: 0.25,
+        SupplierTier.SILVER: 0.20,
+        SupplierTier.BRONZE: 0.15,
+        SupplierTier.NEW: 0.10,
+    }
+    SUPPLIER_INDEX_TTL_SECONDS = 300
+
     def __init__(self, anthropic_api_key: Optional[str] = None):
         """Initialize supplier network agent.
 
@@ -29,6 +40,71 @@ class SupplierNetworkAgent(BaseAgent):
         """
         super().__init__(agent_name="SupplierNetworkAgent", agent_version="1.0.0")
         self.anthropic_client = AsyncAnthropic(api_key=anthropic_api_key) if anthropic_api_key else None
+        self.supplier_index = SupplierCapabilityIndex(
+            base_score=self._base_selection_score,
+            ttl_seconds=self.SUPPLIER_INDEX_TTL_SECONDS,
+        )
+
+    @classmethod
+    def _base_selection_score(cls, profile: SupplierProfile) -> float:
+        """Selection score before skill and location matches (location counts half)."""
+        tier_score = cls.TIER_WEIGHTS.get(profile.tier, 0.10)
+        if profile.latest_rating:
+            perf_score = min(profile.latest_rating / 5.0, 1.0) * 0.15
+        else:
+            perf_score = 0.075  # Default middle score
+        return tier_score + 0.5 * 0.20 + perf_score
+
+    @staticmethod
+    def _profile_for(supplier: Supplier) -> SupplierProfile:
+        return SupplierProfile(
+            supplier_id=supplier.id,
+            name=supplier.company_name,
+            tier=supplier.tier,
+            specializations=normalize_terms(supplier.specializations),
+            locations=normalize_terms(supplier.locations_served),
+        )
+
+    async def refresh_supplier_index(self, db: AsyncSession) -> None:
+        """Rebuild the capability index: active suppliers plus their latest performance period."""
+        result = await db.execute(select(Supplier).where(Supplier.is_active == True))
+        profiles = {supplier.id: self._profile_for(supplier) for supplier in result.scalars().all()}
+
+        latest = (
+            select(
+                SupplierPerformance.supplier_id,
+                func.max(SupplierPerformance.period_end).label("period_end"),
+            )
+            .group_by(SupplierPerformance.supplier_id)
+            .subquery()
+        )
+        perf_result = await db.execute(
+            select(
+                SupplierPerformance.supplier_id,
+                SupplierPerformance.overall_rating,
+                SupplierPerformance.period_end,
+            ).join(
+                latest,
+                and_(
+                    SupplierPerformance.supplier_id == latest.c.supplier_id,
+                    SupplierPerformance.period_end == latest.c.period_end,
+                ),
+            )
+        )
+        for supplier_id, rating, period_end in perf_result.all():
+            profile = profiles.get(supplier_id)
+            if profile is not None:
+                profile.latest_rating = rating
+                profile.latest_period_end = period_end
+
+        self.supplier_index.rebuild(profiles.values())
+        logger.info(f"Supplier capability index rebuilt with {len(profiles)} suppliers")
+
+    async def ensure_supplier_index(self, db: AsyncSession) -> SupplierCapabilityIndex:
+        """Return the capability index, rebuilding it when older than its TTL."""
+        if self.supplier_index.is_stale():
+            await self.refresh_supplier_index(db)
+        return self.supplier_index
 
     async def onboard_supplier(self, db: AsyncSession, supplier_data: dict) -> Supplier:
         """Onboard new supplier with validation and initialization.
@@ -80,6 +156,9 @@ class SupplierNetworkAgent(BaseAgent):
             await db.commit()
             await db.refresh(supplier)
 
+            if not self.supplier_index.is_stale():
+                self.supplier_index.add(self._profile_for(supplier))
+
             logger.info(f"Onboarded new supplier: {supplier.id} - {supplier.company_name}")
             return supplier
 
@@ -120,31 +199,32 @@ class SupplierNetworkAgent(BaseAgent):
             else:
                 selected_suppliers = []
 
-            distributions = []
-            now = datetime.utcnow()
-
-            for supplier_id in selected_suppliers:
-                # Check if already distributed
+            # One existence check for the whole batch, then one bulk insert
+            selected_suppliers = list(dict.fromkeys(selected_suppliers))
+            already_distributed = set()
+            if selected_suppliers:
                 existing = await db.execute(
-                    select(SupplierRequirement).where(
+                    select(SupplierRequirement.supplier_id).where(
                         and_(
-                            SupplierRequirement.supplier_id == supplier_id,
                             SupplierRequirement.requirement_id == requirement_id,
+                            SupplierRequirement.supplier_id.in_(selected_suppliers),
                         )
                     )
                 )
-                if existing.scalar_one_or_none():
-                    continue
+                already_distributed = set(existing.scalars().all())
 
-                # Create distribution record
-                dist = SupplierRequirement(
+            now = datetime.utcnow()
+            distributions = [
+                SupplierRequirement(
                     supplier_id=supplier_id,
                     requirement_id=requirement_id,
                     distributed_at=now,
                     response_status="pending",
                 )
-                db.add(dist)
-                distributions.append(dist)
+                for supplier_id in selected_suppliers
+                if supplier_id not in already_distributed
+            ]
+            db.add_all(distributions)
 
             await db.commit()
             logger.info(f"Distributed requirement {requirement_id} to {len(distributions)} suppliers")
@@ -178,64 +258,17 @@ class SupplierNetworkAgent(BaseAgent):
             if not req:
                 raise ValueError(f"Requirement {requirement_id} not found")
 
-            req_skills = set(req.skills_required or [])
-            req_location = req.location_city or ""
+            req_skills = normalize_terms(req.skills_required)
+            index = await self.ensure_supplier_index(db)
 
-            # Get all active suppliers
-            result = await db.execute(
-                select(Supplier).where(Supplier.is_active == True).order_by(Supplier.tier)
-            )
-            suppliers = result.scalars().all()
+            def score(profile: SupplierProfile, overlap: int, serves_location: bool) -> float:
+                # Base score already counts the location at half weight
+                skill_score = overlap / len(req_skills) * 0.35 if req_skills else 0
+                location_bonus = 0.5 * 0.20 if serves_location else 0
+                return profile.base_score + skill_score + location_bonus
 
-            supplier_scores = []
-
-            for supplier in suppliers:
-                # Skill match score (35%)
-                supplier_skills = set(supplier.specializations or [])
-                if req_skills and supplier_skills:
-                    skill_overlap = len(req_skills & supplier_skills) / len(req_skills)
-                    skill_score = skill_overlap * 0.35
-                else:
-                    skill_score = 0
-
-                # Tier score (30%)
-                tier_weights = {
-                    SupplierTier.PLATINUM: 0.30,
-                    SupplierTier.GOLD: 0.25,
-                    SupplierTier.SILVER: 0.20,
-                    SupplierTier.BRONZE: 0.15,
-                    SupplierTier.NEW: 0.10,
-                }
-                tier_score = tier_weights.get(supplier.tier, 0.10)
-
-                # Location match score (20%)
-                location_match = (
-                    1.0 if req_location in (supplier.locations_served or []) else 0.5
-                )
-                location_score = location_match * 0.20
-
-                # Get latest performance metrics
-                perf_result = await db.execute(
-                    select(SupplierPerformance)
-                    .where(SupplierPerformance.supplier_id == supplier.id)
-                    .order_by(desc(SupplierPerformance.period_end))
-                    .limit(1)
-                )
-                perf = perf_result.scalar_one_or_none()
-
-                # Performance score (15%)
-                if perf and perf.overall_rating:
-                    perf_score = min(perf.overall_rating / 5.0, 1.0) * 0.15
-                else:
-                    perf_score = 0.075  # Default middle score
-
-                total_score = skill_score + tier_score + location_score + perf_score
-
-                supplier_scores.append((supplier.id, total_score))
-
-            # Sort by score and return top N
-            supplier_scores.sort(key=lambda x: x[1], reverse=True)
-            selected = [s[0] for s in supplier_scores[:max_suppliers]]
+            ranked = index.top_n(max_suppliers, score, skills=req_skills, location=req.location_city)
+            selected = [profile.supplier_id for _, profile in ranked]
 
             logger.info(f"Auto-selected {len(selected)} suppliers for requirement {requirement_id}")
             return selected
@@ -374,6 +407,9 @@ class SupplierNetworkAgent(BaseAgent):
             await db.commit()
             await db.refresh(perf)
 
+            # The period is closed: refresh the supplier's snapshot in the index
+            self.supplier_index.record_performance(supplier_id, perf.overall_rating, perf.period_end)
+
             logger.info(f"Evaluated performance for supplier {supplier_id}: rating={overall_rating:.2f}")
             return perf
 
@@ -442,6 +478,7 @@ class SupplierNetworkAgent(BaseAgent):
                 db.add(supplier)
                 await db.commit()
                 await db.refresh(supplier)
+                self.supplier_index.update(supplier_id, tier=new_tier)
                 logger.info(
                     f"Promoted supplier {supplier_id} from {old_tier} to {new_tier}"
                 )
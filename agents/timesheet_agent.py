@@ -58,7 +58,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=timesheet.id,
                 payload={"placement_id": timesheet.placement_id, "contractor_id": timesheet.contractor_id},
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Created timesheet {timesheet.id}")
             return timesheet
@@ -99,7 +101,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet_entry",
                 entity_id=entry.id,
                 payload={"timesheet_id": timesheet_id, "entry_date": str(entry.entry_date)},
+                db=db,
             )
+            await db.commit()
 
             return entry
 
@@ -134,7 +138,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=timesheet_id,
                 payload={"status": "submitted", "submitted_at": timesheet.submitted_at.isoformat()},
+                db=db,
             )
+            await db.commit()
 
             logger.info(f"Submitted timesheet {timesheet_id}")
             return timesheet
@@ -171,7 +177,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=timesheet_id,
                 payload={"status": "approved", "approver_id": approver_id},
+                db=db,
             )
+            await db.commit()
 
             return timesheet
 
@@ -206,7 +214,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=timesheet_id,
                 payload={"status": "rejected", "reason": reason},
+                db=db,
             )
+            await db.commit()
 
             return timesheet
 
@@ -235,7 +245,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=timesheet_id,
                 payload={"status": "recalled"},
+                db=db,
             )
+            await db.commit()
 
             return timesheet
 
@@ -269,7 +281,9 @@ class TimesheetAgent(BaseAgent):
                 entity_type="timesheet",
                 entity_id=0,
                 payload=result,
+                db=db,
             )
+            await db.commit()
 
             return result
 
@@ -1,12 +1,21 @@
 import logging
 from fastapi import FastAPI, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
-from database import init_db, close_db, check_db_health
+from database import connection, init_db, close_db, check_db_health
 from config import settings
 from api.middleware import setup_middleware
 from schemas.common import HealthCheckResponse
-from agents.event_bus import EventBus, RedisPubSubBroker, RabbitMQBroker
+from agents.agent_supervisor import agent_supervisor
+from agents.background_tasks import background_tasks
+from agents.event_bus import EventBus, InProcessBroker, RedisPubSubBroker, RabbitMQBroker
+from agents.event_codec import get_codec
+from agents.event_consumer import ConsumerPolicy
+from agents.event_outbox import OutboxRelay, create_outbox_relay
+from services.api_key_cache import api_key_cache
+from services.audit_sink import audit_sink
+from services.notification_digest_service import NotificationDigestService
+from utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +29,13 @@ app = FastAPI(
 
 # Global variables for app lifecycle
 event_bus: EventBus = None
+outbox_relay: OutboxRelay = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler."""
-    global event_bus
+    global event_bus, outbox_relay
 
     logger.info(f"Starting {settings.app_name}")
 
@@ -33,24 +43,85 @@ async def startup_event():
     await init_db()
     logger.info("Database initialized")
 
+    # Unread counters and digest buckets start from the notifications already stored
+    try:
+        async with connection.AsyncSessionLocal() as session:
+            await NotificationDigestService(session).backfill()
+    except Exception as e:
+        logger.error(f"Notification counter backfill failed: {str(e)}")
+
+    # Bulk jobs and other request-spawned work run here, with their own connection pool
+    await background_tasks.start()
+
     # Initialize event bus
-    redis_broker = RedisPubSubBroker(settings.redis_url)
-    rabbitmq_broker = RabbitMQBroker(settings.rabbitmq_url, settings.rabbitmq_queue_prefix)
+    if settings.event_broker_backend == "in_process":
+        redis_broker = rabbitmq_broker = InProcessBroker()
+    else:
+        codec = get_codec(settings.event_codec, settings.event_compress_threshold_bytes)
+        consumer_policy = ConsumerPolicy(
+            prefetch=settings.event_consumer_prefetch,
+            concurrency=settings.event_consumer_concurrency,
+            handler_timeout=settings.event_handler_timeout_seconds,
+            drain_timeout=settings.event_consumer_drain_seconds,
+        )
+        redis_broker = RedisPubSubBroker(
+            settings.redis_url,
+            transport=settings.redis_event_transport,
+            consumer_group=settings.redis_consumer_group,
+            stream_maxlen=settings.redis_stream_maxlen,
+            policy=consumer_policy,
+            codec=codec,
+        )
+        rabbitmq_broker = RabbitMQBroker(
+            settings.rabbitmq_url,
+            settings.rabbitmq_queue_prefix,
+            policy=consumer_policy,
+            codec=codec,
+        )
 
     event_bus = EventBus(redis_broker=redis_broker, rabbitmq_broker=rabbitmq_broker)
     await event_bus.initialize()
     logger.info("Event bus initialized")
 
+    # Publish committed outbox events; the supervisor restarts the relay loop if it crashes
+    outbox_relay = create_outbox_relay(event_bus, settings)
+    agent_supervisor.supervise("outbox_relay", outbox_relay.run)
+    agent_supervisor.supervise("api_key_last_used", api_key_cache.run)
+    agent_supervisor.supervise("audit_sink", audit_sink.run)
+
+    # Agents are constructed on first use; initialize the ones that already exist
+    await agent_supervisor.start(timeout=settings.agent_lifecycle_timeout_seconds)
+
     logger.info(f"{settings.app_name} started successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler."""
-    global event_bus
+    global event_bus, outbox_relay
 
     logger.info(f"Shutting down {settings.app_name}")
 
+    # Finish queued resume parsing before the database goes away
+    from api.v1.resumes import parsing_pool
+
+    await parsing_pool.close()
+
+    # Let background jobs finish (then cancel them) while their sessions can still commit
+    await background_tasks.close()
+
+    # Stop supervised consumers and shut down the agents that were used
+    # (the alerts agent delivers its queued notifications; in-app rows need the database)
+    await agent_supervisor.stop(timeout=settings.agent_shutdown_timeout_seconds)
+
+    # Publish what is already committed to the outbox while the brokers are up
+    if outbox_relay:
+        await outbox_relay.close()
+
+    # Write the last API key uses and access records still buffered
+    await api_key_cache.close()
+    await audit_sink.close()
+
     # Retry dead letter queue
     if event_bus:
         await event_bus.retry_dead_letter_queue()
@@ -99,9 +170,102 @@ async def v1_health_check():
         "checks": {
             "database": db_health,
         },
+        "agents": agent_supervisor.report(),
+        "audit": audit_sink.stats(),
+        "background_tasks": background_tasks.stats(),
+        "outbox": await _outbox_lag(),
+        "event_consumers": event_bus.consumer_metrics() if event_bus else {},
     }
 
 
+audit_buffer_depth = metrics.gauge("audit_buffer_depth", "Access records waiting to be written.")
+audit_records_dropped = metrics.gauge("audit_records_dropped", "Access records dropped since start.")
+
+
+def _collect_audit_metrics() -> None:
+    audit_buffer_depth.set(audit_sink.depth)
+    audit_records_dropped.set(audit_sink.dropped)
+
+
+metrics.add_collector(_collect_audit_metrics)
+
+background_tasks_queued = metrics.gauge("background_tasks_queued", "Background tasks waiting for a worker.")
+background_tasks_running = metrics.gauge("background_tasks_running", "Background tasks running.")
+background_db_connections_in_use = metrics.gauge(
+    "background_db_connections_in_use", "Database connections held by background tasks."
+)
+
+
+def _collect_background_task_metrics() -> None:
+    stats = background_tasks.stats()
+    background_tasks_queued.set(stats["queued"])
+    background_tasks_running.set(stats["running"])
+    background_db_connections_in_use.set(stats["db_connections_in_use"])
+
+
+metrics.add_collector(_collect_background_task_metrics)
+
+event_consumer_queue_depth = metrics.gauge(
+    "event_consumer_queue_depth", "Events received but not yet handled, per queue.", ("queue",)
+)
+event_consumer_acked = metrics.gauge("event_consumer_acked", "Events acknowledged since start.", ("queue",))
+event_consumer_nacked = metrics.gauge("event_consumer_nacked", "Events rejected since start.", ("queue",))
+event_handler_calls = metrics.gauge(
+    "event_handler_calls", "Handler runs since start.", ("queue", "handler")
+)
+event_handler_errors = metrics.gauge(
+    "event_handler_errors", "Handler runs that raised or timed out.", ("queue", "handler")
+)
+event_handler_p99_seconds = metrics.gauge(
+    "event_handler_p99_seconds", "Upper bound of the 99th percentile handler run time.", ("queue", "handler")
+)
+
+
+def _collect_event_consumer_metrics() -> None:
+    if event_bus is None:
+        return
+    for queue, consumer in event_bus.consumer_metrics().items():
+        event_consumer_queue_depth.set(consumer["queue_depth"], (queue,))
+        event_consumer_acked.set(consumer["acked"], (queue,))
+        event_consumer_nacked.set(consumer["nacked"], (queue,))
+        for handler, timing in consumer["handlers"].items():
+            event_handler_calls.set(timing["count"], (queue, handler))
+            event_handler_errors.set(timing["errors"], (queue, handler))
+            event_handler_p99_seconds.set(timing["p99"] or 0, (queue, handler))
+
+
+metrics.add_collector(_collect_event_consumer_metrics)
+
+outbox_pending = metrics.gauge("event_outbox_pending", "Outbox events waiting to be published.")
+outbox_dead = metrics.gauge("event_outbox_dead", "Outbox events that used up their publish attempts.")
+outbox_oldest_pending_age = metrics.gauge(
+    "event_outbox_oldest_pending_age_seconds", "Age of the oldest outbox event waiting to be published."
+)
+
+
+async def _outbox_lag():
+    """Outbox backlog from the relay, also recorded in the outbox gauges (None if unavailable)."""
+    if outbox_relay is None:
+        return None
+    try:
+        lag = await outbox_relay.lag()
+    except Exception as e:
+        logger.warning(f"Outbox lag query failed: {str(e)}")
+        return None
+    outbox_pending.set(lag["pending"])
+    outbox_dead.set(lag["dead"])
+    outbox_oldest_pending_age.set(lag["oldest_pending_age_seconds"] or 0)
+    return lag
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (this worker's metrics)."""
+    # Lag is a database query, so it is refreshed here rather than by a (synchronous) collector
+    await _outbox_lag()
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint.
@@ -4,14 +4,13 @@ Multi-tenant VMS/MSP platform.
 """
 
 import logging
-from typing import Optional, List
+from typing import Any, AsyncGenerator, Dict, Optional, List
 from functools import wraps
 from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from database import get_db
+from database import get_db, open_read_session
 from database.tenant_context import TenantContext, set_tenant_context, clear_tenant_context
-from utils.security import verify_token
+from utils.principal_cache import principal_cache, verify_token_cached
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from models.user import User
 from models.organization import Organization
@@ -22,13 +21,33 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    payload = verify_token(token)
+async def get_read_db(session: AsyncSession = Depends(get_db)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints (dashboards, reports, analytics, search).
+
+    Uses the read replica when one is configured and reachable, otherwise
+    the primary session (which connects lazily, so it costs nothing when
+    the replica is used). Replica reads may lag recent writes.
+    """
+    replica = await open_read_session()
+    if replica is None:
+        yield session
+        return
+    try:
+        yield replica
+    finally:
+        await replica.close()
+
+
+async def get_token_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+    """
+    Verified JWT claims of the request.
+
+    Verification results are cached per token until it expires, and FastAPI
+    resolves this dependency once per request however many dependencies
+    use it.
+    """
+    payload = verify_token_cached(credentials.credentials)
 
     if payload is None:
         raise HTTPException(
@@ -37,7 +56,41 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id: str = payload.get("sub")
+    return payload
+
+
+async def get_request_tenant_context(claims: Dict[str, Any] = Depends(get_token_claims)) -> Optional[TenantContext]:
+    """
+    TenantContext built from the token claims, once per request.
+
+    Returns None for tokens without an organization; otherwise the context
+    is also set for the request so repositories can read it.
+    """
+    org_id = claims.get("organization_id")
+    user_id = claims.get("sub")
+    if not org_id or not user_id:
+        return None
+
+    role_in_org = claims.get("role_in_org", "viewer")
+    ctx = TenantContext(
+        organization_id=int(org_id),
+        user_id=int(user_id),
+        user_role=role_in_org,
+        organization_type=claims.get("organization_type", ""),
+        accessible_org_ids=[int(x) for x in claims.get("accessible_org_ids", [])],
+        is_platform_admin=(role_in_org == "platform_admin"),
+    )
+    set_tenant_context(ctx)
+    return ctx
+
+
+async def get_current_user(
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    ctx: Optional[TenantContext] = Depends(get_request_tenant_context),
+    session: AsyncSession = Depends(get_db),
+) -> User:
+    """Get current authenticated user from JWT token."""
+    user_id: str = claims.get("sub")
 
     if user_id is None:
         raise HTTPException(
@@ -46,34 +99,20 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Fetch user from database
-    stmt = select(User).where(User.id == int(user_id))
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
+    # Cached active user, attached to this session
+    user = await principal_cache.get_user(session, int(user_id))
 
-    if not user or not user.is_active:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Set tenant context from JWT claims
-    org_id = payload.get("organization_id")
-    org_type = payload.get("organization_type", "")
-    role_in_org = payload.get("role_in_org", str(user.role))
-    accessible_org_ids = payload.get("accessible_org_ids", [])
-
-    if org_id:
-        ctx = TenantContext(
-            organization_id=int(org_id),
-            user_id=user.id,
-            user_role=role_in_org,
-            organization_type=org_type,
-            accessible_org_ids=[int(x) for x in accessible_org_ids],
-            is_platform_admin=(role_in_org == "platform_admin"),
-        )
-        set_tenant_context(ctx)
+    # Tokens without a role claim act with the user's own role
+    if ctx is not None and "role_in_org" not in claims:
+        ctx.user_role = str(user.role)
+        ctx.is_platform_admin = ctx.user_role == "platform_admin"
 
     return user
 
@@ -86,7 +125,7 @@ async def get_optional_user(
     if credentials is None:
         return None
 
-    payload = verify_token(credentials.credentials)
+    payload = verify_token_cached(credentials.credentials)
 
     if payload is None:
         return None
@@ -96,46 +135,25 @@ async def get_optional_user(
     if user_id is None:
         return None
 
-    stmt = select(User).where(User.id == int(user_id))
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if not user or not user.is_active:
-        return None
-
-    return user
+    return await principal_cache.get_user(session, int(user_id))
 
 
 async def get_current_organization(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     session: AsyncSession = Depends(get_db),
 ) -> Organization:
     """
     Extract current organization from JWT and verify it exists.
     Returns the Organization object.
     """
-    token = credentials.credentials
-    payload = verify_token(token)
-
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
-
-    org_id = payload.get("organization_id")
+    org_id = claims.get("organization_id")
     if not org_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No organization context. Please switch to an organization.",
         )
 
-    stmt = select(Organization).where(
-        Organization.id == int(org_id),
-        Organization.is_active == True,
-    )
-    result = await session.execute(stmt)
-    org = result.scalar_one_or_none()
+    org = await principal_cache.get_organization(session, int(org_id))
 
     if not org:
         raise HTTPException(
@@ -147,43 +165,18 @@ async def get_current_organization(
 
 
 async def get_tenant_context_dep(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_db),
+    ctx: Optional[TenantContext] = Depends(get_request_tenant_context),
 ) -> TenantContext:
     """
     FastAPI dependency that returns the TenantContext.
     Use when you need the full tenant context object.
     """
-    token = credentials.credentials
-    payload = verify_token(token)
-
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
-
-    user_id = payload.get("sub")
-    org_id = payload.get("organization_id")
-    org_type = payload.get("organization_type", "")
-    role_in_org = payload.get("role_in_org", "viewer")
-    accessible_org_ids = payload.get("accessible_org_ids", [])
-
-    if not user_id or not org_id:
+    if ctx is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incomplete token claims. Please log in again.",
         )
 
-    ctx = TenantContext(
-        organization_id=int(org_id),
-        user_id=int(user_id),
-        user_role=role_in_org,
-        organization_type=org_type,
-        accessible_org_ids=[int(x) for x in accessible_org_ids],
-        is_platform_admin=(role_in_org == "platform_admin"),
-    )
-    set_tenant_context(ctx)
     return ctx
 
 
@@ -197,14 +190,10 @@ def require_role(*allowed_roles: str):
             ...
     """
     async def _check_role(
-        credentials: HTTPAuthorizationCredentials = Depends(security),
-        session: AsyncSession = Depends(get_db),
+        claims: Dict[str, Any] = Depends(get_token_claims),
+        user: User = Depends(get_current_user),
     ) -> User:
-        user = await get_current_user(credentials, session)
-        token = credentials.credentials
-        payload = verify_token(token)
-        
-        role_in_org = payload.get("role_in_org", str(user.role)) if payload else str(user.role)
+        role_in_org = claims.get("role_in_org", str(user.role))
         
         # Check against allowed roles (check both role_in_org and user.role for backward compat)
         user_roles = {role_in_org, str(user.role)}
@@ -228,14 +217,10 @@ def require_org_type(*allowed_types: str):
             ...
     """
     async def _check_org_type(
-        credentials: HTTPAuthorizationCredentials = Depends(security),
-        session: AsyncSession = Depends(get_db),
+        claims: Dict[str, Any] = Depends(get_token_claims),
+        user: User = Depends(get_current_user),
     ) -> User:
-        user = await get_current_user(credentials, session)
-        token = credentials.credentials
-        payload = verify_token(token)
-        
-        org_type = payload.get("organization_type", "") if payload else ""
+        org_type = claims.get("organization_type", "")
         
         if org_type.lower() not in [t.lower() for t in allowed_types]:
             raise HTTPException(
@@ -1,91 +1,124 @@
 import logging
+import os
+import random
+import re
 import time
-import uuid
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from itertools import count
+from typing import Optional
+
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from config import settings
+from utils.metrics import RequestStats, http_requests_in_flight, record_request, request_stats
 
 logger = logging.getLogger(__name__)
 
+# Request IDs are a per-process random prefix plus a counter: unique, and
+# much cheaper than a uuid4 per request
+_ID_PREFIX = os.urandom(4).hex()
+_ID_COUNTER = count(1)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all requests and responses."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Log request and response details.
-
-        Args:
-            request: The HTTP request
-            call_next: Next middleware/handler
-
-        Returns:
-            The HTTP response
-        """
-        # Add request ID to state
-        request.state.request_id = str(uuid.uuid4())
-        request.state.start_time = time.time()
-
-        # Log request
-        logger.info(
-            f"Request {request.state.request_id}: {request.method} {request.url.path}",
-            extra={
-                "request_id": request.state.request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query": str(request.url.query),
-            },
-        )
-
-        try:
-            response = await call_next(request)
-        except Exception as exc:
-            logger.error(
-                f"Request {request.state.request_id} failed with exception",
-                exc_info=exc,
-                extra={"request_id": request.state.request_id},
-            )
-            raise
+_REQUEST_ID_FORMAT = re.compile(rb"[A-Za-z0-9._:-]{1,128}")
+_ERROR_BODY = b'{"detail":"Internal server error","request_id":"%s"}'
 
-        # Log response
-        process_time = time.time() - request.state.start_time
-        logger.info(
-            f"Request {request.state.request_id} completed: {response.status_code} ({process_time:.2f}s)",
-            extra={
-                "request_id": request.state.request_id,
-                "status_code": response.status_code,
-                "process_time": process_time,
-            },
-        )
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request.state.request_id
+def _new_request_id() -> str:
+    return f"{_ID_PREFIX}-{next(_ID_COUNTER):x}"
 
-        return response
 
+def _incoming_request_id(scope: Scope) -> Optional[str]:
+    """An X-Request-ID set by a proxy or calling service, if it looks sane."""
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            if _REQUEST_ID_FORMAT.fullmatch(value):
+                return value.decode("ascii")
+            return None
+    return None
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle exceptions."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Handle exceptions in the request.
+class RequestContextMiddleware:
+    """
+    Request ID, metrics, error mapping and access logging as one raw ASGI layer.
+
+    Unlike ``BaseHTTPMiddleware`` this does not run the app in a separate
+    task or re-stream its response, so streaming responses pass straight
+    through. Every response gets an ``X-Request-ID`` header (the caller's,
+    if it sent one). An unhandled exception raised before the response
+    started becomes a JSON 500 with the request ID. Latency, status and the
+    request's database work are recorded per route template in
+    ``utils.metrics``. One access log line is written per sampled request;
+    errors and slow requests are always logged.
+    """
 
-        Args:
-            request: The HTTP request
-            call_next: Next middleware/handler
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        slow_request_seconds: float = 1.0,
+        n_plus_one_threshold: int = 10,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_seconds = slow_request_seconds
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or _new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = (b"x-request-id", request_id.encode("ascii"))
+        stats = RequestStats(self.n_plus_one_threshold)
+        stats_token = request_stats.set(stats)
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        status_code = 500
+        response_started = False
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            await send(message)
 
-        Returns:
-            The HTTP response
-        """
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_with_request_id)
         except Exception as exc:
             logger.error(
-                f"Unhandled exception in request {request.state.request_id}",
-                exc_info=exc,
+                "Request %s failed: %s %s", request_id, scope["method"], scope["path"], exc_info=exc
             )
-            raise
+            if response_started:
+                raise
+            status_code = 500
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [(b"content-type", b"application/json"), request_id_header],
+            })
+            await send({"type": "http.response.body", "body": _ERROR_BODY % request_id.encode("ascii")})
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            request_stats.reset(stats_token)
+            route = scope.get("route")
+            if route is not None:
+                stats.route = route.path
+            record_request(stats, scope["method"], status_code, elapsed)
+            if logger.isEnabledFor(logging.INFO) and (
+                status_code >= 500
+                or elapsed >= self.slow_request_seconds
+                or self.sample_rate >= 1.0
+                or random.random() < self.sample_rate
+            ):
+                logger.info(
+                    "Request %s: %s %s -> %s (%.3fs, %d queries, %.3fs db)",
+                    request_id, scope["method"], scope["path"], status_code, elapsed,
+                    stats.queries, stats.db_seconds,
+                )
 
 
 def setup_middleware(app):
@@ -103,6 +136,10 @@ def setup_middleware(app):
         allow_headers=["*"],
     )
 
-    # Custom middlewares
-    app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(ErrorHandlingMiddleware)
+    # Request context (outermost, so CORS responses carry the request ID too)
+    app.add_middleware(
+        RequestContextMiddleware,
+        sample_rate=settings.access_log_sample_rate,
+        slow_request_seconds=settings.access_log_slow_request_ms / 1000,
+        n_plus_one_threshold=settings.n_plus_one_threshold,
+    )
@@ -21,12 +21,15 @@ from schemas.alerts import (
 from schemas.common import PaginatedResponse
 from services.alerts_service import AlertsService
 from agents.alerts_notification_agent import AlertsNotificationAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
-alerts_agent = AlertsNotificationAgent(anthropic_api_key=settings.anthropic_api_key)
+alerts_agent = agent_supervisor.lazy(
+    "alerts_notification_agent", AlertsNotificationAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 # ===== ALERT RULE ENDPOINTS =====
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.dependencies import get_read_db
 from database import get_db
 from schemas.analytics import (
     CandidateScorecardResponse, StrongSkill, WeakSkill, RecommendedJob,
@@ -86,7 +87,7 @@ def _get_match_strength(score: float) -> str:
 )
 async def get_candidate_scorecard(
     candidate_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> CandidateScorecardResponse:
     """
     Get full candidate scoring breakdown.
@@ -143,7 +144,7 @@ async def get_candidate_scorecard(
 )
 async def get_applicant_tracking(
     requirement_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> ApplicantTrackingResponse:
     """
     Get applicant tracking system (ATS) data for a requirement.
@@ -228,7 +229,7 @@ async def get_applicant_tracking(
 )
 async def get_skill_analysis(
     candidate_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> SkillAnalysisResponse:
     """
     Get skill gap analysis for a candidate.
@@ -311,7 +312,7 @@ async def get_skill_analysis(
 )
 async def get_match_insights(
     requirement_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> MatchInsightsResponse:
     """
     Get AI match insights for a requirement.
@@ -394,7 +395,7 @@ async def get_match_insights(
 )
 async def get_recruiter_performance(
     recruiter_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> RecruiterPerformanceResponse:
     """
     Get recruiter performance metrics.
@@ -461,7 +462,7 @@ async def get_recruiter_performance(
     description="AI-powered predictions for workforce, suppliers, skills, revenue, and compliance.",
 )
 async def get_predictions_dashboard(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> PredictionsDashboardResponse:
     """
     Get AI predictions dashboard.
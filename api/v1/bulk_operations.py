@@ -6,8 +6,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import random
 import string
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
@@ -24,13 +25,20 @@ from schemas.bulk_operations import (
     FailureRecord, FailureDownloadResponse, RetryResponse,
     JobCompletionNotification,
 )
+from agents.background_tasks import BackgroundQueueFull, background_tasks
+from agents.resume_parsing_pool import ParseJob
 from models.import_job import ImportJob, ImportJobStatus, ImportJobType
 from services.import_job_service import ImportJobService
+from services.blob_store import ByteBudget, UploadTooLarge, check_declared_size, create_blob_store, iter_upload
+from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bulk", tags=["Bulk Operations"])
 
+# Resume files are stored content-addressed, so repeat uploads share a blob
+blob_store = create_blob_store(settings)
+
 
 # ────────────────────────────────────────────────────────────────────────────
 # HELPER FUNCTIONS
@@ -56,8 +64,79 @@ def _extract_from_filename(filename: str) -> tuple:
     return first_name, last_name, email, skills
 
 
-async def _simulate_background_processing(job: ImportJob, db: Optional[AsyncSession]):
+async def _simulate_background_processing(job: ImportJob):
     """Simulate background processing of an import job."""
+    async with background_tasks.session() as db:
+        if job.job_type == ImportJobType.RESUME_UPLOAD:
+            await _process_resume_upload(job, db)
+        else:
+            await _process_import_job(job, db)
+
+
+async def _process_resume_upload(job: ImportJob, db: AsyncSession):
+    """Parse the uploaded resume files in the worker-process pool, recording progress as each finishes."""
+    from api.v1.resumes import parsing_pool
+
+    async def parse(row_number: int, stored: Dict[str, Any]):
+        local_path = await blob_store.materialize(stored["uri"])
+        outcome = await parsing_pool.parse(
+            ParseJob(resume_id=row_number, file_path=local_path, file_name=stored["file_name"])
+        )
+        return row_number, stored, outcome
+
+    try:
+        success_records = []
+        failure_records = []
+        files = job.job_config.get("files", [])
+
+        pending = [parse(i + 1, stored) for i, stored in enumerate(files)]
+        for finished in asyncio.as_completed(pending):
+            row_number, stored, outcome = await finished
+            if outcome.ok:
+                contact = outcome.parsed["parsed_data"].get("contact", {})
+                success_records.append({
+                    "row_number": row_number,
+                    "data_summary": {
+                        "file_name": stored["file_name"],
+                        "name": contact.get("name"),
+                        "email": contact.get("email"),
+                        "parsing_confidence": outcome.parsed.get("parsing_confidence"),
+                    },
+                    "extraction_stats": outcome.parsed.get("extraction_stats", {}),
+                })
+            else:
+                failure_records.append({
+                    "row_number": row_number,
+                    "data": {"file_name": stored["file_name"]},
+                    "errors": [outcome.error],
+                })
+
+            await ImportJobService.update_progress(
+                db, job.id,
+                processed=len(success_records) + len(failure_records),
+                success=len(success_records),
+                failure=len(failure_records),
+                skipped=0,
+            )
+
+        await ImportJobService.complete_job(
+            db, job.id,
+            success_records=sorted(success_records, key=lambda r: r["row_number"]),
+            failure_records=sorted(failure_records, key=lambda r: r["row_number"]),
+            skipped_records=[],
+        )
+        await ImportJobService.create_completion_notification(db, job)
+
+    except asyncio.CancelledError:
+        await ImportJobService.fail_job(db, job.id, "Cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"Error processing job {job.id}: {str(e)}")
+        await ImportJobService.fail_job(db, job.id, str(e))
+
+
+async def _process_import_job(job: ImportJob, db: AsyncSession):
+    """Generate mock results for ``job``, recording progress as it goes."""
     try:
         # Simulate processing delay
         await asyncio.sleep(0.5)
@@ -112,11 +191,38 @@ async def _simulate_background_processing(job: ImportJob, db: Optional[AsyncSess
         # Create completion notification
         await ImportJobService.create_completion_notification(db, job)
 
+    except asyncio.CancelledError:
+        await ImportJobService.fail_job(db, job.id, "Cancelled")
+        raise
     except Exception as e:
         logger.error(f"Error processing job {job.id}: {str(e)}")
         await ImportJobService.fail_job(db, job.id, str(e))
 
 
+async def _start_job(job: ImportJob, db: AsyncSession) -> None:
+    """
+    Queue an import job on the background task runtime.
+
+    Raises:
+        HTTPException: 503 when the runtime is saturated; the job is marked failed first
+    """
+    try:
+        background_tasks.submit(
+            "import_job",
+            _simulate_background_processing,
+            job,
+            task_id=f"import_job:{job.id}",
+            metadata={"job_id": job.id, "job_type": job.job_type},
+        )
+    except BackgroundQueueFull as e:
+        await ImportJobService.fail_job(db, job.id, f"Not started: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+
+
 # ────────────────────────────────────────────────────────────────────────────
 # BULK RESUME IMPORT ENDPOINTS
 # ────────────────────────────────────────────────────────────────────────────
@@ -129,6 +235,7 @@ async def _simulate_background_processing(job: ImportJob, db: Optional[AsyncSess
     description="Upload multiple resume files (up to 50) for batch processing.",
 )
 async def bulk_upload_resumes(
+    request: Request,
     files: List[UploadFile] = File(...),
     session: AsyncSession = Depends(get_db),
 ) -> JobCreateResponse:
@@ -136,7 +243,11 @@ async def bulk_upload_resumes(
     Bulk upload multiple resume files.
     Returns immediately with job_id; processing happens in background.
 
+    Files are streamed to the blob store one chunk at a time, within a
+    per-file limit and a total limit for the whole request.
+
     Args:
+        request: Incoming request (for its declared size)
         files: List of resume files (max 50)
         session: Database session
 
@@ -150,6 +261,18 @@ async def bulk_upload_resumes(
                 detail="Maximum 50 files allowed per batch",
             )
 
+        check_declared_size(request.headers.get("content-length"), settings.resume_upload_max_request_bytes)
+
+        budget = ByteBudget(settings.resume_upload_max_request_bytes)
+        stored = []
+        for upload in files:
+            blob = await blob_store.put_stream(
+                budget.limit(iter_upload(upload)),
+                suffix=Path(upload.filename or "").suffix,
+                max_bytes=settings.resume_upload_max_bytes,
+            )
+            stored.append({"file_name": upload.filename, "uri": blob.uri, "sha256": blob.sha256, "size": blob.size})
+
         # Create job
         job = await ImportJobService.create_job(
             session,
@@ -158,11 +281,15 @@ async def bulk_upload_resumes(
             job_type=ImportJobType.RESUME_UPLOAD,
             file_name=f"{len(files)}_resumes.zip",
             total_records=len(files),
-            job_config={"file_count": len(files)},
+            job_config={
+                "file_count": len(files),
+                "unique_files": len({f["sha256"] for f in stored}),
+                "files": stored,
+            },
         )
 
         # Start background processing
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -173,6 +300,11 @@ async def bulk_upload_resumes(
 
     except HTTPException:
         raise
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error uploading resumes: {str(e)}")
         raise HTTPException(
@@ -211,7 +343,7 @@ async def import_resumes_from_excel(
         )
 
         # Start background processing
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -220,6 +352,8 @@ async def import_resumes_from_excel(
             message="Import job queued. You'll be notified when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error importing from Excel: {str(e)}")
         raise HTTPException(
@@ -255,7 +389,7 @@ async def import_placements_from_excel(
             job_config={"filename": file.filename},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -264,6 +398,8 @@ async def import_placements_from_excel(
             message="Import job queued. You'll be notified when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error importing placements: {str(e)}")
         raise HTTPException(
@@ -299,7 +435,7 @@ async def import_requirements_from_excel(
             job_config={"filename": file.filename},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -308,6 +444,8 @@ async def import_requirements_from_excel(
             message="Import job queued. You'll be notified when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error importing requirements: {str(e)}")
         raise HTTPException(
@@ -343,7 +481,7 @@ async def import_associates_from_excel(
             job_config={"filename": file.filename},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -352,6 +490,8 @@ async def import_associates_from_excel(
             message="Import job queued. You'll be notified when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error importing associates: {str(e)}")
         raise HTTPException(
@@ -587,6 +727,37 @@ async def get_job_successes(
         )
 
 
+@router.post(
+    "/jobs/{job_id}/cancel",
+    status_code=status.HTTP_200_OK,
+    summary="Cancel a job",
+    description="Cancel a queued or running import job.",
+)
+async def cancel_import_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_db),
+):
+    """Cancel a job's background processing."""
+    job = await ImportJobService.get_job(session, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    task_id = f"import_job:{job_id}"
+    if not background_tasks.cancel(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} is not queued or running",
+        )
+    if job.status == ImportJobStatus.QUEUED:
+        # A running task records its own cancellation; a queued one never starts
+        await ImportJobService.fail_job(session, job_id, "Cancelled")
+
+    return {"job_id": job_id, "task": background_tasks.get(task_id).to_dict()}
+
+
 @router.post(
     "/jobs/{job_id}/retry-failures",
     response_model=RetryResponse,
@@ -614,6 +785,11 @@ async def retry_job_failures(
                 detail="No failures to retry",
             )
 
+        job_config = {"original_job_id": job_id, "retry": True}
+        if original_job.job_type == ImportJobType.RESUME_UPLOAD:
+            files = original_job.job_config.get("files", [])
+            job_config["files"] = [files[f["row_number"] - 1] for f in failure_records]
+
         # Create new job with only the failed records
         new_job = await ImportJobService.create_job(
             session,
@@ -622,11 +798,11 @@ async def retry_job_failures(
             job_type=original_job.job_type,
             file_name=f"{original_job.file_name}_retry",
             total_records=len(failure_records),
-            job_config={"original_job_id": job_id, "retry": True},
+            job_config=job_config,
         )
 
         # Start background processing
-        asyncio.create_task(_simulate_background_processing(new_job, session))
+        await _start_job(new_job, session)
 
         return RetryResponse(
             new_job_id=new_job.id,
@@ -673,7 +849,7 @@ async def batch_score_candidates(
             job_config={"requirement_id": requirement_id, "candidate_ids": candidate_ids},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -682,6 +858,8 @@ async def batch_score_candidates(
             message="Batch scoring job queued. Results available when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error batch scoring: {str(e)}")
         raise HTTPException(
@@ -713,7 +891,7 @@ async def batch_extract_skills(
             job_config={"candidate_ids": candidate_ids},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -722,6 +900,8 @@ async def batch_extract_skills(
             message="Skill extraction job queued. Results available when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error extracting skills: {str(e)}")
         raise HTTPException(
@@ -754,7 +934,7 @@ async def batch_predict_placements(
             job_config={"requirement_id": requirement_id, "candidate_ids": candidate_ids},
         )
 
-        asyncio.create_task(_simulate_background_processing(job, session))
+        await _start_job(job, session)
 
         return JobCreateResponse(
             job_id=job.id,
@@ -763,6 +943,8 @@ async def batch_predict_placements(
             message="Placement prediction job queued. Results available when complete.",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error predicting placements: {str(e)}")
         raise HTTPException(
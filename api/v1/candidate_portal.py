@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.dependencies import get_db, get_current_user
 from agents.candidate_portal_agent import CandidatePortalAgent
+from agents.agent_supervisor import agent_supervisor
 from services.candidate_portal_service import CandidatePortalService
 from schemas.candidate_portal import (
     CandidateProfileSchema,
@@ -22,7 +23,7 @@ from schemas.candidate_portal import (
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/portal", tags=["candidate_portal"])
-agent = CandidatePortalAgent()
+agent = agent_supervisor.lazy("candidate_portal_agent", CandidatePortalAgent)
 
 
 @router.get("/profile", response_model=CandidateProfileSchema)
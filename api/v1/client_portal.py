@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from api.dependencies import get_current_user, require_org_type, get_tenant_context_dep
+from api.dependencies import get_current_user, get_read_db, require_org_type, get_tenant_context_dep
 from database.tenant_context import TenantContext
 from models.user import User
 from schemas.msp import (
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/client", tags=["Client Portal"])
 async def get_client_dashboard(
     user: User = Depends(get_current_user),
     ctx: TenantContext = Depends(get_tenant_context_dep),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """Get client dashboard with key metrics."""
     analytics_svc = MSPAnalyticsService(session)
@@ -172,7 +172,7 @@ async def get_client_placements(
 async def get_my_analytics(
     user: User = Depends(get_current_user),
     ctx: TenantContext = Depends(get_tenant_context_dep),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """Get analytics for this client organization."""
     svc = MSPAnalyticsService(session)
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.dependencies import get_db, get_current_user
 from agents.contract_management_agent import ContractManagementAgent
+from agents.agent_supervisor import agent_supervisor
 from services.contract_service import ContractService
 from schemas.contract import (
     ContractSchema,
@@ -21,7 +22,7 @@ from schemas.common import PaginatedResponse
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
-agent = ContractManagementAgent()
+agent = agent_supervisor.lazy("contract_management_agent", ContractManagementAgent)
 
 
 @router.post("", response_model=ContractSchema, status_code=201)
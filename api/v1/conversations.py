@@ -18,11 +18,12 @@ from schemas.conversation import (
 )
 from services.conversation_service import ConversationService
 from agents.conversational_interface_agent import ConversationalInterfaceAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
-conversation_agent = ConversationalInterfaceAgent()
+conversation_agent = agent_supervisor.lazy("conversational_interface_agent", ConversationalInterfaceAgent)
 
 
 @router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
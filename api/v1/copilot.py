@@ -28,12 +28,15 @@ from services.copilot_service import (
     CopilotInsightService,
 )
 from agents.copilot_agent import CopilotAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/copilot", tags=["copilot"])
-copilot_agent = CopilotAgent(anthropic_api_key=settings.anthropic_api_key)
+copilot_agent = agent_supervisor.lazy(
+    "copilot_agent", CopilotAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 # ===== CONVERSATION ENDPOINTS =====
@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.dependencies import get_db, get_current_user
+from api.dependencies import get_read_db, get_current_user
 from models.user import User
 from models.enums import UserRole
 from schemas.dashboard import (
@@ -43,7 +43,7 @@ def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
 async def get_dashboard_overview(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> OverviewMetrics:
     """Get executive summary dashboard metrics.
@@ -76,7 +76,7 @@ async def get_dashboard_overview(
 async def get_pipeline_metrics(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> PipelineMetrics:
     """Get full pipeline view with stages.
@@ -109,7 +109,7 @@ async def get_pipeline_metrics(
 async def get_recruiter_performance(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> RecruiterPerformanceMetrics:
     """Get per-recruiter performance metrics.
@@ -142,7 +142,7 @@ async def get_recruiter_performance(
 async def get_requirement_analytics(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> RequirementAnalytics:
     """Get requirement analytics.
@@ -175,7 +175,7 @@ async def get_requirement_analytics(
 async def get_submission_funnel(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> SubmissionFunnel:
     """Get submission funnel conversion metrics.
@@ -208,7 +208,7 @@ async def get_submission_funnel(
 async def get_offer_metrics(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> OfferMetrics:
     """Get offer metrics.
@@ -241,7 +241,7 @@ async def get_offer_metrics(
 async def get_supplier_leaderboard(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> SupplierLeaderboard:
     """Get supplier performance leaderboard.
@@ -274,7 +274,7 @@ async def get_supplier_leaderboard(
 async def get_candidate_sources(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> CandidateSourceMetrics:
     """Get candidate volume by source.
@@ -309,7 +309,7 @@ async def get_time_series(
     interval: str = Query("daily", pattern="^(daily|weekly|monthly)$"),
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> TimeSeriesMetrics:
     """Get historical time series data for a metric.
@@ -344,7 +344,7 @@ async def get_time_series(
 async def get_kpi_summary(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> KPISummary:
     """Get key performance indicators summary.
@@ -377,7 +377,7 @@ async def get_kpi_summary(
 async def get_complete_dashboard(
     start_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="YYYY-MM-DD format"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> DashboardOverviewResponse:
     """Get complete dashboard with all metrics.
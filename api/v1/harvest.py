@@ -15,18 +15,23 @@ from schemas.harvest import (
     HarvestResultResponse,
     HarvestSearchRequest,
     HarvestSearchResponse,
+    HarvestRunRequest,
+    HarvestRunResponse,
     CandidateSourceMappingResponse,
     HarvestAnalyticsResponse,
 )
 from schemas.common import PaginatedResponse
 from services.harvest_service import HarvestService
 from agents.resume_harvesting_agent import ResumeHarvestingAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/harvest", tags=["harvest"])
-harvesting_agent = ResumeHarvestingAgent(anthropic_api_key=settings.anthropic_api_key)
+harvesting_agent = agent_supervisor.lazy(
+    "resume_harvesting_agent", ResumeHarvestingAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 # ===== HARVEST SOURCE ENDPOINTS =====
@@ -120,6 +125,29 @@ async def search_candidates(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/run", response_model=HarvestRunResponse)
+async def run_concurrent_harvest(
+    run_request: HarvestRunRequest,
+    db: AsyncSession = Depends(get_db),
+) -> HarvestRunResponse:
+    """Harvest several sources concurrently under their rate limits, incrementally from stored cursors."""
+    try:
+        summary = await harvesting_agent.harvest_sources(
+            db,
+            run_request.source_names,
+            run_request.search_criteria,
+            full_refresh=run_request.full_refresh,
+        )
+        await db.commit()
+        return HarvestRunResponse(**summary)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error running concurrent harvest: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 # ===== HARVEST JOB ENDPOINTS =====
 
 
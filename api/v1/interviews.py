@@ -26,6 +26,7 @@ from schemas.common import BaseResponse
 from services.interview_service import InterviewService
 from agents.interview_agent import InterviewAgent
 from agents.interview_intelligence_agent import InterviewIntelligenceAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -33,8 +34,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/interviews", tags=["interviews"])
 
 # Initialize agents
-interview_agent = InterviewAgent(anthropic_api_key=settings.anthropic_api_key)
-intelligence_agent = InterviewIntelligenceAgent(anthropic_api_key=settings.anthropic_api_key)
+interview_agent = agent_supervisor.lazy(
+    "interview_agent", InterviewAgent, anthropic_api_key=settings.anthropic_api_key
+)
+intelligence_agent = agent_supervisor.lazy(
+    "interview_intelligence_agent", InterviewIntelligenceAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 @router.post("/schedule", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
@@ -35,11 +35,12 @@ from schemas.invoice import (
 from schemas.common import PaginatedResponse
 from services.invoicing_service import InvoicingService, QuickBooksIntegrationService
 from agents.invoicing_agent import InvoicingAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
-invoicing_agent = InvoicingAgent()
+invoicing_agent = agent_supervisor.lazy("invoicing_agent", InvoicingAgent)
 
 
 # ===== INVOICE ENDPOINTS =====
@@ -21,6 +21,7 @@ from schemas.job_post import (
 from schemas.common import PaginatedResponse
 from services.job_post_service import JobPostService
 from agents.job_post_agent import JobPostAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -28,7 +29,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/job-posts", tags=["job_posts"])
 
 # Initialize agent
-job_post_agent = JobPostAgent(anthropic_api_key=settings.anthropic_api_key)
+job_post_agent = agent_supervisor.lazy(
+    "job_post_agent", JobPostAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 @router.post(
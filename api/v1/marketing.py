@@ -26,12 +26,15 @@ from schemas.marketing import (
 from schemas.common import PaginatedResponse
 from services.marketing_service import MarketingService
 from agents.digital_marketing_agent import DigitalMarketingAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/marketing", tags=["marketing"])
-marketing_agent = DigitalMarketingAgent(anthropic_api_key=settings.anthropic_api_key)
+marketing_agent = agent_supervisor.lazy(
+    "digital_marketing_agent", DigitalMarketingAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 # ===== MARKETING CAMPAIGN ENDPOINTS =====
@@ -7,13 +7,14 @@ from database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.matching_service import MatchingService
 from agents.matching_agent import MatchingAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/matching", tags=["matching"])
 
 # Initialize service
-matching_agent = MatchingAgent()
+matching_agent = agent_supervisor.lazy("matching_agent", MatchingAgent)
 matching_service = MatchingService(matching_agent)
 
 
@@ -29,11 +29,12 @@ from schemas.messaging import (
 from schemas.common import BaseResponse
 from services.messaging_service import MessagingService
 from agents.messaging_integration_agent import MessagingIntegrationAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/messaging", tags=["messaging"])
-agent = MessagingIntegrationAgent()
+agent = agent_supervisor.lazy("messaging_integration_agent", MessagingIntegrationAgent)
 
 
 # Integration endpoints
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from api.dependencies import get_current_user, require_role, require_org_type, get_tenant_context_dep
+from api.dependencies import get_current_user, get_read_db, require_role, require_org_type, get_tenant_context_dep
 from database.tenant_context import TenantContext
 from models.user import User
 from models.organization import Organization
@@ -36,7 +36,7 @@ router = APIRouter(prefix="/msp", tags=["MSP Admin"])
 async def get_msp_dashboard(
     user: User = Depends(require_role("msp_admin", "msp_manager", "msp_recruiter", "platform_admin", "admin")),
     ctx: TenantContext = Depends(get_tenant_context_dep),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """Get MSP dashboard aggregate metrics."""
     svc = MSPAnalyticsService(session)
@@ -364,6 +364,61 @@ async def get_client_metrics(
 
 # --- Placements ---
 
+def _placement_response(p) -> PlacementResponse:
+    return PlacementResponse(
+        id=p.id,
+        organization_id=p.organization_id,
+        requirement_id=p.requirement_id,
+        candidate_id=p.candidate_id,
+        supplier_org_id=p.supplier_org_id,
+        client_org_id=p.client_org_id,
+        start_date=p.start_date,
+        end_date=p.end_date,
+        bill_rate=p.bill_rate,
+        pay_rate=p.pay_rate,
+        msp_margin=p.msp_margin,
+        status=str(p.status),
+        work_location=p.work_location,
+        job_title=p.job_title,
+        created_at=p.created_at,
+    )
+
+
+@router.post("/placements", response_model=PlacementResponse, status_code=status.HTTP_201_CREATED)
+async def create_placement(
+    request: PlacementCreateRequest,
+    user: User = Depends(require_role("msp_admin", "msp_manager", "platform_admin", "admin")),
+    ctx: TenantContext = Depends(get_tenant_context_dep),
+    session: AsyncSession = Depends(get_db),
+):
+    """Place a candidate from a supplier submission."""
+    if request.supplier_submission_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Placements are created from a supplier submission",
+        )
+    svc = MSPCoordinationService(session)
+    try:
+        placement = await svc.create_placement(
+            msp_org_id=ctx.organization_id,
+            submission_id=request.supplier_submission_id,
+            start_date=request.start_date,
+            bill_rate=request.bill_rate,
+            pay_rate=request.pay_rate,
+            end_date=request.end_date,
+            msp_margin=request.msp_margin,
+            work_location=request.work_location,
+            job_title=request.job_title,
+            department=request.department,
+            manager_name=request.manager_name,
+            manager_email=request.manager_email,
+            job_category=request.job_category,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _placement_response(placement)
+
+
 @router.get("/placements", response_model=PlacementListResponse)
 async def list_placements(
     offset: int = Query(0, ge=0),
@@ -376,23 +431,7 @@ async def list_placements(
     svc = MSPCoordinationService(session)
     result = await svc.get_active_placements(ctx.organization_id, "msp", offset, limit)
     return PlacementListResponse(
-        items=[PlacementResponse(
-            id=p.id,
-            organization_id=p.organization_id,
-            requirement_id=p.requirement_id,
-            candidate_id=p.candidate_id,
-            supplier_org_id=p.supplier_org_id,
-            client_org_id=p.client_org_id,
-            start_date=p.start_date,
-            end_date=p.end_date,
-            bill_rate=p.bill_rate,
-            pay_rate=p.pay_rate,
-            msp_margin=p.msp_margin,
-            status=str(p.status),
-            work_location=p.work_location,
-            job_title=p.job_title,
-            created_at=p.created_at,
-        ) for p in result["items"]],
+        items=[_placement_response(p) for p in result["items"]],
         total=result["total"],
         offset=result["offset"],
         limit=result["limit"],
@@ -26,11 +26,12 @@ from schemas.negotiation import (
 from schemas.common import PaginatedResponse
 from services.rate_negotiation_service import RateNegotiationService, InterviewSchedulingService
 from agents.rate_negotiation_agent import RateNegotiationAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/negotiations", tags=["negotiations", "scheduling"])
-negotiation_agent = RateNegotiationAgent()
+negotiation_agent = agent_supervisor.lazy("rate_negotiation_agent", RateNegotiationAgent)
 
 
 # ===== RATE NEGOTIATION ENDPOINTS =====
@@ -19,12 +19,13 @@ from schemas.offer import (
 from schemas.common import PaginatedResponse
 from services.offer_service import OfferService, OnboardingService
 from agents.offer_onboarding_agent import OfferOnboardingAgent
+from agents.agent_supervisor import agent_supervisor
 from models.enums import OfferStatus, OnboardingStatus
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/offers", tags=["offers", "onboarding"])
-workflow_agent = OfferOnboardingAgent()
+workflow_agent = agent_supervisor.lazy("offer_onboarding_agent", OfferOnboardingAgent)
 
 
 # ===== OFFER ENDPOINTS =====
@@ -22,6 +22,7 @@ from schemas.organization import (
     SwitchOrgRequest,
     SwitchOrgResponse,
 )
+from utils.principal_cache import principal_cache
 from utils.security import create_tenant_token
 
 logger = logging.getLogger(__name__)
@@ -71,13 +72,7 @@ async def switch_organization(
 ):
     """Switch the active organization context. Returns new JWT token."""
     # Verify user has membership in target org
-    stmt = select(OrganizationMembership).where(
-        OrganizationMembership.organization_id == org_id,
-        OrganizationMembership.user_id == user.id,
-        OrganizationMembership.is_active == True,
-    )
-    result = await session.execute(stmt)
-    membership = result.scalar_one_or_none()
+    membership = await principal_cache.get_membership(session, user.id, org_id)
 
     # Also allow if it's the user's primary org
     if not membership and user.organization_id != org_id:
@@ -87,12 +82,7 @@ async def switch_organization(
         )
 
     # Get the organization
-    stmt2 = select(Organization).where(
-        Organization.id == org_id,
-        Organization.is_active == True,
-    )
-    result2 = await session.execute(stmt2)
-    org = result2.scalar_one_or_none()
+    org = await principal_cache.get_organization(session, org_id)
 
     if not org:
         raise HTTPException(
@@ -29,11 +29,12 @@ from schemas.payment import (
 from schemas.common import BaseResponse
 from services.payment_service import PaymentService
 from agents.payment_processing_agent import PaymentProcessingAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["payments"])
-agent = PaymentProcessingAgent()
+agent = agent_supervisor.lazy("payment_processing_agent", PaymentProcessingAgent)
 
 
 # Payment endpoints
@@ -643,7 +644,7 @@ async def get_payment_analytics(
         Analytics data
     """
     try:
-        result = await agent.get_payment_analytics(db)
+        result = await agent.get_payment_analytics(db, days)
         return PaymentAnalytics(**result)
     except Exception as e:
         logger.error(f"Error getting analytics: {str(e)}")
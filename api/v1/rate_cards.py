@@ -83,20 +83,10 @@ async def update_rate_card(
 ):
     """Update a rate card."""
     try:
-        result = await db.execute(select(RateCard).where(RateCard.id == rate_card_id))
-        rate_card = result.scalar_one_or_none()
+        svc = RateCardService(db)
+        rate_card = await svc.update_rate_card(rate_card_id, update_data.model_dump(exclude_unset=True))
         if not rate_card:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate card not found")
-
-        # Update fields
-        update_dict = update_data.model_dump(exclude_unset=True)
-        for key, value in update_dict.items():
-            if hasattr(rate_card, key):
-                setattr(rate_card, key, value)
-
-        db.add(rate_card)
-        await db.commit()
-        await db.refresh(rate_card)
         return RateCardResponse.model_validate(rate_card)
     except HTTPException:
         raise
@@ -126,6 +116,8 @@ async def validate_rates(
             rate_card_id=details.get("rate_card_id"),
             violations=details.get("violations", []),
             message="Rates are valid" if is_valid else "Rates violate rate card constraints",
+            overall_score=details.get("assessment", {}).get("overall_score"),
+            recommendation=details.get("assessment", {}).get("recommendation"),
         )
     except Exception as e:
         logger.error(f"Error validating rates: {str(e)}")
@@ -140,14 +132,9 @@ async def archive_rate_card(
 ):
     """Soft delete a rate card by archiving it."""
     try:
-        result = await db.execute(select(RateCard).where(RateCard.id == rate_card_id))
-        rate_card = result.scalar_one_or_none()
-        if not rate_card:
+        svc = RateCardService(db)
+        if not await svc.archive_rate_card(rate_card_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate card not found")
-
-        rate_card.status = "ARCHIVED"
-        db.add(rate_card)
-        await db.commit()
         return None
     except HTTPException:
         raise
@@ -14,6 +14,7 @@ from schemas.rediscovery import (
 from schemas.common import PaginatedResponse
 from services.rediscovery_service import RediscoveryService
 from agents.candidate_rediscovery_agent import CandidateRediscoveryAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -23,8 +24,8 @@ router = APIRouter(
 )
 
 # Initialize agent
-rediscovery_agent = CandidateRediscoveryAgent(
-    anthropic_api_key=settings.anthropic_api_key
+rediscovery_agent = agent_supervisor.lazy(
+    "candidate_rediscovery_agent", CandidateRediscoveryAgent, anthropic_api_key=settings.anthropic_api_key
 )
 
 
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.dependencies import get_db, get_current_user
 from agents.referral_network_agent import ReferralNetworkAgent
+from agents.agent_supervisor import agent_supervisor
 from services.referral_service import ReferralService
 from schemas.referral import (
     ReferrerSchema,
@@ -30,7 +31,7 @@ from schemas.common import PaginatedResponse
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/referrals", tags=["referrals"])
-agent = ReferralNetworkAgent()
+agent = agent_supervisor.lazy("referral_network_agent", ReferralNetworkAgent)
 
 
 @router.post("/register", response_model=ReferrerSchema, status_code=201)
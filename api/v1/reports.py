@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 
-from api.dependencies import get_db, get_current_user
+from api.dependencies import get_read_db, get_current_user
 from models.user import User
 from schemas.reports import (
     RecruiterLeaderboardResponse,
@@ -1039,7 +1039,7 @@ def _fallback_msp_executive_summary() -> Dict[str, Any]:
 
 @router.get("/overview")
 async def get_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get platform-wide overview metrics.
@@ -1075,7 +1075,7 @@ async def get_overview(
 
 @router.get("/recruitment-funnel")
 async def get_recruitment_funnel(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get recruitment pipeline conversion rates.
@@ -1107,7 +1107,7 @@ async def get_recruitment_funnel(
 
 @router.get("/supplier-scorecard")
 async def get_supplier_scorecard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get supplier performance metrics.
@@ -1136,7 +1136,7 @@ async def get_supplier_scorecard(
 
 @router.get("/financial-summary")
 async def get_financial_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get revenue and cost analysis.
@@ -1171,7 +1171,7 @@ async def get_financial_summary(
 
 @router.get("/compliance-summary")
 async def get_compliance_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get compliance health check.
@@ -1206,7 +1206,7 @@ async def get_compliance_summary(
 
 @router.get("/sla-performance")
 async def get_sla_performance(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get SLA adherence metrics.
@@ -1239,7 +1239,7 @@ async def get_sla_performance(
 
 @router.get("/recruiter-leaderboard", response_model=RecruiterLeaderboardResponse)
 async def get_recruiter_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get recruiter performance ranking.
@@ -1267,7 +1267,7 @@ async def get_recruiter_leaderboard(
 
 @router.get("/source-attribution", response_model=SourceAttributionResponse)
 async def get_source_attribution(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get recruitment source effectiveness.
@@ -1299,7 +1299,7 @@ async def get_source_attribution(
 
 @router.get("/cost-analytics", response_model=CostAnalyticsResponse)
 async def get_cost_analytics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get cost per hire and financial analysis.
@@ -1339,7 +1339,7 @@ async def get_cost_analytics(
 
 @router.get("/diversity-analytics", response_model=DiversityAnalyticsResponse)
 async def get_diversity_analytics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get diversity metrics (anonymized and aggregated).
@@ -1376,7 +1376,7 @@ async def get_diversity_analytics(
 
 @router.get("/time-analytics", response_model=TimeAnalyticsResponse)
 async def get_time_analytics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get time-to-fill deep dive analytics.
@@ -1416,7 +1416,7 @@ async def get_time_analytics(
 
 @router.get("/pipeline-aging", response_model=PipelineAgingResponse)
 async def get_pipeline_aging(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get stale requisitions and candidates analysis.
@@ -1449,7 +1449,7 @@ async def get_pipeline_aging(
 
 @router.get("/msp-executive", response_model=MSPExecutiveSummaryResponse)
 async def get_msp_executive_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get MSP executive summary report.
@@ -1,6 +1,6 @@
 import logging
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status, Query
 from pydantic import BaseModel, Field
 from datetime import datetime
 from pathlib import Path
@@ -10,15 +10,43 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from services.resume_service import ResumeService
 from agents.resume_parser_agent import ResumeParserAgent
 from agents.resume_tailoring_agent import ResumeTailoringAgent
+from agents.resume_parsing_pool import ResumeParsingPool
+from agents.agent_supervisor import agent_supervisor
+from services.blob_store import UploadTooLarge, check_declared_size, create_blob_store, iter_upload
+from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/resumes", tags=["resumes"])
 
 # Initialize service
-parser_agent = ResumeParserAgent()
-tailoring_agent = ResumeTailoringAgent()
-resume_service = ResumeService(parser_agent, tailoring_agent)
+parser_agent = agent_supervisor.lazy("resume_parser_agent", ResumeParserAgent)
+tailoring_agent = agent_supervisor.lazy("resume_tailoring_agent", ResumeTailoringAgent)
+resume_service = ResumeService(
+    parser_agent,
+    tailoring_agent,
+    upload_dir=settings.resume_upload_dir,
+    blob_store=create_blob_store(settings),
+)
+
+
+async def _save_parsed_batch(outcomes) -> None:
+    """Parsing pool sink: write each finished batch in its own session."""
+    from database import connection
+
+    async with connection.AsyncSessionLocal() as session:
+        await resume_service.save_parsed_results(session, outcomes)
+
+
+# Worker processes are spawned on first use and stopped on app shutdown
+parsing_pool = ResumeParsingPool(
+    workers=settings.resume_parse_workers or None,
+    queue_size=settings.resume_parse_queue_size,
+    timeout_seconds=settings.resume_parse_timeout_seconds,
+    memory_limit_mb=settings.resume_parse_memory_limit_mb,
+    batch_size=settings.resume_parse_batch_size,
+    result_sink=_save_parsed_batch,
+)
 
 
 # Pydantic models
@@ -30,6 +58,7 @@ class ResumeUploadResponse(BaseModel):
     file_name: str
     file_type: str
     file_size: int
+    content_hash: Optional[str] = None
     is_primary: bool
     uploaded_at: str
 
@@ -96,6 +125,20 @@ class ResumeSummaryResponse(BaseModel):
     uploaded_at: str
 
 
+class BatchParseRequest(BaseModel):
+    """Batch parse request."""
+
+    resume_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchParseResponse(BaseModel):
+    """Batch parse response."""
+
+    queued: List[int]
+    not_found: List[int]
+    pool: Dict[str, Any]
+
+
 class SkillSearchResponse(BaseModel):
     """Skill search response."""
 
@@ -113,6 +156,7 @@ class SkillSearchResponse(BaseModel):
     description="Upload a resume file (PDF or DOCX) for a candidate.",
 )
 async def upload_resume(
+    request: Request,
     candidate_id: int = Query(..., ge=1),
     file: UploadFile = File(...),
     is_primary: bool = Query(True),
@@ -122,6 +166,7 @@ async def upload_resume(
     Upload resume file for a candidate.
 
     Args:
+        request: Incoming request (for its declared size)
         candidate_id: Candidate ID
         file: Resume file (PDF or DOCX)
         is_primary: Whether this is the primary resume
@@ -141,22 +186,24 @@ async def upload_resume(
                 detail=f"File type {file_ext} not supported. Allowed: {allowed_types}",
             )
 
-        # Save file
-        file_path = resume_service.upload_dir / file.filename
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        check_declared_size(request.headers.get("content-length"), settings.resume_upload_max_request_bytes)
 
-        file_size = len(content)
+        # Stream to the blob store; identical files are stored once
+        blob = await resume_service.store_file(
+            iter_upload(file),
+            file.filename,
+            max_bytes=settings.resume_upload_max_bytes,
+        )
 
         # Store in database
         result = await resume_service.upload_resume(
             session,
             candidate_id,
-            str(file_path),
+            blob.uri,
             file.filename,
-            file_size,
+            blob.size,
             is_primary,
+            blob=blob,
         )
 
         await session.commit()
@@ -165,6 +212,11 @@ async def upload_resume(
 
     except HTTPException:
         raise
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error uploading resume: {str(e)}")
         raise HTTPException(
@@ -212,6 +264,52 @@ async def parse_resume(
         )
 
 
+@router.post(
+    "/parse-batch",
+    response_model=BatchParseResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Parse resumes in the background",
+    description="Queue resumes for parsing in the worker-process pool; results are saved in batches.",
+)
+async def parse_resumes_batch(
+    request: BatchParseRequest,
+    session: AsyncSession = Depends(get_db),
+) -> BatchParseResponse:
+    """
+    Queue resumes for background parsing.
+
+    Args:
+        request: Resume IDs to parse
+        session: Database session
+
+    Returns:
+        Queued IDs and current pool metrics
+    """
+    try:
+        queued = await resume_service.queue_resumes_for_parsing(session, request.resume_ids, parsing_pool)
+        not_found = sorted(set(request.resume_ids) - set(queued))
+
+        return BatchParseResponse(queued=queued, not_found=not_found, pool=parsing_pool.metrics())
+
+    except Exception as e:
+        logger.error(f"Error queueing resumes for parsing: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
+
+
+@router.get(
+    "/parse-pool/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Resume parsing pool metrics",
+    description="Throughput (resumes/sec), queue depth, failures and latency of the parsing pool.",
+)
+async def get_parsing_pool_metrics() -> Dict[str, Any]:
+    """Get parsing pool metrics."""
+    return parsing_pool.metrics()
+
+
 @router.get(
     "/{resume_id}/parsed",
     response_model=ParsedResumeData,
@@ -25,6 +25,8 @@ from schemas.security import (
     SessionPolicyResponse,
     SecurityDashboard,
     PermissionCheckResponse,
+    PermissionBulkCheckRequest,
+    PermissionBulkCheckResponse,
     UserEffectivePermissions,
     SecurityReport,
 )
@@ -38,11 +40,12 @@ from services.security_service import (
     SessionPolicyService,
 )
 from agents.security_agent import SecurityAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/security", tags=["security"])
-security_agent = SecurityAgent()
+security_agent = agent_supervisor.lazy("security_agent", SecurityAgent)
 
 
 # ===== PERMISSION ENDPOINTS =====
@@ -479,6 +482,34 @@ async def check_permission(
         )
 
 
+@router.post("/permissions/check-bulk", response_model=PermissionBulkCheckResponse)
+async def check_permissions_bulk(
+    check_data: PermissionBulkCheckRequest,
+    db: AsyncSession = Depends(get_db),
+) -> PermissionBulkCheckResponse:
+    """Check many permissions for a user in one call.
+
+    Args:
+        check_data: User ID and resource+action pairs
+        db: Database session
+
+    Returns:
+        Result per "resource:action"
+    """
+    try:
+        results = await security_agent.check_permissions(
+            db, check_data.user_id, [(check.resource, check.action) for check in check_data.checks]
+        )
+        return PermissionBulkCheckResponse(user_id=check_data.user_id, results=results)
+
+    except Exception as e:
+        logger.error(f"Error checking permissions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to check permissions",
+        )
+
+
 # ===== USER AGENT PERMISSIONS ENDPOINTS =====
 
 
@@ -13,12 +13,13 @@ from schemas.submission import (
 from schemas.common import PaginatedResponse
 from services.submission_service import SubmissionService
 from agents.submission_workflow_agent import SubmissionWorkflowAgent
+from agents.agent_supervisor import agent_supervisor
 from models.enums import SubmissionStatus
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
-workflow_agent = SubmissionWorkflowAgent()
+workflow_agent = agent_supervisor.lazy("submission_workflow_agent", SubmissionWorkflowAgent)
 
 
 @router.post("", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED)
@@ -20,6 +20,7 @@ from schemas.supplier_network import (
 from schemas.common import PaginatedResponse
 from services.supplier_service import SupplierService
 from agents.supplier_network_agent import SupplierNetworkAgent
+from agents.agent_supervisor import agent_supervisor
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
 # Initialize agent
-supplier_agent = SupplierNetworkAgent(anthropic_api_key=settings.anthropic_api_key)
+supplier_agent = agent_supervisor.lazy(
+    "supplier_network_agent", SupplierNetworkAgent, anthropic_api_key=settings.anthropic_api_key
+)
 
 
 @router.post("", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED)
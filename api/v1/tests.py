@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_db, get_current_user
 from agents.test_agent import TestAgent
+from agents.agent_supervisor import agent_supervisor
 from models.user import User
 from models.enums import UserRole
 
@@ -16,7 +17,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tests", tags=["testing"])
 
 # Global test agent instance
-test_agent = TestAgent()
+test_agent = agent_supervisor.lazy("test_agent", TestAgent)
 test_runs: Dict[str, Dict[str, Any]] = {}
 
 
@@ -26,11 +26,12 @@ from schemas.timesheet import (
 from schemas.common import PaginatedResponse
 from services.timesheet_service import TimesheetService
 from agents.timesheet_agent import TimesheetAgent
+from agents.agent_supervisor import agent_supervisor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/timesheets", tags=["timesheets"])
-timesheet_agent = TimesheetAgent()
+timesheet_agent = agent_supervisor.lazy("timesheet_agent", TimesheetAgent)
 
 
 # ===== TIMESHEET ENDPOINTS =====
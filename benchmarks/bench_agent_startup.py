@@ -0,0 +1,130 @@
+"""
+Benchmark API agent startup: eager construction versus the agent supervisor.
+
+"eager" is the previous behaviour: every router constructed its agents at
+import time and agents were initialized one after another. "supervised"
+registers the same agents lazily, starts the supervisor (nothing to
+construct yet), then serves a first request that needs one agent.
+Module imports are done up front and reported separately; they are the
+same on both sides.
+
+``--init-delay-ms`` adds simulated I/O to every agent's ``on_start`` to show
+the effect of concurrent initialization.
+
+    python -m benchmarks.bench_agent_startup --init-delay-ms 0 20
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import time
+from typing import List, Tuple, Type
+
+from agents.agent_supervisor import AgentSupervisor
+from agents.base_agent import BaseAgent
+
+# (module, class, takes an Anthropic API key) for each agent the API routers declare
+AGENTS = [
+    ("digital_marketing_agent", "DigitalMarketingAgent", True),
+    ("interview_agent", "InterviewAgent", True),
+    ("interview_intelligence_agent", "InterviewIntelligenceAgent", True),
+    ("candidate_rediscovery_agent", "CandidateRediscoveryAgent", True),
+    ("offer_onboarding_agent", "OfferOnboardingAgent", False),
+    ("referral_network_agent", "ReferralNetworkAgent", False),
+    ("resume_harvesting_agent", "ResumeHarvestingAgent", True),
+    ("supplier_network_agent", "SupplierNetworkAgent", True),
+    ("matching_agent", "MatchingAgent", False),
+    ("contract_management_agent", "ContractManagementAgent", False),
+    ("messaging_integration_agent", "MessagingIntegrationAgent", False),
+    ("copilot_agent", "CopilotAgent", True),
+    ("invoicing_agent", "InvoicingAgent", False),
+    ("resume_parser_agent", "ResumeParserAgent", False),
+    ("resume_tailoring_agent", "ResumeTailoringAgent", False),
+    ("rate_negotiation_agent", "RateNegotiationAgent", False),
+    ("payment_processing_agent", "PaymentProcessingAgent", False),
+    ("timesheet_agent", "TimesheetAgent", False),
+    ("candidate_portal_agent", "CandidatePortalAgent", False),
+    ("security_agent", "SecurityAgent", False),
+    ("conversational_interface_agent", "ConversationalInterfaceAgent", False),
+    ("submission_workflow_agent", "SubmissionWorkflowAgent", False),
+    ("alerts_notification_agent", "AlertsNotificationAgent", True),
+    ("job_post_agent", "JobPostAgent", True),
+]
+
+
+def load_agents(init_delay: float) -> List[Tuple[str, Type[BaseAgent], dict]]:
+    loaded = []
+    for module_name, class_name, takes_key in AGENTS:
+        try:
+            agent_class = getattr(importlib.import_module(f"agents.{module_name}"), class_name)
+        except Exception as e:
+            print(f"  skipping {class_name}: {e}")
+            continue
+        if init_delay:
+            async def on_start(self, _on_start=agent_class.on_start) -> None:
+                await asyncio.sleep(init_delay)
+                await _on_start(self)
+
+            agent_class = type(class_name, (agent_class,), {"on_start": on_start})
+        loaded.append((module_name, agent_class, {"anthropic_api_key": "bench"} if takes_key else {}))
+    return loaded
+
+
+async def eager(agents: List[Tuple[str, Type[BaseAgent], dict]]) -> Tuple[float, float]:
+    started = time.perf_counter()
+    instances = [agent_class(**kwargs) for _, agent_class, kwargs in agents]
+    constructed = time.perf_counter()
+    for agent in instances:
+        await agent.initialize()
+    initialized = time.perf_counter()
+    for agent in instances:
+        await agent.shutdown()
+    return (constructed - started) * 1000, (initialized - started) * 1000
+
+
+async def supervised(agents: List[Tuple[str, Type[BaseAgent], dict]], first: str) -> Tuple[float, float, float]:
+    supervisor = AgentSupervisor()
+    started = time.perf_counter()
+    for name, agent_class, kwargs in agents:
+        supervisor.lazy(name, agent_class, **kwargs)
+    await supervisor.start()
+    ready = time.perf_counter()
+    supervisor.get(first)
+    await asyncio.gather(*supervisor._pending)
+    first_use = time.perf_counter()
+
+    # Everything constructed, to time concurrent initialization on its own
+    for name, _, _ in agents:
+        supervisor.get(name)
+    await asyncio.gather(*supervisor._pending)
+    all_started = time.perf_counter()
+    await supervisor.stop()
+    return (ready - started) * 1000, (first_use - ready) * 1000, (all_started - first_use) * 1000
+
+
+def run(delays_ms: List[float], first: str) -> None:
+    started = time.perf_counter()
+    load_agents(0)
+    print(f"module imports (shared): {(time.perf_counter() - started) * 1000:.0f}ms")
+    print(f"{'init delay':>10} {'eager construct':>16} {'eager ready':>12} {'supervised ready':>17} "
+          f"{'first use':>10} {'all agents':>11}")
+    for delay_ms in delays_ms:
+        agents = load_agents(delay_ms / 1000)
+        construct_ms, eager_ms = asyncio.run(eager(agents))
+        ready_ms, first_ms, all_ms = asyncio.run(supervised(agents, first))
+        print(f"{delay_ms:>8.0f}ms {construct_ms:>14.1f}ms {eager_ms:>10.1f}ms {ready_ms:>15.2f}ms "
+              f"{first_ms:>8.1f}ms {all_ms:>9.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--init-delay-ms", type=float, nargs="+", default=[0, 20])
+    parser.add_argument("--first", default="matching_agent", help="Agent the first request uses")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    run(args.init_delay_ms, args.first)
+
+
+if __name__ == "__main__":
+    main()
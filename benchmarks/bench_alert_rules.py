@@ -0,0 +1,157 @@
+"""
+Benchmark alert rule evaluation throughput.
+
+Compares the compiled, indexed rule engine with the previous approach of
+interpreting every rule of the event type through the operator chain.
+Database and cooldown round trips are left out of both sides; the
+previous implementation also paid one query per event plus one per
+matching rule.
+
+    python -m benchmarks.bench_alert_rules --rules 100 1000 5000 --events 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from agents.alert_rule_engine import AlertRuleEngine, InMemoryCooldownTracker
+from agents.events import EventType
+
+EVENT_TYPES = [event_type.value for event_type in EventType]
+STATUSES = ["new", "pending", "approved", "rejected", "escalated", "on_hold", "withdrawn", "closed"]
+REGIONS = ["us-east", "us-west", "us-central", "emea", "apac", "latam"]
+
+
+def generate_rules(count: int, seed: int = 3) -> List[SimpleNamespace]:
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        conditions: List[Dict[str, Any]] = []
+        if rng.random() < 0.7:
+            conditions.append({"field": "status", "operator": "==", "value": rng.choice(STATUSES)})
+        if rng.random() < 0.5:
+            conditions.append({"field": "region", "operator": "==", "value": rng.choice(REGIONS)})
+        if rng.random() < 0.6:
+            conditions.append({"field": "amount", "operator": ">=", "value": rng.randint(0, 10_000)})
+        if rng.random() < 0.2:
+            conditions.append({"field": "title", "operator": "contains", "value": rng.choice(["urgent", "senior", "remote"])})
+        if rng.random() < 0.1:
+            conditions.append({"field": "tags", "operator": "!=", "value": "internal"})
+        rules.append(SimpleNamespace(
+            id=i + 1, name=f"rule {i}", event_type=rng.choice(EVENT_TYPES), conditions=conditions,
+            notification_channels=["in_app"], recipients=[], template_subject=None, template_body=None,
+            priority="medium", cooldown_minutes=0, is_active=True,
+        ))
+    return rules
+
+
+def generate_events(count: int, seed: int = 5) -> List[SimpleNamespace]:
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            event_type=SimpleNamespace(value=rng.choice(EVENT_TYPES)),
+            entity_id=rng.randint(1, 10_000),
+            payload={
+                "status": rng.choice(STATUSES),
+                "amount": rng.randint(0, 10_000),
+                "region": rng.choice(REGIONS),
+                "title": rng.choice(["Senior engineer", "Urgent: nurse", "Analyst", "Remote designer"]),
+            },
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_conditions(conditions: List[Dict[str, Any]], payload: Dict[str, Any]) -> bool:
+    """The previous interpreter, kept here for comparison."""
+    for condition in conditions:
+        field = condition.get("field")
+        op = condition.get("operator", "==")
+        value = condition.get("value")
+        if field not in payload:
+            return False
+        actual = payload[field]
+        if op == "==":
+            if actual != value:
+                return False
+        elif op == "!=":
+            if actual == value:
+                return False
+        elif op == ">":
+            if not (actual > value):
+                return False
+        elif op == ">=":
+            if not (actual >= value):
+                return False
+        elif op == "<":
+            if not (actual < value):
+                return False
+        elif op == "<=":
+            if not (actual <= value):
+                return False
+        elif op == "contains":
+            if value not in str(actual):
+                return False
+        elif op == "in":
+            if actual not in value:
+                return False
+    return True
+
+
+def legacy_evaluate(rules: List[SimpleNamespace], events: List[SimpleNamespace]) -> int:
+    by_type: Dict[str, List[SimpleNamespace]] = {}
+    for rule in rules:
+        by_type.setdefault(rule.event_type, []).append(rule)
+    matched = 0
+    for event in events:
+        for rule in by_type.get(event.event_type.value, ()):
+            if legacy_conditions(rule.conditions, event.payload):
+                matched += 1
+    return matched
+
+
+async def compiled_evaluate(engine: AlertRuleEngine, events: List[SimpleNamespace]) -> int:
+    matched = 0
+    for event in events:
+        matched += len(await engine.evaluate(None, event))
+    return matched
+
+
+def run(sizes: List[int], event_count: int) -> None:
+    events = generate_events(event_count)
+    print(f"{'rules':>7} {'compile (ms)':>13} {'compiled ev/s':>14} {'legacy ev/s':>12} {'matches':>9}")
+    for size in sizes:
+        rules = generate_rules(size)
+
+        start = time.perf_counter()
+        engine = AlertRuleEngine(cooldowns=InMemoryCooldownTracker())
+        engine.load(rules)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matched = asyncio.run(compiled_evaluate(engine, events))
+        compiled_rate = event_count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        legacy_matched = legacy_evaluate(rules, events)
+        legacy_rate = event_count / (time.perf_counter() - start)
+
+        assert matched == legacy_matched, (matched, legacy_matched)
+        print(f"{size:>7} {compile_ms:>13.1f} {compiled_rate:>14,.0f} {legacy_rate:>12,.0f} {matched:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    run(args.rules, args.events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark DuplicateDetectorAgent.batch_check at 1k/10k/100k records.
+
+The pairwise reference scan is only timed at sizes where it finishes
+in reasonable time (``--brute-force-limit``).
+
+    python -m benchmarks.bench_duplicate_detection --sizes 1000 10000 100000
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+from agents.duplicate_detector_agent import DuplicateDetectorAgent
+
+FIRST_NAMES = ["James", "Mary", "Raj", "Priya", "Wei", "Ana", "Omar", "Li", "Ivan", "Sara"]
+LAST_NAMES = ["Smith", "Patel", "Garcia", "Chen", "Khan", "Jones", "Kim", "Nguyen", "Silva", "Brown"]
+
+
+def generate_submissions(count: int, duplicate_rate: float = 0.1, seed: int = 42) -> List[Dict[str, Any]]:
+    """Synthetic supplier submissions, ~duplicate_rate of which resubmit an earlier person."""
+    rng = random.Random(seed)
+    records: List[Dict[str, Any]] = []
+    for i in range(count):
+        if records and rng.random() < duplicate_rate:
+            original = rng.choice(records)
+            record = dict(original)
+            record["email"] = original["email"].upper() if original["email"] else None
+            record["phone"] = f"+1 {original['phone']}" if original["phone"] else ""
+        else:
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            record = {
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first}.{last}.{i}@example.com".lower(),
+                "phone": f"{rng.randrange(10**9, 10**10)}",
+                "linkedin_url": f"https://www.linkedin.com/in/{first}-{last}-{i}".lower(),
+            }
+        record["id"] = i + 1
+        records.append(record)
+    return records
+
+
+def run(sizes: List[int], brute_force_limit: int) -> None:
+    agent = DuplicateDetectorAgent()
+    print(f"{'records':>10} {'indexed (s)':>12} {'rec/s':>12} {'dupes':>8} {'pairwise (s)':>13}")
+    for size in sizes:
+        records = generate_submissions(size)
+
+        start = time.perf_counter()
+        results = agent.batch_check(records)
+        indexed = time.perf_counter() - start
+        duplicates = sum(1 for r in results if r.is_duplicate)
+
+        pairwise = "-"
+        if size <= brute_force_limit:
+            start = time.perf_counter()
+            for i, record in enumerate(records):
+                agent.check_for_duplicates(record, records[:i] + records[i + 1:])
+            pairwise = f"{time.perf_counter() - start:.2f}"
+
+        print(f"{size:>10} {indexed:>12.3f} {size / indexed:>12,.0f} {duplicates:>8} {pairwise:>13}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--brute-force-limit", type=int, default=2_000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # per-duplicate warnings would dominate the timing
+    run(args.sizes, args.brute_force_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark event encode/decode throughput per codec.
+
+Compares the JSON format with msgpack and msgpack with zstd compression
+of every body, on a small event (a computed match) and a large one (a
+parsed resume). Needs msgpack and zstandard installed.
+
+    python -m benchmarks.bench_event_codec --events 20000
+"""
+
+import argparse
+import logging
+import time
+import uuid
+from typing import Callable, List, Tuple
+
+from agents.event_codec import JsonCodec, MsgpackCodec
+from agents.events import Event, EventType
+
+
+def small_event() -> Event:
+    return Event(
+        event_type=EventType.MATCH_COMPUTED,
+        event_id=str(uuid.uuid4()),
+        source_agent="matching_agent",
+        entity_id=4211,
+        entity_type="match",
+        payload={"requirement_id": 87, "candidate_id": 4211, "score": 0.8734, "skills_matched": 7},
+        correlation_id="c0ffee00-1234-5678-9abc-def012345678",
+        user_id=12,
+    )
+
+
+def large_event() -> Event:
+    experience = [
+        {
+            "company": f"Company {i}",
+            "title": "Senior Software Engineer",
+            "start": f"20{10 + i}-01",
+            "end": f"20{11 + i}-06",
+            "description": "Built and operated distributed services for payments and scheduling. " * 4,
+        }
+        for i in range(8)
+    ]
+    return Event(
+        event_type=EventType.RESUME_PARSED,
+        event_id=str(uuid.uuid4()),
+        source_agent="resume_parser_agent",
+        entity_id=9001,
+        entity_type="candidate",
+        payload={
+            "skills": ["python", "postgresql", "kubernetes", "fastapi", "redis", "rabbitmq"] * 5,
+            "experience": experience,
+            "education": [{"school": "State University", "degree": "BSc Computer Science", "year": 2009}],
+            "raw_text_chars": 18_422,
+        },
+    )
+
+
+def measure(fn: Callable[[], object], count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def run(count: int) -> None:
+    variants: List[Tuple[str, object]] = [
+        ("json", JsonCodec()),
+        ("msgpack", MsgpackCodec(compress_threshold=None)),
+        ("msgpack+zstd", MsgpackCodec(compress_threshold=0)),
+    ]
+    for label, event in (("small", small_event()), ("large", large_event())):
+        print(f"{label} event")
+        print(f"  {'codec':<22} {'bytes':>7} {'encode/s':>12} {'decode/s':>12}")
+        for name, codec in variants:
+            data = codec.encode(event)
+            assert codec.decode(data).event_id == event.event_id
+            encode_rate = measure(lambda: codec.encode(event), count)
+            decode_rate = measure(lambda: codec.decode(data), count)
+            print(f"  {name:<22} {len(data):>7} {encode_rate:>12,.0f} {decode_rate:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    run(args.events)
+
+
+if __name__ == "__main__":
+    main()
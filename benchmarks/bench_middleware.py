@@ -0,0 +1,125 @@
+"""
+Benchmark per-request middleware overhead.
+
+Three copies of a FastAPI app with one trivial route are driven through
+httpx's ASGI transport (no sockets):
+
+- "bare": no middleware, the floor;
+- "before": the previous RequestLoggingMiddleware + ErrorHandlingMiddleware
+  pair built on BaseHTTPMiddleware (copied here, since the API no longer
+  ships them), with a uuid4 and two log calls per request;
+- "after": RequestContextMiddleware.
+
+Access logging is routed to a NullHandler so formatting cost is included
+but nothing is printed. Reported overhead is relative to "bare".
+
+    python -m benchmarks.bench_middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import List
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.middleware import RequestContextMiddleware
+
+logger = logging.getLogger("benchmarks.bench_middleware")
+
+
+class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request.state.request_id = str(uuid.uuid4())
+        request.state.start_time = time.time()
+        logger.info(
+            f"Request {request.state.request_id}: {request.method} {request.url.path}",
+            extra={
+                "request_id": request.state.request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "query": str(request.url.query),
+            },
+        )
+        response = await call_next(request)
+        process_time = time.time() - request.state.start_time
+        logger.info(
+            f"Request {request.state.request_id} completed: {response.status_code} ({process_time:.2f}s)",
+            extra={
+                "request_id": request.state.request_id,
+                "status_code": response.status_code,
+                "process_time": process_time,
+            },
+        )
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            logger.error(f"Unhandled exception in request {request.state.request_id}", exc_info=exc)
+            raise
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if variant == "before":
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(ErrorHandlingMiddleware)
+    elif variant == "after":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> List[float]:
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):
+            await client.get("/ping")
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/ping")
+            samples.append((time.perf_counter() - started) * 1e6)
+            assert response.status_code == 200
+    return samples
+
+
+async def run(requests: int) -> None:
+    print(f"{'variant':<8} {'p50 (us)':>10} {'p99 (us)':>10} {'mean (us)':>10} {'overhead (us)':>14}")
+    bare_mean = None
+    for variant in ("bare", "before", "after"):
+        samples = await measure(build_app(variant), requests)
+        mean = statistics.fmean(samples)
+        bare_mean = mean if bare_mean is None else bare_mean
+        p50, p99 = statistics.quantiles(samples, n=100)[49], statistics.quantiles(samples, n=100)[98]
+        print(f"{variant:<8} {p50:>10.0f} {p99:>10.0f} {mean:>10.0f} {mean - bare_mean:>14.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+    for name in ("api.middleware", logger.name):
+        access_logger = logging.getLogger(name)
+        access_logger.setLevel(logging.INFO)
+        access_logger.propagate = False
+        access_logger.addHandler(logging.NullHandler())
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
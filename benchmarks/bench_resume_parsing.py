@@ -0,0 +1,145 @@
+"""
+Benchmark resume extraction + parsing: inline on the event loop vs ResumeParsingPool.
+
+Reports throughput (resumes/sec) and the worst event-loop stall seen by
+a 10ms ticker while the corpus is processed.
+
+Point ``--corpus`` at a directory of sample PDF/DOCX resumes; without it
+a synthetic DOCX corpus is generated in a temp directory (needs
+python-docx).
+
+    python -m benchmarks.bench_resume_parsing --corpus ./samples --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from agents.resume_parser_agent import ResumeParserAgent, read_resume_text
+from agents.resume_parsing_pool import ParseJob, ResumeParsingPool
+
+SKILLS = ["Python", "Java", "AWS", "Docker", "Kubernetes", "React", "SQL", "Spark", "Terraform", "Go"]
+
+
+def generate_docx_corpus(directory: Path, count: int, seed: int = 1) -> List[Path]:
+    """Write ``count`` synthetic resumes as DOCX files."""
+    from docx import Document
+
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        doc = Document()
+        doc.add_paragraph(f"Candidate {i}")
+        doc.add_paragraph(f"candidate{i}@example.com | (555) 010-{i % 10000:04d} | linkedin.com/in/candidate-{i}")
+        doc.add_paragraph("SKILLS")
+        doc.add_paragraph(", ".join(rng.sample(SKILLS, 6)))
+        doc.add_paragraph("EXPERIENCE")
+        for job in range(rng.randint(2, 5)):
+            doc.add_paragraph(f"Senior Engineer at Company {job} | Jan 201{job} - Dec 201{job + 1}")
+            for _ in range(8):
+                doc.add_paragraph(
+                    f"Expert in {rng.choice(SKILLS)}; built services handling millions of requests with "
+                    f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)} over {rng.randint(1, 9)} years."
+                )
+        doc.add_paragraph("EDUCATION")
+        doc.add_paragraph("Bachelor of Science in Computer Science, State University, 2012")
+        path = directory / f"resume_{i:05d}.docx"
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+class LoopLagProbe:
+    """Measures how late a 10ms ticker wakes up, i.e. how blocked the event loop is."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _tick(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - before - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def read_and_parse_inline(agent: ResumeParserAgent, path: Path) -> None:
+    """The pre-pool behaviour: blocking extraction and parsing on the loop thread."""
+    agent.parse_resume_sync(read_resume_text(str(path)), path.name)
+
+
+async def run_inline(paths: List[Path]) -> dict:
+    agent = ResumeParserAgent()
+    with LoopLagProbe() as probe:
+        start = time.perf_counter()
+        for path in paths:
+            read_and_parse_inline(agent, path)
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "max_loop_lag": probe.max_lag}
+
+
+async def run_pool(paths: List[Path], workers: int) -> dict:
+    pool = ResumeParsingPool(workers=workers, queue_size=workers * 4, batch_size=50)
+    await pool.start()
+    with LoopLagProbe() as probe:
+        start = time.perf_counter()
+        for i, path in enumerate(paths):
+            await pool.submit(ParseJob(resume_id=i, file_path=str(path), file_name=path.name))
+        await pool.drain()
+        elapsed = time.perf_counter() - start
+    metrics = pool.metrics()
+    await pool.close()
+    metrics["elapsed"] = elapsed
+    metrics["max_loop_lag"] = probe.max_lag
+    return metrics
+
+
+async def main_async(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(p for p in Path(args.corpus).iterdir() if p.suffix.lower() in {".pdf", ".docx"})
+        else:
+            paths = generate_docx_corpus(Path(tmp), args.count)
+        print(f"corpus: {len(paths)} files")
+
+        inline = await run_inline(paths)
+        print(
+            f"inline: {inline['elapsed']:.2f}s ({len(paths) / inline['elapsed']:.1f} resumes/s, "
+            f"max event-loop lag={inline['max_loop_lag'] * 1000:.0f}ms)"
+        )
+
+        pooled = await run_pool(paths, args.workers)
+        print(
+            f"pool x{args.workers}: {pooled['elapsed']:.2f}s "
+            f"({len(paths) / pooled['elapsed']:.1f} resumes/s, "
+            f"max event-loop lag={pooled['max_loop_lag'] * 1000:.0f}ms, "
+            f"failed={pooled['failed']}, p50={pooled['p50_seconds']}s, p95={pooled['p95_seconds']}s)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Directory of sample .pdf/.docx resumes")
+    parser.add_argument("--count", type=int, default=200, help="Synthetic corpus size when --corpus is omitted")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark skill extraction against taxonomy size.
+
+Compares the compiled extractor with the previous per-skill scan
+(substring test per section plus a context regex per found skill).
+
+    python -m benchmarks.bench_skill_extraction --skills 100 1000 10000
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+from typing import Dict, List
+
+from agents.skill_extractor import DEFAULT_SKILL_TAXONOMY, PROFICIENCY_INDICATORS, SkillExtractor
+
+FILLER = ["built", "services", "for", "payments", "team", "of", "engineers", "using", "and", "with", "years"]
+
+
+def generate_taxonomy(size: int, seed: int = 7) -> Dict[str, List[str]]:
+    """The default taxonomy padded with synthetic skill names up to ``size``."""
+    rng = random.Random(seed)
+    taxonomy = {category: list(skills) for category, skills in DEFAULT_SKILL_TAXONOMY.items()}
+    count = sum(len(skills) for skills in taxonomy.values())
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while count < size:
+        name = "".join(rng.choice(letters) for _ in range(rng.randint(5, 12)))
+        taxonomy.setdefault(f"generated_{count % 50}", []).append(name)
+        count += 1
+    return taxonomy
+
+
+def generate_resume(taxonomy: Dict[str, List[str]], seed: int = 11) -> str:
+    rng = random.Random(seed)
+    skills = [skill for skill_list in taxonomy.values() for skill in skill_list]
+    skill_line = ", ".join(rng.sample(skills, 25))
+    experience = []
+    for _ in range(40):
+        words = [rng.choice(FILLER) for _ in range(12)] + rng.sample(skills, 2)
+        rng.shuffle(words)
+        experience.append(" ".join(words))
+    return "Jane Doe\n\nTechnical Skills: Expert in " + skill_line + "\n\nExperience\n" + "\n".join(experience) + "\n"
+
+
+def legacy_extract(taxonomy: Dict[str, List[str]], text: str) -> int:
+    """The pre-compiled implementation, kept here for comparison."""
+    found = set()
+    sections = re.findall(
+        r"(?:Skills?|Technical\s+Skills?|Competencies?)[\s:]*(.*?)(?=\n\n|[A-Z][a-z]+\s+(?:Experience|Education|Projects)|$)",
+        text,
+        re.MULTILINE | re.IGNORECASE,
+    )
+    sections += re.findall(r"(?:Experience|Work History)[\s:]*(.*?)(?=\n\n|Education|$)", text, re.MULTILINE | re.IGNORECASE | re.DOTALL)
+    for section in sections:
+        for skill_list in taxonomy.values():
+            for skill in skill_list:
+                if skill.lower() in section.lower() and skill not in found:
+                    contexts = re.findall(rf".{{0,100}}{re.escape(skill.lower())}.{{0,100}}", text.lower())
+                    for indicators in PROFICIENCY_INDICATORS.values():
+                        if any(i in c for c in contexts for i in indicators):
+                            break
+                    found.add(skill)
+    return len(found)
+
+
+def run(sizes: List[int], repeat: int, legacy_limit: int) -> None:
+    print(f"{'skills':>8} {'compile (s)':>12} {'compiled (ms)':>14} {'legacy (ms)':>12} {'found':>6}")
+    for size in sizes:
+        taxonomy = generate_taxonomy(size)
+        text = generate_resume(taxonomy)
+
+        start = time.perf_counter()
+        extractor = SkillExtractor(taxonomy)
+        compile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            found = len(extractor.extract(text))
+        compiled_ms = (time.perf_counter() - start) / repeat * 1000
+
+        legacy = "-"
+        if size <= legacy_limit:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                legacy_extract(taxonomy, text)
+            legacy = f"{(time.perf_counter() - start) / repeat * 1000:.2f}"
+
+        print(f"{size:>8} {compile_seconds:>12.3f} {compiled_ms:>14.2f} {legacy:>12} {found:>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skills", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--legacy-limit", type=int, default=10_000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    run(args.skills, args.repeat, args.legacy_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,14 @@ class Settings(BaseSettings):
     database_max_overflow: int = Field(default=10)
     database_pool_recycle: int = Field(default=3600)
     database_echo: bool = Field(default=False)
+    database_query_cache_size: int = Field(default=1200)  # compiled SQL cache per engine
+    database_statement_cache_size: int = Field(default=500)  # asyncpg prepared statements per connection
+
+    # Read Replica Configuration (unset: all reads use the primary)
+    database_read_url: Optional[str] = Field(default=None)  # e.g. sqlite+aiosqlite:///./replica.db locally
+    database_read_pool_size: int = Field(default=30)
+    database_read_max_overflow: int = Field(default=20)
+    database_read_retry_seconds: float = Field(default=30.0)  # stay on the primary after a replica failure
 
     # Redis Configuration
     redis_url: str = Field(default="redis://localhost:6379/0")
@@ -33,11 +41,18 @@ class Settings(BaseSettings):
     jwt_expiry_hours: int = Field(default=24)
     jwt_refresh_expiry_days: int = Field(default=30)
 
+    # Auth Cache Configuration
+    auth_token_cache_size: int = Field(default=10_000)  # verified tokens, kept until they expire
+    auth_token_cache_max_seconds: float = Field(default=86_400.0)
+    principal_cache_ttl_seconds: float = Field(default=30.0)  # users, organizations and memberships
+    principal_cache_size: int = Field(default=10_000)
+
     # AWS S3 Configuration
     aws_s3_bucket: str = Field(default="hr-platform-bucket")
     aws_s3_region: str = Field(default="us-east-1")
     aws_access_key_id: Optional[str] = Field(default=None)
     aws_secret_access_key: Optional[str] = Field(default=None)
+    aws_s3_endpoint_url: Optional[str] = Field(default=None)  # S3-compatible stores (MinIO etc.)
 
     # External APIs Configuration
     openai_api_key: Optional[str] = Field(default=None)
@@ -56,6 +71,86 @@ class Settings(BaseSettings):
     matching_rate_weight: float = Field(default=0.10)
     matching_availability_weight: float = Field(default=0.05)
 
+    # Resume Parsing Pool Configuration
+    resume_parse_workers: int = Field(default=0)  # 0 = one per CPU, minus one for the API
+    resume_parse_queue_size: int = Field(default=200)
+    resume_parse_timeout_seconds: float = Field(default=60.0)
+    resume_parse_memory_limit_mb: int = Field(default=1024)
+    resume_parse_batch_size: int = Field(default=20)
+    skill_taxonomy_path: Optional[str] = Field(default=None)  # JSON {"category": ["skill", ...]}
+
+    # Resume Upload Configuration
+    resume_storage_backend: str = Field(default="local")  # local | s3
+    resume_upload_dir: str = Field(default="/tmp/resumes")
+    resume_upload_max_bytes: int = Field(default=10 * 1024 * 1024)
+    resume_upload_max_request_bytes: int = Field(default=200 * 1024 * 1024)
+
+    # Rate Card Cache Configuration
+    rate_card_cache_ttl_seconds: int = Field(default=300)  # bounds staleness across workers
+    rate_history_window: int = Field(default=500)  # recent accepted bill rates per category
+
+    # Alert Rule Engine Configuration
+    alert_rule_cache_ttl_seconds: int = Field(default=60)
+    alert_cooldown_backend: str = Field(default="memory")  # memory | redis (shared across workers)
+
+    # API Key Cache Configuration
+    api_key_cache_ttl_seconds: int = Field(default=60)  # bounds revocation lag on other workers
+    api_key_cache_size: int = Field(default=10_000)
+    api_key_negative_cache_ttl_seconds: int = Field(default=300)
+    api_key_negative_cache_size: int = Field(default=100_000)
+    api_key_last_used_flush_seconds: float = Field(default=5.0)
+
+    # Access Log Configuration
+    access_log_sample_rate: float = Field(default=1.0)  # share of requests logged; errors and slow ones always are
+    access_log_slow_request_ms: int = Field(default=1000)
+    n_plus_one_threshold: int = Field(default=10)  # same statement this many times in one request is flagged
+
+    # Access Audit Configuration
+    audit_buffer_capacity: int = Field(default=50_000)  # oldest records are dropped beyond this
+    audit_batch_size: int = Field(default=500)
+    audit_flush_interval_ms: int = Field(default=250)
+    audit_fallback_dir: str = Field(default="/tmp/audit")  # JSON lines when the database is unavailable
+
+    # Permission Cache Configuration
+    permission_cache_backend: str = Field(default="memory")  # memory | redis (shared across workers)
+    permission_cache_ttl_seconds: int = Field(default=60)
+    permission_cache_size: int = Field(default=10_000)
+
+    # Event Outbox Configuration
+    event_broker_backend: str = Field(default="external")  # external (Redis + RabbitMQ) | in_process
+    outbox_relay_batch_size: int = Field(default=100)
+    outbox_poll_interval_seconds: float = Field(default=1.0)
+    outbox_max_attempts: int = Field(default=10)
+    outbox_retention_hours: int = Field(default=72)  # published events kept for replay
+
+    # Agent Supervisor Configuration
+    agent_lifecycle_timeout_seconds: float = Field(default=10.0)  # per-agent initialize and health check
+    agent_shutdown_timeout_seconds: float = Field(default=30.0)  # per agent; covers draining queued work
+
+    # Background Task Configuration
+    background_task_workers: int = Field(default=8)
+    background_task_queue_size: int = Field(default=500)  # submissions beyond this are rejected
+    background_task_db_connections: int = Field(default=4)  # own pool, separate from the API's
+    background_task_drain_seconds: float = Field(default=30.0)
+    background_task_history_size: int = Field(default=1000)  # finished tasks kept for status lookups
+
+    # Payment Batch Configuration
+    payment_provider_concurrency: Dict[str, int] = Field(
+        default={"ach": 20, "wire": 5, "paypal": 10, "stripe": 25}
+    )  # concurrent calls per provider; JSON in the environment
+    payment_batch_write_size: int = Field(default=200)  # payment status updates per write
+
+    # Event Consumer Configuration
+    event_consumer_prefetch: int = Field(default=32)  # unacked messages per queue and worker
+    event_consumer_concurrency: int = Field(default=8)  # handler tasks per queue and worker
+    event_handler_timeout_seconds: float = Field(default=30.0)
+    event_consumer_drain_seconds: float = Field(default=30.0)
+    redis_event_transport: str = Field(default="pubsub")  # pubsub | streams (consumer groups)
+    redis_consumer_group: str = Field(default="hr_platform")
+    redis_stream_maxlen: int = Field(default=100_000)
+    event_codec: str = Field(default="json")  # json | msgpack (needs msgpack; zstd compression needs zstandard)
+    event_compress_threshold_bytes: int = Field(default=4096)
+
     # CORS Configuration
     cors_origins: Any = Field(default="http://localhost:3000,http://localhost:8000")
 
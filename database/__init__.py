@@ -1,5 +1,5 @@
 from .base import Base
-from .connection import get_db, init_db, close_db, engine, AsyncSessionLocal, check_db_health
+from .connection import get_db, init_db, close_db, engine, AsyncSessionLocal, check_db_health, open_read_session
 from .tenant_context import (
     TenantContext,
     set_tenant_context,
@@ -17,6 +17,7 @@ __all__ = [
     "engine",
     "AsyncSessionLocal",
     "check_db_health",
+    "open_read_session",
     "TenantContext",
     "set_tenant_context",
     "get_tenant_context",
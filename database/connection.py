@@ -1,5 +1,8 @@
 import logging
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
@@ -8,42 +11,92 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.pool import NullPool, QueuePool
 from config import settings
+from utils.metrics import instrument_engine
 
 logger = logging.getLogger(__name__)
 
 engine: AsyncEngine = None
 AsyncSessionLocal: async_sessionmaker = None
 
-
-async def init_db() -> None:
-    """Initialize the database engine and session factory."""
-    global engine, AsyncSessionLocal
-
-    engine = create_async_engine(
-        settings.database_url,
-        echo=settings.database_echo,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
+# Optional read replica (settings.database_read_url); see open_read_session
+read_engine: Optional[AsyncEngine] = None
+ReadSessionLocal: Optional[async_sessionmaker] = None
+_replica_down_until = 0.0
+
+
+def engine_options(url: str, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for ``url``.
+
+    Server databases get a sized connection pool; with asyncpg each
+    connection also keeps a cache of prepared statements, so repeated
+    queries skip the parse/plan round trip. SQLite uses SQLAlchemy's
+    default pool for the file (or memory) database.
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.database_echo,
+        "query_cache_size": settings.database_query_cache_size,
+    }
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return options
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
         pool_recycle=settings.database_pool_recycle,
         pool_pre_ping=True,
         echo_pool=False,
     )
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.database_statement_cache_size,
+        }
+    return options
+
 
-    AsyncSessionLocal = async_sessionmaker(
-        engine,
+def _session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
         class_=AsyncSession,
         expire_on_commit=False,
         autoflush=False,
         autocommit=False,
     )
 
+
+async def init_db() -> None:
+    """Initialize the database engines and session factories."""
+    global engine, AsyncSessionLocal, read_engine, ReadSessionLocal
+
+    engine = create_async_engine(
+        settings.database_url,
+        **engine_options(settings.database_url, settings.database_pool_size, settings.database_max_overflow),
+    )
+    instrument_engine(engine.sync_engine)
+    AsyncSessionLocal = _session_factory(engine)
+
+    if settings.database_read_url:
+        read_engine = create_async_engine(
+            settings.database_read_url,
+            **engine_options(
+                settings.database_read_url,
+                settings.database_read_pool_size,
+                settings.database_read_max_overflow,
+            ),
+        )
+        instrument_engine(read_engine.sync_engine)
+        ReadSessionLocal = _session_factory(read_engine)
+        logger.info("Database read replica engine initialized")
+
     logger.info("Database engine initialized")
 
 
 async def close_db() -> None:
-    """Close the database engine."""
-    global engine
+    """Close the database engines."""
+    global engine, read_engine, ReadSessionLocal
 
+    if read_engine:
+        await read_engine.dispose()
+        read_engine = ReadSessionLocal = None
     if engine:
         await engine.dispose()
         logger.info("Database engine closed")
@@ -61,6 +114,30 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def open_read_session() -> Optional[AsyncSession]:
+    """
+    A session on the read replica with its connection checked out, or None.
+
+    None means reads should use the primary: no replica is configured, or
+    it failed to connect within the last ``database_read_retry_seconds``.
+    Replica sessions may lag the primary; only use them for reads that do
+    not need to see the caller's own recent writes.
+    """
+    global _replica_down_until
+
+    if ReadSessionLocal is None or time.monotonic() < _replica_down_until:
+        return None
+    session = ReadSessionLocal()
+    try:
+        await session.connection()
+        return session
+    except Exception as e:
+        await session.close()
+        _replica_down_until = time.monotonic() + settings.database_read_retry_seconds
+        logger.error(f"Read replica unavailable, using the primary: {str(e)}")
+        return None
+
+
 async def check_db_health() -> dict:
     """Check database connection health."""
     if engine is None:
@@ -68,8 +145,18 @@ async def check_db_health() -> dict:
 
     try:
         async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
-        return {"status": "healthy", "database": "postgres"}
+            await conn.execute(text("SELECT 1"))
+        health = {"status": "healthy", "database": "postgres"}
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
         return {"status": "unhealthy", "database": "postgres", "error": str(e)}
+
+    if read_engine is not None:
+        try:
+            async with read_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            health["replica"] = "healthy"
+        except Exception as e:
+            logger.error(f"Read replica health check failed: {str(e)}")
+            health["replica"] = "unhealthy"
+    return health
@@ -75,6 +75,7 @@ from .offer import Offer, Onboarding
 from .supplier import Supplier, SupplierPerformance
 from .user import User
 from .audit import AuditLog
+from .event_outbox import OutboxEvent
 from .harvest import HarvestSource, HarvestJob, HarvestResult, CandidateSourceMapping
 from .marketing import MarketingCampaign, Hotlist, CampaignDistribution, EmailCampaignTracking
 # Import automation before alerts to register Notification from automation (newer version)
@@ -83,7 +84,7 @@ from .automation import (
     AutomationRule,
     Notification,
 )
-from .alerts import AlertRule, NotificationPreference
+from .alerts import AlertRule, NotificationPreference, NotificationDigestBucket, NotificationCounter
 # Note: alerts.Notification is not imported here to avoid table name conflicts
 # Services that need alerts.Notification will import it directly from models.alerts
 from .tenant_management import (
@@ -196,6 +197,7 @@ __all__ = [
     "SupplierPerformance",
     "User",
     "AuditLog",
+    "OutboxEvent",
     "HarvestSource",
     "HarvestJob",
     "HarvestResult",
@@ -206,6 +208,8 @@ __all__ = [
     "EmailCampaignTracking",
     "AlertRule",
     "NotificationPreference",
+    "NotificationDigestBucket",
+    "NotificationCounter",
     # Note: Notification is exported from automation (newer version)
     # alerts.Notification is imported directly by alerts_service.py to avoid conflicts
     # Tenant management
@@ -1,8 +1,8 @@
 """Alerts and notification data models."""
 
-from datetime import datetime, time
+from datetime import date, datetime, time
 from typing import Optional, Dict, Any, List
-from sqlalchemy import String, Integer, DateTime, Boolean, Float, Text, JSON, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy import String, Integer, Date, DateTime, Boolean, Float, Text, JSON, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models.base import BaseModel
 
@@ -31,7 +31,7 @@ class AlertRule(BaseModel):
     created_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     # Relationships
-    notifications: Mapped[List["Notification"]] = relationship("Notification", back_populates="rule")
+    notifications: Mapped[List["models.alerts.Notification"]] = relationship("models.alerts.Notification", back_populates="rule")
 
 
 class Notification(BaseModel):
@@ -40,6 +40,7 @@ class Notification(BaseModel):
     __tablename__ = "notifications_alerts"
     __table_args__ = (
         Index("ix_notifications_alerts_user_id", "user_id"),
+        Index("ix_notifications_alerts_user_id_created_at", "user_id", "created_at"),
         Index("ix_notifications_alerts_alert_rule_id", "alert_rule_id"),
         Index("ix_notifications_alerts_channel", "channel"),
         Index("ix_notifications_alerts_status", "status"),
@@ -86,3 +87,35 @@ class NotificationPreference(BaseModel):
     quiet_hours_end: Mapped[Optional[str]] = mapped_column(String(5), nullable=True)  # "08:00"
     digest_frequency: Mapped[str] = mapped_column(String(20), default="daily")  # none/daily/weekly
     digest_time: Mapped[str] = mapped_column(String(5), default="09:00")
+
+
+class NotificationDigestBucket(BaseModel):
+    """Per-user notification counts for one UTC day, updated as notifications are created."""
+
+    __tablename__ = "notification_digest_buckets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "bucket_date", name="uq_notification_digest_bucket"),
+        Index("ix_notification_digest_buckets_bucket_date", "bucket_date"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    bucket_date: Mapped[date] = mapped_column(Date, nullable=False)
+    total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    critical_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    high_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    medium_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    low_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_notification_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class NotificationCounter(BaseModel):
+    """Running unread and total notification counts for a user."""
+
+    __tablename__ = "notification_counters"
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_notification_counters_user"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import String, Integer, Boolean, DateTime, JSON, Text, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from models.base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    """Event written in the same transaction as the change it describes, relayed to the brokers."""
+
+    __tablename__ = "event_outbox"
+    __table_args__ = (
+        Index("ix_event_outbox_occurred_at", "occurred_at"),
+        Index(
+            "ix_event_outbox_pending",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL"),
+        ),
+        Index("ix_event_outbox_published_at", "published_at"),
+    )
+
+    event_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    use_rabbitmq: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    body: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, event_id={self.event_id}, event_type={self.event_type})>"
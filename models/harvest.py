@@ -27,6 +27,8 @@ class HarvestSource(BaseModel):
     config: Mapped[Dict[str, Any]] = mapped_column(JSON, default={}, nullable=False)
     last_harvested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     total_candidates_harvested: Mapped[int] = mapped_column(Integer, default=0)
+    # Opaque resume token from the source's last page; incremental harvests start from here
+    harvest_cursor: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Relationships
     jobs: Mapped[List["HarvestJob"]] = relationship("HarvestJob", back_populates="source")
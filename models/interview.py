@@ -35,7 +35,7 @@ class Interview(BaseModel):
     candidate = relationship("Candidate", back_populates="interviews")
     requirement = relationship("Requirement", back_populates="interviews")
     feedback = relationship(
-        "InterviewFeedback",
+        "models.interview.InterviewFeedback",
         back_populates="interview",
         uselist=False,
         cascade="all, delete-orphan",
@@ -94,7 +94,7 @@ class InvoiceLineItem(BaseModel):
     qb_account_id: Mapped[Optional[str]] = mapped_column(String(255))
     sort_order: Mapped[int] = mapped_column(Integer, default=0)
 
-    invoice = relationship("Invoice", back_populates="line_items")
+    invoice = relationship("models.invoice.Invoice", back_populates="line_items")
 
 
 class InvoicePayment(BaseModel):
@@ -111,7 +111,7 @@ class InvoicePayment(BaseModel):
     qb_payment_id: Mapped[Optional[str]] = mapped_column(String(255))
     recorded_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
 
-    invoice = relationship("Invoice", back_populates="payments")
+    invoice = relationship("models.invoice.Invoice", back_populates="payments")
 
 
 class CreditMemo(BaseModel):
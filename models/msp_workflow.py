@@ -271,6 +271,8 @@ class PlacementRecord(BaseModel):
     pay_rate: Mapped[float] = mapped_column(Float, nullable=False)
     msp_margin: Mapped[Optional[float]] = mapped_column(Float)
     currency: Mapped[str] = mapped_column(String(10), default="USD", nullable=False)
+    # Rate card category the bill rate counts towards in the client's rate history
+    job_category: Mapped[Optional[str]] = mapped_column(String(100))
 
     # Status
     status: Mapped[str] = mapped_column(
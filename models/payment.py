@@ -16,6 +16,7 @@ class Payment(BaseModel):
     referral_bonus_id: Mapped[Optional[int]] = mapped_column(ForeignKey("referral_bonuses.id"))
     invoice_id: Mapped[Optional[int]] = mapped_column(ForeignKey("invoices.id"))
     timesheet_id: Mapped[Optional[int]] = mapped_column(ForeignKey("timesheets.id"))
+    payment_schedule_id: Mapped[Optional[int]] = mapped_column(ForeignKey("payment_schedules.id"), index=True)
     # Payee
     payee_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # candidate/supplier/referrer
     payee_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
@@ -34,6 +35,7 @@ class Payment(BaseModel):
     status: Mapped[str] = mapped_column(String(50), default="pending", index=True)
     # External references
     external_transaction_id: Mapped[Optional[str]] = mapped_column(String(255), unique=True)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(64), unique=True)  # sent with every provider call
     gateway_response: Mapped[Optional[dict]] = mapped_column(JSON)
     # Dates
     scheduled_date: Mapped[Optional[date]] = mapped_column(Date, index=True)
@@ -15,6 +15,7 @@ class Resume(BaseModel):
     file_name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_type: Mapped[str] = mapped_column(String(50), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True)  # SHA-256 of the file
     is_primary: Mapped[bool] = mapped_column(default=False)
     uploaded_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
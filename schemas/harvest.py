@@ -41,6 +41,7 @@ class HarvestSourceResponse(BaseModel):
     is_active: bool
     last_harvested_at: Optional[datetime]
     total_candidates_harvested: int
+    harvest_cursor: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -124,6 +125,21 @@ class HarvestSearchRequest(BaseModel):
     search_criteria: Dict[str, Any] = Field(..., description="Keywords, skills, location, experience level")
 
 
+class HarvestRunRequest(BaseModel):
+    """Harvest several sources concurrently."""
+
+    source_names: List[str] = Field(..., min_length=1, description="Sources to harvest in parallel")
+    search_criteria: Dict[str, Any] = Field(..., description="Keywords, skills, location, experience level")
+    full_refresh: bool = Field(default=False, description="Ignore stored cursors and re-fetch from the start")
+
+
+class HarvestRunResponse(BaseModel):
+    """Per-source results of a concurrent harvest run."""
+
+    sources: Dict[str, Dict[str, Any]]
+    duration_seconds: float
+
+
 class HarvestSearchResponse(BaseModel):
     """Harvest search response."""
 
@@ -162,6 +162,8 @@ class PlacementCreateRequest(BaseModel):
     department: Optional[str] = None
     manager_name: Optional[str] = None
     manager_email: Optional[str] = None
+    # Rate card category; the bill rate then counts towards the client's rate history
+    job_category: Optional[str] = Field(default=None, max_length=100)
 
 
 class PlacementResponse(BaseModel):
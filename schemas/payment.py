@@ -208,6 +208,7 @@ class PaymentBatchResult(BaseModel):
     success: bool
     processed: int
     failed: int
+    retryable: int = 0  # transient provider errors; processing the same IDs again retries them
     total_amount: float
     timestamp: datetime
 
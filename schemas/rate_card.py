@@ -105,3 +105,5 @@ class RateValidationResponse(BaseModel):
     rate_card_id: Optional[int] = None
     violations: List[dict] = []
     message: str = ""
+    overall_score: Optional[float] = None
+    recommendation: Optional[str] = None
@@ -278,6 +278,27 @@ class PermissionCheckResponse(BaseModel):
     reason: Optional[str] = None
 
 
+class PermissionCheckItem(BaseModel):
+    """One resource+action pair to check."""
+
+    resource: str = Field(..., min_length=1, max_length=100)
+    action: str = Field(..., min_length=1, max_length=50)
+
+
+class PermissionBulkCheckRequest(BaseModel):
+    """Check many permissions for one user."""
+
+    user_id: int
+    checks: List[PermissionCheckItem] = Field(..., min_length=1, max_length=500)
+
+
+class PermissionBulkCheckResponse(BaseModel):
+    """Bulk permission check result, keyed by "resource:action"."""
+
+    user_id: int
+    results: Dict[str, bool]
+
+
 # ===== User Effective Permissions =====
 
 
@@ -1,12 +1,14 @@
 """Alerts and notifications service."""
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, and_, case, delete, func, desc, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from agents.alert_rule_engine import alert_rule_engine
 from models.alerts import AlertRule, Notification, NotificationPreference
+from services.notification_digest_service import NotificationDigestService
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,7 @@ class AlertsService:
     def __init__(self, db: AsyncSession):
         """Initialize alerts service."""
         self.db = db
+        self.digests = NotificationDigestService(db)
 
     async def get_rules(self, skip: int = 0, limit: int = 20) -> tuple[List[AlertRule], int]:
         """Get all alert rules with pagination."""
@@ -57,7 +60,8 @@ class AlertsService:
                 if hasattr(rule, key) and value is not None:
                     setattr(rule, key, value)
 
-            await self.db.flush()
+            await self.db.commit()
+            alert_rule_engine.invalidate()
             logger.info(f"Updated alert rule {rule_id}")
             return rule
 
@@ -71,7 +75,8 @@ class AlertsService:
             rule = await self.get_rule_by_id(rule_id)
             if rule:
                 rule.is_active = False
-                await self.db.flush()
+                await self.db.commit()
+                alert_rule_engine.invalidate()
                 logger.info(f"Deactivated alert rule {rule_id}")
             return rule
 
@@ -85,7 +90,8 @@ class AlertsService:
             rule = await self.get_rule_by_id(rule_id)
             if rule:
                 rule.is_active = True
-                await self.db.flush()
+                await self.db.commit()
+                alert_rule_engine.invalidate()
                 logger.info(f"Activated alert rule {rule_id}")
             return rule
 
@@ -123,6 +129,11 @@ class AlertsService:
     async def get_unread_count(self, user_id: int) -> int:
         """Get count of unread notifications for user."""
         try:
+            unread = await self.digests.get_unread_count(user_id)
+            if unread is not None:
+                return unread
+
+            # No counter yet (nothing recorded since counters were introduced)
             stmt = select(func.count(Notification.id)).where(
                 and_(
                     Notification.user_id == user_id,
@@ -152,9 +163,12 @@ class AlertsService:
         try:
             notification = await self.get_notification_by_id(notification_id)
             if notification:
+                was_unread = notification.read_at is None
                 notification.read_at = datetime.utcnow()
                 notification.status = "read"
                 await self.db.flush()
+                if was_unread and notification.user_id is not None:
+                    await self.digests.record_read(notification.user_id)
                 logger.debug(f"Marked notification {notification_id} as read")
             return notification
 
@@ -165,22 +179,22 @@ class AlertsService:
     async def mark_all_read(self, user_id: int) -> int:
         """Mark all user notifications as read."""
         try:
-            stmt = select(Notification).where(
-                and_(
-                    Notification.user_id == user_id,
-                    Notification.read_at.is_(None),
+            stmt = (
+                update(Notification)
+                .where(
+                    and_(
+                        Notification.user_id == user_id,
+                        Notification.read_at.is_(None),
+                    )
                 )
+                .values(read_at=datetime.utcnow(), status="read")
+                .execution_options(synchronize_session=False)
             )
             result = await self.db.execute(stmt)
-            notifications = result.scalars().all()
+            await self.digests.reset_unread(user_id)
 
-            for notification in notifications:
-                notification.read_at = datetime.utcnow()
-                notification.status = "read"
-
-            await self.db.flush()
-            logger.info(f"Marked {len(notifications)} notifications as read for user {user_id}")
-            return len(notifications)
+            logger.info(f"Marked {result.rowcount} notifications as read for user {user_id}")
+            return result.rowcount
 
         except Exception as e:
             logger.error(f"Error marking all as read: {str(e)}")
@@ -249,16 +263,35 @@ class AlertsService:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-            stmt = select(Notification).where(Notification.created_at < cutoff_date)
+            # What is about to go, per user, so the counters stay right
+            stmt = (
+                select(
+                    Notification.user_id,
+                    func.count(Notification.id),
+                    func.sum(case((Notification.read_at.is_(None), 1), else_=0)),
+                )
+                .where(
+                    and_(
+                        Notification.created_at < cutoff_date,
+                        Notification.user_id.isnot(None),
+                    )
+                )
+                .group_by(Notification.user_id)
+            )
             result = await self.db.execute(stmt)
-            old_notifications = result.scalars().all()
+            deleted_by_user = result.all()
 
-            for notification in old_notifications:
-                await self.db.delete(notification)
+            stmt = (
+                delete(Notification)
+                .where(Notification.created_at < cutoff_date)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(stmt)
+            for user_id, total, unread in deleted_by_user:
+                await self.digests.record_deleted(user_id, total, unread or 0)
 
-            await self.db.flush()
-            logger.info(f"Deleted {len(old_notifications)} old notifications")
-            return len(old_notifications)
+            logger.info(f"Deleted {result.rowcount} old notifications")
+            return result.rowcount
 
         except Exception as e:
             logger.error(f"Error deleting old notifications: {str(e)}")
@@ -0,0 +1,206 @@
+"""
+API key verification cache.
+
+- Verified keys: an LRU keyed by the key hash holding the ``api_keys`` row,
+  kept for ``ttl_seconds`` and never past the key's ``expires_at``.
+  ``revoke_api_key`` drops the entry immediately in this process; other
+  workers stop accepting a revoked key within ``ttl_seconds``.
+- Unknown keys: a bounded TTL set of hashes that matched no active key, so
+  a client retrying with a revoked or mistyped key does not query the
+  database on every call. Strings that are not shaped like a key we issue
+  are rejected before hashing.
+- Last use: ``record_use`` only remembers the latest timestamp and IP per
+  key; ``flush`` writes them in one executemany UPDATE. ``run`` flushes
+  every ``flush_interval`` seconds and ``close`` flushes what is left.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.security import APIKey
+from utils.principal_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_api_keys = APIKey.__table__
+
+# create_api_key issues "hrp_" + secrets.token_urlsafe(32)
+KEY_FORMAT = re.compile(r"hrp_[A-Za-z0-9_-]{43}")
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class APIKeyCache:
+    """Verified and unknown API key hashes, plus pending last-used writes."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        maxsize: int = 10_000,
+        negative_ttl_seconds: float = 300.0,
+        negative_maxsize: int = 100_000,
+        flush_interval: float = 5.0,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize API key cache.
+
+        Args:
+            ttl_seconds: Longest a verified key is trusted without a query
+            maxsize: Verified keys kept
+            negative_ttl_seconds: How long an unknown hash is remembered
+            negative_maxsize: Unknown hashes kept
+            flush_interval: Seconds between last-used writes in ``run``
+            session_factory: Session factory for ``flush`` (defaults to the app's)
+            clock: Wall clock, compared with key expiry (for tests)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self._session_factory = session_factory
+        self._clock = clock
+        self.verified: TTLCache[Dict[str, Any]] = TTLCache(maxsize, ttl_seconds, clock)
+        self.unknown: TTLCache[bool] = TTLCache(negative_maxsize, negative_ttl_seconds, clock)
+        self._pending: Dict[int, Tuple[datetime, Optional[str]]] = {}
+        self._generation = 0
+        self.rejected = 0
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from database import connection
+
+            return connection.AsyncSessionLocal()
+        return self._session_factory()
+
+    async def lookup(self, db: AsyncSession, plaintext_key: str, key_hash: str) -> Optional[Dict[str, Any]]:
+        """The active, unexpired ``api_keys`` row for ``key_hash`` as a dict, or None."""
+        if not KEY_FORMAT.fullmatch(plaintext_key):
+            self.rejected += 1
+            return None
+        row = self.verified.get(key_hash)
+        if row is not None:
+            return row
+        if self.unknown.get(key_hash):
+            return None
+
+        generation = self._generation
+        result = await db.execute(
+            select(_api_keys).where(
+                and_(
+                    _api_keys.c.key_hash == key_hash,
+                    _api_keys.c.is_active == True,
+                    or_(
+                        _api_keys.c.expires_at.is_(None),
+                        _api_keys.c.expires_at > datetime.utcnow(),
+                    ),
+                )
+            )
+        )
+        found = result.mappings().one_or_none()
+        row = dict(found) if found is not None else None
+        if generation != self._generation:
+            # Revoked while the query ran; answer this call, remember nothing
+            return row
+
+        if row is None:
+            self.unknown.set(key_hash, True)
+            return None
+        expires_at = self._clock() + self.ttl_seconds
+        if row["expires_at"] is not None:
+            expires_at = min(expires_at, _epoch(row["expires_at"]))
+        self.verified.set(key_hash, row, expires_at=expires_at)
+        return row
+
+    def invalidate(self, key_hash: str) -> None:
+        """Forget a key (revoked, or created with a hash remembered as unknown)."""
+        self._generation += 1
+        self.verified.pop(key_hash)
+        self.unknown.pop(key_hash)
+
+    def record_use(self, key_id: int, ip_address: Optional[str] = None) -> None:
+        """Remember that a key was used; written by the next ``flush``."""
+        self._pending[key_id] = (datetime.utcnow(), ip_address)
+
+    async def flush(self) -> int:
+        """Write pending last-used timestamps in one statement; returns how many keys."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        params = [
+            {"key_id": key_id, "used_at": used_at, "used_ip": ip_address}
+            for key_id, (used_at, ip_address) in pending.items()
+        ]
+        try:
+            async with self._new_session() as session:
+                await session.execute(
+                    update(_api_keys)
+                    .where(_api_keys.c.id == bindparam("key_id"))
+                    .values(
+                        last_used_at=bindparam("used_at"),
+                        last_used_ip=func.coalesce(bindparam("used_ip"), _api_keys.c.last_used_ip),
+                    ),
+                    params,
+                )
+                await session.commit()
+        except BaseException as e:
+            # Put them back unless newer uses arrived meanwhile. A cancelled flush
+            # does too: rewriting a timestamp that did land is harmless.
+            for key_id, used in pending.items():
+                self._pending.setdefault(key_id, used)
+            if isinstance(e, Exception):
+                logger.error(f"Error writing API key last use: {str(e)}")
+            raise
+        return len(params)
+
+    async def run(self) -> None:
+        """Flush every ``flush_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass  # logged by flush; retried next interval
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "verified": self.verified.stats(),
+            "unknown": self.unknown.stats(),
+            "rejected": self.rejected,
+            "pending_last_used": len(self._pending),
+        }
+
+
+def create_api_key_cache(settings: Any) -> APIKeyCache:
+    """Build a cache configured from ``settings``."""
+    return APIKeyCache(
+        ttl_seconds=settings.api_key_cache_ttl_seconds,
+        maxsize=settings.api_key_cache_size,
+        negative_ttl_seconds=settings.api_key_negative_cache_ttl_seconds,
+        negative_maxsize=settings.api_key_negative_cache_size,
+        flush_interval=settings.api_key_last_used_flush_seconds,
+    )
+
+
+def _create_cache() -> APIKeyCache:
+    from config import settings
+
+    return create_api_key_cache(settings)
+
+
+api_key_cache = _create_cache()
@@ -0,0 +1,183 @@
+"""
+Asynchronous, batched access-audit logging.
+
+``AccessControlService.log_access`` no longer inserts and commits a row in
+the request; it puts the record in this sink's ring buffer and returns.
+A supervised background task (``run``) writes the buffer to
+``access_logs`` with one multi-row INSERT every ``flush_interval``
+seconds, or as soon as ``batch_size`` records are waiting.
+
+When the buffer is full the oldest record is dropped and counted, so a
+stalled database never grows memory without bound. If a batch cannot be
+inserted it is appended to a JSON-lines file in ``fallback_dir`` (one
+file per day) instead of being lost; those files can be bulk-loaded once
+the database is back. ``close`` flushes everything that is left and runs
+on shutdown. A batch being written when ``run`` is cancelled is shielded:
+its write finishes (to the table or the fallback file) and ``close``
+waits for it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.security import AccessLog
+
+logger = logging.getLogger(__name__)
+
+_access_logs = AccessLog.__table__
+
+
+class AuditSink:
+    """Ring buffer of access records, flushed to the database in bulk."""
+
+    def __init__(
+        self,
+        capacity: int = 50_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.25,
+        fallback_dir: str = "logs/audit",
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        """Initialize audit sink.
+
+        Args:
+            capacity: Records buffered before the oldest are dropped
+            batch_size: Records per INSERT; a full batch triggers a flush
+            flush_interval: Longest a record waits before it is written
+            fallback_dir: Directory for JSON-lines files when inserts fail
+            session_factory: Session factory (defaults to the app's)
+            clock: Timestamp source for records (for tests)
+        """
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fallback_dir = fallback_dir
+        self._session_factory = session_factory
+        self._clock = clock
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._in_flight: Set[asyncio.Future] = set()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.fallback_written = 0
+        self.failed_batches = 0
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from database import connection
+
+            return connection.AsyncSessionLocal()
+        return self._session_factory()
+
+    @property
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    def enqueue(self, **record: Any) -> None:
+        """Buffer one ``access_logs`` row (column values); never blocks."""
+        record.setdefault("timestamp", self._clock())
+        if len(self._buffer) == self.capacity:
+            self.dropped += 1
+        self._buffer.append(record)
+        self.enqueued += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _take(self) -> List[Dict[str, Any]]:
+        count = min(self.batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    async def _insert(self, batch: List[Dict[str, Any]]) -> None:
+        async with self._new_session() as session:
+            await session.execute(_access_logs.insert(), batch)
+            await session.commit()
+
+    def _write_fallback(self, batch: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.fallback_dir, exist_ok=True)
+        path = os.path.join(self.fallback_dir, f"access-{self._clock():%Y%m%d}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, default=str) + "\n" for record in batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self._insert(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.error(f"Audit insert failed, writing {len(batch)} records to {self.fallback_dir}: {str(e)}")
+            try:
+                await asyncio.to_thread(self._write_fallback, batch)
+                self.fallback_written += len(batch)
+            except Exception as fallback_error:
+                self.dropped += len(batch)
+                logger.error(f"Audit fallback write failed: {str(fallback_error)}")
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns how many records were written."""
+        written = 0
+        async with self._lock:
+            while self._buffer:
+                batch = self._take()
+                # The batch has left the buffer: cancelling flush must not lose it
+                write = asyncio.ensure_future(self._write(batch))
+                self._in_flight.add(write)
+                write.add_done_callback(self._in_flight.discard)
+                await asyncio.shield(write)
+                written += len(batch)
+        return written
+
+    async def run(self) -> None:
+        """Flush every ``flush_interval`` seconds, or when a batch is full, until cancelled."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def close(self) -> None:
+        """Flush what is left (called on shutdown, after the flush task is cancelled)."""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        await self.flush()
+        logger.info(f"Audit sink closed: {self.stats()}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "fallback_written": self.fallback_written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
+
+
+def create_audit_sink(settings: Any) -> AuditSink:
+    """Build a sink configured from ``settings``."""
+    return AuditSink(
+        capacity=settings.audit_buffer_capacity,
+        batch_size=settings.audit_batch_size,
+        flush_interval=settings.audit_flush_interval_ms / 1000,
+        fallback_dir=settings.audit_fallback_dir,
+    )
+
+
+def _create_sink() -> AuditSink:
+    from config import settings
+
+    return create_audit_sink(settings)
+
+
+audit_sink = _create_sink()
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 
 from models.user import User
 from models.enums import UserRole
+from utils.principal_cache import principal_cache
 from utils.security import hash_password, verify_password, create_access_token, create_refresh_token, verify_token
 
 logger = logging.getLogger(__name__)
@@ -227,6 +228,7 @@ class AuthService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user_id)
 
         logger.info(f"Password changed for user {user_id}")
         return user
@@ -312,6 +314,7 @@ class AuthService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user.id)
 
         logger.info(f"Password reset completed for user {user.id}")
         return user
@@ -400,6 +403,7 @@ class AuthService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user_id)
 
         logger.info(f"Profile updated for user {user_id}")
         return user
@@ -424,6 +428,7 @@ class AuthService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user_id)
 
         logger.info(f"User deactivated: {user_id}")
         return user
@@ -0,0 +1,276 @@
+"""
+Content-addressed blob storage for uploaded files.
+
+Uploads are streamed in fixed-size chunks to a spool file while their
+SHA-256 is computed, so memory use stays at one chunk per upload no
+matter how large the file is. The digest becomes the storage key, which
+means identical files (e.g. the same resume submitted for two candidates)
+are stored once. Size limits are enforced while streaming; an oversized
+upload is abandoned as soon as it crosses the limit.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds its size limit."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Where a stored blob lives and what it contains."""
+    uri: str
+    sha256: str
+    size: int
+    deduplicated: bool = False
+
+
+class ByteBudget:
+    """Byte allowance shared by every file in one request."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    async def limit(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Pass chunks through, raising ``UploadTooLarge`` once the budget is spent."""
+        async for chunk in chunks:
+            self.used += len(chunk)
+            if self.used > self.max_bytes:
+                raise UploadTooLarge(self.max_bytes)
+            yield chunk
+
+
+def check_declared_size(content_length: Optional[str], max_bytes: int) -> None:
+    """Reject a request up front when its Content-Length is already over the limit."""
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+
+async def iter_upload(upload: Any, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an ``UploadFile`` (or anything with async ``read(n)``) chunk by chunk."""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def blob_key(sha256: str, suffix: str = "") -> str:
+    """Storage key for a digest, fanned out so no directory gets too large."""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{suffix.lower()}"
+
+
+def _write_chunk(f, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    f.write(chunk)
+
+
+async def spool_stream(
+    chunks: AsyncIterator[bytes], directory: Path, max_bytes: Optional[int] = None
+) -> Tuple[Path, str, int]:
+    """
+    Write a stream to a temporary file in ``directory``, hashing as it goes.
+
+    Returns ``(path, sha256, size)``. The temp file is removed if the stream
+    fails or exceeds ``max_bytes``.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".part")
+    tmp_path = Path(tmp_name)
+    digest = hashlib.sha256()
+    size = 0
+    f = os.fdopen(fd, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            await asyncio.to_thread(_write_chunk, f, digest, chunk)
+        f.close()
+    except BaseException:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+
+class BlobStore(ABC):
+    """Abstract base class for blob storage backends."""
+
+    @abstractmethod
+    async def put_stream(
+        self, chunks: AsyncIterator[bytes], suffix: str = "", max_bytes: Optional[int] = None
+    ) -> BlobRef:
+        """Store a stream under its content hash.
+
+        Args:
+            chunks: Async iterator of file content
+            suffix: File extension to keep on the stored blob (e.g. ".pdf")
+            max_bytes: Per-file size limit
+
+        Returns:
+            Reference to the stored (or already present) blob
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, uri: str) -> None:
+        """Remove a blob. Missing blobs are ignored."""
+        pass
+
+    @abstractmethod
+    async def materialize(self, uri: str) -> str:
+        """Return a local file path holding the blob's content."""
+        pass
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs stored as files under a root directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.spool_dir = self.root / ".incoming"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    async def put_stream(
+        self, chunks: AsyncIterator[bytes], suffix: str = "", max_bytes: Optional[int] = None
+    ) -> BlobRef:
+        tmp_path, sha256, size = await spool_stream(chunks, self.spool_dir, max_bytes)
+        target = self.root / blob_key(sha256, suffix)
+        deduplicated = await asyncio.to_thread(self._commit, tmp_path, target)
+        if deduplicated:
+            logger.info(f"Upload matches existing blob {sha256[:12]}; stored once")
+        return BlobRef(uri=str(target), sha256=sha256, size=size, deduplicated=deduplicated)
+
+    @staticmethod
+    def _commit(tmp_path: Path, target: Path) -> bool:
+        if target.exists():
+            tmp_path.unlink(missing_ok=True)
+            return True
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, target)
+        return False
+
+    async def delete(self, uri: str) -> None:
+        await asyncio.to_thread(Path(uri).unlink, missing_ok=True)
+
+    async def materialize(self, uri: str) -> str:
+        return uri
+
+
+class S3BlobStore(BlobStore):
+    """
+    Blobs stored in an S3-compatible bucket.
+
+    Uploads are spooled to local disk first so the digest (and therefore
+    the key) is known before anything is sent; a blob already in the
+    bucket is not uploaded again. ``materialize`` downloads into a local
+    cache for code that needs a file path (text extraction).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "resumes",
+        client: Any = None,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        cache_dir: str = "/tmp/resume-blob-cache",
+    ):
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                region_name=region,
+                endpoint_url=endpoint_url,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.cache_dir = Path(cache_dir)
+
+    def _key(self, sha256: str, suffix: str) -> str:
+        key = blob_key(sha256, suffix)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _split_uri(self, uri: str) -> Tuple[str, str]:
+        bucket, _, key = uri[len("s3://"):].partition("/")
+        return bucket, key
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception as e:
+            code = str(getattr(e, "response", {}).get("Error", {}).get("Code", ""))
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def put_stream(
+        self, chunks: AsyncIterator[bytes], suffix: str = "", max_bytes: Optional[int] = None
+    ) -> BlobRef:
+        tmp_path, sha256, size = await spool_stream(chunks, self.cache_dir / ".incoming", max_bytes)
+        key = self._key(sha256, suffix)
+        try:
+            deduplicated = await asyncio.to_thread(self._exists, key)
+            if not deduplicated:
+                await asyncio.to_thread(self.client.upload_file, str(tmp_path), self.bucket, key)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return BlobRef(uri=f"s3://{self.bucket}/{key}", sha256=sha256, size=size, deduplicated=deduplicated)
+
+    async def delete(self, uri: str) -> None:
+        if not uri.startswith("s3://"):
+            await asyncio.to_thread(Path(uri).unlink, missing_ok=True)
+            return
+        bucket, key = self._split_uri(uri)
+        await asyncio.to_thread(self.client.delete_object, Bucket=bucket, Key=key)
+
+    async def materialize(self, uri: str) -> str:
+        # Resumes uploaded before the S3 backend was enabled keep local paths
+        if not uri.startswith("s3://"):
+            return uri
+        bucket, key = self._split_uri(uri)
+        local_path = self.cache_dir / key
+        if not local_path.exists():
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = local_path.with_name(f"{local_path.name}.part")
+            await asyncio.to_thread(self.client.download_file, bucket, key, str(partial))
+            os.replace(partial, local_path)
+        return str(local_path)
+
+
+def create_blob_store(settings: Any) -> BlobStore:
+    """Build the backend selected by ``settings.resume_storage_backend``."""
+    if settings.resume_storage_backend == "s3":
+        return S3BlobStore(
+            bucket=settings.aws_s3_bucket,
+            region=settings.aws_s3_region,
+            endpoint_url=settings.aws_s3_endpoint_url,
+            access_key_id=settings.aws_access_key_id,
+            secret_access_key=settings.aws_secret_access_key,
+        )
+    return LocalBlobStore(settings.resume_upload_dir)
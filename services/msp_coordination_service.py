@@ -16,6 +16,7 @@ from models.enums import (
     VMSSubmissionStatus, DistributionStatus, PlacementStatus,
     MSPReviewDecision, ClientFeedbackDecision,
 )
+from services.rate_card_service import RateCardService
 
 logger = logging.getLogger(__name__)
 
@@ -89,30 +90,27 @@ class MSPCoordinationService:
         now = datetime.utcnow()
 
         # 1. Supplier response SLA — distributions with no submissions past deadline
+        has_submissions = select(SupplierCandidateSubmission.id).where(
+            SupplierCandidateSubmission.requirement_distribution_id == RequirementDistribution.id
+        ).exists()
         dist_stmt = select(RequirementDistribution).where(
             RequirementDistribution.organization_id == msp_org_id,
             RequirementDistribution.status == DistributionStatus.ACTIVE,
+            RequirementDistribution.distributed_at < now - timedelta(hours=DEFAULT_SLAS["supplier_response"]),
+            ~has_submissions,
         )
         dist_result = await self.session.execute(dist_stmt)
-        distributions = list(dist_result.scalars().all())
 
-        for dist in distributions:
+        for dist in dist_result.scalars().all():
             hours_since = (now - dist.distributed_at.replace(tzinfo=None)).total_seconds() / 3600
-            if hours_since > DEFAULT_SLAS["supplier_response"]:
-                # Check if any submissions exist
-                count_stmt = select(func.count(SupplierCandidateSubmission.id)).where(
-                    SupplierCandidateSubmission.requirement_distribution_id == dist.id
-                )
-                count_result = await self.session.execute(count_stmt)
-                if (count_result.scalar() or 0) == 0:
-                    breaches.append({
-                        "type": "supplier_response",
-                        "entity_id": dist.id,
-                        "entity_type": "distribution",
-                        "supplier_org_id": dist.supplier_org_id,
-                        "requirement_id": dist.requirement_id,
-                        "hours_overdue": round(hours_since - DEFAULT_SLAS["supplier_response"], 1),
-                    })
+            breaches.append({
+                "type": "supplier_response",
+                "entity_id": dist.id,
+                "entity_type": "distribution",
+                "supplier_org_id": dist.supplier_org_id,
+                "requirement_id": dist.requirement_id,
+                "hours_overdue": round(hours_since - DEFAULT_SLAS["supplier_response"], 1),
+            })
 
         # 2. MSP review SLA — submissions waiting for review
         pending_stmt = select(SupplierCandidateSubmission).where(
@@ -148,8 +146,15 @@ class MSPCoordinationService:
         department: Optional[str] = None,
         manager_name: Optional[str] = None,
         manager_email: Optional[str] = None,
+        job_category: Optional[str] = None,
     ) -> PlacementRecord:
-        """Create a placement record from a successful submission."""
+        """
+        Create a placement record from a successful submission.
+
+        When ``job_category`` is given, the placed bill rate is added to the
+        client's rate history used by rate validation (and stored on the
+        placement, which is where that history is reloaded from).
+        """
         # Get submission and related data
         sub_stmt = select(SupplierCandidateSubmission).where(
             SupplierCandidateSubmission.id == submission_id
@@ -189,6 +194,7 @@ class MSPCoordinationService:
             bill_rate=bill_rate,
             pay_rate=pay_rate,
             msp_margin=msp_margin or (bill_rate - pay_rate),
+            job_category=job_category,
             status=PlacementStatus.ACTIVE,
             work_location=work_location,
             job_title=job_title,
@@ -207,6 +213,9 @@ class MSPCoordinationService:
         await self.session.commit()
         await self.session.refresh(placement)
 
+        if job_category:
+            RateCardService(self.session).record_accepted_rate(client_org_id, job_category, bill_rate)
+
         logger.info(f"Created placement for submission {submission_id}")
         return placement
 
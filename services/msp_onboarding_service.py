@@ -12,6 +12,7 @@ from models.organization import Organization
 from models.user import User
 from models.tenant_management import OrganizationMembership, OrganizationInvitation
 from models.enums import OrganizationType, OrgOnboardingStatus, UserRole, SupplierTier
+from utils.principal_cache import principal_cache
 from utils.security import hash_password
 
 logger = logging.getLogger(__name__)
@@ -206,6 +207,7 @@ class MSPOnboardingService:
 
         org.onboarding_status = OrgOnboardingStatus.ACTIVE
         await self.session.commit()
+        principal_cache.invalidate_organization(org_id)
         logger.info(f"Activated organization: {org.name} (id={org_id})")
         return org
 
@@ -225,6 +227,7 @@ class MSPOnboardingService:
             settings["suspended_at"] = datetime.utcnow().isoformat()
             org.settings = settings
         await self.session.commit()
+        principal_cache.invalidate_organization(org_id)
         logger.info(f"Suspended organization: {org.name} (reason={reason})")
         return org
 
@@ -240,6 +243,7 @@ class MSPOnboardingService:
         org.onboarding_status = OrgOnboardingStatus.OFFBOARDED
         org.is_active = False
         await self.session.commit()
+        principal_cache.invalidate_organization(org_id)
         logger.info(f"Offboarded organization: {org.name}")
         return org
 
@@ -4,15 +4,61 @@ import logging
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, insert, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from models.organization import Organization
-from models.requirement import Requirement
 from models.msp_workflow import RequirementDistribution, SupplierCandidateSubmission
 from models.enums import DistributionStatus, RequirementStatus
 
 logger = logging.getLogger(__name__)
 
+_distributions = RequirementDistribution.__table__
+
+
+def submission_count(*criteria):
+    """Correlated COUNT of a distribution's submissions, for selecting alongside it."""
+    return (
+        select(func.count(SupplierCandidateSubmission.id))
+        .where(
+            SupplierCandidateSubmission.requirement_distribution_id == RequirementDistribution.id,
+            *criteria,
+        )
+        .correlate(RequirementDistribution)
+        .scalar_subquery()
+        .label("submission_count")
+    )
+
+
+def reactivate_distributions(requirement_id: int, supplier_org_ids: List[int], **values):
+    """UPDATE setting a requirement's inactive distributions for the given suppliers back to active."""
+    return (
+        update(_distributions)
+        .where(
+            _distributions.c.requirement_id == requirement_id,
+            _distributions.c.supplier_org_id.in_(supplier_org_ids),
+            _distributions.c.status != DistributionStatus.ACTIVE,
+        )
+        .values(status=DistributionStatus.ACTIVE, **values)
+    )
+
+
+def distribution_rows(
+    msp_org_id: int, requirement_id: int, supplier_org_ids: List[int], **values
+) -> List[Dict[str, Any]]:
+    """Parameter rows for inserting active distributions of a requirement."""
+    return [
+        {
+            "organization_id": msp_org_id,
+            "requirement_id": requirement_id,
+            "supplier_org_id": supplier_org_id,
+            "status": DistributionStatus.ACTIVE,
+            **values,
+        }
+        for supplier_org_id in supplier_org_ids
+    ]
+
 
 class MSPRequirementService:
     """Manages requirement distribution from MSP to suppliers."""
@@ -32,48 +78,73 @@ class MSPRequirementService:
     ) -> List[RequirementDistribution]:
         """
         Distribute a requirement to one or more suppliers.
-        Creates a RequirementDistribution record per supplier.
+
+        Existing distributions are looked up in one query and new ones are
+        inserted in one statement. Suppliers already holding an active
+        distribution keep it; revoked or expired ones are reactivated in place,
+        since a requirement has one distribution row per supplier.
+
+        Returns:
+            One distribution per supplier, in the order given
         """
-        distributions = []
-
-        for supplier_org_id in supplier_org_ids:
-            # Check if already distributed to this supplier
-            stmt = select(RequirementDistribution).where(
-                RequirementDistribution.requirement_id == requirement_id,
-                RequirementDistribution.supplier_org_id == supplier_org_id,
-                RequirementDistribution.status == DistributionStatus.ACTIVE,
-            )
-            result = await self.session.execute(stmt)
-            existing = result.scalar_one_or_none()
+        supplier_org_ids = list(dict.fromkeys(supplier_org_ids))
+        if not supplier_org_ids:
+            return []
+        now = datetime.utcnow()
 
-            if existing:
+        existing_stmt = select(RequirementDistribution).where(
+            RequirementDistribution.requirement_id == requirement_id,
+            RequirementDistribution.supplier_org_id.in_(supplier_org_ids),
+        )
+        existing = {
+            dist.supplier_org_id: dist
+            for dist in (await self.session.execute(existing_stmt)).scalars().all()
+        }
+
+        values = {
+            "distributed_by_user_id": distributed_by_user_id,
+            "distributed_at": now,
+            "expires_at": expires_at,
+            "max_submissions": max_submissions,
+            "notes_to_supplier": notes_to_supplier,
+        }
+        reactivated = []
+        for supplier_org_id, dist in existing.items():
+            if dist.status == DistributionStatus.ACTIVE:
                 logger.warning(
                     f"Requirement {requirement_id} already distributed to supplier {supplier_org_id}"
                 )
-                distributions.append(existing)
                 continue
-
-            dist = RequirementDistribution(
-                organization_id=msp_org_id,
-                requirement_id=requirement_id,
-                supplier_org_id=supplier_org_id,
-                distributed_by_user_id=distributed_by_user_id,
-                distributed_at=datetime.utcnow(),
-                expires_at=expires_at,
-                status=DistributionStatus.ACTIVE,
-                max_submissions=max_submissions,
-                notes_to_supplier=notes_to_supplier,
+            reactivated.append(dist)
+        if reactivated:
+            await self.session.execute(
+                reactivate_distributions(requirement_id, [d.supplier_org_id for d in reactivated], **values)
+            )
+            # The UPDATE already wrote these: keep the loaded rows in step without dirtying them
+            for dist in reactivated:
+                for key, value in {"status": DistributionStatus.ACTIVE, **values}.items():
+                    set_committed_value(dist, key, value)
+
+        new_rows = distribution_rows(
+            msp_org_id,
+            requirement_id,
+            [supplier_org_id for supplier_org_id in supplier_org_ids if supplier_org_id not in existing],
+            **values,
+        )
+        if new_rows:
+            inserted = await self.session.scalars(
+                insert(RequirementDistribution).returning(RequirementDistribution),
+                new_rows,
             )
-            self.session.add(dist)
-            distributions.append(dist)
+            existing.update((dist.supplier_org_id, dist) for dist in inserted.all())
 
-        await self.session.flush()
         await self.session.commit()
 
         logger.info(
-            f"Distributed requirement {requirement_id} to {len(supplier_org_ids)} suppliers"
+            f"Distributed requirement {requirement_id} to {len(supplier_org_ids)} suppliers "
+            f"({len(new_rows)} new)"
         )
-        return distributions
+        return [existing[supplier_org_id] for supplier_org_id in supplier_org_ids]
 
     async def revoke_distribution(self, distribution_id: int) -> RequirementDistribution:
         """Revoke a supplier's access to a requirement."""
@@ -93,9 +164,15 @@ class MSPRequirementService:
     async def get_distributions_for_requirement(
         self, requirement_id: int, include_expired: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get all distributions for a requirement with submission counts."""
-        stmt = select(RequirementDistribution).where(
-            RequirementDistribution.requirement_id == requirement_id,
+        """Get all distributions for a requirement with submission counts, in one query."""
+        stmt = (
+            select(
+                RequirementDistribution,
+                submission_count(),
+                Organization.name,
+            )
+            .outerjoin(Organization, Organization.id == RequirementDistribution.supplier_org_id)
+            .where(RequirementDistribution.requirement_id == requirement_id)
         )
         if not include_expired:
             stmt = stmt.where(
@@ -107,36 +184,26 @@ class MSPRequirementService:
         stmt = stmt.order_by(RequirementDistribution.distributed_at.desc())
 
         result = await self.session.execute(stmt)
-        distributions = list(result.scalars().all())
-
-        # Get submission counts per distribution
-        enriched = []
-        for dist in distributions:
-            count_stmt = select(func.count(SupplierCandidateSubmission.id)).where(
-                SupplierCandidateSubmission.requirement_distribution_id == dist.id
-            )
-            count_result = await self.session.execute(count_stmt)
-            sub_count = count_result.scalar() or 0
-
-            # Get supplier org name
-            org_stmt = select(Organization.name).where(Organization.id == dist.supplier_org_id)
-            org_result = await self.session.execute(org_stmt)
-            supplier_name = org_result.scalar() or "Unknown"
-
-            enriched.append({
+        return [
+            {
                 "distribution": dist,
                 "submission_count": sub_count,
-                "supplier_org_name": supplier_name,
-            })
-
-        return enriched
+                "supplier_org_name": supplier_name or "Unknown",
+            }
+            for dist, sub_count, supplier_name in result.all()
+        ]
 
     async def get_supplier_opportunities(
         self, supplier_org_id: int, status_filter: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get requirements distributed to a supplier (supplier's view)."""
-        stmt = select(RequirementDistribution).where(
-            RequirementDistribution.supplier_org_id == supplier_org_id,
+        """Get requirements distributed to a supplier (supplier's view), in one query."""
+        stmt = (
+            select(
+                RequirementDistribution,
+                submission_count(SupplierCandidateSubmission.organization_id == supplier_org_id),
+            )
+            .options(joinedload(RequirementDistribution.requirement))
+            .where(RequirementDistribution.supplier_org_id == supplier_org_id)
         )
         if status_filter:
             stmt = stmt.where(RequirementDistribution.status == status_filter)
@@ -145,31 +212,16 @@ class MSPRequirementService:
 
         stmt = stmt.order_by(RequirementDistribution.distributed_at.desc())
         result = await self.session.execute(stmt)
-        distributions = list(result.scalars().all())
-
-        enriched = []
-        for dist in distributions:
-            # Get requirement details
-            req_stmt = select(Requirement).where(Requirement.id == dist.requirement_id)
-            req_result = await self.session.execute(req_stmt)
-            requirement = req_result.scalar_one_or_none()
-
-            # Count my submissions
-            count_stmt = select(func.count(SupplierCandidateSubmission.id)).where(
-                SupplierCandidateSubmission.requirement_distribution_id == dist.id,
-                SupplierCandidateSubmission.organization_id == supplier_org_id,
-            )
-            count_result = await self.session.execute(count_stmt)
-            my_submissions = count_result.scalar() or 0
 
-            enriched.append({
+        return [
+            {
                 "distribution": dist,
-                "requirement": requirement,
+                "requirement": dist.requirement,
                 "my_submission_count": my_submissions,
                 "remaining_submissions": dist.max_submissions - my_submissions,
-            })
-
-        return enriched
+            }
+            for dist, my_submissions in result.all()
+        ]
 
     async def check_expired_distributions(self) -> int:
         """Mark expired distributions. Called by scheduler."""
@@ -0,0 +1,297 @@
+"""
+Materialized notification digests and unread counters.
+
+Every notification that is created for a user is folded into two small
+tables in the same transaction:
+
+- ``notification_digest_buckets``: one row per user and UTC day with the
+  total and per-priority counts. A daily digest reads one bucket, a weekly
+  digest sums seven, instead of scanning the notifications themselves.
+- ``notification_counters``: one row per user with the unread and total
+  counts, so unread badges are a primary-key lookup.
+
+Both are maintained with ``INSERT ... ON CONFLICT DO UPDATE`` increments,
+so concurrent writers never lose an update. ``rebuild`` recomputes both
+tables from the notifications table (repair); ``backfill`` runs it once
+at startup, before any counter exists, so notifications stored before the
+counters were introduced are included.
+
+The statements here work on the tables directly: they are aggregate
+bookkeeping and never need ORM instances.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.alerts import Notification, NotificationCounter, NotificationDigestBucket, NotificationPreference
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("critical", "high", "medium", "low")
+DIGEST_PERIOD_DAYS = {"daily": 1, "weekly": 7}
+
+_buckets = NotificationDigestBucket.__table__
+_counters = NotificationCounter.__table__
+_notifications = Notification.__table__
+_preferences = NotificationPreference.__table__
+
+
+def digest_window(period: str, as_of: Optional[date] = None) -> Tuple[date, date]:
+    """First and last UTC day covered by a digest ending on ``as_of``."""
+    end = as_of or datetime.utcnow().date()
+    return end - timedelta(days=DIGEST_PERIOD_DAYS.get(period, 1) - 1), end
+
+
+def _empty_counts() -> Dict[str, Any]:
+    return {"total": 0, **{priority: 0 for priority in PRIORITIES}, "last_at": None}
+
+
+class NotificationDigestService:
+    """Incremental digest buckets and unread counters for notifications."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize notification digest service."""
+        self.db = db
+
+    def _insert(self, table):
+        bind = self.db.bind
+        dialect = bind.dialect.name if bind is not None else "postgresql"
+        return sqlite_insert(table) if dialect == "sqlite" else postgresql_insert(table)
+
+    async def record_created(self, notifications: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Count newly created notifications.
+
+        Each item needs ``user_id`` and ``priority``; ``created_at`` defaults
+        to now and ``read_at`` to unread. Items without a user are ignored.
+        Call in the transaction that inserts the notifications.
+        """
+        now = datetime.utcnow()
+        by_day: Dict[Tuple[int, date], Dict[str, Any]] = defaultdict(_empty_counts)
+        by_user: Dict[int, Dict[str, int]] = defaultdict(lambda: {"unread": 0, "total": 0})
+
+        for notification in notifications:
+            user_id = notification.get("user_id")
+            if user_id is None:
+                continue
+            created_at = notification.get("created_at") or now
+            counts = by_day[(user_id, created_at.date())]
+            counts["total"] += 1
+            priority = notification.get("priority") or "medium"
+            if priority in PRIORITIES:
+                counts[priority] += 1
+            if counts["last_at"] is None or created_at > counts["last_at"]:
+                counts["last_at"] = created_at
+            by_user[user_id]["total"] += 1
+            if notification.get("read_at") is None:
+                by_user[user_id]["unread"] += 1
+
+        if not by_user:
+            return
+
+        stmt = self._insert(_buckets).values([
+            {
+                "user_id": user_id,
+                "bucket_date": day,
+                "total_count": counts["total"],
+                **{f"{priority}_count": counts[priority] for priority in PRIORITIES},
+                "last_notification_at": counts["last_at"],
+            }
+            for (user_id, day), counts in sorted(by_day.items())
+        ])
+        increments = {
+            column: _buckets.c[column] + stmt.excluded[column]
+            for column in ("total_count", *(f"{priority}_count" for priority in PRIORITIES))
+        }
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "bucket_date"],
+            set_={
+                **increments,
+                "last_notification_at": func.coalesce(
+                    stmt.excluded.last_notification_at, _buckets.c.last_notification_at
+                ),
+                "updated_at": func.now(),
+            },
+        ))
+
+        stmt = self._insert(_counters).values([
+            {"user_id": user_id, "unread_count": counts["unread"], "total_count": counts["total"]}
+            for user_id, counts in sorted(by_user.items())
+        ])
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "unread_count": _counters.c.unread_count + stmt.excluded.unread_count,
+                "total_count": _counters.c.total_count + stmt.excluded.total_count,
+                "updated_at": func.now(),
+            },
+        ))
+
+    async def record_read(self, user_id: int, count: int = 1) -> None:
+        """Take ``count`` notifications off a user's unread counter (never below zero)."""
+        if count <= 0:
+            return
+        await self.db.execute(
+            update(_counters)
+            .where(_counters.c.user_id == user_id)
+            .values(unread_count=case(
+                (_counters.c.unread_count > count, _counters.c.unread_count - count), else_=0
+            ))
+        )
+
+    async def record_deleted(self, user_id: int, total: int, unread: int) -> None:
+        """Take deleted notifications off a user's counters; digest buckets keep their history."""
+        if total <= 0:
+            return
+        await self.db.execute(
+            update(_counters)
+            .where(_counters.c.user_id == user_id)
+            .values(
+                total_count=case((_counters.c.total_count > total, _counters.c.total_count - total), else_=0),
+                unread_count=case((_counters.c.unread_count > unread, _counters.c.unread_count - unread), else_=0),
+            )
+        )
+
+    async def reset_unread(self, user_id: int) -> None:
+        """Zero a user's unread counter (everything was marked read)."""
+        await self.db.execute(
+            update(_counters).where(_counters.c.user_id == user_id).values(unread_count=0)
+        )
+
+    async def get_unread_count(self, user_id: int) -> Optional[int]:
+        """Unread count from the counter row, or None if the user has none yet."""
+        result = await self.db.execute(
+            select(_counters.c.unread_count).where(_counters.c.user_id == user_id)
+        )
+        return result.scalar()
+
+    async def get_counts(self, user_id: int, period: str = "daily", as_of: Optional[date] = None) -> Dict[str, Any]:
+        """Total and per-priority counts for one user's digest window."""
+        start, end = digest_window(period, as_of)
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(_buckets.c.total_count), 0),
+                *(func.coalesce(func.sum(_buckets.c[f"{priority}_count"]), 0) for priority in PRIORITIES),
+            ).where(
+                and_(
+                    _buckets.c.user_id == user_id,
+                    _buckets.c.bucket_date >= start,
+                    _buckets.c.bucket_date <= end,
+                )
+            )
+        )
+        total, *by_priority = result.one()
+        return {
+            "start": start,
+            "end": end,
+            "total": total,
+            "by_priority": dict(zip(PRIORITIES, by_priority)),
+        }
+
+    async def stream_digests(self, period: str = "daily", as_of: Optional[date] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Digest counts for every user whose ``digest_frequency`` is ``period``.
+
+        One grouped query over the buckets of the window, streamed in user
+        order; users without preferences get the default daily digest and
+        users with nothing in the window are skipped.
+        """
+        start, end = digest_window(period, as_of)
+        stmt = (
+            select(
+                _buckets.c.user_id,
+                func.sum(_buckets.c.total_count).label("total"),
+                *(func.sum(_buckets.c[f"{priority}_count"]).label(priority) for priority in PRIORITIES),
+                func.max(_buckets.c.last_notification_at).label("last_notification_at"),
+                func.max(func.coalesce(_counters.c.unread_count, 0)).label("unread_count"),
+            )
+            .select_from(
+                _buckets
+                .outerjoin(_preferences, _preferences.c.user_id == _buckets.c.user_id)
+                .outerjoin(_counters, _counters.c.user_id == _buckets.c.user_id)
+            )
+            .where(
+                and_(
+                    _buckets.c.bucket_date >= start,
+                    _buckets.c.bucket_date <= end,
+                    func.coalesce(_preferences.c.digest_frequency, literal("daily")) == period,
+                )
+            )
+            .group_by(_buckets.c.user_id)
+            .having(func.sum(_buckets.c.total_count) > 0)
+            .order_by(_buckets.c.user_id)
+        )
+        result = await self.db.stream(stmt)
+        async for row in result:
+            yield {
+                "user_id": row.user_id,
+                "period": period,
+                "start": start,
+                "end": end,
+                "total_notifications": row.total,
+                "by_priority": {priority: row._mapping[priority] for priority in PRIORITIES},
+                "last_notification_at": row.last_notification_at,
+                "unread_count": row.unread_count,
+            }
+
+    async def rebuild(self) -> int:
+        """Recompute buckets and counters from the notifications table; returns users counted."""
+        day = func.date(_notifications.c.created_at)
+        by_day = (
+            select(
+                _notifications.c.user_id,
+                day.label("bucket_date"),
+                func.count().label("total_count"),
+                *(
+                    func.sum(case((_notifications.c.priority == priority, 1), else_=0)).label(f"{priority}_count")
+                    for priority in PRIORITIES
+                ),
+                func.max(_notifications.c.created_at).label("last_notification_at"),
+            )
+            .where(_notifications.c.user_id.isnot(None))
+            .group_by(_notifications.c.user_id, day)
+        )
+        by_user = (
+            select(
+                _notifications.c.user_id,
+                func.sum(case((_notifications.c.read_at.is_(None), 1), else_=0)).label("unread_count"),
+                func.count().label("total_count"),
+            )
+            .where(_notifications.c.user_id.isnot(None))
+            .group_by(_notifications.c.user_id)
+        )
+
+        await self.db.execute(delete(_buckets))
+        await self.db.execute(delete(_counters))
+        await self.db.execute(
+            _buckets.insert().from_select(
+                ["user_id", "bucket_date", "total_count", *(f"{p}_count" for p in PRIORITIES), "last_notification_at"],
+                by_day,
+            )
+        )
+        result = await self.db.execute(
+            _counters.insert().from_select(["user_id", "unread_count", "total_count"], by_user)
+        )
+        logger.info(f"Rebuilt notification digests and counters for {result.rowcount} users")
+        return result.rowcount
+
+    async def backfill(self) -> Optional[int]:
+        """
+        Rebuild and commit if no counters exist yet; returns users counted, or None if skipped.
+
+        Run at startup before serving requests: once the first counter row
+        exists, later increments assume it already holds the earlier history.
+        """
+        result = await self.db.execute(select(_counters.c.user_id).limit(1))
+        if result.first() is not None:
+            return None
+        users = await self.rebuild()
+        await self.db.commit()
+        return users
@@ -0,0 +1,277 @@
+"""
+Batch payment processing against the payments table.
+
+A batch runs in three steps:
+
+1. Claim: pending payments move to ``processing`` in one statement, and
+   each gets an idempotency key, stored on the row before any provider is
+   called. A pending row claimed first by a concurrent batch ends up with
+   that batch's key and is skipped. Payments already ``processing`` (left
+   by an interrupted run) keep the key they were claimed with and are
+   resumed by every batch that includes them, so two concurrent resumes
+   both send them; the shared key lets the provider drop the duplicate.
+   Run one resume batch at a time.
+2. Send: provider calls run concurrently, at most ``limits[provider]`` at
+   a time per provider. Every call carries the payment's idempotency key,
+   so sending a payment again after a crash cannot pay it twice.
+3. Record: outcomes are buffered and written with one executemany
+   UPDATE per ``write_batch_size`` payments.
+
+A provider raising ``PaymentDeclined`` fails the payment. Any other error
+is treated as transient: the payment stays ``processing`` with its key,
+and running the batch again retries it.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.payment import Payment
+
+logger = logging.getLogger(__name__)
+
+ProviderCall = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+_payments = Payment.__table__
+
+CLAIMABLE = ("pending", "processing")
+
+_CLAIM_COLUMNS = (
+    _payments.c.id,
+    _payments.c.status,
+    _payments.c.idempotency_key,
+    _payments.c.payment_type,
+    _payments.c.payee_type,
+    _payments.c.payee_id,
+    _payments.c.payee_name,
+    _payments.c.net_amount,
+    _payments.c.currency,
+    _payments.c.payment_method_id,
+    _payments.c.payment_method_type,
+)
+
+
+class PaymentDeclined(Exception):
+    """Raised by a provider call when the payment is refused and must not be retried."""
+
+
+def new_idempotency_key() -> str:
+    return f"pay_{uuid.uuid4().hex}"
+
+
+class PaymentBatchEngine:
+    """
+    Claims, sends and records payments in bulk.
+
+    Usage::
+
+        engine = PaymentBatchEngine({"ach": send_ach, "stripe": send_stripe}, limits={"ach": 20})
+        result = await engine.process(db, payment_ids)
+
+    ``providers`` maps a ``payment_method_type`` to its call; payments
+    without a known method type use ``default_provider``.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, ProviderCall],
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 10,
+        default_provider: str = "stripe",
+        write_batch_size: int = 200,
+    ):
+        self.providers = providers
+        self.default_provider = default_provider
+        self.write_batch_size = write_batch_size
+        limits = limits or {}
+        self._limits = {name: asyncio.Semaphore(limits.get(name, default_limit)) for name in providers}
+
+    async def insert_payments(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert pending payments in one statement and return their IDs in order."""
+        if not rows:
+            return []
+        result = await db.execute(
+            insert(_payments).returning(_payments.c.id, sort_by_parameter_order=True),
+            [{"status": "pending", **row} for row in rows],
+        )
+        ids = list(result.scalars().all())
+        await db.commit()
+        return ids
+
+    async def open_scheduled_payments(self, db: AsyncSession, schedule_ids: List[int]) -> List[Dict[str, Any]]:
+        """Payments of ``schedule_ids`` still pending or processing, i.e. not settled by an earlier run."""
+        if not schedule_ids:
+            return []
+        rows = await db.execute(
+            select(_payments.c.id, _payments.c.payment_schedule_id, _payments.c.gross_amount)
+            .where(_payments.c.payment_schedule_id.in_(schedule_ids), _payments.c.status.in_(CLAIMABLE))
+            .order_by(_payments.c.id)
+        )
+        return [dict(row) for row in rows.mappings().all()]
+
+    async def process(self, db: AsyncSession, payment_ids: Iterable[int]) -> Dict[str, Any]:
+        """
+        Process ``payment_ids``; running it again resumes an interrupted batch.
+
+        Args:
+            db: Database session
+            payment_ids: Payments to process (completed, failed or cancelled ones are skipped)
+
+        Returns:
+            Counts, the total amount paid and per-payment outcomes
+        """
+        claimed = await self._claim(db, list(payment_ids))
+        successful: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        retryable: List[Dict[str, Any]] = []
+        pending_writes: List[Dict[str, Any]] = []
+        write_lock = asyncio.Lock()
+
+        async def flush() -> None:
+            async with write_lock:
+                if not pending_writes:
+                    return
+                batch = pending_writes[:]
+                pending_writes.clear()
+                await self._record(db, batch)
+
+        async def send(payment: Dict[str, Any]) -> None:
+            provider = payment["payment_method_type"]
+            if provider not in self.providers:
+                provider = self.default_provider
+            try:
+                async with self._limits[provider]:
+                    response = await self.providers[provider](payment)
+            except PaymentDeclined as e:
+                failed.append({"payment_id": payment["id"], "error": str(e)})
+                pending_writes.append(_outcome(payment["id"], "failed", failure_reason=str(e)))
+            except Exception as e:
+                logger.warning(f"Payment {payment['id']} will be retried: {str(e)}")
+                retryable.append({"payment_id": payment["id"], "error": str(e)})
+                return
+            else:
+                successful.append({
+                    "payment_id": payment["id"],
+                    "status": "completed",
+                    "transaction_id": response.get("transaction_id"),
+                    "amount": payment["net_amount"],
+                })
+                pending_writes.append(_outcome(
+                    payment["id"],
+                    "completed",
+                    external_transaction_id=response.get("transaction_id"),
+                    gateway_response=response,
+                ))
+            if len(pending_writes) >= self.write_batch_size:
+                await flush()
+
+        await asyncio.gather(*(send(payment) for payment in claimed))
+        await flush()
+
+        total_amount = sum(float(p["amount"] or 0) for p in successful)
+        logger.info(
+            f"Payment batch: {len(successful)} completed, {len(failed)} failed, "
+            f"{len(retryable)} to retry, total ${total_amount}"
+        )
+        return {
+            "success": True,
+            "processed": len(successful),
+            "failed": len(failed),
+            "retryable": len(retryable),
+            "total_amount": total_amount,
+            "results": {"successful": successful, "failed": failed, "retryable": retryable},
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    async def _claim(self, db: AsyncSession, payment_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Mark payments as processing with an idempotency key and return the ones to send.
+
+        Pending rows another batch claimed first are left out. Rows that were
+        already processing are returned with their stored key even if another
+        batch is sending them too; the provider dedupes on that key.
+        """
+        if not payment_ids:
+            return []
+        rows = (await db.execute(
+            select(*_CLAIM_COLUMNS).where(_payments.c.id.in_(payment_ids), _payments.c.status.in_(CLAIMABLE))
+        )).mappings().all()
+
+        keys = {
+            row["id"]: row["idempotency_key"]
+            for row in rows
+            if row["status"] == "processing" and row["idempotency_key"]
+        }
+        fresh = [{"pid": row["id"], "key": new_idempotency_key()} for row in rows if row["status"] == "pending"]
+        unkeyed = [
+            {"pid": row["id"], "key": new_idempotency_key()}
+            for row in rows
+            if row["status"] == "processing" and not row["idempotency_key"]
+        ]
+        if fresh:
+            await db.execute(
+                update(_payments)
+                .where(_payments.c.id == bindparam("pid"), _payments.c.status == "pending")
+                .values(status="processing", idempotency_key=bindparam("key"), processed_at=_now()),
+                fresh,
+            )
+        if unkeyed:
+            # Marked processing elsewhere (e.g. by hand) without ever being sent from a batch
+            await db.execute(
+                update(_payments)
+                .where(_payments.c.id == bindparam("pid"), _payments.c.idempotency_key.is_(None))
+                .values(idempotency_key=bindparam("key")),
+                unkeyed,
+            )
+        keys.update((item["pid"], item["key"]) for item in fresh + unkeyed)
+        await db.commit()
+
+        # Keep only rows whose stored key is ours: another batch may have claimed some first
+        owned = (await db.execute(
+            select(*_CLAIM_COLUMNS).where(_payments.c.id.in_(list(keys)), _payments.c.status == "processing")
+        )).mappings().all()
+        return [dict(row) for row in owned if row["idempotency_key"] == keys[row["id"]]]
+
+    async def _record(self, db: AsyncSession, outcomes: List[Dict[str, Any]]) -> None:
+        await db.execute(
+            update(_payments)
+            .where(_payments.c.id == bindparam("pid"), _payments.c.status == "processing")
+            .values(
+                status=bindparam("new_status"),
+                external_transaction_id=bindparam("transaction_id"),
+                gateway_response=bindparam("response"),
+                completed_at=bindparam("completed"),
+                failed_at=bindparam("failed"),
+                failure_reason=bindparam("reason"),
+            ),
+            outcomes,
+        )
+        await db.commit()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _outcome(
+    payment_id: int,
+    status: str,
+    external_transaction_id: Optional[str] = None,
+    gateway_response: Optional[Dict[str, Any]] = None,
+    failure_reason: Optional[str] = None,
+) -> Dict[str, Any]:
+    now = _now()
+    return {
+        "pid": payment_id,
+        "new_status": status,
+        "transaction_id": external_transaction_id,
+        "response": gateway_response,
+        "completed": now if status == "completed" else None,
+        "failed": now if status == "failed" else None,
+        "reason": failure_reason,
+    }
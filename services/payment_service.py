@@ -19,6 +19,9 @@ from schemas.payment import (
 
 logger = logging.getLogger(__name__)
 
+# Aggregates run on the table directly, without loading Payment objects
+_payments = Payment.__table__
+
 
 class PaymentService:
     """Service for payment management."""
@@ -459,25 +462,22 @@ class PaymentService:
         if period_start > period_end:
             raise ValueError("Start date must be before end date")
 
-        # Get payments for period
-        stmt = select(Payment).where(
+        # Total completed payments for period
+        stmt = select(func.count(), func.coalesce(func.sum(_payments.c.net_amount), 0.0)).where(
             and_(
-                Payment.created_at >= datetime.combine(period_start, datetime.min.time()),
-                Payment.created_at <= datetime.combine(period_end, datetime.max.time()),
-                Payment.status == "completed",
+                _payments.c.created_at >= datetime.combine(period_start, datetime.min.time()),
+                _payments.c.created_at <= datetime.combine(period_end, datetime.max.time()),
+                _payments.c.status == "completed",
             )
         )
-        result = await self.db.execute(stmt)
-        payments = result.scalars().all()
-
-        total_paid_out = sum(float(p.net_amount) for p in payments)
+        payment_count, total_paid_out = (await self.db.execute(stmt)).one()
 
         reconciliation = PaymentReconciliation(
             period_start=period_start,
             period_end=period_end,
-            total_paid_out=total_paid_out,
+            total_paid_out=float(total_paid_out),
             status="pending",
-            payment_count=len(payments),
+            payment_count=payment_count,
         )
 
         self.db.add(reconciliation)
@@ -569,28 +569,44 @@ class PaymentService:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        stmt = select(Payment).where(Payment.created_at >= cutoff_date)
+        # One grouped aggregate; only the (type, method, status) groups come back
+        stmt = (
+            select(
+                _payments.c.payment_type,
+                _payments.c.payment_method_type,
+                _payments.c.status,
+                func.count().label("count"),
+                func.coalesce(func.sum(_payments.c.net_amount), 0.0).label("amount"),
+            )
+            .where(_payments.c.created_at >= cutoff_date)
+            .group_by(_payments.c.payment_type, _payments.c.payment_method_type, _payments.c.status)
+        )
         result = await self.db.execute(stmt)
-        payments = result.scalars().all()
-
-        total_processed = len([p for p in payments if p.status == "completed"])
-        total_failed = len([p for p in payments if p.status == "failed"])
-        total_amount = sum(float(p.net_amount) for p in payments if p.status == "completed")
 
+        total_payments = 0
+        total_processed = 0
+        total_failed = 0
+        total_amount = 0.0
         by_type = {}
         by_method = {}
 
-        for payment in payments:
-            by_type[payment.payment_type] = by_type.get(payment.payment_type, 0) + 1
-            if payment.payment_method_type:
-                by_method[payment.payment_method_type] = by_method.get(payment.payment_method_type, 0) + 1
+        for payment_type, method_type, payment_status, count, amount in result.all():
+            total_payments += count
+            if payment_status == "completed":
+                total_processed += count
+                total_amount += float(amount)
+            elif payment_status == "failed":
+                total_failed += count
+            by_type[payment_type] = by_type.get(payment_type, 0) + count
+            if method_type:
+                by_method[method_type] = by_method.get(method_type, 0) + count
 
         analytics = {
             "period_days": days,
-            "total_payments": len(payments),
+            "total_payments": total_payments,
             "total_processed": total_processed,
             "total_failed": total_failed,
-            "failure_rate": (total_failed / len(payments) * 100) if payments else 0,
+            "failure_rate": (total_failed / total_payments * 100) if total_payments else 0,
             "total_amount": total_amount,
             "by_type": by_type,
             "by_method": by_method,
@@ -598,6 +614,45 @@ class PaymentService:
 
         return analytics
 
+    async def get_processing_summary(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Payment counts, amounts and average processing time for a period, in one query.
+
+        Args:
+            start_date: First day (by created date)
+            end_date: Last day (inclusive)
+
+        Returns:
+            total, completed, failed, completed_amount and avg_processing_hours
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            hours = (func.julianday(_payments.c.processed_at) - func.julianday(_payments.c.created_at)) * 24
+        else:
+            hours = func.extract("epoch", _payments.c.processed_at - _payments.c.created_at) / 3600
+
+        stmt = select(
+            func.count().label("total"),
+            func.count().filter(_payments.c.status == "completed").label("completed"),
+            func.count().filter(_payments.c.status == "failed").label("failed"),
+            func.coalesce(func.sum(_payments.c.net_amount).filter(_payments.c.status == "completed"), 0.0).label(
+                "completed_amount"
+            ),
+            func.avg(hours).label("avg_processing_hours"),
+        ).where(
+            and_(
+                _payments.c.created_at >= datetime.combine(start_date, datetime.min.time()),
+                _payments.c.created_at <= datetime.combine(end_date, datetime.max.time()),
+            )
+        )
+        row = (await self.db.execute(stmt)).one()
+
+        return {
+            "total": row.total,
+            "completed": row.completed,
+            "failed": row.failed,
+            "completed_amount": float(row.completed_amount),
+            "avg_processing_hours": float(row.avg_processing_hours or 0.0),
+        }
+
     # Helper methods
 
     async def _get_default_method(self, entity_type: str, entity_id: int) -> Optional[PaymentMethod]:
@@ -0,0 +1,293 @@
+"""
+Compiled per-user permissions.
+
+A user's active role assignments are flattened once into a frozen set of
+``resource:action`` strings plus a set of allowed methods per agent, so a
+route guard checks a permission with one set lookup instead of loading the
+roles and scanning their permission lists.
+
+Compiled sets live in a per-process LRU and, with the ``redis`` backend,
+in Redis so every worker shares them. Redis keys include the role template
+revision: ``update_role_template`` bumps it, which retires every compiled
+set at once, and ``assign_role_to_user`` drops the one user. A set never
+outlives the earliest expiring role assignment it was built from;
+``ttl_seconds`` bounds how long a worker keeps a set after a change made
+elsewhere.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.security import Permission, RoleTemplate, UserRoleAssignment, role_template_permissions
+from utils.principal_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def permission_key(resource: str, action: str) -> str:
+    return f"{resource}:{action}"
+
+
+@dataclass(frozen=True)
+class CompiledPermissions:
+    """Everything a user's active roles grant."""
+    user_id: int
+    revision: int
+    permissions: FrozenSet[str] = frozenset()
+    agent_methods: Mapping[str, FrozenSet[str]] = field(default_factory=dict)
+    valid_until: Optional[float] = None  # epoch seconds of the earliest expiring assignment
+
+    def allows(self, resource: str, action: str) -> bool:
+        return permission_key(resource, action) in self.permissions
+
+    def allows_agent(self, agent: str, method: str) -> bool:
+        return method in self.agent_methods.get(agent, ())
+
+    def agent_permissions(self) -> Dict[str, List[str]]:
+        return {agent: sorted(methods) for agent, methods in self.agent_methods.items()}
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "user_id": self.user_id,
+            "revision": self.revision,
+            "permissions": sorted(self.permissions),
+            "agent_methods": self.agent_permissions(),
+            "valid_until": self.valid_until,
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "CompiledPermissions":
+        raw = json.loads(data)
+        return cls(
+            user_id=raw["user_id"],
+            revision=raw["revision"],
+            permissions=frozenset(raw["permissions"]),
+            agent_methods={agent: frozenset(methods) for agent, methods in raw["agent_methods"].items()},
+            valid_until=raw["valid_until"],
+        )
+
+
+def _epoch(value: datetime) -> float:
+    # Naive timestamps are UTC, as written by datetime.utcnow()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def compile_permissions(
+    user_id: int,
+    revision: int,
+    roles: Iterable[Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, List[str]]], Optional[datetime]]],
+    granted: Iterable[Tuple[str, str]] = (),
+) -> CompiledPermissions:
+    """
+    Flatten a user's roles.
+
+    Args:
+        user_id: User ID
+        revision: Role template revision the roles were read at
+        roles: (permissions JSON, agent_access, assignment expires_at) per active role
+        granted: (resource, action) of the permissions linked to those roles
+
+    Returns:
+        Compiled permissions
+    """
+    permissions = {permission_key(resource, action) for resource, action in granted}
+    agent_methods: Dict[str, set] = {}
+    valid_until = None
+    for json_permissions, agent_access, expires_at in roles:
+        for perm in json_permissions or ():
+            if isinstance(perm, dict) and perm.get("resource") and perm.get("action"):
+                permissions.add(permission_key(perm["resource"], perm["action"]))
+        for agent, methods in (agent_access or {}).items():
+            agent_methods.setdefault(agent, set()).update(methods)
+        if expires_at is not None:
+            expires = _epoch(expires_at)
+            valid_until = expires if valid_until is None else min(valid_until, expires)
+    return CompiledPermissions(
+        user_id=user_id,
+        revision=revision,
+        permissions=frozenset(permissions),
+        agent_methods={agent: frozenset(methods) for agent, methods in agent_methods.items()},
+        valid_until=valid_until,
+    )
+
+
+class PermissionMatrix:
+    """Per-user compiled permissions, cached in process and optionally in Redis."""
+
+    REVISION_KEY = "rbac:revision"
+
+    def __init__(
+        self,
+        redis: Any = None,
+        ttl_seconds: float = 60.0,
+        maxsize: int = 10_000,
+        prefix: str = "rbac:perms",
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize permission matrix.
+
+        Args:
+            redis: Optional ``redis.asyncio`` client shared by all workers
+            ttl_seconds: Longest a compiled set is served without reloading
+            maxsize: Users kept in the in-process LRU
+            prefix: Redis key prefix
+            clock: Wall clock, compared with assignment expiry (for tests)
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._clock = clock
+        self._local: TTLCache[CompiledPermissions] = TTLCache(maxsize, ttl_seconds, clock)
+        self.revision = 0
+        self._generation = 0
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}:{self.revision}:{user_id}"
+
+    def _expires_at(self, compiled: CompiledPermissions) -> float:
+        expires_at = self._clock() + self.ttl_seconds
+        return expires_at if compiled.valid_until is None else min(expires_at, compiled.valid_until)
+
+    def _observe_revision(self, revision: int) -> None:
+        if revision != self.revision:
+            self.revision = revision
+            self._local.clear()
+
+    async def _get_remote(self, user_id: int) -> Optional[CompiledPermissions]:
+        try:
+            revision = await self.redis.get(self.REVISION_KEY)
+            self._observe_revision(int(revision or 0))
+            data = await self.redis.get(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Permission cache read failed: {str(e)}")
+            return None
+        return CompiledPermissions.from_json(data) if data else None
+
+    async def _set_remote(self, compiled: CompiledPermissions, expires_at: float) -> None:
+        try:
+            ttl_ms = max(1, int((expires_at - self._clock()) * 1000))
+            await self.redis.set(self._key(compiled.user_id), compiled.to_json(), px=ttl_ms)
+        except Exception as e:
+            logger.warning(f"Permission cache write failed: {str(e)}")
+
+    async def load(self, db: AsyncSession, user_id: int) -> CompiledPermissions:
+        """Compile a user's permissions from the database (two queries, one without roles)."""
+        result = await db.execute(
+            select(
+                RoleTemplate.id,
+                RoleTemplate.json_permissions,
+                RoleTemplate.agent_access,
+                UserRoleAssignment.expires_at,
+            ).join(
+                UserRoleAssignment,
+                UserRoleAssignment.role_template_id == RoleTemplate.id
+            ).where(
+                and_(
+                    UserRoleAssignment.user_id == user_id,
+                    UserRoleAssignment.is_active == True,
+                    RoleTemplate.is_active == True,
+                    or_(
+                        UserRoleAssignment.expires_at.is_(None),
+                        UserRoleAssignment.expires_at > datetime.utcnow(),
+                    ),
+                )
+            )
+        )
+        roles = result.all()
+
+        granted = []
+        if roles:
+            result = await db.execute(
+                select(Permission.resource, Permission.action).join(
+                    role_template_permissions,
+                    role_template_permissions.c.permission_id == Permission.id
+                ).where(
+                    role_template_permissions.c.role_template_id.in_([role.id for role in roles]),
+                    Permission.is_active == True,
+                )
+            )
+            granted = result.all()
+
+        return compile_permissions(
+            user_id,
+            self.revision,
+            [(role.json_permissions, role.agent_access, role.expires_at) for role in roles],
+            granted,
+        )
+
+    async def get(self, db: AsyncSession, user_id: int) -> CompiledPermissions:
+        """A user's compiled permissions, from the cache when fresh."""
+        compiled = self._local.get(user_id)
+        if compiled is not None:
+            return compiled
+
+        if self.redis is not None:
+            compiled = await self._get_remote(user_id)
+            if compiled is not None:
+                self._local.set(user_id, compiled, expires_at=self._expires_at(compiled))
+                return compiled
+
+        generation = self._generation
+        compiled = await self.load(db, user_id)
+        if generation == self._generation:
+            # Not cached when roles changed while the queries ran
+            expires_at = self._expires_at(compiled)
+            self._local.set(user_id, compiled, expires_at=expires_at)
+            if self.redis is not None:
+                await self._set_remote(compiled, expires_at)
+        return compiled
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Forget one user's compiled permissions (role assigned or revoked)."""
+        self._generation += 1
+        self._local.pop(user_id)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(self._key(user_id))
+            except Exception as e:
+                logger.warning(f"Permission cache invalidation failed: {str(e)}")
+
+    async def bump_revision(self) -> None:
+        """Retire every compiled set (a role template changed)."""
+        self._generation += 1
+        self._observe_revision(self.revision + 1)
+        if self.redis is not None:
+            try:
+                self._observe_revision(int(await self.redis.incr(self.REVISION_KEY)))
+            except Exception as e:
+                logger.warning(f"Permission cache revision bump failed: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"revision": self.revision, **self._local.stats()}
+
+
+def create_permission_matrix(settings: Any) -> PermissionMatrix:
+    """Build the matrix for ``settings.permission_cache_backend``."""
+    redis = None
+    if settings.permission_cache_backend == "redis":
+        import redis.asyncio as aioredis
+
+        redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+    return PermissionMatrix(
+        redis=redis,
+        ttl_seconds=settings.permission_cache_ttl_seconds,
+        maxsize=settings.permission_cache_size,
+    )
+
+
+def _create_matrix() -> PermissionMatrix:
+    from config import settings
+
+    return create_permission_matrix(settings)
+
+
+permission_matrix = _create_matrix()
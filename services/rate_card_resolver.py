@@ -0,0 +1,277 @@
+"""
+In-memory rate card resolution.
+
+Each client organization's active rate cards are loaded once and grouped
+by (job_category, location). Every group is compiled into an effective-date
+timeline: the date axis is cut at every card's ``effective_from`` and the
+day after its ``effective_to``, and each segment stores the card that wins
+there (the most recently created one, as the SQL lookup ordered by
+``created_at``). Resolving a date is then a single bisect.
+
+The cache is per process. Writes through ``RateCardService`` invalidate the
+tenant immediately; ``ttl_seconds`` bounds how long other workers can serve
+a tenant that was changed elsewhere.
+
+The resolver also keeps rolling bill-rate statistics per (tenant, job
+category), so rate validation reads a mean and standard deviation instead
+of scanning rate history. They are seeded from the tenant's most recent
+placements whenever its rate cards load, and new placements are added as
+they are made.
+"""
+
+import heapq
+import logging
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.rate_validation_agent import RollingRateStats
+from models.msp_workflow import PlacementRecord
+from models.rate_card import RateCard
+
+logger = logging.getLogger(__name__)
+
+_placements = PlacementRecord.__table__
+
+
+@dataclass(frozen=True)
+class RateCardSnapshot:
+    """The fields of a rate card that resolution and validation need."""
+    id: int
+    client_org_id: int
+    job_category: str
+    location: Optional[str]
+    bill_rate_min: float
+    bill_rate_max: float
+    pay_rate_min: float
+    pay_rate_max: float
+    effective_from: date
+    effective_to: Optional[date]
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_model(cls, rate_card: RateCard) -> "RateCardSnapshot":
+        return cls(
+            id=rate_card.id,
+            client_org_id=rate_card.client_org_id,
+            job_category=rate_card.job_category,
+            location=rate_card.location,
+            bill_rate_min=rate_card.bill_rate_min,
+            bill_rate_max=rate_card.bill_rate_max,
+            pay_rate_min=rate_card.pay_rate_min,
+            pay_rate_max=rate_card.pay_rate_max,
+            effective_from=rate_card.effective_from,
+            effective_to=rate_card.effective_to,
+            created_at=rate_card.created_at,
+        )
+
+    @property
+    def precedence(self) -> Tuple:
+        """Newer cards win; ID breaks ties between cards created together."""
+        return (self.created_at is not None, self.created_at or 0, self.id)
+
+    def as_limits(self) -> Dict[str, float]:
+        """Rate limits in the shape ``RateValidationAgent.validate`` expects."""
+        return {
+            "bill_rate_min": self.bill_rate_min,
+            "bill_rate_max": self.bill_rate_max,
+            "pay_rate_min": self.pay_rate_min,
+            "pay_rate_max": self.pay_rate_max,
+        }
+
+
+def _newer(a: Optional[RateCardSnapshot], b: Optional[RateCardSnapshot]) -> Optional[RateCardSnapshot]:
+    if a is None or b is None:
+        return a or b
+    return a if a.precedence >= b.precedence else b
+
+
+def _end_exclusive(card: RateCardSnapshot) -> Optional[date]:
+    if card.effective_to is None or card.effective_to >= date.max:
+        return None
+    return card.effective_to + timedelta(days=1)
+
+
+class RateCardTimeline:
+    """Effective-date interval index over the rate cards of one group."""
+
+    def __init__(self, cards: Iterable[RateCardSnapshot]):
+        cards = [c for c in cards if c.effective_to is None or c.effective_to >= c.effective_from]
+        ends = (_end_exclusive(c) for c in cards)
+        self._starts: List[date] = sorted({c.effective_from for c in cards} | {e for e in ends if e})
+        self._winners = self._sweep(self._starts, cards)
+
+    @staticmethod
+    def _sweep(points: List[date], cards: List[RateCardSnapshot]) -> List[Optional[RateCardSnapshot]]:
+        """Winner of each segment, via a max-heap of open cards with lazy expiry."""
+        ranked = sorted(cards, key=lambda c: c.precedence)
+        by_start = sorted(range(len(ranked)), key=lambda i: ranked[i].effective_from)
+        winners: List[Optional[RateCardSnapshot]] = []
+        active: List[int] = []
+        next_card = 0
+        for point in points:
+            while next_card < len(by_start) and ranked[by_start[next_card]].effective_from <= point:
+                heapq.heappush(active, -by_start[next_card])
+                next_card += 1
+            while active:
+                end = _end_exclusive(ranked[-active[0]])
+                if end is None or end > point:
+                    break
+                heapq.heappop(active)
+            winners.append(ranked[-active[0]] if active else None)
+        return winners
+
+    def at(self, on: date) -> Optional[RateCardSnapshot]:
+        """The card in force on ``on``, or None. O(log n)."""
+        i = bisect_right(self._starts, on) - 1
+        return self._winners[i] if i >= 0 else None
+
+
+class TenantRateCards:
+    """One client organization's rate cards, indexed for resolution."""
+
+    def __init__(self, cards: Iterable[RateCardSnapshot], loaded_at: float = 0.0):
+        self.loaded_at = loaded_at
+        groups: Dict[Tuple[str, Optional[str]], List[RateCardSnapshot]] = {}
+        categories: Dict[str, List[RateCardSnapshot]] = {}
+        for card in cards:
+            groups.setdefault((card.job_category, card.location or None), []).append(card)
+            categories.setdefault(card.job_category, []).append(card)
+        self._by_location = {key: RateCardTimeline(group) for key, group in groups.items()}
+        self._by_category = {key: RateCardTimeline(group) for key, group in categories.items()}
+
+    def resolve(
+        self, job_category: str, location: Optional[str], effective_date: date
+    ) -> Optional[RateCardSnapshot]:
+        """
+        Same semantics as the SQL lookup: with a location, cards for that
+        location or for no location qualify; without one, any card does.
+        """
+        if not location:
+            timeline = self._by_category.get(job_category)
+            return timeline.at(effective_date) if timeline else None
+        best = None
+        for key in ((job_category, location), (job_category, None)):
+            timeline = self._by_location.get(key)
+            if timeline:
+                best = _newer(best, timeline.at(effective_date))
+        return best
+
+
+class RateCardResolver:
+    """Per-tenant rate card cache with rolling historical rate statistics."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        history_window: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.history_window = history_window
+        self._clock = clock
+        self._tenants: Dict[int, TenantRateCards] = {}
+        self._generations: Dict[int, int] = {}
+        self._history: Dict[Tuple[int, str], RollingRateStats] = {}
+
+    def _fresh(self, tenant: TenantRateCards) -> bool:
+        return self.ttl_seconds is None or self._clock() - tenant.loaded_at <= self.ttl_seconds
+
+    async def _load(self, db: AsyncSession, client_org_id: int) -> TenantRateCards:
+        generation = self._generations.get(client_org_id, 0)
+        result = await db.execute(
+            select(RateCard).where(
+                RateCard.client_org_id == client_org_id,
+                RateCard.is_active == True,
+            )
+        )
+        tenant = TenantRateCards(
+            (RateCardSnapshot.from_model(rc) for rc in result.scalars().all()),
+            loaded_at=self._clock(),
+        )
+        history = await self._load_history(db, client_org_id)
+        # An invalidation while the query was in flight means the rows may predate it
+        if self._generations.get(client_org_id, 0) == generation:
+            self._tenants[client_org_id] = tenant
+            for key in [key for key in self._history if key[0] == client_org_id]:
+                del self._history[key]
+            for job_category, rates in history.items():
+                self._history[(client_org_id, job_category)] = RollingRateStats(self.history_window, rates)
+        return tenant
+
+    async def _load_history(self, db: AsyncSession, client_org_id: int) -> Dict[str, List[float]]:
+        """The last ``history_window`` placed bill rates per job category, oldest first."""
+        recent = (
+            select(
+                _placements.c.id,
+                _placements.c.job_category,
+                _placements.c.bill_rate,
+                _placements.c.created_at,
+                func.row_number().over(
+                    partition_by=_placements.c.job_category,
+                    order_by=(_placements.c.created_at.desc(), _placements.c.id.desc()),
+                ).label("recency"),
+            )
+            .where(_placements.c.client_org_id == client_org_id, _placements.c.job_category.isnot(None))
+            .subquery()
+        )
+        result = await db.execute(
+            select(recent.c.job_category, recent.c.bill_rate)
+            .where(recent.c.recency <= self.history_window)
+            .order_by(recent.c.created_at, recent.c.id)
+        )
+        history: Dict[str, List[float]] = {}
+        for job_category, bill_rate in result.all():
+            history.setdefault(job_category, []).append(bill_rate)
+        return history
+
+    async def tenant(self, db: AsyncSession, client_org_id: int) -> TenantRateCards:
+        tenant = self._tenants.get(client_org_id)
+        if tenant is None or not self._fresh(tenant):
+            tenant = await self._load(db, client_org_id)
+        return tenant
+
+    async def resolve(
+        self,
+        db: AsyncSession,
+        client_org_id: int,
+        job_category: str,
+        location: Optional[str] = None,
+        effective_date: Optional[date] = None,
+    ) -> Optional[RateCardSnapshot]:
+        tenant = await self.tenant(db, client_org_id)
+        return tenant.resolve(job_category, location, effective_date or date.today())
+
+    def invalidate(self, client_org_id: Optional[int] = None) -> None:
+        """Drop one tenant (or every tenant) so the next lookup reloads it."""
+        org_ids = [client_org_id] if client_org_id is not None else list(self._tenants)
+        for org_id in org_ids:
+            self._tenants.pop(org_id, None)
+            self._generations[org_id] = self._generations.get(org_id, 0) + 1
+
+    def record_rate(self, client_org_id: int, job_category: str, bill_rate: float) -> None:
+        key = (client_org_id, job_category)
+        stats = self._history.get(key)
+        if stats is None:
+            stats = self._history[key] = RollingRateStats(self.history_window)
+        stats.add(bill_rate)
+
+    def historical_stats(self, client_org_id: int, job_category: str) -> Optional[RollingRateStats]:
+        return self._history.get((client_org_id, job_category))
+
+
+def _create_resolver() -> RateCardResolver:
+    from config import settings
+
+    return RateCardResolver(
+        ttl_seconds=settings.rate_card_cache_ttl_seconds,
+        history_window=settings.rate_history_window,
+    )
+
+
+rate_card_resolver = _create_resolver()
@@ -3,16 +3,20 @@ import logging
 from typing import List, Tuple, Optional, Dict, Any
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import select, desc
+from agents.rate_validation_agent import RateValidationAgent
 from models.rate_card import RateCard, RateCardEntry
 from models.organization import Organization
+from services.rate_card_resolver import RateCardResolver, RateCardSnapshot, rate_card_resolver
 
 logger = logging.getLogger(__name__)
 
 
 class RateCardService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, resolver: Optional[RateCardResolver] = None):
         self.db = db
+        self.resolver = resolver or rate_card_resolver
+        self.validator = RateValidationAgent()
 
     async def create_rate_card(self, data: dict) -> RateCard:
         result = await self.db.execute(
@@ -29,28 +33,44 @@ class RateCardService:
         self.db.add(rate_card)
         await self.db.commit()
         await self.db.refresh(rate_card)
+        self.resolver.invalidate(rate_card.client_org_id)
         return rate_card
 
-    async def get_applicable_rate_card(
-        self, client_org_id: int, job_category: str,
-        location: Optional[str] = None, effective_date: Optional[date] = None,
-    ) -> Optional[RateCard]:
-        if not effective_date:
-            effective_date = date.today()
+    async def update_rate_card(self, rate_card_id: int, data: dict) -> Optional[RateCard]:
+        result = await self.db.execute(select(RateCard).where(RateCard.id == rate_card_id))
+        rate_card = result.scalar_one_or_none()
+        if not rate_card:
+            return None
 
-        query = select(RateCard).where(and_(
-            RateCard.client_org_id == client_org_id,
-            RateCard.job_category == job_category,
-            RateCard.is_active == True,
-            RateCard.effective_from <= effective_date,
-            or_(RateCard.effective_to.is_(None), RateCard.effective_to >= effective_date),
-        ))
+        for key, value in data.items():
+            if hasattr(rate_card, key):
+                setattr(rate_card, key, value)
 
-        if location:
-            query = query.where(or_(RateCard.location == location, RateCard.location.is_(None)))
+        self.db.add(rate_card)
+        await self.db.commit()
+        await self.db.refresh(rate_card)
+        self.resolver.invalidate(rate_card.client_org_id)
+        return rate_card
 
-        result = await self.db.execute(query.order_by(desc(RateCard.created_at)))
-        return result.scalars().first()
+    async def archive_rate_card(self, rate_card_id: int) -> Optional[RateCard]:
+        result = await self.db.execute(select(RateCard).where(RateCard.id == rate_card_id))
+        rate_card = result.scalar_one_or_none()
+        if not rate_card:
+            return None
+
+        rate_card.status = "ARCHIVED"
+        self.db.add(rate_card)
+        await self.db.commit()
+        self.resolver.invalidate(rate_card.client_org_id)
+        return rate_card
+
+    async def get_applicable_rate_card(
+        self, client_org_id: int, job_category: str,
+        location: Optional[str] = None, effective_date: Optional[date] = None,
+    ) -> Optional[RateCardSnapshot]:
+        return await self.resolver.resolve(
+            self.db, client_org_id, job_category, location, effective_date
+        )
 
     async def validate_submission_rates(
         self, client_org_id: int, job_category: str,
@@ -68,7 +88,25 @@ class RateCardService:
             violations.append({"field": "pay_rate", "actual": pay_rate,
                              "min": rate_card.pay_rate_min, "max": rate_card.pay_rate_max})
 
-        return len(violations) == 0, {"violations": violations, "rate_card_id": rate_card.id}
+        details = {"violations": violations, "rate_card_id": rate_card.id}
+        stats = self.resolver.historical_stats(client_org_id, job_category)
+        if stats and stats.count:
+            details["historical"] = {
+                "count": stats.count, "mean": round(stats.mean, 2), "std": round(stats.std, 2),
+            }
+        assessment = self.validator.validate(
+            bill_rate, pay_rate, rate_card=rate_card.as_limits(), historical_stats=stats,
+        )
+        details["assessment"] = {
+            "overall_score": assessment.overall_score,
+            "recommendation": assessment.recommendation,
+            "justification": assessment.justification,
+        }
+        return len(violations) == 0, details
+
+    def record_accepted_rate(self, client_org_id: int, job_category: str, bill_rate: float) -> None:
+        """Add an accepted or placed bill rate to the rolling history used by validation."""
+        self.resolver.record_rate(client_org_id, job_category, bill_rate)
 
     async def list_rate_cards(self, client_org_id: Optional[int] = None, status: Optional[str] = None) -> List[RateCard]:
         query = select(RateCard).where(RateCard.is_active == True)
@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
 from models.negotiation import RateNegotiation, NegotiationRound, InterviewSchedule
@@ -24,6 +24,9 @@ from schemas.negotiation import (
 
 logger = logging.getLogger(__name__)
 
+# Called with the changed entity after flush and before commit (e.g. to write outbox events)
+BeforeCommit = Optional[Callable[[Any], Awaitable[None]]]
+
 
 class RateNegotiationService:
     """Service for rate negotiation lifecycle management."""
@@ -39,11 +42,13 @@ class RateNegotiationService:
     async def create_negotiation(
         self,
         negotiation_data: RateNegotiationCreate,
+        before_commit: BeforeCommit = None,
     ) -> RateNegotiation:
         """Create new rate negotiation.
 
         Args:
             negotiation_data: Negotiation creation data
+            before_commit: Awaited with the negotiation before commit
 
         Returns:
             Created negotiation
@@ -78,6 +83,9 @@ class RateNegotiationService:
             )
 
             self.db.add(negotiation)
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(negotiation)
             await self.db.commit()
             await self.db.refresh(negotiation)
 
@@ -170,12 +178,14 @@ class RateNegotiationService:
         self,
         negotiation_id: int,
         round_data: NegotiationRoundUpdate,
+        before_commit: BeforeCommit = None,
     ) -> NegotiationRound:
         """Submit counter offer in negotiation.
 
         Args:
             negotiation_id: Negotiation ID
             round_data: Counter offer data
+            before_commit: Awaited with the round before commit
 
         Returns:
             Updated negotiation round
@@ -208,6 +218,9 @@ class RateNegotiationService:
                 negotiation.current_proposed_rate = round_data.counter_rate or negotiation.current_proposed_rate
                 negotiation.status = "in_progress"
 
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(latest_round)
             await self.db.commit()
             await self.db.refresh(latest_round)
 
@@ -334,6 +347,7 @@ class RateNegotiationService:
         negotiation_id: int,
         agreed_rate: float,
         agreed_rate_type: str,
+        before_commit: BeforeCommit = None,
     ) -> RateNegotiation:
         """Finalize agreed rate.
 
@@ -341,6 +355,7 @@ class RateNegotiationService:
             negotiation_id: Negotiation ID
             agreed_rate: Agreed rate
             agreed_rate_type: Rate type
+            before_commit: Awaited with the negotiation before commit
 
         Returns:
             Updated negotiation
@@ -359,6 +374,9 @@ class RateNegotiationService:
             negotiation.closed_at = datetime.utcnow()
             negotiation.closed_reason = "Rate agreed"
 
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(negotiation)
             await self.db.commit()
             await self.db.refresh(negotiation)
 
@@ -448,11 +466,13 @@ class InterviewSchedulingService:
     async def schedule_interview(
         self,
         schedule_data: InterviewScheduleCreate,
+        before_commit: BeforeCommit = None,
     ) -> InterviewSchedule:
         """Schedule interview.
 
         Args:
             schedule_data: Interview schedule data
+            before_commit: Awaited with the schedule before commit
 
         Returns:
             Created interview schedule
@@ -482,6 +502,9 @@ class InterviewSchedulingService:
             )
 
             self.db.add(interview_schedule)
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(interview_schedule)
             await self.db.commit()
             await self.db.refresh(interview_schedule)
 
@@ -573,6 +596,7 @@ class InterviewSchedulingService:
         schedule_id: int,
         reschedule_data: InterviewRescheduleRequest,
         rescheduled_by: int,
+        before_commit: BeforeCommit = None,
     ) -> InterviewSchedule:
         """Reschedule interview.
 
@@ -580,6 +604,7 @@ class InterviewSchedulingService:
             schedule_id: Schedule ID
             reschedule_data: New schedule data
             rescheduled_by: User ID who rescheduled
+            before_commit: Awaited with the schedule before commit
 
         Returns:
             Updated interview schedule
@@ -614,6 +639,9 @@ class InterviewSchedulingService:
                 schedule.reschedule_history = []
             schedule.reschedule_history.append(old_entry)
 
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(schedule)
             await self.db.commit()
             await self.db.refresh(schedule)
 
@@ -629,12 +657,14 @@ class InterviewSchedulingService:
         self,
         schedule_id: int,
         cancel_data: InterviewCancelRequest,
+        before_commit: BeforeCommit = None,
     ) -> InterviewSchedule:
         """Cancel interview.
 
         Args:
             schedule_id: Schedule ID
             cancel_data: Cancellation data
+            before_commit: Awaited with the schedule before commit
 
         Returns:
             Updated interview schedule
@@ -650,6 +680,9 @@ class InterviewSchedulingService:
             schedule.status = "cancelled"
             schedule.cancellation_reason = cancel_data.reason
 
+            await self.db.flush()
+            if before_commit is not None:
+                await before_commit(schedule)
             await self.db.commit()
             await self.db.refresh(schedule)
 
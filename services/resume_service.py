@@ -1,15 +1,16 @@
 import logging
 import json
-from typing import Dict, Any, Optional, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 import shutil
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.resume import Resume, ParsedResume
 from models.candidate import Candidate
 from agents.resume_parser_agent import ResumeParserAgent
 from agents.resume_tailoring_agent import ResumeTailoringAgent
+from services.blob_store import BlobRef, BlobStore, LocalBlobStore
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ class ResumeService:
         parser_agent: Optional[ResumeParserAgent] = None,
         tailoring_agent: Optional[ResumeTailoringAgent] = None,
         upload_dir: str = "/tmp/resumes",
+        blob_store: Optional[BlobStore] = None,
     ):
         """Initialize resume service.
 
@@ -30,11 +32,32 @@ class ResumeService:
             parser_agent: Optional pre-initialized parser agent
             tailoring_agent: Optional pre-initialized tailoring agent
             upload_dir: Directory for storing uploaded resumes
+            blob_store: Storage backend for resume files (local under upload_dir by default)
         """
         self.parser = parser_agent or ResumeParserAgent()
         self.tailor = tailoring_agent or ResumeTailoringAgent()
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_store = blob_store or LocalBlobStore(upload_dir)
+
+    async def store_file(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        max_bytes: Optional[int] = None,
+    ) -> BlobRef:
+        """
+        Stream a resume file into the blob store.
+
+        Args:
+            chunks: File content, chunk by chunk
+            file_name: Original file name (its extension is kept)
+            max_bytes: Size limit for this file
+
+        Returns:
+            Reference to the stored blob; identical content is stored once
+        """
+        return await self.blob_store.put_stream(chunks, Path(file_name).suffix, max_bytes)
 
     async def upload_resume(
         self,
@@ -44,6 +67,7 @@ class ResumeService:
         file_name: str,
         file_size: int,
         is_primary: bool = True,
+        blob: Optional[BlobRef] = None,
     ) -> Dict[str, Any]:
         """
         Upload resume file and store in database.
@@ -55,6 +79,8 @@ class ResumeService:
             file_name: Original file name
             file_size: File size in bytes
             is_primary: Whether this is primary resume
+            blob: Stored blob from ``store_file``; its URI, size and hash
+                take precedence over ``file_path`` and ``file_size``
 
         Returns:
             Resume record details
@@ -62,6 +88,10 @@ class ResumeService:
         try:
             logger.info(f"Uploading resume for candidate {candidate_id}: {file_name}")
 
+            content_hash = None
+            if blob is not None:
+                file_path, file_size, content_hash = blob.uri, blob.size, blob.sha256
+
             # If this is primary, unset other primaries
             if is_primary:
                 stmt = select(Resume).where(
@@ -86,6 +116,7 @@ class ResumeService:
                 file_name=file_name,
                 file_type=file_type,
                 file_size=file_size,
+                content_hash=content_hash,
                 is_primary=is_primary,
             )
 
@@ -100,6 +131,7 @@ class ResumeService:
                 "file_name": file_name,
                 "file_type": file_type,
                 "file_size": file_size,
+                "content_hash": content_hash,
                 "is_primary": is_primary,
                 "uploaded_at": resume.uploaded_at.isoformat(),
             }
@@ -136,7 +168,9 @@ class ResumeService:
                 raise ValueError(f"Resume {resume_id} not found")
 
             # Extract text from file
-            text = await self.parser.extract_text_from_file(resume.file_path)
+            text = await self.parser.extract_text_from_file(
+                await self.blob_store.materialize(resume.file_path)
+            )
 
             # Parse resume
             parsed_data = await self.parser.parse_resume(text, resume.file_name)
@@ -201,6 +235,116 @@ class ResumeService:
             await session.rollback()
             raise
 
+    async def queue_resumes_for_parsing(
+        self,
+        session: AsyncSession,
+        resume_ids: List[int],
+        pool: Any,
+    ) -> List[int]:
+        """
+        Submit resumes to a ``ResumeParsingPool`` for background parsing.
+
+        Args:
+            session: Database session
+            resume_ids: Resume IDs to parse
+            pool: Parsing pool whose sink persists the results
+
+        Returns:
+            IDs of resumes that were queued
+        """
+        from agents.resume_parsing_pool import ParseJob
+
+        stmt = select(Resume.id, Resume.file_path, Resume.file_name).where(Resume.id.in_(resume_ids))
+        result = await session.execute(stmt)
+        rows = result.all()
+
+        for resume_id, file_path, file_name in rows:
+            local_path = await self.blob_store.materialize(file_path)
+            await pool.submit(ParseJob(resume_id=resume_id, file_path=local_path, file_name=file_name))
+
+        logger.info(f"Queued {len(rows)} resumes for parsing")
+        return [row[0] for row in rows]
+
+    async def save_parsed_results(
+        self,
+        session: AsyncSession,
+        outcomes: List[Any],
+    ) -> int:
+        """
+        Persist a batch of ``ParseOutcome`` results from the parsing pool.
+
+        Existing parsed rows, resumes and candidates are loaded with one
+        ``IN`` query each, so a batch costs a fixed number of round trips
+        regardless of its size.
+
+        Args:
+            session: Database session
+            outcomes: Parse outcomes; failed ones are skipped
+
+        Returns:
+            Number of parsed resumes written
+        """
+        successful = {o.resume_id: o for o in outcomes if o.ok}
+        if not successful:
+            return 0
+
+        try:
+            resume_ids = list(successful)
+
+            result = await session.execute(
+                select(ParsedResume).where(ParsedResume.resume_id.in_(resume_ids))
+            )
+            existing = {p.resume_id: p for p in result.scalars().all()}
+
+            result = await session.execute(
+                select(Resume.id, Resume.candidate_id).where(Resume.id.in_(resume_ids))
+            )
+            candidate_by_resume = dict(result.all())
+
+            result = await session.execute(
+                select(Candidate).where(Candidate.id.in_(set(candidate_by_resume.values())))
+            )
+            candidates = {c.id: c for c in result.scalars().all()}
+
+            for resume_id, outcome in successful.items():
+                if resume_id not in candidate_by_resume:
+                    logger.warning(f"Skipping parsed result for missing resume {resume_id}")
+                    continue
+
+                data = outcome.parsed["parsed_data"]
+                fields = {
+                    "raw_text": outcome.text,
+                    "parsed_data": data,
+                    "skills_extracted": data.get("skills", []),
+                    "experience_extracted": data.get("experience", []),
+                    "education_extracted": data.get("education", []),
+                    "certifications_extracted": data.get("certifications", []),
+                    "parsing_confidence": outcome.parsed["parsing_confidence"],
+                    "parser_version": outcome.parsed["parser_version"],
+                }
+                parsed = existing.get(resume_id)
+                if parsed:
+                    for key, value in fields.items():
+                        setattr(parsed, key, value)
+                else:
+                    session.add(ParsedResume(resume_id=resume_id, **fields))
+
+                candidate = candidates.get(candidate_by_resume[resume_id])
+                if candidate:
+                    if data.get("skills"):
+                        candidate.skills = data["skills"]
+                    if data.get("education"):
+                        candidate.education = data["education"]
+
+            await session.commit()
+            logger.info(f"Saved {len(successful)} parsed resumes")
+            return len(successful)
+
+        except Exception as e:
+            logger.error(f"Error saving parsed resume batch: {str(e)}")
+            await session.rollback()
+            raise
+
     async def get_parsed_resume(
         self,
         session: AsyncSession,
@@ -285,7 +429,9 @@ class ResumeService:
             candidate = result.scalar_one_or_none()
 
             # Extract resume text
-            resume_text = await self.parser.extract_text_from_file(resume.file_path)
+            resume_text = await self.parser.extract_text_from_file(
+                await self.blob_store.materialize(resume.file_path)
+            )
 
             # Tailor resume
             tailoring_result = await self.tailor.tailor_resume_for_requirement(
@@ -337,7 +483,9 @@ class ResumeService:
                 raise ValueError(f"Resume {resume_id} not found")
 
             # Extract text
-            resume_text = await self.parser.extract_text_from_file(resume.file_path)
+            resume_text = await self.parser.extract_text_from_file(
+                await self.blob_store.materialize(resume.file_path)
+            )
 
             # Calculate ATS score
             ats_result = await self.tailor.get_ats_score(resume_text)
@@ -478,10 +626,14 @@ class ResumeService:
             if not resume:
                 raise ValueError(f"Resume {resume_id} not found")
 
-            # Delete file if it exists
+            # Delete the file unless another resume shares the same blob
             try:
-                if Path(resume.file_path).exists():
-                    Path(resume.file_path).unlink()
+                stmt = select(func.count(Resume.id)).where(
+                    and_(Resume.file_path == resume.file_path, Resume.id != resume.id)
+                )
+                shared = (await session.execute(stmt)).scalar_one()
+                if not shared:
+                    await self.blob_store.delete(resume.file_path)
             except Exception as e:
                 logger.warning(f"Could not delete resume file: {str(e)}")
 
@@ -4,7 +4,7 @@ import logging
 import hashlib
 import secrets
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Iterable, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
 from models.security import (
@@ -12,7 +12,6 @@ from models.security import (
     RoleTemplate,
     UserRoleAssignment,
     APIKey,
-    AccessLog,
     SecurityAlert,
     SessionPolicy,
 )
@@ -25,6 +24,10 @@ from schemas.security import (
     SessionPolicyCreate,
     SessionPolicyUpdate,
 )
+from services.api_key_cache import api_key_cache
+from services.audit_sink import audit_sink
+from services.permission_matrix import permission_key, permission_matrix
+from utils.principal_cache import attach_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -257,6 +260,7 @@ class RoleTemplateService:
 
             await self.db.commit()
             await self.db.refresh(role)
+            await permission_matrix.bump_revision()
 
             logger.info(f"Updated role template {role_id}")
             return role
@@ -307,6 +311,7 @@ class AccessControlService:
             self.db.add(assignment)
             await self.db.commit()
             await self.db.refresh(assignment)
+            await permission_matrix.invalidate_user(assignment_data.user_id)
 
             logger.info(f"Assigned role {assignment_data.role_template_id} to user {assignment_data.user_id}")
             return assignment
@@ -370,19 +375,9 @@ class AccessControlService:
             Exception: If database operation fails
         """
         try:
-            # Get user's roles
-            roles = await self.get_user_roles(user_id)
-
-            if not roles:
-                logger.warning(f"User {user_id} has no active roles")
-                return False
-
-            # Check if any role has the permission
-            for role in roles:
-                if role.permissions:
-                    for perm in role.permissions:
-                        if isinstance(perm, dict) and perm.get("resource") == resource and perm.get("action") == action:
-                            return True
+            compiled = await permission_matrix.get(self.db, user_id)
+            if compiled.allows(resource, action):
+                return True
 
             logger.debug(f"User {user_id} denied access to {resource}.{action}")
             return False
@@ -391,6 +386,29 @@ class AccessControlService:
             logger.error(f"Error checking permission: {str(e)}")
             return False
 
+    async def check_permissions(
+        self,
+        user_id: int,
+        checks: Iterable[Tuple[str, str]],
+    ) -> Dict[str, bool]:
+        """Check many resource+action pairs against one compiled permission set.
+
+        Args:
+            user_id: User ID
+            checks: (resource, action) pairs
+
+        Returns:
+            Dictionary of {"resource:action": allowed}; all False if the check fails
+        """
+        keys = [permission_key(resource, action) for resource, action in checks]
+        try:
+            compiled = await permission_matrix.get(self.db, user_id)
+            return {key: key in compiled.permissions for key in keys}
+
+        except Exception as e:
+            logger.error(f"Error checking permissions: {str(e)}")
+            return dict.fromkeys(keys, False)
+
     async def get_user_agent_permissions(self, user_id: int) -> Dict[str, List[str]]:
         """Get which agents/methods user can access.
 
@@ -404,17 +422,8 @@ class AccessControlService:
             Exception: If database operation fails
         """
         try:
-            roles = await self.get_user_roles(user_id)
-
-            agent_access = {}
-            for role in roles:
-                if role.agent_access:
-                    for agent, methods in role.agent_access.items():
-                        if agent not in agent_access:
-                            agent_access[agent] = []
-                        agent_access[agent].extend(methods)
-
-            return agent_access
+            compiled = await permission_matrix.get(self.db, user_id)
+            return compiled.agent_permissions()
 
         except Exception as e:
             logger.error(f"Error getting user agent permissions: {str(e)}")
@@ -433,9 +442,11 @@ class AccessControlService:
         response_status: Optional[int] = None,
         user_agent: Optional[str] = None,
         api_key_id: Optional[int] = None,
-    ) -> AccessLog:
+    ) -> None:
         """Log resource access.
 
+        The record is buffered and written in bulk by ``audit_sink``.
+
         Args:
             user_id: User ID
             resource: Resource accessed
@@ -448,36 +459,20 @@ class AccessControlService:
             response_status: HTTP response status
             user_agent: User agent string
             api_key_id: Optional API key ID
-
-        Returns:
-            Created access log
-
-        Raises:
-            Exception: If database operation fails
         """
-        try:
-            log = AccessLog(
-                user_id=user_id,
-                api_key_id=api_key_id,
-                resource=resource,
-                action=action,
-                entity_id=entity_id,
-                result=result,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_path=request_path,
-                request_method=request_method,
-                response_status=response_status,
-            )
-
-            self.db.add(log)
-            await self.db.commit()
-            return log
-
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error logging access: {str(e)}")
-            raise
+        audit_sink.enqueue(
+            user_id=user_id,
+            api_key_id=api_key_id,
+            resource=resource,
+            action=action,
+            entity_id=entity_id,
+            result=result,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            request_path=request_path,
+            request_method=request_method,
+            response_status=response_status,
+        )
 
 
 class APIKeyService:
@@ -532,6 +527,7 @@ class APIKeyService:
             self.db.add(api_key)
             await self.db.commit()
             await self.db.refresh(api_key)
+            api_key_cache.invalidate(key_hash)
 
             logger.info(f"Created API key {api_key.key_prefix} for user {user_id}")
             return plaintext_key, api_key
@@ -581,11 +577,15 @@ class APIKeyService:
             logger.error(f"Error getting API keys: {str(e)}")
             raise
 
-    async def verify_api_key(self, plaintext_key: str) -> Optional[APIKey]:
+    async def verify_api_key(self, plaintext_key: str, ip_address: Optional[str] = None) -> Optional[APIKey]:
         """Verify API key.
 
+        Verified and unknown keys are cached (see ``services.api_key_cache``);
+        the key's last use is recorded and written in batches.
+
         Args:
             plaintext_key: Plaintext API key
+            ip_address: Caller IP, stored as the key's last used IP
 
         Returns:
             APIKey model if valid and active, None otherwise
@@ -595,20 +595,12 @@ class APIKeyService:
         """
         try:
             key_hash = hashlib.sha256(plaintext_key.encode()).hexdigest()
+            row = await api_key_cache.lookup(self.db, plaintext_key, key_hash)
+            if row is None:
+                return None
 
-            result = await self.db.execute(
-                select(APIKey).where(
-                    and_(
-                        APIKey.key_hash == key_hash,
-                        APIKey.is_active == True,
-                        or_(
-                            APIKey.expires_at.is_(None),
-                            APIKey.expires_at > datetime.utcnow(),
-                        ),
-                    )
-                )
-            )
-            return result.scalar_one_or_none()
+            api_key_cache.record_use(row["id"], ip_address)
+            return attach_snapshot(self.db, APIKey, row)
 
         except Exception as e:
             logger.error(f"Error verifying API key: {str(e)}")
@@ -640,6 +632,7 @@ class APIKeyService:
 
             await self.db.commit()
             await self.db.refresh(api_key)
+            api_key_cache.invalidate(api_key.key_hash)
 
             logger.info(f"Revoked API key {api_key.key_prefix}")
             return api_key
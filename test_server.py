@@ -240,8 +240,8 @@ def create_test_app():
     )
 
     # Middleware
-    from api.middleware import RequestLoggingMiddleware
-    app.add_middleware(RequestLoggingMiddleware)
+    from api.middleware import RequestContextMiddleware
+    app.add_middleware(RequestContextMiddleware)
 
     # Startup
     @app.on_event("startup")
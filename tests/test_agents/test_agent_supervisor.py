@@ -0,0 +1,180 @@
+"""Tests for the agent registry lifecycle and the agent supervisor."""
+import asyncio
+import time
+
+import pytest
+
+from agents.agent_supervisor import AgentSupervisor
+from agents.base_agent import BaseAgent
+
+
+class FakeAgent(BaseAgent):
+    """Agent with configurable start and health check delays."""
+
+    constructed = 0
+
+    def __init__(self, name="fake", start_delay=0.0, health_delay=0.0):
+        super().__init__(name, "1.0")
+        FakeAgent.constructed += 1
+        self.start_delay = start_delay
+        self.health_delay = health_delay
+        self.stopped = False
+        self.client = None
+
+    async def on_start(self) -> None:
+        await asyncio.sleep(self.start_delay)
+        self.client = object()
+
+    async def on_stop(self) -> None:
+        self.stopped = True
+
+    async def health_check(self):
+        await asyncio.sleep(self.health_delay)
+        return await super().health_check()
+
+    async def call_client(self):
+        if self.client is None:
+            raise RuntimeError("client used before on_start")
+        return self.client
+
+
+@pytest.fixture(autouse=True)
+def _reset_count():
+    FakeAgent.constructed = 0
+
+
+class TestAgentSupervisor:
+    """Test suite for AgentSupervisor."""
+
+    @pytest.mark.unit
+    def test_lazy_agent_constructed_on_first_use(self):
+        supervisor = AgentSupervisor()
+        agent = supervisor.lazy("fake", FakeAgent, name="lazy-fake")
+
+        assert FakeAgent.constructed == 0
+        assert repr(agent) == "<lazy fake>"
+        assert agent.agent_name == "lazy-fake"
+        agent.start_delay = 0.5
+        assert FakeAgent.constructed == 1
+        assert supervisor.get("fake").start_delay == 0.5
+        assert "construct_ms" in supervisor.startup_times["fake"]
+        assert supervisor.report()["agents"]["fake"]["instantiated"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_start_initializes_concurrently_with_timeout(self):
+        supervisor = AgentSupervisor(timeout=0.2)
+        for n in range(5):
+            supervisor.register(FakeAgent(f"a{n}", start_delay=0.05))
+        supervisor.register(FakeAgent("slow", start_delay=5))
+        supervisor.lazy("unused", FakeAgent)
+
+        started = time.perf_counter()
+        await supervisor.start()
+
+        assert time.perf_counter() - started < 0.5
+        assert all(supervisor.get(f"a{n}").is_running for n in range(5))
+        assert supervisor.startup_times["slow"]["initialize_ms"] >= 150
+        assert not supervisor.is_instantiated("unused")
+        assert FakeAgent.constructed == 6
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_agents_used_after_start_are_initialized(self):
+        supervisor = AgentSupervisor()
+        agent = supervisor.lazy("late", FakeAgent)
+        await supervisor.start()
+
+        assert agent.is_running is False  # constructed now, initializing in the background
+        await supervisor.ensure_started("late")
+        assert agent.is_running is True
+
+        await supervisor.stop()
+        assert agent.stopped is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_first_call_after_start_waits_for_initialization(self):
+        supervisor = AgentSupervisor()
+        agent = supervisor.lazy("late", FakeAgent, start_delay=0.05)
+        await supervisor.start()
+
+        # The first use constructs the agent; its on_start is still sleeping
+        assert await agent.call_client() is supervisor.get("late").client
+        assert agent.is_running is True
+        # Once started, methods are handed out unwrapped
+        assert agent.call_client == supervisor.get("late").call_client
+
+        await supervisor.stop()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_initialization(self):
+        supervisor = AgentSupervisor()
+        agent = supervisor.lazy("late", FakeAgent, start_delay=0.05)
+        await supervisor.start()
+
+        call = asyncio.create_task(agent.call_client())
+        await asyncio.sleep(0.01)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+
+        await supervisor.ensure_started("late")
+        assert agent.is_running is True
+        await supervisor.stop()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_checks_run_concurrently(self):
+        supervisor = AgentSupervisor(timeout=0.1)
+        supervisor.register(FakeAgent("ok", health_delay=0.05))
+        supervisor.register(FakeAgent("ok2", health_delay=0.05))
+        supervisor.register(FakeAgent("hung", health_delay=5))
+        supervisor.lazy("idle", FakeAgent)
+
+        started = time.perf_counter()
+        results = await supervisor.health_check_all()
+
+        assert time.perf_counter() - started < 0.3
+        assert results["ok"]["agent_name"] == "ok"
+        assert results["hung"]["status"] == "timeout"
+        assert results["idle"]["status"] == "idle"
+        assert not supervisor.is_instantiated("idle")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_crashed_consumer_is_restarted(self):
+        supervisor = AgentSupervisor(restart_backoff=0.001, restart_backoff_max=0.01)
+        runs = 0
+        done = asyncio.Event()
+
+        async def consumer():
+            nonlocal runs
+            runs += 1
+            if runs < 3:
+                raise RuntimeError(f"crash {runs}")
+            done.set()
+            await asyncio.sleep(3600)
+
+        supervisor.supervise("consumer", consumer)
+        await asyncio.wait_for(done.wait(), 1)
+
+        report = supervisor.report()["consumers"]["consumer"]
+        assert report == {"running": True, "restarts": 2, "last_error": "crash 2"}
+
+        await supervisor.stop()
+        assert supervisor.report()["consumers"]["consumer"]["running"] is False
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_consumer_gives_up_after_max_restarts(self):
+        supervisor = AgentSupervisor(restart_backoff=0.001)
+
+        async def consumer():
+            raise ValueError("bad config")
+
+        supervisor.supervise("consumer", consumer, max_restarts=2)
+        await asyncio.wait_for(supervisor.consumers["consumer"].task, 1)
+
+        assert supervisor.consumers["consumer"].restarts == 2
+        assert supervisor.consumers["consumer"].last_error == "bad config"
@@ -0,0 +1,164 @@
+"""Tests for the compiled alert rule engine."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agents.alert_rule_engine import (
+    AlertRuleEngine,
+    InMemoryCooldownTracker,
+    RedisCooldownTracker,
+    compile_conditions,
+)
+from agents.alerts_notification_agent import AlertsNotificationAgent
+from agents.events import Event, EventType
+
+
+def _rule(rule_id, conditions=(), event_type="offer.sent", cooldown=0):
+    return SimpleNamespace(
+        id=rule_id, name=f"rule {rule_id}", event_type=event_type, conditions=list(conditions),
+        notification_channels=["in_app"], recipients=[], template_subject=None, template_body=None,
+        priority="high", cooldown_minutes=cooldown, is_active=True,
+    )
+
+
+def _event(payload, entity_id=1, event_type=EventType.OFFER_SENT):
+    return Event(
+        event_type=event_type, event_id="evt", source_agent="test",
+        entity_id=entity_id, entity_type="offer", payload=payload,
+    )
+
+
+def _db_with_rules(rules):
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rules
+    db.execute.return_value = result
+    return db
+
+
+class TestCompileConditions:
+    """Test suite for condition compilation."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("operator,value,payload_value,expected", [
+        ("==", "gold", "gold", True),
+        ("!=", "gold", "gold", False),
+        (">", 10, 11, True),
+        (">=", 10, 10, True),
+        ("<", 10, 10, False),
+        ("<=", 10, 10, True),
+        ("contains", "URGENT", "Urgent: URGENT req", True),
+        ("contains", "urgent", "URGENT", False),
+        ("in", ["us", "ca"], "mx", False),
+        ("between", 1, 2, True),
+    ])
+    def test_operators(self, operator, value, payload_value, expected):
+        predicate = compile_conditions([{"field": "f", "operator": operator, "value": value}])
+
+        assert predicate({"f": payload_value}) is expected
+        assert predicate({}) is False
+
+    @pytest.mark.unit
+    def test_conditions_are_anded(self):
+        predicate = compile_conditions([
+            {"field": "status", "value": "approved"},
+            {"field": "amount", "operator": ">", "value": 100},
+        ])
+
+        assert predicate({"status": "approved", "amount": 101})
+        assert not predicate({"status": "approved", "amount": 100})
+        assert compile_conditions([])({})
+
+
+class TestAlertRuleEngine:
+    """Test suite for AlertRuleEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = AlertRuleEngine()
+        engine.load([
+            _rule(1),
+            _rule(2, [{"field": "status", "operator": "==", "value": "approved"}]),
+            _rule(3, [{"field": "amount", "operator": ">=", "value": 500}]),
+            _rule(4, [{"field": "status", "value": "approved"}, {"field": "amount", "operator": "<", "value": 50}]),
+            _rule(5, [{"field": "amount", "operator": ">", "value": 0}], event_type="offer.accepted"),
+            _rule(6, [{"field": "region", "operator": "in", "value": ["us", "ca"]}]),
+        ])
+        return engine
+
+    @pytest.mark.unit
+    def test_match_uses_event_type_and_conditions(self, engine):
+        assert [r.id for r in engine.match("offer.sent", {"status": "approved", "amount": 600})] == [1, 2, 3]
+        assert [r.id for r in engine.match("offer.sent", {"status": "approved", "amount": 10})] == [1, 2, 4]
+        assert [r.id for r in engine.match("offer.sent", {"region": "ca"})] == [1, 6]
+        assert [r.id for r in engine.match("offer.accepted", {"amount": 1})] == [5]
+        assert engine.match("offer.declined", {}) == []
+
+    @pytest.mark.unit
+    def test_condition_type_errors_skip_only_that_rule(self, engine):
+        matched = engine.match("offer.sent", {"amount": "lots", "status": "approved"})
+
+        assert [r.id for r in matched] == [1, 2]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_loads_active_rules_once_until_invalidated(self):
+        engine = AlertRuleEngine()
+        db = _db_with_rules([_rule(1)])
+
+        await engine.evaluate(db, _event({}))
+        await engine.evaluate(db, _event({}))
+        assert db.execute.await_count == 1
+
+        engine.invalidate()
+        await engine.evaluate(db, _event({}))
+        assert db.execute.await_count == 2
+        # A real SQL predicate, not the constant False that `is_active is True` produced
+        active_filter = db.execute.await_args.args[0].whereclause
+        assert active_filter.left.name == "is_active"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cooldown_per_rule_and_entity(self):
+        now = [0.0]
+        engine = AlertRuleEngine(cooldowns=InMemoryCooldownTracker(clock=lambda: now[0]))
+        engine.load([_rule(1, cooldown=5), _rule(2)])
+
+        assert [r.id for r in await engine.evaluate(None, _event({}, entity_id=7))] == [1, 2]
+        assert [r.id for r in await engine.evaluate(None, _event({}, entity_id=7))] == [2]
+        assert [r.id for r in await engine.evaluate(None, _event({}, entity_id=8))] == [1, 2]
+
+        now[0] = 301.0
+        assert [r.id for r in await engine.evaluate(None, _event({}, entity_id=7))] == [1, 2]
+        assert len(engine.cooldowns) == 1
+
+
+class TestCooldownTrackers:
+    """Test suite for cooldown stores."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redis_tracker_sets_key_with_expiry(self):
+        redis = AsyncMock()
+        redis.set.side_effect = [True, None]
+        tracker = RedisCooldownTracker(redis)
+
+        assert await tracker.acquire("3:9", 60)
+        assert not await tracker.acquire("3:9", 60)
+        redis.set.assert_awaited_with("alert-cooldown:3:9", 1, nx=True, px=60000)
+
+
+class TestAlertsNotificationAgent:
+    """Engine-backed AlertsNotificationAgent."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_evaluate_rules_and_condition_test(self):
+        engine = AlertRuleEngine()
+        engine.load([_rule(1, [{"field": "score", "operator": ">=", "value": 80}])])
+        agent = AlertsNotificationAgent(anthropic_api_key="test", rule_engine=engine)
+
+        assert [r.id for r in await agent.evaluate_rules(None, _event({"score": 90}))] == [1]
+        assert await agent.evaluate_rules(None, _event({"score": 10})) == []
+        assert await agent._evaluate_conditions([{"field": "x", "value": 1}], {"x": 1})
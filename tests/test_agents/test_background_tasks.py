@@ -0,0 +1,147 @@
+"""Tests for the background task runtime."""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from agents.background_tasks import BackgroundQueueFull, BackgroundTaskRuntime, TaskStatus
+
+
+class CountingSessions:
+    """Session factory stand-in that records how many sessions are open at once."""
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def _session(self):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        try:
+            yield object()
+        finally:
+            self.open -= 1
+
+    def __call__(self):
+        return self._session()
+
+
+def make_runtime(**kwargs):
+    sessions = CountingSessions()
+    options = {"workers": 2, "queue_size": 10, "db_connections": 1, "drain_timeout": 1.0}
+    options.update(kwargs)
+    return BackgroundTaskRuntime(session_factory=sessions, **options), sessions
+
+
+class TestBackgroundTaskRuntime:
+    """Test suite for BackgroundTaskRuntime."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tasks_run_and_registry_tracks_outcome(self):
+        runtime, _ = make_runtime()
+        await runtime.start()
+
+        async def ok(value):
+            return value
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        first = runtime.submit("job", ok, 1, metadata={"job_id": 1})
+        second = runtime.submit("job", broken, task_id="job:2")
+        await runtime.close()
+
+        assert runtime.get(first.id).status == TaskStatus.SUCCEEDED
+        assert runtime.get(first.id).metadata == {"job_id": 1}
+        assert runtime.get("job:2").status == TaskStatus.FAILED
+        assert runtime.get("job:2").error == "RuntimeError: boom"
+        assert second.finished_at is not None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queue_bound_and_duplicate_ids_rejected(self):
+        runtime, _ = make_runtime(workers=1, queue_size=1)
+        await runtime.start()
+        release = asyncio.Event()
+
+        runtime.submit("job", release.wait, task_id="a")
+        await asyncio.sleep(0)  # the worker takes "a" off the queue
+        runtime.submit("job", release.wait, task_id="b")
+        with pytest.raises(BackgroundQueueFull):
+            runtime.submit("job", release.wait, task_id="c")
+        with pytest.raises(ValueError):
+            runtime.submit("job", release.wait, task_id="a")
+
+        closing = asyncio.create_task(runtime.close())
+        await asyncio.sleep(0)
+        with pytest.raises(BackgroundQueueFull):
+            runtime.submit("job", release.wait, task_id="d")
+
+        release.set()
+        await closing
+        assert runtime.stats()["rejected"] == 2
+        assert runtime.get("b").status == TaskStatus.SUCCEEDED
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running_tasks(self):
+        runtime, _ = make_runtime(workers=1)
+        await runtime.start()
+        started = asyncio.Event()
+
+        async def long_running():
+            started.set()
+            await asyncio.sleep(60)
+
+        runtime.submit("job", long_running, task_id="running")
+        runtime.submit("job", long_running, task_id="queued")
+        await started.wait()
+
+        assert runtime.cancel("queued") is True
+        assert runtime.get("queued").status == TaskStatus.CANCELLED
+        assert runtime.cancel("running") is True
+        await asyncio.sleep(0.01)
+        assert runtime.get("running").status == TaskStatus.CANCELLED
+        assert runtime.cancel("running") is False
+        assert runtime.cancel("unknown") is False
+
+        await runtime.close()
+        assert runtime.stats()["cancelled"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sessions_capped_at_db_connections(self):
+        runtime, sessions = make_runtime(workers=4, db_connections=2)
+        await runtime.start()
+
+        async def uses_db():
+            async with runtime.session():
+                await asyncio.sleep(0.01)
+
+        for _ in range(8):
+            runtime.submit("job", uses_db)
+        await runtime.close()
+
+        assert sessions.peak == 2
+        assert runtime.stats()["succeeded"] == 8
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_close_drains_then_cancels_stragglers(self):
+        runtime, _ = make_runtime(workers=1)
+        await runtime.start()
+
+        async def quick():
+            await asyncio.sleep(0.01)
+
+        runtime.submit("job", quick, task_id="quick")
+        runtime.submit("job", asyncio.sleep, 60, task_id="stuck")
+        runtime.submit("job", quick, task_id="behind")
+        await runtime.close(timeout=0.1)
+
+        assert runtime.get("quick").status == TaskStatus.SUCCEEDED
+        assert runtime.get("stuck").status == TaskStatus.CANCELLED
+        assert runtime.get("behind").status == TaskStatus.CANCELLED
+        assert not runtime.is_running
@@ -0,0 +1,145 @@
+"""Tests for DuplicateDetectorAgent and its blocking index."""
+import random
+
+import pytest
+
+from agents.duplicate_detector_agent import (
+    DuplicateDetectorAgent,
+    DuplicateIndex,
+    _soundex,
+)
+
+
+def _brute_force_batch(agent, candidates):
+    """Reference implementation: compare every candidate with every other."""
+    return [
+        agent.check_for_duplicates(c, candidates[:i] + candidates[i + 1:])
+        for i, c in enumerate(candidates)
+    ]
+
+
+def _random_candidates(count, seed=7):
+    rng = random.Random(seed)
+    first = ["john", "jane", "raj", "maria", "wei", "ahmed"]
+    last = ["smith", "patel", "garcia", "chen", "khan", "jones"]
+    candidates = []
+    for i in range(count):
+        person = rng.randrange(count // 3 or 1)
+        candidates.append({
+            "id": i + 1,
+            "first_name": first[person % len(first)].title(),
+            "last_name": last[(person // len(first)) % len(last)],
+            "email": f"user{person}@example.com" if rng.random() < 0.7 else None,
+            "phone": f"+1 (555) 01{person:04d}" if rng.random() < 0.6 else "",
+            "linkedin_url": (
+                f"https://www.linkedin.com/in/user-{person}" if rng.random() < 0.5 else ""
+            ),
+        })
+    return candidates
+
+
+class TestDuplicateDetectorAgent:
+    """Test suite for DuplicateDetectorAgent."""
+
+    @pytest.mark.unit
+    def test_extract_keys_normalizes_once(self):
+        """Keys carry the normalized email, phone, slug and name tokens."""
+        agent = DuplicateDetectorAgent()
+        keys = agent.extract_keys({
+            "id": 1,
+            "first_name": "John",
+            "last_name": "Smith",
+            "email": "  John.Smith@Example.com ",
+            "phone": "+1 (415) 555-0100",
+            "linkedin_url": "https://linkedin.com/in/John-Smith-42/",
+        })
+
+        assert keys.email == "john.smith@example.com"
+        assert keys.phone == "4155550100"
+        assert keys.linkedin == "john-smith-42"
+        assert keys.sorted_name == "john smith"
+        assert keys.phonetic_name == "J500 S530"
+
+    @pytest.mark.unit
+    def test_soundex(self):
+        """Soundex groups common spelling variants."""
+        assert _soundex("Robert") == _soundex("Rupert") == "R163"
+        assert _soundex("Ashcraft") == "A261"
+        assert _soundex("Smyth") == _soundex("Smith")
+
+    @pytest.mark.unit
+    def test_index_only_returns_blocked_records(self):
+        """Records sharing no key are never compared."""
+        agent = DuplicateDetectorAgent()
+        index = agent.build_index([
+            {"id": 1, "first_name": "Ann", "last_name": "Lee", "email": "ann@x.com"},
+            {"id": 2, "first_name": "Bob", "last_name": "Ray", "email": "bob@x.com"},
+        ])
+        keys = agent.extract_keys({"id": 3, "email": "ANN@x.com"})
+
+        assert index.candidates_for(keys) == [0]
+
+    @pytest.mark.unit
+    def test_large_name_blocks_are_skipped(self):
+        """Very common names do not fan out into full scans."""
+        agent = DuplicateDetectorAgent()
+        index = DuplicateIndex(max_name_block=2)
+        for i in range(3):
+            index.add(agent.extract_keys({"id": i, "first_name": "John", "last_name": "Smith"}))
+
+        keys = agent.extract_keys({"id": 99, "first_name": "John", "last_name": "Smith"})
+        assert index.candidates_for(keys) == []
+
+    @pytest.mark.unit
+    def test_check_against_index(self):
+        """Indexed lookup confirms an email + phone duplicate."""
+        agent = DuplicateDetectorAgent()
+        index = agent.build_index([
+            {"id": 1, "first_name": "Jane", "last_name": "Doe",
+             "email": "jane@doe.com", "phone": "555-123-4567"},
+        ])
+
+        result = agent.check_against_index(
+            {"id": 2, "first_name": "Jane", "last_name": "Doe",
+             "email": "Jane@Doe.com", "phone": "(555) 123 4567"},
+            index,
+        )
+
+        assert result.is_duplicate is True
+        assert result.recommendation == "CONFIRMED_DUPLICATE"
+        assert result.matched_with == 1
+        assert result.match_fields == ["email", "phone", "name"]
+
+    @pytest.mark.unit
+    def test_batch_check_matches_brute_force(self):
+        """Blocking gives the same verdicts as the pairwise scan."""
+        agent = DuplicateDetectorAgent()
+        candidates = _random_candidates(300)
+
+        indexed = agent.batch_check(candidates)
+        expected = _brute_force_batch(agent, candidates)
+
+        assert [r.recommendation for r in indexed] == [r.recommendation for r in expected]
+        assert [r.matched_with for r in indexed] == [r.matched_with for r in expected]
+        duplicates = [(r.confidence, r.match_fields) for r in indexed if r.is_duplicate]
+        assert duplicates == [
+            (r.confidence, r.match_fields) for r in expected if r.is_duplicate
+        ]
+
+    @pytest.mark.unit
+    def test_batch_check_against_existing(self):
+        """Incoming submissions are checked against known candidates too."""
+        agent = DuplicateDetectorAgent()
+        existing = [{"id": 10, "email": "a@b.com", "phone": "5551234567",
+                     "first_name": "Al", "last_name": "Bee"}]
+        incoming = [
+            {"id": 11, "email": "a@b.com", "phone": "555 123 4567",
+             "first_name": "Al", "last_name": "Bee"},
+            {"id": 12, "email": "c@d.com", "first_name": "Cy", "last_name": "Dee"},
+        ]
+
+        results = agent.batch_check(incoming, existing_candidates=existing)
+
+        assert len(results) == 2
+        assert results[0].matched_with == 10
+        assert results[1].is_duplicate is False
@@ -0,0 +1,107 @@
+"""Tests for the event wire formats."""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("msgpack")
+
+from agents.event_bus import RabbitMQBroker
+from agents.event_codec import FLAG_ZSTD, MAGIC, SCHEMA_VERSION, JsonCodec, MsgpackCodec, decode_event
+from agents.events import Event, EventType
+
+
+def _event(payload=None, **fields):
+    return Event(
+        event_type=EventType.MATCH_COMPUTED, event_id="evt-1", source_agent="matching_agent",
+        entity_id=7, entity_type="match", payload=payload if payload is not None else {"score": 0.91},
+        correlation_id="corr-1", user_id=3, timestamp=datetime(2026, 3, 10, 9, 30, 15, 123456), **fields,
+    )
+
+
+class TestMsgpackCodec:
+    """Test suite for MsgpackCodec."""
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        codec = MsgpackCodec(compress_threshold=None)
+        event = _event({"skills": ["python", "sql"], "nested": {"n": 1}})
+
+        data = codec.encode(event)
+        decoded = codec.decode(data)
+
+        assert data[:4] == MAGIC + bytes((SCHEMA_VERSION, 0))
+        assert decoded == event
+        assert decoded.event_type is EventType.MATCH_COMPUTED
+        assert decoded.model_dump_json() == event.model_dump_json()
+
+    @pytest.mark.unit
+    def test_aware_timestamp_and_payload_types(self):
+        codec = MsgpackCodec(compress_threshold=None)
+        event = _event(
+            {"amount": Decimal("12.50"), "at": datetime(2026, 1, 1), "status": EventType.MATCH_COMPUTED},
+            retry_count=2,
+        )
+        event.timestamp = datetime(2026, 3, 10, 11, 0, tzinfo=timezone(timedelta(hours=2)))
+
+        decoded = codec.decode(codec.encode(event))
+
+        assert decoded.timestamp == datetime(2026, 3, 10, 9, 0)
+        assert decoded.payload == {"amount": "12.50", "at": "2026-01-01T00:00:00", "status": "match.computed"}
+        assert decoded.retry_count == 2
+
+    @pytest.mark.unit
+    def test_large_bodies_are_compressed(self):
+        pytest.importorskip("zstandard")
+        codec = MsgpackCodec(compress_threshold=256)
+        small = codec.encode(_event())
+        large_event = _event({"text": "experience " * 500})
+        large = codec.encode(large_event)
+
+        assert small[3] == 0
+        assert large[3] & FLAG_ZSTD
+        assert len(large) < len(large_event.model_dump_json()) // 10
+        assert codec.decode(large) == large_event
+        assert decode_event(large) == large_event
+
+    @pytest.mark.unit
+    def test_rejects_unknown_version_and_invalid_fields(self):
+        codec = MsgpackCodec(compress_threshold=None)
+        data = codec.encode(_event())
+
+        with pytest.raises(ValueError, match="schema version"):
+            codec.decode(MAGIC + bytes((SCHEMA_VERSION + 1, 0)) + data[4:])
+
+        bad = _event()
+        bad.retry_count = -1
+        with pytest.raises(ValueError):
+            codec.decode(codec.encode(bad))
+
+
+class TestDecodeEvent:
+    """Test suite for format sniffing."""
+
+    @pytest.mark.unit
+    def test_reads_json_and_msgpack(self):
+        event = _event()
+        json_data = JsonCodec().encode(event)
+
+        assert decode_event(json_data) == event
+        assert decode_event(json_data.decode()) == event
+        assert decode_event(Event.to_json(event)) == Event.from_json(event.to_json())
+        assert decode_event(MsgpackCodec(compress_threshold=None).encode(event)) == event
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rabbitmq_publishes_with_codec_content_type(self):
+        broker = RabbitMQBroker("amqp://test", codec=MsgpackCodec(compress_threshold=None))
+        exchange = MagicMock(publish=AsyncMock())
+        broker.channel = MagicMock()
+        broker.exchanges["hr_platform.events"] = exchange
+
+        await broker.publish(_event())
+
+        message = exchange.publish.await_args.args[0]
+        assert message.content_type == "application/x-msgpack"
+        assert decode_event(message.body) == _event()
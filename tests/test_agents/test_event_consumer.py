@@ -0,0 +1,227 @@
+"""Tests for the event consumer runtime and broker consumers."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agents.event_bus import EventBus, InProcessBroker, RabbitMQBroker, RedisPubSubBroker
+from agents.event_consumer import ConsumerPolicy, ConsumerPool, InboundEvent, TimingHistogram
+from agents.events import Event, EventType
+
+
+def _event(n=1, event_type=EventType.MATCH_COMPUTED):
+    return Event(
+        event_type=event_type, event_id=f"evt-{n}", source_agent="test",
+        entity_id=n, entity_type="match", payload={},
+    )
+
+
+def _inbound(n=1):
+    return InboundEvent(_event(n), ack=AsyncMock(), nack=AsyncMock())
+
+
+class TestConsumerPool:
+    """Test suite for ConsumerPool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_handlers_concurrently_and_acks(self):
+        active, peak = 0, 0
+
+        async def handler(event):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+
+        pool = ConsumerPool("q", [handler], ConsumerPolicy(prefetch=4, concurrency=3))
+        messages = [_inbound(n) for n in range(9)]
+        for message in messages:
+            await pool.submit(message)
+        await pool.drain()
+
+        assert peak == 3
+        assert pool.acked == 9
+        assert all(message.ack.await_count == 1 for message in messages)
+        [timing] = pool.metrics()["handlers"].values()
+        assert timing["count"] == 9
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failure_or_timeout_nacks(self):
+        async def ok(event):
+            pass
+
+        async def flaky(event):
+            if event.entity_id == 1:
+                raise ValueError("bad")
+            if event.entity_id == 2:
+                await asyncio.sleep(1)
+
+        pool = ConsumerPool("q", [ok, flaky], ConsumerPolicy(concurrency=2, handler_timeout=0.01))
+        messages = [_inbound(n) for n in (1, 2, 3)]
+        for message in messages:
+            await pool.submit(message)
+        await pool.drain()
+
+        assert [m.nack.await_count for m in messages] == [1, 1, 0]
+        assert messages[2].ack.await_count == 1
+        timings = {name.rsplit(".", 1)[-1]: timing for name, timing in pool.timings.items()}
+        assert (timings["ok"].count, timings["ok"].errors) == (3, 0)
+        assert (timings["flaky"].count, timings["flaky"].errors) == (3, 2)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_drain_finishes_queued_work_then_hands_back_new_messages(self):
+        handled = []
+
+        async def handler(event):
+            await asyncio.sleep(0.001)
+            handled.append(event.entity_id)
+
+        pool = ConsumerPool("q", [handler], ConsumerPolicy(concurrency=1, prefetch=10))
+        for n in range(5):
+            await pool.submit(_inbound(n))
+        await pool.drain()
+
+        late = _inbound(99)
+        await pool.submit(late)
+
+        assert handled == [0, 1, 2, 3, 4]
+        assert not pool.running
+        late.nack.assert_awaited_once()
+
+
+class TestTimingHistogram:
+    """Test suite for TimingHistogram."""
+
+    @pytest.mark.unit
+    def test_quantiles_are_bucket_upper_bounds(self):
+        histogram = TimingHistogram(buckets=(0.01, 0.1, 1.0))
+        for seconds in [0.005] * 98 + [0.5, 4.0]:
+            histogram.observe(seconds)
+
+        assert histogram.quantile(0.5) == 0.01
+        assert histogram.quantile(0.99) == 1.0
+        assert histogram.quantile(1.0) == 4.0
+        assert TimingHistogram().quantile(0.5) is None
+
+
+class TestBrokerConsumers:
+    """Broker subscriptions feed consumer pools."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rabbitmq_sets_prefetch_and_settles_each_message(self):
+        consumer_channel = AsyncMock()
+        queue = AsyncMock()
+        consumer_channel.declare_queue.return_value = queue
+        broker = RabbitMQBroker("amqp://test", policy=ConsumerPolicy(prefetch=5, concurrency=2))
+        broker.channel = AsyncMock()
+        broker.connection = AsyncMock()
+        broker.connection.channel.return_value = consumer_channel
+
+        received = []
+
+        async def handler(event):
+            received.append(event.entity_id)
+            if event.entity_id == 2:
+                raise RuntimeError("boom")
+
+        await broker.subscribe(EventType.MATCH_COMPUTED, handler)
+        await broker.subscribe(EventType.MATCH_COMPUTED, handler)  # same queue, one consumer
+
+        consumer_channel.set_qos.assert_awaited_once_with(prefetch_count=5)
+        queue.consume.assert_awaited_once()
+        on_message = queue.consume.await_args.args[0]
+
+        messages = [
+            SimpleNamespace(body=body, ack=AsyncMock(), nack=AsyncMock(), reject=AsyncMock())
+            for body in (_event(1).to_json().encode(), _event(2).to_json().encode(), b"not json")
+        ]
+        for message in messages:
+            await on_message(message)
+        await broker.close()
+
+        assert sorted(received) == [1, 1, 2, 2]
+        messages[0].ack.assert_awaited_once()
+        messages[1].nack.assert_awaited_once_with(requeue=False)
+        messages[2].reject.assert_awaited_once_with(requeue=False)
+        queue.cancel.assert_awaited_once()
+        consumer_channel.close.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redis_streams_reads_group_and_acks(self):
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xack = AsyncMock()
+        redis.close = AsyncMock()
+        entries = [(f"{n}-0".encode(), {b"event": _event(n).to_json().encode()}) for n in (1, 2)]
+        reads = []
+
+        async def xreadgroup(group, consumer, streams, count, block):
+            reads.append(dict(streams))
+            if len(reads) == 2:
+                return [[b"events:match.computed", entries]]
+            await asyncio.sleep(0.001)
+            return []
+
+        redis.xreadgroup = xreadgroup
+        broker = RedisPubSubBroker("redis://test", transport="streams", consumer_name="w1")
+        broker.redis = redis
+        handled = []
+
+        async def handler(event):
+            handled.append(event.entity_id)
+
+        await broker.subscribe(EventType.MATCH_COMPUTED, handler)
+        for _ in range(100):
+            if redis.xack.await_count == 2:
+                break
+            await asyncio.sleep(0.001)
+        await broker.close()
+
+        redis.xgroup_create.assert_awaited_once_with("events:match.computed", "hr_platform", id="$", mkstream=True)
+        # pending entries of this consumer first, then new ones
+        assert reads[0] == {"events:match.computed": "0"} and reads[1] == {"events:match.computed": ">"}
+        assert sorted(handled) == [1, 2]
+        assert sorted(call.args[2] for call in redis.xack.await_args_list) == [b"1-0", b"2-0"]
+
+
+class TestEventBusRouting:
+    """Subscriptions follow the publish route."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_subscribers_get_events_once_through_the_broker(self):
+        broker = InProcessBroker()
+        bus = EventBus(redis_broker=broker)
+        received = []
+
+        async def handler(event):
+            received.append(event.event_id)
+
+        await bus.subscribe(EventType.MATCH_COMPUTED, handler)
+        await bus.publish(_event(1))
+        await bus.unsubscribe(EventType.MATCH_COMPUTED, handler)
+        await bus.publish(_event(2))
+
+        assert received == ["evt-1"]
+        assert not bus.local_subscribers
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_without_brokers_subscribers_are_local(self):
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event.event_id)
+
+        await bus.subscribe(EventType.MATCH_COMPUTED, handler)
+        await bus.publish(_event(1))
+
+        assert received == ["evt-1"]
@@ -0,0 +1,227 @@
+"""Tests for the transactional event outbox and relay."""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from agents.base_agent import BaseAgent
+from agents.event_bus import EventBus, InProcessBroker
+from agents.event_outbox import OutboxRelay, enqueue_event
+from agents.events import Event, EventType
+from database.base import Base
+from agents.referral_network_agent import ReferralNetworkAgent
+from models.event_outbox import OutboxEvent
+from models.referral import Referrer
+
+_outbox = OutboxEvent.__table__
+
+
+class OutboxAgent(BaseAgent):
+    """Minimal concrete agent."""
+
+
+class FlakyBroker(InProcessBroker):
+    """In-process broker that fails the first ``failures`` publishes."""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+
+    async def publish(self, event, queue=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker down")
+        await super().publish(event, queue)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[_outbox, Referrer.__table__])
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _event(n, event_type=EventType.CANDIDATE_CREATED, timestamp=None):
+    return Event(
+        event_type=event_type, event_id=f"evt-{n}", source_agent="test", entity_id=n,
+        entity_type="candidate", payload={"n": n}, timestamp=timestamp or datetime(2026, 5, 1, 12, n),
+    )
+
+
+async def _enqueue(session_factory, events, commit=True):
+    async with session_factory() as session:
+        for event in events:
+            await enqueue_event(session, event)
+        if commit:
+            await session.commit()
+
+
+class TestOutboxRelay:
+    """Test suite for OutboxRelay."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_only_committed_events_are_relayed_in_order(self, session_factory):
+        broker = InProcessBroker()
+        bus = EventBus(redis_broker=broker)
+        received = []
+
+        async def on_event(event):
+            received.append(event.entity_id)
+
+        await bus.subscribe(EventType.CANDIDATE_CREATED, on_event)
+        relay = OutboxRelay(bus, session_factory, batch_size=2)
+
+        await _enqueue(session_factory, [_event(1), _event(2), _event(3)])
+        await _enqueue(session_factory, [_event(4)], commit=False)
+
+        assert await relay.relay_once() == 2
+        assert await relay.relay_once() == 1
+        assert await relay.relay_once() == 0
+        assert received == [1, 2, 3]
+        assert [event.event_id for event, _ in broker.published] == ["evt-1", "evt-2", "evt-3"]
+        assert (await relay.lag())["pending"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_publish_backs_off_then_dead_letters(self, session_factory):
+        now = [datetime(2026, 5, 1, 13)]
+        bus = EventBus(redis_broker=FlakyBroker(failures=10))
+        relay = OutboxRelay(bus, session_factory, max_attempts=3, backoff_seconds=10, clock=lambda: now[0])
+        await _enqueue(session_factory, [_event(1)])
+
+        assert await relay.relay_once() == 1
+        assert await relay.relay_once() == 0  # backing off
+        now[0] += timedelta(seconds=10)
+        assert await relay.relay_once() == 1
+        now[0] += timedelta(seconds=20)
+        assert await relay.relay_once() == 1
+        now[0] += timedelta(hours=1)
+        assert await relay.relay_once() == 0
+
+        lag = await relay.lag()
+        assert (lag["pending"], lag["dead"], lag["failed"]) == (0, 1, 3)
+
+        bus.redis_broker.failures = 0
+        assert await relay.requeue_dead() == 1
+        assert await relay.relay_once() == 1
+        assert relay.stats.published == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lag_reports_oldest_pending_age(self, session_factory):
+        relay = OutboxRelay(EventBus(), session_factory, clock=lambda: datetime(2026, 5, 1, 12, 30))
+        await _enqueue(session_factory, [_event(5), _event(10)])
+
+        lag = await relay.lag()
+
+        assert lag["pending"] == 2
+        assert lag["oldest_pending_age_seconds"] == 25 * 60
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replay_by_time_range_and_type(self, session_factory):
+        broker = InProcessBroker()
+        relay = OutboxRelay(EventBus(redis_broker=broker), session_factory)
+        await _enqueue(session_factory, [
+            _event(1), _event(2, EventType.MATCH_COMPUTED), _event(3), _event(40),
+        ])
+        await relay.relay_once()
+        broker.published.clear()
+
+        replayed = await relay.replay(
+            datetime(2026, 5, 1, 12, 0), datetime(2026, 5, 1, 12, 30), [EventType.CANDIDATE_CREATED]
+        )
+
+        assert replayed == 2
+        assert [event.event_id for event, _ in broker.published] == ["evt-1", "evt-3"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_purge_keeps_unpublished_and_recent_rows(self, session_factory):
+        now = [datetime(2026, 5, 1, 13)]
+        relay = OutboxRelay(
+            EventBus(redis_broker=InProcessBroker()), session_factory,
+            retention=timedelta(hours=1), clock=lambda: now[0],
+        )
+        await _enqueue(session_factory, [_event(1)])
+        await relay.relay_once()
+        await _enqueue(session_factory, [_event(2)])
+
+        now[0] += timedelta(hours=2)
+        assert await relay.purge() == 1
+
+        async with session_factory() as session:
+            remaining = (await session.execute(select(_outbox.c.event_id))).scalars().all()
+        assert remaining == ["evt-2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_emit_event_with_session_writes_outbox(self, session_factory):
+        agent = OutboxAgent(agent_name="OutboxAgent", agent_version="1.0.0")
+
+        async with session_factory() as session:
+            event = await agent.emit_event(
+                EventType.OFFER_SENT, "offer", 7, {"amount": 100}, db=session, use_rabbitmq=True
+            )
+            await session.commit()
+
+            row = (await session.execute(select(_outbox))).one()
+        assert row.event_id == event.event_id
+        assert row.use_rabbitmq is True
+        assert Event.model_validate(row.body) == event
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_emitted_event_shares_the_business_transaction(self, session_factory):
+        agent = OutboxAgent(agent_name="OutboxAgent", agent_version="1.0.0")
+
+        async with session_factory() as session:
+            await agent.emit_event(EventType.CONTRACT_VOIDED, "contract", 3, {"reason": "x"}, db=session)
+            await session.rollback()  # the change failed: its event goes too
+            await agent.emit_event(EventType.RATE_AGREED, "RateNegotiation", 4, {"agreed_rate": 90.0}, db=session)
+            await session.commit()
+
+            rows = (await session.execute(select(_outbox.c.event_type))).scalars().all()
+        assert rows == ["rate.agreed"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_agent_change_and_its_event_commit_together(self, session_factory):
+        agent = ReferralNetworkAgent()
+        data = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com"}
+
+        async with session_factory() as session:
+            referrer_id = (await agent.register_referrer(session, data)).id
+
+        async with session_factory() as session:
+            rows = (await session.execute(select(_outbox.c.event_type, _outbox.c.body))).all()
+        assert [row.event_type for row in rows] == ["referral.referrer_registered"]
+        assert rows[0].body["entity_id"] == referrer_id
+
+
+class TestEventBus:
+    """Dead letter handling in EventBus."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dead_letter_queue_is_bounded_and_retried(self):
+        bus = EventBus(redis_broker=FlakyBroker(failures=5), dead_letter_limit=2)
+
+        for n in range(3):
+            await bus.publish(_event(n))
+        assert [event.event_id for event in bus.dead_letter_queue] == ["evt-1", "evt-2"]
+
+        await bus.retry_dead_letter_queue()
+        await bus.retry_dead_letter_queue()
+        assert not bus.dead_letter_queue
+        assert len(bus.redis_broker.published) == 2
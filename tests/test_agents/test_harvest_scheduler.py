@@ -0,0 +1,204 @@
+"""Tests for the concurrent harvest scheduler against a local fake source server."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from agents.harvest_scheduler import HarvestScheduler, TokenBucket
+from agents.resume_harvesting_agent import ResumeHarvestingAgent
+
+
+PROFILES_PER_PAGE = 3
+TOTAL_PROFILES = 7
+
+
+def _make_fake_source_app(delay: float = 0.0) -> web.Application:
+    """Cursor-paginated source: cursor is the index of the next profile to return."""
+
+    async def search(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        start = int(request.query.get("cursor", 0))
+        end = min(start + PROFILES_PER_PAGE, request.app["total"])
+        request.app["requests"].append(request.query.get("cursor"))
+        profiles = [
+            {
+                "source_profile_id": f"p{i}",
+                "name": f"Person {i}",
+                "email": f"person{i}@example.com",
+            }
+            for i in range(start, end)
+        ]
+        return web.json_response({
+            "profiles": profiles,
+            "cursor": str(end),
+            "has_more": end < request.app["total"],
+        })
+
+    app = web.Application()
+    app["total"] = TOTAL_PROFILES
+    app["requests"] = []
+    app.router.add_get("/search", search)
+    return app
+
+
+@pytest_asyncio.fixture
+async def fake_source_server():
+    """Start the fake source on an ephemeral localhost port."""
+    app = _make_fake_source_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield app, f"http://127.0.0.1:{port}/search"
+    await runner.cleanup()
+
+
+def _source(name, endpoint, cursor=None, **config):
+    return SimpleNamespace(
+        id=1,
+        name=name,
+        api_endpoint=endpoint,
+        api_key_encrypted=None,
+        rate_limit_per_hour=3600,
+        harvest_cursor=cursor,
+        config={"paginated": True, "requests_per_second": 1000, **config},
+    )
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        """Burst capacity is immediate; further tokens wait for refill."""
+        bucket = TokenBucket(rate=20, capacity=2)
+
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 0.09
+
+    @pytest.mark.unit
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestHarvestScheduler:
+    """Test suite for HarvestScheduler."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streams_all_pages_and_cursor(self, fake_source_server):
+        """Pages are walked from the stored cursor to the end of the source."""
+        app, endpoint = fake_source_server
+        agent = ResumeHarvestingAgent(anthropic_api_key="test")
+        source = _source("fake", endpoint)
+
+        pages = [page async for page in agent.harvest_scheduler.stream([source], {"keywords": ["python"]})]
+        await agent.on_stop()
+
+        assert [len(page.profiles) for page in pages] == [3, 3, 1]
+        assert pages[-1].cursor == str(TOTAL_PROFILES)
+        assert all(page.error is None for page in pages)
+        assert pages[0].profiles[0]["source"] == "fake"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_incremental_harvest_fetches_only_new_profiles(self, fake_source_server):
+        """A stored cursor skips profiles seen by the previous run."""
+        app, endpoint = fake_source_server
+        agent = ResumeHarvestingAgent(anthropic_api_key="test")
+        source = _source("fake", endpoint, cursor=str(TOTAL_PROFILES))
+        app["total"] = TOTAL_PROFILES + 2
+
+        pages = [page async for page in agent.harvest_scheduler.stream([source], {})]
+        await agent.on_stop()
+
+        ids = [p["source_profile_id"] for page in pages for p in page.profiles]
+        assert ids == ["p7", "p8"]
+        assert app["requests"] == [str(TOTAL_PROFILES)]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slow_source_does_not_block_fast_source(self):
+        """Pages from a fast source arrive before a slow source finishes."""
+        async def fetch_page(source, criteria, cursor):
+            await asyncio.sleep(source.config["delay"])
+            return [{"source_profile_id": source.name}], None, False
+
+        scheduler = HarvestScheduler(fetch_page)
+        slow = _source("slow", None, delay=0.3)
+        fast = _source("fast", None, delay=0.0)
+
+        order = [page.source_name async for page in scheduler.stream([slow, fast], {})]
+
+        assert order == ["fast", "slow"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_error_is_reported_per_source(self):
+        """A failing source yields an error page without stopping the others."""
+        async def fetch_page(source, criteria, cursor):
+            if source.name == "broken":
+                raise RuntimeError("boom")
+            return [{"source_profile_id": "ok"}], "c1", False
+
+        scheduler = HarvestScheduler(fetch_page)
+        pages = [page async for page in scheduler.stream(
+            [_source("broken", None, cursor="c0"), _source("ok", None)], {}
+        )]
+
+        by_source = {page.source_name: page for page in pages}
+        assert by_source["broken"].error == "boom"
+        assert by_source["broken"].cursor == "c0"
+        assert by_source["ok"].cursor == "c1"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_shared_per_source(self):
+        """Concurrent runs against one source never exceed its max_concurrency."""
+        in_flight = 0
+        peak = 0
+
+        async def fetch_page(source, criteria, cursor):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return [], None, False
+
+        scheduler = HarvestScheduler(fetch_page)
+        source = _source("capped", None, max_concurrency=1)
+
+        async def drain():
+            return [page async for page in scheduler.stream([source], {})]
+
+        await asyncio.gather(*(drain() for _ in range(4)))
+
+        assert peak == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_consumer_can_stop_early_with_a_full_queue(self):
+        """Breaking out of the stream cancels the fetchers instead of hanging."""
+        async def fetch_page(source, criteria, cursor):
+            return [{"source_profile_id": source.name}], str(int(cursor or 0) + 1), True
+
+        scheduler = HarvestScheduler(fetch_page, queue_size=2)
+        stream = scheduler.stream([_source(name, None) for name in ("a", "b", "c")], {})
+
+        async for page in stream:
+            await asyncio.sleep(0.05)  # let the fetchers fill the queue
+            break
+        await asyncio.wait_for(stream.aclose(), timeout=1)
+
+        assert page.profiles
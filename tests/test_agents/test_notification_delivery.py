@@ -0,0 +1,175 @@
+"""Tests for per-channel notification delivery."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agents.alert_rule_engine import AlertRuleEngine
+from agents.alerts_notification_agent import AlertsNotificationAgent
+from agents.events import Event, EventType
+from agents.notification_delivery import (
+    REJECTED,
+    RETRY,
+    SENT,
+    ChannelPolicy,
+    Delivery,
+    NotificationDispatcher,
+)
+
+
+def _delivery(channel="email", value="a@example.com", title="Alert", message="Body"):
+    return Delivery(channel, {"type": "email", "value": value}, {"title": title, "message": message})
+
+
+class RecordingSender:
+    """Sender that records batch sizes and returns scripted outcomes."""
+
+    def __init__(self, outcomes=None):
+        self.batches = []
+        self.outcomes = list(outcomes or [])
+
+    async def __call__(self, batch):
+        self.batches.append(len(batch))
+        return [self.outcomes.pop(0) if self.outcomes else SENT for _ in batch]
+
+
+class TestNotificationDispatcher:
+    """Test suite for NotificationDispatcher."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batches_what_is_queued(self):
+        sender = RecordingSender()
+        dispatcher = NotificationDispatcher(
+            {"email": sender}, policies={"email": ChannelPolicy(concurrency=1, batch_size=100)}
+        )
+
+        await dispatcher.enqueue_many(_delivery() for _ in range(250))
+        await dispatcher.close()
+
+        assert sender.batches == [100, 100, 50]
+        assert dispatcher.stats["email"].sent == 250
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures_only(self):
+        sender = RecordingSender([RETRY, REJECTED, RETRY, SENT])
+        dispatcher = NotificationDispatcher(
+            {"sms": sender},
+            policies={"sms": ChannelPolicy(concurrency=1, batch_size=2, backoff_seconds=0.001)},
+        )
+
+        await dispatcher.enqueue_many([_delivery("sms"), _delivery("sms")])
+        await dispatcher.close()
+
+        stats = dispatcher.stats["sms"]
+        assert (stats.sent, stats.retried, stats.failed) == (1, 2, 1)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        async def failing(batch):
+            raise ConnectionError("provider down")
+
+        dispatcher = NotificationDispatcher(
+            {"webhook": failing},
+            policies={"webhook": ChannelPolicy(concurrency=1, max_attempts=3, backoff_seconds=0.001)},
+        )
+        delivery = _delivery("webhook")
+
+        await dispatcher.enqueue(delivery)
+        await dispatcher.close()
+
+        assert delivery.attempts == 3
+        assert delivery.last_error == "provider down"
+        assert dispatcher.stats["webhook"].failed == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped_per_channel(self):
+        active, peak = 0, 0
+
+        async def slow(batch):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+            return [SENT] * len(batch)
+
+        dispatcher = NotificationDispatcher({"slack": slow}, policies={"slack": ChannelPolicy(concurrency=3)})
+
+        await dispatcher.enqueue_many(_delivery("slack") for _ in range(12))
+        await dispatcher.close()
+
+        assert peak == 3
+        assert dispatcher.stats["slack"].sent == 12
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unknown_channel_is_not_queued(self):
+        dispatcher = NotificationDispatcher({"email": RecordingSender()})
+
+        assert not await dispatcher.enqueue(_delivery("fax"))
+        assert not dispatcher.running
+
+
+class TestAlertsNotificationAgentDelivery:
+    """Queue-backed delivery in AlertsNotificationAgent."""
+
+    @staticmethod
+    def _agent(session=None):
+        engine = AlertRuleEngine()
+        engine.load([SimpleNamespace(
+            id=1, name="offer", event_type="offer.sent", conditions=[], priority="high", cooldown_minutes=0,
+            notification_channels=["in_app", "email"], template_subject="Offer sent", template_body="Body",
+            recipients=[{"type": "user", "value": uid} for uid in (4, 5, 6)],
+        )])
+        return AlertsNotificationAgent(
+            anthropic_api_key="test", rule_engine=engine, session_factory=lambda: session,
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_process_event_returns_once_queued_and_bulk_inserts(self):
+        session = AsyncMock()
+        session.__aenter__.return_value = session
+        agent = self._agent(session)
+        event = Event(
+            event_type=EventType.OFFER_SENT, event_id="e1", source_agent="test",
+            entity_id=9, entity_type="offer", payload={},
+        )
+
+        await agent.process_event(None, event)
+        assert agent.dispatcher.stats["in_app"].enqueued == 3
+        session.execute.assert_not_called()
+
+        await agent.dispatcher.close()
+
+        # one multi-row insert, then the digest bucket and counter upserts
+        assert session.execute.await_count == 3
+        session.commit.assert_awaited_once()
+        rows = session.execute.await_args_list[0].args[1]
+        assert [row["user_id"] for row in rows] == [4, 5, 6]
+        assert rows[0]["alert_rule_id"] == 1 and rows[0]["entity_id"] == 9
+        # user IDs are not email addresses
+        assert agent.dispatcher.stats["email"].failed == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_email_batch_groups_identical_messages(self):
+        agent = self._agent()
+        agent.send_email_batch = AsyncMock(return_value=True)
+        batch = [
+            _delivery(value="a@example.com"),
+            _delivery(value="b@example.com"),
+            _delivery(value="c@example.com", title="Other"),
+            _delivery(value="not-an-address"),
+        ]
+
+        outcomes = await agent._deliver_email(batch)
+
+        assert outcomes == [SENT, SENT, SENT, REJECTED]
+        assert agent.send_email_batch.await_count == 2
+        assert agent.send_email_batch.await_args_list[0].args[0] == ["a@example.com", "b@example.com"]
@@ -0,0 +1,142 @@
+"""Tests for ResumeHarvestingAgent batch deduplication helpers."""
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from agents.resume_harvesting_agent import ResumeHarvestingAgent, _NameBlockIndex, _chunked
+from models.base import Base
+from models.candidate import Candidate
+from models.harvest import CandidateSourceMapping, HarvestJob, HarvestResult, HarvestSource
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    tables = [model.__table__ for model in (HarvestSource, HarvestJob, Candidate, CandidateSourceMapping, HarvestResult)]
+    async with engine.begin() as conn:
+        # The foreign keys are not enforced by SQLite
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+class TestNameBlockIndex:
+    """Test suite for the in-memory fuzzy name index."""
+
+    @pytest.mark.unit
+    def test_finds_similar_name_in_shared_block(self):
+        """A near-identical name sharing a token is matched."""
+        index = _NameBlockIndex()
+        index.add_rows([(1, "Jonathan", "Smith"), (2, "Maria", "Garcia")])
+
+        assert index.find_similar("jonathan smyth", 0.85) == 1
+        assert index.find_similar("maria garcia", 0.85) == 2
+
+    @pytest.mark.unit
+    def test_dissimilar_or_unblocked_names_do_not_match(self):
+        """Names below the threshold or with no shared token are unique."""
+        index = _NameBlockIndex()
+        index.add_rows([(1, "Jonathan", "Smith")])
+
+        assert index.find_similar("jonathan appleseed", 0.85) is None
+        assert index.find_similar("jonathon smith", 0.85) == 1
+        assert index.find_similar("jonathansmith", 0.85) is None
+
+    @pytest.mark.unit
+    def test_rows_loaded_twice_are_indexed_once(self):
+        """First- and last-name queries may return the same candidate."""
+        index = _NameBlockIndex()
+        index.add_rows([(1, "Ann", "Lee")])
+        index.add_rows([(1, "Ann", "Lee")])
+
+        assert index._blocks["ann"] == {1}
+
+
+@pytest.mark.unit
+def test_chunked():
+    """Chunks cover the input in order without overlap."""
+    assert list(_chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(_chunked([], 3)) == []
+
+
+class TestProcessHarvestResults:
+    """process_harvest_results against SQLite."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_is_deduplicated_and_stored_in_a_fixed_number_of_queries(self, engine, statements):
+        agent = ResumeHarvestingAgent(anthropic_api_key="test")
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            source = HarvestSource(name="github", source_type="developer_community", config={})
+            db.add(source)
+            await db.flush()
+            job = HarvestJob(source_id=source.id, search_criteria={"keywords": ["python"]})
+            db.add_all([
+                job,
+                Candidate(first_name="Jane", last_name="Doe", email="jane@old.example"),
+                Candidate(first_name="Jonathan", last_name="Smith", email="jonathan@old.example"),
+            ])
+            await db.commit()
+            job_id = job.id
+
+            raw = [
+                {"name": "Jane Doe", "email": "JANE@old.example", "source_profile_id": "p1"},  # known email
+                {"name": "Jonathon Smith", "email": "js@new.example", "source_profile_id": "p2"},  # similar name
+                {"name": "Ada Lovelace", "email": "ada@new.example", "source_profile_id": "p3"},
+                {"name": "Ada Lovelace", "email": "ada@new.example", "source_profile_id": "p4"},  # repeat
+                {"name": "A. Lovelace", "email": "ada@new.example", "source_profile_id": "p5"},  # same email
+                {"name": "Grace Hopper", "email": None, "source_profile_id": "p6"},
+            ]
+            statements.clear()
+            processed = await agent.process_harvest_results(db, job_id, raw)
+            executed = list(statements)
+            await db.commit()
+
+            job = await db.get(HarvestJob, job_id)
+            emails = set((await db.execute(select(Candidate.email))).scalars().all())
+            mappings = (await db.execute(select(CandidateSourceMapping.source_profile_id))).scalars().all()
+            results = (await db.execute(select(HarvestResult.candidate_id))).scalars().all()
+
+        assert (job.candidates_found, job.candidates_new, job.candidates_updated) == (6, 2, 1)
+        assert job.status == "completed"
+        assert emails == {
+            "jane@old.example", "jonathan@old.example", "ada@new.example", "noemail_p6@harvested.local",
+        }
+        # One source mapping per candidate, one harvest result per stored profile
+        assert sorted(mappings) == ["p3", "p6"]
+        assert len(results) == len(processed) == 3
+        # Lookups do not grow with the batch: job, emails, name keys, existing source mappings.
+        # (SQLite inserts row by row here; PostgreSQL batches them with insertmanyvalues.)
+        selects = [statement for statement in executed if statement.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 4
+        assert [statement.split()[0] for statement in executed].count("UPDATE") == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_name_index_only_loads_matching_last_name_and_initial(self, engine):
+        agent = ResumeHarvestingAgent(anthropic_api_key="test")
+        async with AsyncSession(engine) as db:
+            db.add_all(
+                [Candidate(first_name="John", last_name=f"Other{n}", email=f"john{n}@old.example") for n in range(20)]
+                + [
+                    Candidate(first_name="Jonathan", last_name="Smith", email="jonathan@old.example"),
+                    Candidate(first_name="Mary", last_name="Smith", email="mary@old.example"),
+                ]
+            )
+            await db.commit()
+
+            index = await agent._build_name_index(db, {("smith", "j")})
+
+        assert sorted(index._names.values()) == ["jonathan smith"]
@@ -0,0 +1,121 @@
+"""Tests for the process-pool resume parsing pipeline."""
+import signal
+import time
+
+import pytest
+
+from agents import resume_parsing_pool
+from agents.resume_parsing_pool import ParseJob, ResumeParsingPool, _parse_in_worker
+
+
+def _write_docx(path, lines):
+    docx = pytest.importorskip("docx")
+    doc = docx.Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+
+class TestResumeParsingPool:
+    """Test suite for ResumeParsingPool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parses_files_and_flushes_in_batches(self, tmp_path):
+        """Results reach the sink in batches of batch_size, failures included."""
+        good = _write_docx(tmp_path / "jane.docx", [
+            "Jane Doe",
+            "jane.doe@example.com",
+            "Skills: Python, Docker, AWS",
+        ])
+        unsupported = tmp_path / "notes.txt"
+        unsupported.write_text("not a resume")
+
+        batches = []
+
+        async def sink(outcomes):
+            batches.append(outcomes)
+
+        pool = ResumeParsingPool(workers=1, batch_size=2, flush_interval=60, result_sink=sink, memory_limit_mb=None)
+        await pool.submit(ParseJob(resume_id=1, file_path=str(good), file_name="jane.docx"))
+        await pool.submit(ParseJob(resume_id=2, file_path=str(unsupported), file_name="notes.txt"))
+        await pool.submit(ParseJob(resume_id=3, file_path=str(good), file_name="jane.docx"))
+        await pool.close()
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        outcomes = {o.resume_id: o for batch in batches for o in batch}
+        assert outcomes[1].ok
+        assert outcomes[1].parsed["parsed_data"]["contact"]["email"] == "jane.doe@example.com"
+        assert not outcomes[2].ok
+        assert "Unsupported file format" in outcomes[2].error
+
+        metrics = pool.metrics()
+        assert metrics["submitted"] == 3
+        assert metrics["completed"] == 2
+        assert metrics["failed"] == 1
+        assert metrics["flushed"] == 3
+        assert metrics["resumes_per_second"] > 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parse_returns_outcome_to_caller(self, tmp_path):
+        """Jobs submitted through parse() bypass the sink."""
+        good = _write_docx(tmp_path / "jane.docx", ["Jane Doe", "jane.doe@example.com"])
+        batches = []
+
+        async def sink(outcomes):
+            batches.append(outcomes)
+
+        pool = ResumeParsingPool(workers=1, batch_size=1, result_sink=sink, memory_limit_mb=None)
+        outcome = await pool.parse(ParseJob(resume_id=0, file_path=str(good), file_name="jane.docx"))
+        missing = await pool.parse(ParseJob(resume_id=0, file_path=str(tmp_path / "missing.pdf")))
+        await pool.close()
+
+        assert outcome.ok
+        assert outcome.parsed["parsed_data"]["contact"]["email"] == "jane.doe@example.com"
+        assert not missing.ok
+        assert batches == []
+        assert pool.metrics()["completed"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_try_submit_requires_running_pool(self):
+        """Non-blocking submit refuses work before start."""
+        pool = ResumeParsingPool(workers=1)
+        with pytest.raises(RuntimeError):
+            pool.try_submit(ParseJob(resume_id=1, file_path="/tmp/x.pdf"))
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sink_errors_are_counted(self, tmp_path):
+        """A failing writer does not kill the pool."""
+        async def sink(outcomes):
+            raise RuntimeError("db down")
+
+        pool = ResumeParsingPool(workers=1, batch_size=1, result_sink=sink, memory_limit_mb=None)
+        await pool.submit(ParseJob(resume_id=1, file_path=str(tmp_path / "missing.pdf")))
+        await pool.close()
+
+        assert pool.metrics()["write_failed"] == 1
+
+
+@pytest.mark.unit
+def test_worker_timeout(monkeypatch):
+    """A file exceeding its budget is interrupted inside the worker."""
+    previous = signal.getsignal(signal.SIGALRM)
+    monkeypatch.setattr(resume_parsing_pool, "_worker_parser", object())
+    monkeypatch.setattr(
+        "agents.resume_parser_agent.read_resume_text",
+        lambda path: time.sleep(5),
+    )
+    signal.signal(signal.SIGALRM, resume_parsing_pool._raise_timeout)
+    try:
+        started = time.monotonic()
+        text, parsed, error = _parse_in_worker("/tmp/slow.pdf", "slow.pdf", timeout_seconds=1)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+    assert error == "timed out after 1s"
+    assert text is None and parsed is None
+    assert time.monotonic() - started < 3
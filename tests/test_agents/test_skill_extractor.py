@@ -0,0 +1,119 @@
+"""Tests for the compiled skill extractor."""
+import json
+
+import pytest
+
+from agents.resume_parser_agent import ResumeParserAgent
+from agents.skill_extractor import SkillAutomaton, SkillExtractor, load_skill_taxonomy
+
+RESUME = """Jane Doe
+jane.doe@example.com
+
+Technical Skills: Expert in Python, Docker and PostgreSQL. Basic Rust.
+
+Experience
+Senior Engineer at Acme - built services on AWS with Kubernetes
+"""
+
+
+class TestSkillAutomaton:
+    """Test suite for SkillAutomaton."""
+
+    @pytest.mark.unit
+    def test_reports_overlapping_matches_with_offsets(self):
+        automaton = SkillAutomaton(["java", "javascript", "script", "sql", "mysql"])
+
+        matches = automaton.find_all("javascript and mysql")
+
+        assert (0, 4, 0) in matches
+        assert (0, 10, 1) in matches
+        assert (4, 10, 2) in matches
+        assert (15, 20, 4) in matches
+        assert (17, 20, 3) in matches
+        assert [end for _, end, _ in matches] == sorted(end for _, end, _ in matches)
+
+    @pytest.mark.unit
+    def test_follows_failure_links(self):
+        automaton = SkillAutomaton(["abcd", "bce"])
+
+        assert automaton.find_all("abce") == [(1, 4, 1)]
+
+
+class TestSkillExtractor:
+    """Test suite for SkillExtractor."""
+
+    @pytest.mark.unit
+    def test_extracts_sections_confidence_and_proficiency(self):
+        skills = {s["skill"]: s for s in SkillExtractor().extract(RESUME)}
+
+        assert skills["python"]["extracted_from"] == "skills_section"
+        assert skills["python"]["confidence"] == 0.9
+        assert skills["python"]["category"] == "programming_languages"
+        assert skills["python"]["proficiency"] == "expert"
+        assert skills["postgresql"]["category"] == "databases"
+        assert skills["aws"]["extracted_from"] == "experience_section"
+        assert skills["aws"]["confidence"] == 0.7
+        assert skills["kubernetes"]["proficiency"] == "intermediate"
+
+    @pytest.mark.unit
+    def test_orders_by_taxonomy_and_keeps_first_category(self):
+        extractor = SkillExtractor({"first": ["zeta", "alpha"], "second": ["alpha", "beta"]})
+
+        skills = extractor.extract("Skills: beta, alpha, zeta")
+
+        assert [(s["skill"], s["category"]) for s in skills] == [
+            ("zeta", "first"),
+            ("alpha", "first"),
+            ("beta", "second"),
+        ]
+
+    @pytest.mark.unit
+    def test_proficiency_uses_context_of_each_mention(self):
+        extractor = SkillExtractor({"languages": ["go"]})
+        filler = "x" * 150
+        text = f"Skills: go {filler} go, learning\nExpert at cooking"
+
+        skills = extractor.extract(text)
+
+        # "learning" is next to the second mention; "Expert" is on another line
+        assert skills[0]["proficiency"] == "beginner"
+
+    @pytest.mark.unit
+    def test_large_taxonomy(self):
+        taxonomy = {f"category_{c}": [f"tool{c:03d}{i:03d}" for i in range(100)] for c in range(100)}
+        extractor = SkillExtractor(taxonomy)
+
+        skills = extractor.extract("Skills: tool042007, tool099099 and tool003050")
+
+        assert extractor.skill_count == 10_000
+        assert [(s["skill"], s["category"]) for s in skills] == [
+            ("tool003050", "category_3"),
+            ("tool042007", "category_42"),
+            ("tool099099", "category_99"),
+        ]
+
+    @pytest.mark.unit
+    def test_loads_taxonomy_file(self, tmp_path):
+        path = tmp_path / "taxonomy.json"
+        path.write_text(json.dumps({"crm": ["Salesforce"]}))
+
+        skills = SkillExtractor.from_file(str(path)).extract("Skills: salesforce admin")
+
+        assert skills[0]["skill"] == "Salesforce"
+        assert skills[0]["category"] == "crm"
+
+    @pytest.mark.unit
+    def test_rejects_malformed_taxonomy_file(self, tmp_path):
+        path = tmp_path / "taxonomy.json"
+        path.write_text(json.dumps(["python"]))
+
+        with pytest.raises(ValueError):
+            load_skill_taxonomy(str(path))
+
+    @pytest.mark.unit
+    def test_parser_agent_uses_injected_extractor(self):
+        agent = ResumeParserAgent(skill_extractor=SkillExtractor({"crm": ["salesforce"]}))
+
+        skills = agent.extract_skills("Skills: Salesforce, Python")
+
+        assert [s["skill"] for s in skills] == ["salesforce"]
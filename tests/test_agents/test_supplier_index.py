@@ -0,0 +1,163 @@
+"""Tests for the supplier capability index and index-backed supplier selection."""
+import random
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agents.auto_distribution_agent import AutoDistributionAgent
+from agents.supplier_index import SupplierCapabilityIndex, SupplierProfile, normalize_terms
+from agents.supplier_network_agent import SupplierNetworkAgent
+from models.enums import SupplierTier
+
+
+def _profile(supplier_id, specs=(), locations=(), tier=SupplierTier.NEW, rating=None):
+    return SupplierProfile(
+        supplier_id=supplier_id,
+        tier=tier,
+        specializations=normalize_terms(specs),
+        locations=normalize_terms(locations),
+        latest_rating=rating,
+    )
+
+
+class TestSupplierCapabilityIndex:
+    """Test suite for SupplierCapabilityIndex."""
+
+    @pytest.fixture
+    def index(self):
+        index = SupplierCapabilityIndex(base_score=lambda p: p.latest_rating or 0.0)
+        index.rebuild([
+            _profile(1, ["Python", "AWS"], ["Austin"], rating=1.0),
+            _profile(2, ["java"], ["Dallas"], rating=3.0),
+            _profile(3, [], [], rating=5.0),
+            _profile(4, ["python"], ["austin"], rating=0.5),
+        ])
+        return index
+
+    @pytest.mark.unit
+    def test_postings(self, index):
+        assert index.matching(["python", "aws", "go"]) == {1: 2, 4: 1}
+        assert index.serving(" AUSTIN ") == {1, 4}
+        assert index.serving(None) == set()
+
+    @pytest.mark.unit
+    def test_top_n_matches_exhaustive_ranking(self, index):
+        def score(profile, overlap, local):
+            return profile.base_score + overlap * 2 + (1 if local else 0)
+
+        for n in range(1, 5):
+            fast = index.top_n(n, score, skills=["python"], location="austin")
+            full = index.top_n(n, score, skills=["python"], location="austin", exhaustive=True)
+            assert [p.supplier_id for _, p in fast] == [p.supplier_id for _, p in full]
+
+        assert [p.supplier_id for _, p in index.top_n(2, score, skills=["python"], location="austin")] == [3, 1]
+
+    @pytest.mark.unit
+    def test_record_performance_keeps_latest_period(self, index):
+        assert index.record_performance(2, 4.5, date(2026, 6, 30))
+        assert not index.record_performance(2, 1.0, date(2026, 3, 31))
+
+        assert index.get(2).latest_rating == 4.5
+        assert index.get(2).base_score == 4.5
+
+    @pytest.mark.unit
+    def test_update_moves_postings(self, index):
+        index.update(1, specializations=normalize_terms(["go"]))
+
+        assert index.matching(["python"]) == {4: 1}
+        assert index.matching(["go"]) == {1: 1}
+
+    @pytest.mark.unit
+    def test_staleness(self):
+        now = [100.0]
+        index = SupplierCapabilityIndex(base_score=lambda p: 0.0, ttl_seconds=60, clock=lambda: now[0])
+        assert index.is_stale()
+
+        index.rebuild([])
+        now[0] += 30
+        assert not index.is_stale()
+        now[0] += 31
+        assert index.is_stale()
+
+
+class TestAutoSelectSuppliers:
+    """Index-backed SupplierNetworkAgent.auto_select_suppliers."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ranks_from_index_without_queries(self):
+        agent = SupplierNetworkAgent()
+        agent.supplier_index.rebuild([
+            _profile(1, ["python", "django"], ["Austin"], SupplierTier.NEW, rating=4.0),
+            _profile(2, [], [], SupplierTier.PLATINUM, rating=5.0),
+            _profile(3, ["python"], [], SupplierTier.GOLD),
+            _profile(4, ["java"], ["Austin"], SupplierTier.BRONZE, rating=1.0),
+        ])
+        db = AsyncMock()
+        db.get.return_value = SimpleNamespace(skills_required=["Python", "Django"], location_city="austin")
+
+        selected = await agent.auto_select_suppliers(db, requirement_id=7, max_suppliers=3)
+
+        # 1: 0.35 + 0.10 + 0.20 + 0.12; 3: 0.175 + 0.25 + 0.10 + 0.075; 2: 0.30 + 0.10 + 0.15
+        assert selected == [1, 3, 2]
+        db.execute.assert_not_called()
+
+
+class TestAutoDistributionAgent:
+    """Index-backed AutoDistributionAgent.recommend_suppliers."""
+
+    @staticmethod
+    def _suppliers(count, seed=5):
+        rng = random.Random(seed)
+        skills = [f"skill{i}" for i in range(30)]
+        return [
+            {
+                "org_id": i,
+                "name": f"Supplier {i}",
+                "tier": rng.choice(["platinum", "gold", "silver", "bronze", "new"]),
+                "specializations": rng.sample(skills, rng.randint(0, 4)),
+                "avg_quality_score": rng.randint(0, 100),
+                "total_placements": rng.randint(0, 12),
+                "active_distributions": rng.randint(0, 10),
+                "avg_response_time_hours": rng.choice([6, 20, 40, 72]),
+                "max_capacity": 10,
+            }
+            for i in range(count)
+        ]
+
+    @pytest.mark.unit
+    def test_prebuilt_index_matches_full_scoring(self):
+        agent = AutoDistributionAgent()
+        suppliers = self._suppliers(200)
+        index = agent.build_index(suppliers)
+
+        for skills in (["skill1", "skill2"], ["SKILL7"], [], ["unknown"]):
+            requirement = {"skills": skills}
+            indexed = agent.recommend_suppliers(requirement, max_recommendations=5, index=index)
+            full = sorted(
+                agent.recommend_suppliers(requirement, suppliers, max_recommendations=len(suppliers)),
+                key=lambda r: -r.score,
+            )[:5]
+            assert [r.score for r in indexed] == [r.score for r in full]
+
+    @pytest.mark.unit
+    def test_recommendation_details(self):
+        agent = AutoDistributionAgent()
+        suppliers = [
+            {"org_id": 10, "name": "Acme", "tier": "platinum", "specializations": ["Python"],
+             "avg_quality_score": 90, "total_placements": 10, "avg_response_time_hours": 6,
+             "active_distributions": 1, "max_capacity": 10},
+            {"org_id": 11, "name": "Beta", "tier": "new", "specializations": [],
+             "avg_quality_score": 20, "total_placements": 0, "avg_response_time_hours": 96,
+             "active_distributions": 9, "max_capacity": 10},
+        ]
+
+        best, other = agent.recommend_suppliers({"skills": ["python"]}, suppliers)
+
+        assert best.supplier_org_id == 10
+        assert best.priority == "HIGH"
+        assert "Strong specialization match" in best.reasons
+        assert other.supplier_org_id == 11
+        assert other.priority == "LOW"
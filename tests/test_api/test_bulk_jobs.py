@@ -0,0 +1,33 @@
+"""Tests for starting bulk import jobs on the background task runtime."""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from agents.background_tasks import BackgroundQueueFull
+from api.v1 import bulk_operations
+from models.import_job import ImportJobStatus
+from services import import_job_service
+
+
+class SaturatedRuntime:
+    """Background runtime whose queue is always full."""
+
+    def submit(self, *args, **kwargs):
+        raise BackgroundQueueFull("background task queue is full (500)")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rejected_job_is_marked_failed(monkeypatch):
+    job = SimpleNamespace(id=-1, job_type="resume_upload", status=ImportJobStatus.QUEUED)
+    monkeypatch.setitem(import_job_service._job_store, job.id, job)
+    monkeypatch.setattr(bulk_operations, "background_tasks", SaturatedRuntime())
+
+    with pytest.raises(HTTPException) as raised:
+        await bulk_operations._start_job(job, None)
+
+    assert raised.value.status_code == 503
+    assert raised.value.headers["Retry-After"] == "5"
+    assert job.status == ImportJobStatus.FAILED
+    assert "queue is full" in job.error_message
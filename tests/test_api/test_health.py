@@ -2,6 +2,10 @@
 import pytest
 from httpx import AsyncClient
 
+from agents.event_bus import EventBus
+from api import _main
+from utils.metrics import metrics
+
 
 class TestHealthEndpoints:
     """Test suite for health check endpoints."""
@@ -116,3 +120,29 @@ class TestHealthEndpoints:
 
         # Should return 422 for validation error
         assert response.status_code in [400, 422]
+
+
+class StubBroker:
+    """Broker reporting fixed consumer metrics."""
+
+    def metrics(self):
+        return {
+            "candidate.created": {
+                "queue_depth": 3,
+                "acked": 40,
+                "nacked": 2,
+                "handlers": {"index_candidate": {"count": 42, "errors": 2, "p99": 0.25}},
+            },
+        }
+
+
+@pytest.mark.unit
+def test_event_consumer_metrics_are_exported(monkeypatch):
+    monkeypatch.setattr(_main, "event_bus", EventBus(rabbitmq_broker=StubBroker()))
+
+    rendered = metrics.render()
+
+    assert 'event_consumer_queue_depth{queue="candidate.created"} 3' in rendered
+    assert 'event_consumer_nacked{queue="candidate.created"} 2' in rendered
+    assert 'event_handler_errors{queue="candidate.created",handler="index_candidate"} 2' in rendered
+    assert 'event_handler_p99_seconds{queue="candidate.created",handler="index_candidate"} 0.25' in rendered
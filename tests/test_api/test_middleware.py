@@ -0,0 +1,108 @@
+"""Tests for the request context middleware."""
+import logging
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from api.middleware import RequestContextMiddleware
+
+
+async def ok(request):
+    return PlainTextResponse(request.state.request_id)
+
+
+async def boom(request):
+    raise RuntimeError("boom")
+
+
+async def stream(request):
+    async def chunks():
+        for n in range(3):
+            yield f"chunk{n}\n"
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def make_client(**kwargs) -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/ok", ok), Route("/boom", boom), Route("/stream", stream)])
+    app.add_middleware(RequestContextMiddleware, **kwargs)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+class TestRequestContextMiddleware:
+    """Test suite for RequestContextMiddleware."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_request_id_generated_or_propagated(self):
+        async with make_client() as client:
+            first = await client.get("/ok")
+            second = await client.get("/ok")
+            forwarded = await client.get("/ok", headers={"X-Request-ID": "edge-123"})
+            bogus = await client.get("/ok", headers={"X-Request-ID": "bad id\x7f"})
+
+        assert first.headers["x-request-id"] == first.text
+        assert first.text != second.text
+        assert forwarded.headers["x-request-id"] == forwarded.text == "edge-123"
+        assert bogus.text != "bad id\x7f"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unhandled_error_mapped_to_json_500(self):
+        async with make_client() as client:
+            response = await client.get("/boom")
+
+        assert response.status_code == 500
+        assert response.json() == {
+            "detail": "Internal server error",
+            "request_id": response.headers["x-request-id"],
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(self):
+        async with make_client() as client:
+            response = await client.get("/stream")
+
+        assert response.text == "chunk0\nchunk1\nchunk2\n"
+        assert "x-request-id" in response.headers
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_access_log_sampling_keeps_errors(self, caplog):
+        caplog.set_level(logging.INFO, logger="api.middleware")
+        async with make_client(sample_rate=0.0) as client:
+            await client.get("/ok")
+            await client.get("/boom")
+
+        lines = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Request ")]
+        assert len(lines) == 2  # the failure and its access line; /ok was not sampled
+        assert "GET /boom -> 500" in lines[-1]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_metrics_recorded_by_route_template(self):
+        from fastapi import FastAPI
+
+        from utils.metrics import http_request_duration, http_requests
+
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        app.add_middleware(RequestContextMiddleware)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            before = http_requests.values.get(("/items/{item_id}", "GET", "200"), 0)
+            for n in range(3):
+                await client.get(f"/items/{n}")
+            await client.get("/missing")
+
+        assert http_requests.values[("/items/{item_id}", "GET", "200")] - before == 3
+        assert ("<unmatched>", "GET", "404") in http_requests.values
+        assert ("/items/{item_id}", "GET") in http_request_duration.values
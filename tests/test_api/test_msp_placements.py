@@ -0,0 +1,67 @@
+"""Tests for creating placements through the MSP API."""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from api.v1 import msp
+from schemas.msp import PlacementCreateRequest
+
+
+def _request(**overrides):
+    values = dict(
+        requirement_id=1, candidate_id=2, supplier_org_id=3, client_org_id=4,
+        supplier_submission_id=5, start_date=date(2026, 11, 2), bill_rate=95.0, pay_rate=70.0,
+        job_category="engineering",
+    )
+    values.update(overrides)
+    return PlacementCreateRequest(**values)
+
+
+class RecordingService:
+    """Coordination service that records the placement it was asked to create."""
+
+    calls = []
+
+    def __init__(self, session):
+        pass
+
+    async def create_placement(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            id=11, organization_id=kwargs["msp_org_id"], requirement_id=1, candidate_id=2,
+            supplier_org_id=3, client_org_id=4, start_date=kwargs["start_date"], end_date=None,
+            bill_rate=kwargs["bill_rate"], pay_rate=kwargs["pay_rate"], msp_margin=25.0,
+            status="active", work_location=None, job_title=None, created_at=datetime(2026, 10, 1),
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_placement_carries_job_category_to_the_service(monkeypatch):
+    monkeypatch.setattr(msp, "MSPCoordinationService", RecordingService)
+    RecordingService.calls = []
+
+    response = await msp.create_placement(
+        _request(), user=None, ctx=SimpleNamespace(organization_id=9), session=None
+    )
+
+    assert response.id == 11 and response.bill_rate == 95.0
+    (call,) = RecordingService.calls
+    assert call["msp_org_id"] == 9
+    assert call["submission_id"] == 5
+    assert call["job_category"] == "engineering"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_placement_needs_a_submission(monkeypatch):
+    monkeypatch.setattr(msp, "MSPCoordinationService", RecordingService)
+
+    with pytest.raises(HTTPException) as raised:
+        await msp.create_placement(
+            _request(supplier_submission_id=None), user=None, ctx=SimpleNamespace(organization_id=9), session=None
+        )
+
+    assert raised.value.status_code == 400
@@ -0,0 +1,78 @@
+"""Tests for read-replica session routing."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from api.dependencies import get_read_db
+from database import connection
+from database.connection import engine_options, open_read_session
+
+
+@pytest.fixture
+def no_replica(monkeypatch):
+    monkeypatch.setattr(connection, "ReadSessionLocal", None)
+    monkeypatch.setattr(connection, "_replica_down_until", 0.0)
+
+
+class TestEngineOptions:
+    """Test suite for engine_options."""
+
+    @pytest.mark.unit
+    def test_sqlite_gets_no_pool_arguments(self):
+        options = engine_options("sqlite+aiosqlite:///replica.db", 30, 20)
+        assert "pool_size" not in options
+        assert "connect_args" not in options
+        assert "query_cache_size" in options
+
+    @pytest.mark.unit
+    def test_asyncpg_gets_pool_and_statement_cache(self):
+        options = engine_options("postgresql+asyncpg://u:p@replica/db", 30, 20)
+        assert options["pool_size"] == 30
+        assert options["max_overflow"] == 20
+        assert options["pool_pre_ping"] is True
+        assert "prepared_statement_cache_size" in options["connect_args"]
+
+
+class TestReadSessionRouting:
+    """Test suite for open_read_session and get_read_db."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replica_session_used_when_configured(self, no_replica, monkeypatch, tmp_path):
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+        monkeypatch.setattr(connection, "ReadSessionLocal", connection._session_factory(replica))
+        primary = object()
+        try:
+            dependency = get_read_db(primary)
+            session = await dependency.__anext__()
+            assert session is not primary
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            await dependency.aclose()
+        finally:
+            await replica.dispose()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back_and_backs_off(self, no_replica, monkeypatch, tmp_path):
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        monkeypatch.setattr(connection, "ReadSessionLocal", connection._session_factory(replica))
+        monkeypatch.setattr(connection.settings, "database_read_retry_seconds", 60.0)
+        try:
+            assert await open_read_session() is None
+            assert connection._replica_down_until > 0
+
+            # Within the retry window the replica is not even tried
+            opened = []
+            monkeypatch.setattr(connection, "ReadSessionLocal", lambda: opened.append(1))
+            assert await open_read_session() is None
+            assert opened == []
+        finally:
+            await replica.dispose()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_primary_used_without_replica(self, no_replica):
+        primary = object()
+        dependency = get_read_db(primary)
+        assert await dependency.__anext__() is primary
+        await dependency.aclose()
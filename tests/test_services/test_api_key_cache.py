@@ -0,0 +1,164 @@
+"""Tests for the API key verification cache."""
+import asyncio
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from services.api_key_cache import APIKeyCache, _api_keys
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime.now(timezone.utc).timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+def new_key():
+    plaintext = f"hrp_{secrets.token_urlsafe(32)}"
+    return plaintext, hashlib.sha256(plaintext.encode()).hexdigest()
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: _api_keys.create(sync_conn))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+async def insert_key(engine, key_id, key_hash, expires_at=None, is_active=True):
+    now = datetime.utcnow()
+    async with engine.begin() as conn:
+        await conn.execute(_api_keys.insert().values(
+            id=key_id, user_id=1, key_hash=key_hash, key_prefix="hrp_abcdef", name=f"key {key_id}",
+            is_active=is_active, expires_at=expires_at, created_at=now, updated_at=now,
+        ))
+
+
+class TestAPIKeyCache:
+    """Test suite for APIKeyCache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_verified_key_cached_until_revoked(self, engine, statements):
+        cache = APIKeyCache()
+        plaintext, key_hash = new_key()
+        await insert_key(engine, 1, key_hash)
+        statements.clear()
+
+        async with AsyncSession(engine) as db:
+            assert (await cache.lookup(db, plaintext, key_hash))["id"] == 1
+            assert (await cache.lookup(db, plaintext, key_hash))["id"] == 1
+        assert len(statements) == 1
+
+        async with engine.begin() as conn:
+            await conn.execute(_api_keys.update().values(is_active=False))
+        cache.invalidate(key_hash)
+        async with AsyncSession(engine) as db:
+            assert await cache.lookup(db, plaintext, key_hash) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unknown_and_malformed_keys(self, engine, statements):
+        cache = APIKeyCache()
+        plaintext, key_hash = new_key()
+
+        async with AsyncSession(engine) as db:
+            assert await cache.lookup(db, plaintext, key_hash) is None
+            assert await cache.lookup(db, plaintext, key_hash) is None
+            assert await cache.lookup(db, "garbage", hashlib.sha256(b"garbage").hexdigest()) is None
+        assert len(statements) == 1
+        assert cache.rejected == 1
+
+        # A key created with a remembered hash is found once invalidated
+        await insert_key(engine, 1, key_hash)
+        cache.invalidate(key_hash)
+        async with AsyncSession(engine) as db:
+            assert (await cache.lookup(db, plaintext, key_hash))["id"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_entry_ends_at_key_expiry(self, engine):
+        clock = FakeClock()
+        cache = APIKeyCache(ttl_seconds=60, clock=clock)
+        plaintext, key_hash = new_key()
+        expires_at = datetime.utcnow() + timedelta(seconds=10)
+        await insert_key(engine, 1, key_hash, expires_at=expires_at)
+
+        async with AsyncSession(engine) as db:
+            assert await cache.lookup(db, plaintext, key_hash) is not None
+        clock.now += 5
+        assert cache.verified.get(key_hash) is not None
+        clock.now += 10
+        assert cache.verified.get(key_hash) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_last_use_written_in_one_batch(self, engine, statements):
+        cache = APIKeyCache(session_factory=lambda: AsyncSession(engine))
+        for key_id in (1, 2, 3):
+            await insert_key(engine, key_id, new_key()[1])
+        statements.clear()
+
+        for _ in range(100):
+            cache.record_use(1, "10.0.0.1")
+            cache.record_use(2)
+        assert await cache.flush() == 2
+        assert await cache.flush() == 0
+        assert len([s for s in statements if s.startswith("UPDATE")]) == 1
+
+        async with AsyncSession(engine) as db:
+            rows = (await db.execute(
+                select(_api_keys.c.id, _api_keys.c.last_used_at, _api_keys.c.last_used_ip).order_by(_api_keys.c.id)
+            )).all()
+        assert rows[0].last_used_at is not None and rows[0].last_used_ip == "10.0.0.1"
+        assert rows[1].last_used_at is not None and rows[1].last_used_ip is None
+        assert rows[2].last_used_at is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_keeps_pending_uses(self, engine):
+        sessions = []
+
+        def session_factory():
+            session = AsyncSession(engine)
+            if not sessions:
+                async def hang(*args, **kwargs):
+                    await asyncio.Event().wait()
+                session.execute = hang
+            sessions.append(session)
+            return session
+
+        cache = APIKeyCache(session_factory=session_factory)
+        await insert_key(engine, 1, new_key()[1])
+        cache.record_use(1, "10.0.0.1")
+
+        flush = asyncio.create_task(cache.flush())
+        await asyncio.sleep(0.01)
+        flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
+        assert cache.stats()["pending_last_used"] == 1
+
+        await cache.close()
+        async with AsyncSession(engine) as db:
+            used_ip = (await db.execute(select(_api_keys.c.last_used_ip))).scalar()
+        assert used_ip == "10.0.0.1"
@@ -0,0 +1,126 @@
+"""Tests for the batched access-audit sink."""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from services.audit_sink import AuditSink, _access_logs
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: _access_logs.create(sync_conn))
+    yield engine
+    await engine.dispose()
+
+
+def record(n):
+    return {
+        "user_id": n,
+        "resource": "jobs",
+        "action": "read",
+        "result": "allowed",
+        "ip_address": "10.0.0.1",
+        "request_path": f"/api/v1/jobs/{n}",
+        "request_method": "GET",
+    }
+
+
+async def count_rows(engine):
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(_access_logs))).scalar()
+
+
+class TestAuditSink:
+    """Test suite for AuditSink."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_flush_writes_in_batches(self, engine):
+        inserts = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statement.startswith("INSERT") and inserts.append(statement),
+        )
+        sink = AuditSink(batch_size=100, session_factory=lambda: AsyncSession(engine))
+        for n in range(250):
+            sink.enqueue(**record(n))
+
+        assert sink.depth == 250
+        assert await sink.flush() == 250
+        assert await count_rows(engine) == 250
+        assert len(inserts) == 3
+        assert sink.stats()["written"] == 250 and sink.depth == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_background_flush(self, engine):
+        sink = AuditSink(batch_size=10, flush_interval=60, session_factory=lambda: AsyncSession(engine))
+        task = asyncio.create_task(sink.run())
+        for n in range(10):
+            sink.enqueue(**record(n))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if sink.written == 10:
+                break
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert await count_rows(engine) == 10
+
+    @pytest.mark.unit
+    def test_ring_buffer_drops_oldest(self):
+        sink = AuditSink(capacity=3)
+        for n in range(5):
+            sink.enqueue(**record(n))
+
+        assert sink.depth == 3
+        assert sink.dropped == 2
+        assert [r["user_id"] for r in sink._buffer] == [2, 3, 4]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_insert_goes_to_fallback_file(self, tmp_path):
+        def broken_session():
+            raise ConnectionError("database is down")
+
+        sink = AuditSink(batch_size=2, fallback_dir=str(tmp_path), session_factory=broken_session)
+        for n in range(3):
+            sink.enqueue(**record(n))
+        await sink.close()
+
+        lines = [json.loads(line) for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+        assert [line["user_id"] for line in lines] == [0, 1, 2]
+        assert "timestamp" in lines[0]
+        assert sink.stats()["fallback_written"] == 3
+        assert sink.stats()["failed_batches"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_in_flight_when_cancelled_is_still_written(self, engine):
+        inserting = asyncio.Event()
+
+        class SlowSink(AuditSink):
+            async def _insert(self, batch):
+                inserting.set()
+                await asyncio.sleep(0.05)
+                await super()._insert(batch)
+
+        sink = SlowSink(batch_size=5, flush_interval=60, session_factory=lambda: AsyncSession(engine))
+        task = asyncio.create_task(sink.run())
+        for n in range(5):
+            sink.enqueue(**record(n))
+        await inserting.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await sink.close()
+
+        assert await count_rows(engine) == 5
+        assert sink.stats()["written"] == 5 and sink.stats()["dropped"] == 0
@@ -0,0 +1,128 @@
+"""Tests for content-addressed blob storage."""
+import hashlib
+
+import pytest
+
+from services.blob_store import (
+    ByteBudget,
+    LocalBlobStore,
+    S3BlobStore,
+    UploadTooLarge,
+    check_declared_size,
+)
+
+
+async def _chunks(data: bytes, size: int = 4):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class _MissingKey(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class FakeS3Client:
+    """Just enough of the boto3 S3 client for S3BlobStore."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise _MissingKey()
+        return {}
+
+    def upload_file(self, filename, bucket, key):
+        self.uploads += 1
+        with open(filename, "rb") as f:
+            self.objects[(bucket, key)] = f.read()
+
+    def download_file(self, bucket, key, filename):
+        with open(filename, "wb") as f:
+            f.write(self.objects[(bucket, key)])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+class TestLocalBlobStore:
+    """Test suite for LocalBlobStore."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stores_by_hash_and_dedupes(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+        data = b"%PDF-1.4 resume body"
+
+        first = await store.put_stream(_chunks(data), ".PDF")
+        second = await store.put_stream(_chunks(data), ".pdf")
+
+        assert first.sha256 == hashlib.sha256(data).hexdigest()
+        assert first.size == len(data)
+        assert first.uri == second.uri
+        assert first.uri.endswith(f"{first.sha256}.pdf")
+        assert not first.deduplicated
+        assert second.deduplicated
+        assert open(first.uri, "rb").read() == data
+        assert list((tmp_path / ".incoming").iterdir()) == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_oversized_upload_is_abandoned(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+
+        with pytest.raises(UploadTooLarge):
+            await store.put_stream(_chunks(b"x" * 100), ".pdf", max_bytes=10)
+
+        assert list((tmp_path / ".incoming").iterdir()) == []
+        assert [p.name for p in tmp_path.iterdir()] == [".incoming"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_budget_spans_files_in_a_request(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+        budget = ByteBudget(12)
+
+        await store.put_stream(budget.limit(_chunks(b"a" * 8)), ".pdf")
+        with pytest.raises(UploadTooLarge):
+            await store.put_stream(budget.limit(_chunks(b"b" * 8)), ".pdf")
+
+    @pytest.mark.unit
+    def test_declared_size_check(self):
+        check_declared_size("100", 100)
+        check_declared_size(None, 100)
+        with pytest.raises(UploadTooLarge):
+            check_declared_size("101", 100)
+
+
+class TestS3BlobStore:
+    """Test suite for S3BlobStore."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_skips_upload_of_existing_blob(self, tmp_path):
+        client = FakeS3Client()
+        store = S3BlobStore("resumes-bucket", client=client, cache_dir=str(tmp_path))
+        data = b"docx bytes"
+
+        first = await store.put_stream(_chunks(data), ".docx")
+        second = await store.put_stream(_chunks(data), ".docx")
+
+        assert client.uploads == 1
+        assert second.deduplicated
+        assert first.uri == f"s3://resumes-bucket/resumes/{first.sha256[:2]}/{first.sha256[2:4]}/{first.sha256}.docx"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_materialize_downloads_once(self, tmp_path):
+        client = FakeS3Client()
+        store = S3BlobStore("resumes-bucket", client=client, cache_dir=str(tmp_path / "cache"))
+        blob = await store.put_stream(_chunks(b"resume"), ".pdf")
+
+        path = await store.materialize(blob.uri)
+        client.objects.clear()
+
+        assert open(await store.materialize(blob.uri), "rb").read() == b"resume"
+        assert path == await store.materialize(blob.uri)
+        assert await store.materialize("/tmp/resumes/legacy.pdf") == "/tmp/resumes/legacy.pdf"
@@ -0,0 +1,94 @@
+"""Core-level tests for the statements MSPRequirementService distributes with."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models.base import Base
+from models.enums import DistributionStatus
+from models.msp_workflow import RequirementDistribution
+from services.msp_requirement_service import distribution_rows, reactivate_distributions
+
+_distributions = RequirementDistribution.__table__
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        # Only the distributions table: the foreign keys are not enforced by SQLite
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[_distributions]))
+    yield engine
+    await engine.dispose()
+
+
+def _values(**overrides):
+    values = {
+        "distributed_by_user_id": 7,
+        "distributed_at": datetime(2026, 5, 1, 12),
+        "expires_at": datetime(2026, 6, 1),
+        "max_submissions": 5,
+        "notes_to_supplier": "Remote OK",
+    }
+    values.update(overrides)
+    return values
+
+
+class TestDistributionStatements:
+    """The reactivating UPDATE and the bulk INSERT..RETURNING, run against the table directly."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reactivation_updates_only_inactive_rows(self, engine):
+        async with engine.begin() as conn:
+            await conn.execute(insert(_distributions), [
+                {"id": 1, "organization_id": 1, "requirement_id": 1, "supplier_org_id": 2,
+                 "status": DistributionStatus.ACTIVE, "max_submissions": 3},
+                {"id": 2, "organization_id": 1, "requirement_id": 1, "supplier_org_id": 3,
+                 "status": DistributionStatus.REVOKED, "max_submissions": 3},
+                {"id": 3, "organization_id": 1, "requirement_id": 1, "supplier_org_id": 4,
+                 "status": DistributionStatus.EXPIRED, "max_submissions": 3},
+                {"id": 4, "organization_id": 1, "requirement_id": 2, "supplier_org_id": 3,
+                 "status": DistributionStatus.REVOKED, "max_submissions": 3},
+            ])
+            result = await conn.execute(reactivate_distributions(1, [2, 3, 4], **_values()))
+            rows = {
+                row.id: row
+                for row in (await conn.execute(select(_distributions).order_by(_distributions.c.id))).all()
+            }
+
+        assert result.rowcount == 2
+        for reactivated in (rows[2], rows[3]):
+            assert reactivated.status == DistributionStatus.ACTIVE
+            assert reactivated.distributed_by_user_id == 7
+            assert reactivated.distributed_at == datetime(2026, 5, 1, 12)
+            assert reactivated.expires_at == datetime(2026, 6, 1)
+            assert reactivated.max_submissions == 5
+            assert reactivated.notes_to_supplier == "Remote OK"
+        # already active: left as distributed
+        assert rows[1].max_submissions == 3 and rows[1].distributed_by_user_id is None
+        # another requirement's distribution to the same supplier
+        assert rows[4].status == DistributionStatus.REVOKED
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_bulk_insert_returns_every_row(self, engine):
+        suppliers = list(range(2, 32))
+        rows = distribution_rows(1, 1, suppliers, **_values(notes_to_supplier=None))
+
+        async with engine.begin() as conn:
+            returned = (await conn.execute(
+                insert(_distributions).returning(
+                    _distributions.c.id, _distributions.c.supplier_org_id, _distributions.c.status
+                ),
+                rows,
+            )).all()
+            stored = (await conn.execute(select(_distributions.c.id))).scalars().all()
+
+        assert sorted(row.supplier_org_id for row in returned) == suppliers
+        assert sorted(row.id for row in returned) == sorted(stored)
+        assert {row.status for row in returned} == {DistributionStatus.ACTIVE}
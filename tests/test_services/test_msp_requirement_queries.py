@@ -0,0 +1,166 @@
+"""Query-count tests for MSP distribution, opportunity and SLA queries."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models.base import Base
+from models.enums import DistributionStatus, OrganizationType, VMSSubmissionStatus
+from models.msp_workflow import RequirementDistribution, SupplierCandidateSubmission
+from models.organization import Organization
+from models.requirement import Requirement
+from services.msp_coordination_service import MSPCoordinationService
+from services.msp_requirement_service import MSPRequirementService
+
+MSP_ORG_ID = 1
+SUPPLIERS = list(range(2, 32))
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    tables = [
+        Organization.__table__,
+        Requirement.__table__,
+        RequirementDistribution.__table__,
+        SupplierCandidateSubmission.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+        await conn.execute(insert(Organization.__table__), [
+            {"id": org_id, "name": f"Org {org_id}", "slug": f"org-{org_id}", "org_type": OrganizationType.SUPPLIER}
+            for org_id in [MSP_ORG_ID, *SUPPLIERS]
+        ])
+        await conn.execute(insert(Requirement.__table__), [
+            {"id": 1, "customer_id": 1, "title": "Data Engineer"},
+        ])
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+async def seed_distributions(engine, distributed_at, submissions_per_supplier=2):
+    """One distribution per supplier, each with a few submissions from that supplier."""
+    async with engine.begin() as conn:
+        await conn.execute(insert(RequirementDistribution.__table__), [
+            {
+                "id": n,
+                "organization_id": MSP_ORG_ID,
+                "requirement_id": 1,
+                "supplier_org_id": supplier_id,
+                "distributed_at": distributed_at,
+                "status": DistributionStatus.ACTIVE,
+                "max_submissions": 3,
+            }
+            for n, supplier_id in enumerate(SUPPLIERS, start=1)
+        ])
+        rows = [
+            {
+                "organization_id": supplier_id,
+                "requirement_distribution_id": n,
+                "candidate_id": n * 10 + k,
+                "submitted_by_user_id": 1,
+                "status": VMSSubmissionStatus.SUBMITTED,
+            }
+            for n, supplier_id in enumerate(SUPPLIERS, start=1)
+            if n % 2  # every other supplier has not submitted anyone
+            for k in range(submissions_per_supplier)
+        ]
+        await conn.execute(insert(SupplierCandidateSubmission.__table__), rows)
+
+
+class TestMSPRequirementQueries:
+    """The MSP views run a fixed number of queries, however many distributions there are."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_distributions_for_requirement_is_one_query(self, engine, statements):
+        await seed_distributions(engine, datetime.utcnow())
+
+        async with AsyncSession(engine) as session:
+            statements.clear()
+            enriched = await MSPRequirementService(session).get_distributions_for_requirement(1)
+
+        assert len(statements) == 1
+        assert len(enriched) == len(SUPPLIERS)
+        by_supplier = {e["distribution"].supplier_org_id: e for e in enriched}
+        assert by_supplier[2]["submission_count"] == 2
+        assert by_supplier[3]["submission_count"] == 0
+        assert by_supplier[2]["supplier_org_name"] == "Org 2"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_supplier_opportunities_is_one_query(self, engine, statements):
+        await seed_distributions(engine, datetime.utcnow())
+
+        async with AsyncSession(engine) as session:
+            statements.clear()
+            opportunities = await MSPRequirementService(session).get_supplier_opportunities(2)
+            # The requirement is eager loaded: reading it does not query again
+            titles = [o["requirement"].title for o in opportunities]
+
+        assert len(statements) == 1
+        assert titles == ["Data Engineer"]
+        assert opportunities[0]["my_submission_count"] == 2
+        assert opportunities[0]["remaining_submissions"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_bulk_distribute_checks_and_inserts_once(self, engine, statements):
+        async with engine.begin() as conn:
+            await conn.execute(insert(RequirementDistribution.__table__), [
+                {"id": 1, "organization_id": MSP_ORG_ID, "requirement_id": 1, "supplier_org_id": 2,
+                 "status": DistributionStatus.ACTIVE, "max_submissions": 3},
+                {"id": 2, "organization_id": MSP_ORG_ID, "requirement_id": 1, "supplier_org_id": 3,
+                 "status": DistributionStatus.REVOKED, "max_submissions": 3},
+            ])
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            statements.clear()
+            distributions = await MSPRequirementService(session).distribute_requirement(
+                msp_org_id=MSP_ORG_ID,
+                requirement_id=1,
+                supplier_org_ids=SUPPLIERS + [2],
+                distributed_by_user_id=1,
+                max_submissions=5,
+            )
+            executed = list(statements)
+            stored = (await session.execute(
+                select(RequirementDistribution.__table__.c.supplier_org_id, RequirementDistribution.__table__.c.status)
+            )).all()
+
+        # existence check, reactivating the revoked row, one INSERT for the rest
+        assert len(executed) == 3
+        assert [d.supplier_org_id for d in distributions] == SUPPLIERS
+        assert all(d.id is not None for d in distributions)
+        assert distributions[0].id == 1 and distributions[0].max_submissions == 3
+        assert distributions[1].id == 2 and distributions[1].max_submissions == 5
+        assert len(stored) == len(SUPPLIERS)
+        assert {status for _, status in stored} == {DistributionStatus.ACTIVE}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_supplier_response_breaches_are_one_query(self, engine, statements):
+        await seed_distributions(engine, datetime.utcnow() - timedelta(hours=60))
+
+        async with AsyncSession(engine) as session:
+            statements.clear()
+            breaches = await MSPCoordinationService(session).check_sla_breaches(MSP_ORG_ID)
+
+        supplier_breaches = [b for b in breaches if b["type"] == "supplier_response"]
+        # one query for distributions without submissions, one for submissions awaiting review
+        assert len(statements) == 2
+        assert sorted(b["supplier_org_id"] for b in supplier_breaches) == SUPPLIERS[1::2]
+        assert all(b["hours_overdue"] == pytest.approx(12, abs=0.1) for b in supplier_breaches)
@@ -0,0 +1,139 @@
+"""Tests for notification digest buckets and unread counters."""
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from database.base import Base
+from models.alerts import Notification, NotificationCounter, NotificationDigestBucket, NotificationPreference
+from services.notification_digest_service import NotificationDigestService, digest_window
+
+TABLES = [
+    model.__table__
+    for model in (Notification, NotificationDigestBucket, NotificationCounter, NotificationPreference)
+]
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=TABLES))
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+def _created(user_id, priority, day, hour=9):
+    return {"user_id": user_id, "priority": priority, "created_at": datetime(2026, 3, day, hour)}
+
+
+class TestNotificationDigestService:
+    """Test suite for NotificationDigestService."""
+
+    @pytest.mark.unit
+    def test_digest_window(self):
+        assert digest_window("daily", date(2026, 3, 10)) == (date(2026, 3, 10), date(2026, 3, 10))
+        assert digest_window("weekly", date(2026, 3, 10)) == (date(2026, 3, 4), date(2026, 3, 10))
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_buckets_accumulate_across_batches(self, db):
+        service = NotificationDigestService(db)
+
+        await service.record_created([_created(1, "high", 9), _created(1, "low", 10), _created(2, "critical", 10)])
+        await service.record_created([_created(1, "high", 10, hour=18), {"user_id": None, "priority": "high"}])
+
+        daily = await service.get_counts(1, "daily", date(2026, 3, 10))
+        weekly = await service.get_counts(1, "weekly", date(2026, 3, 10))
+        assert daily["total"] == 2
+        assert daily["by_priority"] == {"critical": 0, "high": 1, "medium": 0, "low": 1}
+        assert weekly["total"] == 3
+        assert weekly["by_priority"]["high"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unread_counter(self, db):
+        service = NotificationDigestService(db)
+        assert await service.get_unread_count(1) is None
+
+        await service.record_created([_created(1, "high", 9)] * 4)
+        await service.record_read(1)
+        assert await service.get_unread_count(1) == 3
+
+        await service.record_read(1, 10)
+        assert await service.get_unread_count(1) == 0
+
+        await service.record_created([_created(1, "low", 9)] * 2)
+        await service.reset_unread(1)
+        assert await service.get_unread_count(1) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stream_digests_follows_preferences(self, db):
+        service = NotificationDigestService(db)
+        await service.record_created([
+            _created(1, "high", 10), _created(2, "low", 10), _created(3, "medium", 8), _created(3, "high", 10),
+        ])
+        await db.execute(NotificationPreference.__table__.insert(), [
+            {"user_id": 2, "digest_frequency": "none", "event_preferences": {}},
+            {"user_id": 3, "digest_frequency": "weekly", "event_preferences": {}},
+        ])
+
+        daily = [d async for d in service.stream_digests("daily", date(2026, 3, 10))]
+        weekly = [d async for d in service.stream_digests("weekly", date(2026, 3, 10))]
+
+        assert [(d["user_id"], d["total_notifications"], d["unread_count"]) for d in daily] == [(1, 1, 1)]
+        assert [(d["user_id"], d["total_notifications"]) for d in weekly] == [(3, 2)]
+        assert weekly[0]["by_priority"] == {"critical": 0, "high": 1, "medium": 1, "low": 0}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rebuild_from_notifications(self, db):
+        service = NotificationDigestService(db)
+        await service.record_created([_created(9, "high", 1)])  # stale, replaced by the rebuild
+        row = {
+            "channel": "in_app", "recipient": "user_1", "title": "t", "message": "m",
+            "status": "sent", "metadata": {}, "read_at": None,
+        }
+        await db.execute(Notification.__table__.insert(), [
+            {**row, "user_id": 1, "priority": "critical", "created_at": datetime(2026, 3, 10, 8)},
+            {**row, "user_id": 1, "priority": "low", "created_at": datetime(2026, 3, 10, 9),
+             "read_at": datetime(2026, 3, 10, 10)},
+            {**row, "user_id": None, "priority": "low", "created_at": datetime(2026, 3, 10, 9)},
+        ])
+
+        assert await service.rebuild() == 1
+
+        counts = await service.get_counts(1, "daily", date(2026, 3, 10))
+        assert counts["total"] == 2
+        assert counts["by_priority"]["critical"] == 1
+        assert await service.get_unread_count(1) == 1
+        assert await service.get_unread_count(9) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_backfill_runs_only_before_counters_exist(self, db):
+        service = NotificationDigestService(db)
+        row = {
+            "channel": "in_app", "recipient": "user_1", "title": "t", "message": "m",
+            "status": "sent", "metadata": {}, "read_at": None, "priority": "high",
+        }
+        await db.execute(Notification.__table__.insert(), [
+            {**row, "user_id": 1, "created_at": datetime(2026, 3, 10, 8)},
+            {**row, "user_id": 1, "created_at": datetime(2026, 3, 11, 8)},
+        ])
+
+        # Notifications stored before the counters existed are counted
+        assert await service.backfill() == 1
+        assert await service.get_unread_count(1) == 2
+
+        await db.execute(Notification.__table__.insert(), [{**row, "user_id": 1, "created_at": datetime(2026, 3, 12, 8)}])
+        await service.record_created([_created(1, "high", 12, hour=8)])
+        assert await service.backfill() is None
+        assert await service.get_unread_count(1) == 3
+        assert (await service.get_counts(1, "weekly", date(2026, 3, 12)))["total"] == 3
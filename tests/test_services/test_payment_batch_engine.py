@@ -0,0 +1,239 @@
+"""Tests for the payment batch engine, scheduled payments and SQL payment analytics."""
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import DefaultClause
+from sqlalchemy.types import NullType
+
+from agents.payment_processing_agent import PaymentProcessingAgent
+from services.payment_batch_engine import PaymentBatchEngine, PaymentDeclined, _payments
+from services.payment_service import PaymentService
+
+
+def _standalone_payments_table():
+    """The payments table without its foreign keys, so it can be created on its own."""
+    columns = [
+        Column(
+            c.name,
+            Integer() if isinstance(c.type, NullType) else c.type,
+            primary_key=c.primary_key,
+            unique=c.unique,
+            server_default=DefaultClause(c.server_default.arg) if c.server_default is not None else None,
+        )
+        for c in _payments.c
+    ]
+    return Table("payments", MetaData(), *columns)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: _standalone_payments_table().create(sync_conn))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+def payment_row(n, method="ach", **overrides):
+    row = {
+        "payment_type": "contractor_pay",
+        "payee_type": "candidate",
+        "payee_id": n,
+        "payee_name": f"Contractor {n}",
+        "gross_amount": 100.0,
+        "net_amount": 100.0,
+        "payment_method_type": method,
+    }
+    row.update(overrides)
+    return row
+
+
+class RecordingProvider:
+    """Provider call that tracks concurrency and idempotency keys."""
+
+    def __init__(self, prefix, fail=None):
+        self.prefix = prefix
+        self.fail = fail or {}
+        self.keys = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, payment):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.001)
+            self.keys.append(payment["idempotency_key"])
+            error = self.fail.get(payment["payee_id"])
+            if error is not None:
+                raise error
+            return {"transaction_id": f"{self.prefix}-{payment['idempotency_key']}"}
+        finally:
+            self.active -= 1
+
+
+async def statuses(session):
+    rows = await session.execute(select(_payments.c.id, _payments.c.status, _payments.c.idempotency_key))
+    return {row.id: (row.status, row.idempotency_key) for row in rows}
+
+
+class TestPaymentBatchEngine:
+    """Test suite for PaymentBatchEngine."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_per_provider_limits_and_bulk_writes(self, engine, statements):
+        ach, stripe = RecordingProvider("ACH"), RecordingProvider("STRIPE")
+        batch = PaymentBatchEngine({"ach": ach, "stripe": stripe}, limits={"ach": 3, "stripe": 2}, write_batch_size=50)
+
+        async with AsyncSession(engine) as session:
+            rows = [payment_row(n, "ach" if n % 2 else None) for n in range(40)]
+            ids = await batch.insert_payments(session, rows)
+            statements.clear()
+            result = await batch.process(session, ids)
+            executed = list(statements)
+            stored = await statuses(session)
+
+        assert result["processed"] == 40
+        assert result["total_amount"] == 4000.0
+        assert ach.peak == 3 and stripe.peak == 2  # unknown method types go to the default provider
+        assert all(status == "completed" for status, _ in stored.values())
+        # select, claim, re-select and a single executemany UPDATE for the outcomes
+        updates = [s for s in executed if s.lstrip().upper().startswith("UPDATE")]
+        assert len(updates) == 2
+        assert len(executed) == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_declined_fails_and_transient_errors_resume_with_same_key(self, engine):
+        provider = RecordingProvider("ACH", fail={1: PaymentDeclined("account closed"), 2: ConnectionError("timeout")})
+        batch = PaymentBatchEngine({"ach": provider}, default_provider="ach")
+
+        async with AsyncSession(engine) as session:
+            ids = await batch.insert_payments(session, [payment_row(n) for n in range(4)])
+            first = await batch.process(session, ids)
+            after_first = await statuses(session)
+
+            del provider.fail[2]
+            second = await batch.process(session, ids)
+            after_second = await statuses(session)
+
+        assert (first["processed"], first["failed"], first["retryable"]) == (2, 1, 1)
+        assert after_first[ids[1]][0] == "failed"
+        assert after_first[ids[2]][0] == "processing"
+
+        # Only the interrupted payment is sent again, with the key it was claimed with
+        assert (second["processed"], second["failed"], second["retryable"]) == (1, 0, 0)
+        assert provider.keys.count(after_first[ids[2]][1]) == 2
+        assert after_second[ids[2]] == ("completed", after_first[ids[2]][1])
+        assert len({key for _, key in after_second.values()}) == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_claimed_payments_are_sent_once_with_their_key(self, engine):
+        provider = RecordingProvider("ACH")
+        batch = PaymentBatchEngine({"ach": provider}, default_provider="ach")
+
+        async with AsyncSession(engine) as session:
+            ids = await batch.insert_payments(session, [payment_row(n) for n in range(3)])
+            claimed = await batch._claim(session, ids[:1])
+            result = await batch.process(session, ids)
+
+        # The first payment was left processing by an earlier claim; this run sends it under that key
+        assert claimed[0]["idempotency_key"].startswith("pay_")
+        assert result["processed"] == 3
+        assert provider.keys.count(claimed[0]["idempotency_key"]) == 1
+
+
+class TestPaymentAnalytics:
+    """Test suite for the SQL aggregate payment analytics."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_analytics_and_summary_are_aggregated_in_sql(self, engine, statements):
+        now = datetime.utcnow()
+        rows = [
+            payment_row(1, status="completed", net_amount=100.0, created_at=now, processed_at=now + timedelta(hours=2)),
+            payment_row(2, status="completed", net_amount=50.0, created_at=now, processed_at=now + timedelta(hours=4)),
+            payment_row(3, "wire", status="failed", created_at=now, processed_at=None),
+            payment_row(4, None, payment_type="referral_bonus", status="pending", created_at=now, processed_at=None),
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(_payments.insert(), rows)
+
+        async with AsyncSession(engine) as session:
+            service = PaymentService(session)
+            statements.clear()
+            analytics = await service.get_payment_analytics(days=30)
+            summary = await service.get_processing_summary(date.today() - timedelta(days=1), date.today())
+
+        assert len(statements) == 2
+        assert analytics["total_payments"] == 4
+        assert analytics["total_processed"] == 2
+        assert analytics["total_failed"] == 1
+        assert analytics["total_amount"] == 150.0
+        assert analytics["failure_rate"] == 25.0
+        assert analytics["by_type"] == {"contractor_pay": 3, "referral_bonus": 1}
+        assert analytics["by_method"] == {"ach": 2, "wire": 1}
+        assert summary["total"] == 4
+        assert summary["completed_amount"] == 150.0
+        assert summary["avg_processing_hours"] == pytest.approx(3.0, abs=0.01)
+
+
+class TestScheduledPayments:
+    """Scheduled payments resume a schedule's open payment instead of paying the period again."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_resumed_not_paid_twice(self, engine):
+        provider = RecordingProvider("STRIPE", fail={2: ConnectionError("timeout")})
+        agent = PaymentProcessingAgent()
+        agent.batch_engine = PaymentBatchEngine({"stripe": provider})
+        schedules = [
+            {"id": n, "payee_type": "candidate", "payee_id": n, "amount": 100.0, "frequency": "weekly"}
+            for n in (1, 2)
+        ]
+        advanced = []
+
+        async def due_schedules(db):
+            # A schedule stays due until it is advanced
+            return [s for s in schedules if s["id"] not in advanced]
+
+        async def update_schedule(db, schedule_id, amount, next_date):
+            advanced.append(schedule_id)
+
+        agent._get_due_schedules = due_schedules
+        agent._update_schedule_after_payment = update_schedule
+
+        async with AsyncSession(engine) as session:
+            first = await agent.process_scheduled_payments(session)
+            del provider.fail[2]
+            second = await agent.process_scheduled_payments(session)
+            stored = (await session.execute(
+                select(_payments.c.id, _payments.c.payment_schedule_id, _payments.c.status)
+            )).all()
+
+        (retried,) = first["retryable"]
+        assert (first["processed"], first["resumed"]) == (1, 0)
+        assert (second["processed"], second["resumed"], second["retryable"]) == (1, 1, [])
+        assert advanced == [1, 2]
+        # One payment per schedule; the interrupted one completed on the second run
+        assert sorted((row.payment_schedule_id, row.status) for row in stored) == [
+            (1, "completed"), (2, "completed"),
+        ]
+        assert {row.id for row in stored if row.payment_schedule_id == 2} == {retried}
@@ -0,0 +1,168 @@
+"""Tests for compiled per-user permissions."""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from services.permission_matrix import CompiledPermissions, PermissionMatrix, compile_permissions
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The few redis.asyncio calls the matrix makes, on a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+class CountingMatrix(PermissionMatrix):
+    """Matrix whose database load returns ``roles[user_id]`` and counts calls."""
+
+    def __init__(self, roles, delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.roles = roles
+        self.delay = delay
+        self.loads = 0
+
+    async def load(self, db, user_id):
+        self.loads += 1
+        await asyncio.sleep(self.delay)
+        return compile_permissions(user_id, self.revision, self.roles.get(user_id, []))
+
+
+EDITOR = (
+    [{"resource": "jobs", "action": "read"}, {"resource": "jobs", "action": "write"}, "junk"],
+    {"matching_agent": ["match"]},
+    None,
+)
+VIEWER = ([{"resource": "jobs", "action": "read"}], {"matching_agent": ["explain"]}, None)
+
+
+class TestCompilePermissions:
+    """Test suite for compile_permissions."""
+
+    @pytest.mark.unit
+    def test_flattens_roles_and_linked_permissions(self):
+        compiled = compile_permissions(7, 3, [EDITOR, VIEWER], granted=[("reports", "export")])
+
+        assert compiled.permissions == {"jobs:read", "jobs:write", "reports:export"}
+        assert compiled.allows("jobs", "write")
+        assert not compiled.allows("jobs", "delete")
+        assert compiled.agent_permissions() == {"matching_agent": ["explain", "match"]}
+        assert compiled.allows_agent("matching_agent", "match")
+        assert compiled.valid_until is None
+
+    @pytest.mark.unit
+    def test_valid_until_is_earliest_assignment_expiry(self):
+        soon = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        later = datetime(2031, 1, 1)
+        compiled = compile_permissions(7, 0, [(None, None, later), (None, None, soon)])
+
+        assert compiled.valid_until == soon.timestamp()
+
+    @pytest.mark.unit
+    def test_json_round_trip(self):
+        compiled = compile_permissions(7, 3, [EDITOR])
+
+        assert CompiledPermissions.from_json(compiled.to_json()) == compiled
+
+
+class TestPermissionMatrix:
+    """Test suite for PermissionMatrix."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_compiled_once_until_invalidated(self):
+        matrix = CountingMatrix({1: [VIEWER]})
+
+        assert (await matrix.get(None, 1)).allows("jobs", "read")
+        assert not (await matrix.get(None, 1)).allows("jobs", "write")
+        assert matrix.loads == 1
+
+        matrix.roles[1] = [EDITOR]
+        await matrix.invalidate_user(1)
+        assert (await matrix.get(None, 1)).allows("jobs", "write")
+        assert matrix.loads == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_revision_bump_retires_every_user(self):
+        matrix = CountingMatrix({1: [VIEWER], 2: [VIEWER]})
+        await matrix.get(None, 1)
+        await matrix.get(None, 2)
+
+        await matrix.bump_revision()
+        compiled = await matrix.get(None, 1)
+
+        assert compiled.revision == 1
+        assert matrix.loads == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_not_cached_past_ttl_or_assignment_expiry(self):
+        clock = FakeClock()
+        expiring = (VIEWER[0], None, datetime.fromtimestamp(1_010, tz=timezone.utc))
+        matrix = CountingMatrix({1: [VIEWER], 2: [expiring]}, ttl_seconds=60, clock=clock)
+        await matrix.get(None, 1)
+        await matrix.get(None, 2)
+
+        clock.now = 1_020
+        await matrix.get(None, 1)
+        await matrix.get(None, 2)
+        assert matrix.loads == 3
+
+        clock.now = 1_061
+        await matrix.get(None, 1)
+        assert matrix.loads == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        matrix = CountingMatrix({1: [VIEWER]}, delay=0.01)
+
+        load = asyncio.create_task(matrix.get(None, 1))
+        await asyncio.sleep(0)
+        await matrix.invalidate_user(1)
+        await load
+        await matrix.get(None, 1)
+
+        assert matrix.loads == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redis_shares_sets_and_revision_between_workers(self):
+        redis = FakeRedis()
+        roles = {1: [VIEWER]}
+        worker_a = CountingMatrix(roles, redis=redis)
+        worker_b = CountingMatrix(roles, redis=redis)
+
+        await worker_a.get(None, 1)
+        assert (await worker_b.get(None, 1)).allows("jobs", "read")
+        assert worker_b.loads == 0
+
+        roles[1] = [EDITOR]
+        await worker_a.bump_revision()
+        worker_b._local.clear()  # as if its TTL had passed
+        assert (await worker_b.get(None, 1)).allows("jobs", "write")
+        assert worker_b.revision == 1
+        assert worker_b.loads == 1
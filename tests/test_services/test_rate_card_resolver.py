@@ -0,0 +1,275 @@
+"""Tests for the in-memory rate card resolver."""
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from agents.rate_validation_agent import RateValidationAgent, RollingRateStats
+from models.base import Base
+from models.msp_workflow import PlacementRecord
+from models.rate_card import RateCard
+from services.rate_card_resolver import RateCardResolver, RateCardSnapshot, TenantRateCards
+from services.rate_card_service import RateCardService
+
+BASE_TIME = datetime(2026, 1, 1, 9, 0)
+
+
+def _card(card_id, start, end=None, location=None, category="engineering", created=0, org=1, bill=(50.0, 100.0)):
+    return RateCardSnapshot(
+        id=card_id, client_org_id=org, job_category=category, location=location,
+        bill_rate_min=bill[0], bill_rate_max=bill[1], pay_rate_min=30.0, pay_rate_max=80.0,
+        effective_from=start, effective_to=end, created_at=BASE_TIME + timedelta(minutes=created),
+    )
+
+
+def _scan(cards, category, location, on):
+    """Reference semantics: the old SQL query, evaluated in Python."""
+    hits = [
+        c for c in cards
+        if c.job_category == category
+        and c.effective_from <= on
+        and (c.effective_to is None or c.effective_to >= on)
+        and (not location or c.location in (location, None))
+    ]
+    return max(hits, key=lambda c: (c.created_at, c.id), default=None)
+
+
+def _db_returning(*batches, history=()):
+    """Each load reads the rate cards, then the placement history (``history`` on every load)."""
+    db = AsyncMock()
+    results = []
+    for cards in batches:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [
+            SimpleNamespace(**c.__dict__) for c in cards
+        ]
+        placements = MagicMock()
+        placements.all.return_value = list(history)
+        results.extend((result, placements))
+    db.execute.side_effect = results
+    return db
+
+
+class TestTenantRateCards:
+    """Test suite for interval-indexed resolution."""
+
+    @pytest.mark.unit
+    def test_newer_card_overrides_within_its_window(self):
+        tenant = TenantRateCards([
+            _card(1, date(2026, 1, 1)),
+            _card(2, date(2026, 3, 1), date(2026, 3, 31), created=5),
+        ])
+
+        assert tenant.resolve("engineering", None, date(2026, 2, 28)).id == 1
+        assert tenant.resolve("engineering", None, date(2026, 3, 1)).id == 2
+        assert tenant.resolve("engineering", None, date(2026, 3, 31)).id == 2
+        assert tenant.resolve("engineering", None, date(2026, 4, 1)).id == 1
+        assert tenant.resolve("engineering", None, date(2025, 12, 31)) is None
+        assert tenant.resolve("design", None, date(2026, 2, 1)) is None
+
+    @pytest.mark.unit
+    def test_location_falls_back_to_location_free_card(self):
+        tenant = TenantRateCards([
+            _card(1, date(2026, 1, 1), location=None, created=10),
+            _card(2, date(2026, 1, 1), location="Austin"),
+            _card(3, date(2026, 1, 1), location="Dallas", created=20),
+        ])
+
+        on = date(2026, 6, 1)
+        assert tenant.resolve("engineering", "Austin", on).id == 1
+        assert tenant.resolve("engineering", "Denver", on).id == 1
+        assert tenant.resolve("engineering", None, on).id == 3
+
+    @pytest.mark.unit
+    def test_matches_query_semantics_on_random_cards(self):
+        rng = random.Random(11)
+        start = date(2026, 1, 1)
+        cards = []
+        for i in range(300):
+            begin = start + timedelta(days=rng.randint(0, 120))
+            end = None if rng.random() < 0.3 else begin + timedelta(days=rng.randint(-2, 60))
+            cards.append(_card(
+                i, begin, end,
+                location=rng.choice([None, "Austin", "Dallas"]),
+                category=rng.choice(["engineering", "design"]),
+                created=rng.randint(0, 50),
+            ))
+        tenant = TenantRateCards(cards)
+
+        for _ in range(2000):
+            category = rng.choice(["engineering", "design"])
+            location = rng.choice([None, "", "Austin", "Dallas", "Denver"])
+            on = start + timedelta(days=rng.randint(-5, 200))
+            assert tenant.resolve(category, location, on) == _scan(cards, category, location, on)
+
+
+class TestRateCardResolver:
+    """Test suite for RateCardResolver caching."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_loads_tenant_once_until_invalidated(self):
+        resolver = RateCardResolver()
+        db = _db_returning(
+            [_card(1, date(2026, 1, 1))],
+            [_card(1, date(2026, 1, 1)), _card(2, date(2026, 1, 1), created=5)],
+        )
+        on = date(2026, 2, 1)
+
+        assert (await resolver.resolve(db, 1, "engineering", effective_date=on)).id == 1
+        assert (await resolver.resolve(db, 1, "engineering", effective_date=on)).id == 1
+        assert db.execute.await_count == 2
+
+        resolver.invalidate(1)
+
+        assert (await resolver.resolve(db, 1, "engineering", effective_date=on)).id == 2
+        assert db.execute.await_count == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ttl_expires_tenant(self):
+        now = [0.0]
+        resolver = RateCardResolver(ttl_seconds=60, clock=lambda: now[0])
+        db = _db_returning([_card(1, date(2026, 1, 1))], [])
+
+        assert await resolver.resolve(db, 1, "engineering", effective_date=date(2026, 2, 1))
+        now[0] = 61.0
+        assert await resolver.resolve(db, 1, "engineering", effective_date=date(2026, 2, 1)) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        resolver = RateCardResolver()
+        db = _db_returning([_card(1, date(2026, 1, 1))], [])
+        results = iter(db.execute.side_effect)
+
+        async def execute(*args, **kwargs):
+            # The first load reads its rate cards, then a write lands before it finishes
+            result = next(results)
+            if db.execute.await_count == 1:
+                resolver.invalidate(1)
+            return result
+
+        db.execute.side_effect = execute
+        on = date(2026, 2, 1)
+
+        assert (await resolver.resolve(db, 1, "engineering", effective_date=on)).id == 1
+        assert await resolver.resolve(db, 1, "engineering", effective_date=on) is None
+        assert db.execute.await_count == 4
+
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_history_is_seeded_from_recent_placements(self):
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        tables = [RateCard.__table__, PlacementRecord.__table__]
+        async with engine.begin() as conn:
+            # The foreign keys are not enforced by SQLite
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+            placement = dict(organization_id=9, requirement_id=1, candidate_id=1, supplier_org_id=2,
+                             start_date=date(2026, 1, 5), pay_rate=40.0)
+            await conn.execute(insert(PlacementRecord.__table__), [
+                dict(placement, client_org_id=org, job_category=category, bill_rate=rate,
+                     created_at=BASE_TIME + timedelta(days=day))
+                for org, category, rate, day in [
+                    (1, "engineering", 500.0, 0),  # pushed out of the window by newer placements
+                    (1, "engineering", 60.0, 1),
+                    (1, "engineering", 70.0, 2),
+                    (1, "engineering", 80.0, 3),
+                    (1, "design", 45.0, 1),
+                    (1, None, 999.0, 4),  # made before categories were recorded
+                    (2, "engineering", 300.0, 4),
+                ]
+            ])
+
+        resolver = RateCardResolver(history_window=3)
+        resolver.record_rate(1, "sales", 10.0)  # not in the database: dropped by the load
+        async with AsyncSession(engine) as db:
+            await resolver.tenant(db, 1)
+        await engine.dispose()
+
+        engineering = resolver.historical_stats(1, "engineering")
+        assert (engineering.count, engineering.mean) == (3, pytest.approx(70.0))
+        assert resolver.historical_stats(1, "design").mean == pytest.approx(45.0)
+        assert resolver.historical_stats(1, "sales") is None
+        assert resolver.historical_stats(2, "engineering") is None
+
+        resolver.record_rate(1, "engineering", 90.0)
+        assert resolver.historical_stats(1, "engineering").mean == pytest.approx(80.0)
+
+
+class TestRollingRateStats:
+    """Test suite for RollingRateStats."""
+
+    @pytest.mark.unit
+    def test_matches_two_pass_statistics_over_window(self):
+        rng = random.Random(3)
+        stats = RollingRateStats(window=50)
+        values = []
+        for _ in range(500):
+            value = rng.uniform(40, 160)
+            values.append(value)
+            stats.add(value)
+            recent = values[-50:]
+            mean = sum(recent) / len(recent)
+            std = (sum((x - mean) ** 2 for x in recent) / len(recent)) ** 0.5
+            assert stats.count == len(recent)
+            assert stats.mean == pytest.approx(mean)
+            assert stats.std == pytest.approx(std)
+
+    @pytest.mark.unit
+    def test_constant_rates_have_no_spread(self):
+        stats = RollingRateStats(window=3, values=[0.1, 0.2, 0.1, 0.1, 0.1])
+
+        assert stats.std == 0.0
+
+    @pytest.mark.unit
+    def test_agent_scores_stats_like_raw_history(self):
+        agent = RateValidationAgent()
+        history = [{"bill_rate": r} for r in (90.0, 95.0, 100.0, 110.0)]
+
+        from_list = agent.validate(104.0, 84.0, historical_rates=history)
+        from_stats = agent.validate(
+            104.0, 84.0, historical_stats=RollingRateStats(values=[r["bill_rate"] for r in history])
+        )
+
+        assert from_stats.details["historical"] == pytest.approx(from_list.details["historical"])
+        assert from_stats.overall_score == from_list.overall_score
+
+
+class TestRateCardService:
+    """Resolver-backed RateCardService."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_validation_uses_cache_and_accepted_rate_history(self):
+        resolver = RateCardResolver()
+        db = _db_returning([_card(7, date.today() - timedelta(days=1))])
+        svc = RateCardService(db, resolver=resolver)
+
+        valid, details = await svc.validate_submission_rates(1, "engineering", 70.0, 50.0)
+        assert valid and details["rate_card_id"] == 7
+        assert "historical" not in details  # validating does not record the rate
+
+        for rate in (60.0, 70.0, 80.0):
+            svc.record_accepted_rate(1, "engineering", rate)
+        valid, details = await svc.validate_submission_rates(1, "engineering", 150.0, 50.0)
+
+        assert not valid
+        assert details["historical"] == {"count": 3, "mean": 70.0, "std": 8.16}
+        # The rolling stats reach the validation agent: 150 is far outside the accepted history
+        expected = RateValidationAgent().validate(
+            150.0, 50.0, rate_card=_card(7, date.today()).as_limits(),
+            historical_stats=resolver.historical_stats(1, "engineering"),
+        )
+        assert expected.details["historical"] == 0
+        assert details["assessment"]["overall_score"] == expected.overall_score
+        assert resolver.historical_stats(1, "engineering").count == 3
+        assert db.execute.await_count == 2
@@ -0,0 +1,71 @@
+"""Tests for in-process metrics and query instrumentation."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from utils.metrics import MetricsRegistry, RequestStats, db_queries, instrument_engine, request_stats
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    @pytest.mark.unit
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        in_flight = registry.gauge("in_flight", "In flight.")
+
+        requests.inc(("/jobs/{id}",))
+        requests.inc(("/jobs/{id}",))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, ("/jobs/{id}",))
+        in_flight.inc()
+        in_flight.dec()
+
+        lines = registry.render().splitlines()
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{route="/jobs/{id}"} 2' in lines
+        assert 'latency_seconds_bucket{route="/jobs/{id}",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/jobs/{id}",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{route="/jobs/{id}",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{route="/jobs/{id}"} 4' in lines
+        assert 'latency_seconds_sum{route="/jobs/{id}"} 3.65' in lines
+        assert "in_flight 0" in lines
+
+    @pytest.mark.unit
+    def test_same_name_returns_existing_metric_and_collectors_run(self):
+        registry = MetricsRegistry()
+        depth = registry.gauge("depth", "Depth.")
+        assert registry.gauge("depth", "Depth.") is depth
+
+        registry.add_collector(lambda: depth.set(7))
+        assert "depth 7" in registry.render().splitlines()
+
+
+class TestQueryInstrumentation:
+    """Test suite for instrument_engine."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queries_counted_per_request_and_n_plus_one_flagged(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine.sync_engine)
+        instrument_engine(engine.sync_engine)  # idempotent
+        before = db_queries.values.get((), 0)
+
+        stats = RequestStats(threshold=3)
+        token = request_stats.set(stats)
+        try:
+            async with engine.connect() as conn:
+                for n in range(4):
+                    await conn.execute(text("SELECT :n"), {"n": n})
+                await conn.execute(text("SELECT 2"))
+        finally:
+            request_stats.reset(token)
+            await engine.dispose()
+
+        assert stats.queries == 5
+        assert stats.db_seconds > 0
+        assert stats.n_plus_one == ["SELECT ?"]
+        assert db_queries.values[()] - before == 5
@@ -0,0 +1,172 @@
+"""Tests for the verified token and principal caches."""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import Boolean, Column, Integer, JSON, String, and_, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+from utils import principal_cache as principal_cache_module
+from utils.principal_cache import PrincipalCache, TTLCache, verify_token_cached
+from utils.security import create_access_token
+
+Base = declarative_base()
+
+
+class Account(Base):
+    __tablename__ = "accounts"
+    id = Column(Integer, primary_key=True)
+    email = Column(String(255))
+    is_active = Column(Boolean, default=True)
+    settings = Column(JSON, default=dict)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add(Account(id=1, email="a@example.com", settings={"theme": "dark"}))
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+async def get_account(cache: PrincipalCache, session: AsyncSession, account_id: int):
+    return await cache.get_cached(
+        session, cache.users, account_id, Account,
+        lambda: and_(Account.id == account_id, Account.is_active == True),
+    )
+
+
+class TestTTLCache:
+    """Test suite for TTLCache."""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.keys() == ["a", "c"]
+
+    @pytest.mark.unit
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, expires_at=1)
+
+        clock.now = 2
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        clock.now = 5
+        assert cache.get("a") is None
+        assert cache.stats() == {"size": 0, "hits": 1, "misses": 2}
+
+
+class TestVerifyTokenCached:
+    """Test suite for verify_token_cached."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_tokens(self):
+        principal_cache_module._tokens.clear()
+        yield
+        principal_cache_module._tokens.clear()
+
+    @pytest.mark.unit
+    def test_token_verified_once(self, monkeypatch):
+        token = create_access_token("42")
+        calls = []
+        verify = principal_cache_module.verify_token
+        monkeypatch.setattr(principal_cache_module, "verify_token", lambda t: calls.append(t) or verify(t))
+
+        assert verify_token_cached(token)["sub"] == "42"
+        assert verify_token_cached(token)["sub"] == "42"
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    def test_invalid_and_expired_tokens_not_cached(self):
+        expired = create_access_token("42", expires_delta=timedelta(seconds=-1))
+
+        assert verify_token_cached("not-a-token") is None
+        assert verify_token_cached(expired) is None
+        assert len(principal_cache_module._tokens) == 0
+
+
+class TestPrincipalCache:
+    """Test suite for PrincipalCache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_hit_skips_select_and_attaches_to_session(self, engine, statements):
+        cache = PrincipalCache(ttl=30)
+        async with AsyncSession(engine) as session:
+            first = await get_account(cache, session, 1)
+        assert len(statements) == 1
+
+        async with AsyncSession(engine) as session:
+            account = await get_account(cache, session, 1)
+            assert account is not first
+            assert account in session
+            assert account.settings == {"theme": "dark"}
+            account.settings["theme"] = "light"
+            account.email = "b@example.com"
+            await session.commit()
+        assert len(statements) == 2  # the UPDATE
+
+        cache.invalidate_user(1)
+        async with AsyncSession(engine) as session:
+            account = await get_account(cache, session, 1)
+            assert account.email == "b@example.com"
+        assert len(statements) == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_missing_rows_not_cached_and_snapshots_expire(self, engine, statements):
+        clock = FakeClock()
+        cache = PrincipalCache(ttl=30, clock=clock)
+        async with AsyncSession(engine) as session:
+            assert await get_account(cache, session, 2) is None
+            assert await get_account(cache, session, 2) is None
+            await get_account(cache, session, 1)
+        assert len(statements) == 3
+
+        clock.now = 31
+        async with AsyncSession(engine) as session:
+            await get_account(cache, session, 1)
+        assert len(statements) == 4
+
+    @pytest.mark.unit
+    def test_invalidate_memberships(self):
+        cache = PrincipalCache()
+        for key in [(1, 10), (1, 20), (2, 10)]:
+            cache.memberships.set(key, {})
+
+        cache.invalidate_organization(20)
+        assert cache.memberships.keys() == [(1, 10), (2, 10)]
+        cache.invalidate_user(2)
+        assert cache.memberships.keys() == [(1, 10)]
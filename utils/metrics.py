@@ -0,0 +1,258 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are plain Python numbers updated from the
+event loop thread, with no locks: an update is a dict lookup and an add.
+Values are per process; each worker serves its own ``/metrics``.
+
+``instrument_engine`` hooks SQLAlchemy cursor events to count queries and
+database time, both globally and for the current request
+(``RequestStats``, bound by the request-context middleware). A statement
+executed ``n_plus_one_threshold`` times in one request is logged once as a
+likely N+1 and counted in ``db_n_plus_one_total``.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """A named family of time series keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(series name, rendered labels, value) for every series of this metric."""
+        pass
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (last is +Inf, not cumulative), sum]
+        self.values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, labels, le), cumulative))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, labels), total))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """The metrics a process exposes."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Call ``collect`` before each render, e.g. to set gauges from queue depths."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {str(e)}")
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests by route template, method and status.", ("route", "method", "status")
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and method.", ("route", "method")
+)
+http_requests_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests being served.")
+db_queries = metrics.counter("db_queries_total", "SQL statements executed.")
+db_query_duration = metrics.histogram("db_query_duration_seconds", "SQL statement latency.")
+db_request_queries = metrics.histogram(
+    "http_request_db_queries", "SQL statements per HTTP request by route template.", ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+db_n_plus_one = metrics.counter(
+    "db_n_plus_one_total", "Requests that repeated one statement past the N+1 threshold.", ("route",)
+)
+
+
+class RequestStats:
+    """Database work done on behalf of one request."""
+
+    __slots__ = ("route", "queries", "db_seconds", "statements", "n_plus_one", "threshold")
+
+    def __init__(self, threshold: int = 10):
+        self.route = "<unmatched>"
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: Dict[str, int] = {}
+        self.n_plus_one: List[str] = []
+        self.threshold = threshold
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        count = self.statements.get(statement, 0) + 1
+        self.statements[statement] = count
+        if count == self.threshold:
+            self.n_plus_one.append(statement)
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    db_queries.inc()
+    db_query_duration.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: Any) -> None:
+    """Count queries and database time on ``engine`` (a sync ``Engine``; use ``.sync_engine``)."""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def record_request(stats: RequestStats, method: str, status_code: int, elapsed: float) -> None:
+    """Record a finished request's latency and database work."""
+    http_requests.inc((stats.route, method, str(status_code)))
+    http_request_duration.observe(elapsed, (stats.route, method))
+    db_request_queries.observe(stats.queries, (stats.route,))
+    if stats.n_plus_one:
+        db_n_plus_one.inc((stats.route,))
+        for statement in stats.n_plus_one:
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d+ times: %.200s",
+                method, stats.route, stats.threshold, " ".join(statement.split()),
+            )
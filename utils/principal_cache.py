@@ -0,0 +1,220 @@
+"""
+Caches for authenticating requests.
+
+- Verified tokens: an LRU keyed by the SHA-256 of the raw token that holds
+  the decoded claims until the token's ``exp``, so a token's signature is
+  checked once rather than on every request.
+- Principals: short-TTL snapshots of users, organizations and memberships.
+  A hit returns a fresh instance attached to the caller's session (no
+  SELECT); instances are never shared between sessions.
+
+The caches are per process. Code that deactivates a user or changes an
+organization or membership calls the matching ``invalidate_*`` method;
+other worker processes see the change after ``principal_cache_ttl_seconds``
+at most.
+"""
+
+import copy
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Type, TypeVar
+
+from sqlalchemy import and_, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import settings
+from models.organization import Organization
+from models.tenant_management import OrganizationMembership
+from models.user import User
+from utils.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+M = TypeVar("M")
+
+
+class TTLCache(Generic[V]):
+    """LRU mapping whose entries also expire (``ttl`` seconds, or an explicit ``expires_at``)."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: V, expires_at: Optional[float] = None) -> None:
+        self._entries[key] = (self._clock() + self.ttl if expires_at is None else expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def keys(self):
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_tokens: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.auth_token_cache_size, ttl=settings.auth_token_cache_max_seconds, clock=time.time
+)
+
+
+def verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """``verify_token`` with the result remembered until the token expires.
+
+    The returned claims are shared between requests; do not modify them.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _tokens.get(key)
+    if claims is not None:
+        return claims
+
+    claims = verify_token(token)
+    if claims is not None and claims.get("exp"):
+        _tokens.set(key, claims, expires_at=min(float(claims["exp"]), time.time() + _tokens.ttl))
+    return claims
+
+
+def _copy(values: Dict[str, Any]) -> Dict[str, Any]:
+    # JSON columns are mutable; everything else is immutable
+    return {key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value for key, value in values.items()}
+
+
+def _snapshot(instance: Any) -> Dict[str, Any]:
+    return _copy({attr.key: getattr(instance, attr.key) for attr in sa_inspect(type(instance)).column_attrs})
+
+
+def attach_snapshot(session: AsyncSession, model: Type[M], snapshot: Dict[str, Any]) -> M:
+    """A persistent instance built from a snapshot, as if it had been loaded by ``session``."""
+    instance = model(**_copy(snapshot))
+    make_transient_to_detached(instance)
+    # merge(load=False) emits no SQL, so the sync session can do it without a greenlet hop
+    return session.sync_session.merge(instance, load=False)
+
+
+class PrincipalCache:
+    """Short-TTL cache of the users, organizations and memberships requests authenticate as."""
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        """Initialize principal cache.
+
+        Args:
+            ttl: Seconds a snapshot is served before it is reloaded
+            maxsize: Entries kept per kind
+            clock: Monotonic clock (for tests)
+        """
+        self.users: TTLCache[Dict[str, Any]] = TTLCache(maxsize, ttl, clock)
+        self.organizations: TTLCache[Dict[str, Any]] = TTLCache(maxsize, ttl, clock)
+        self.memberships: TTLCache[Dict[str, Any]] = TTLCache(maxsize, ttl, clock)
+
+    async def get_cached(
+        self,
+        session: AsyncSession,
+        cache: TTLCache,
+        key: Hashable,
+        model: Type[M],
+        criteria: Callable[[], Any],
+    ) -> Optional[M]:
+        """
+        The ``model`` row matching ``criteria()``, from ``cache`` under ``key`` when fresh.
+
+        ``criteria`` is only called on a miss; building the expression costs
+        about as much as the rest of a hit.
+        """
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return attach_snapshot(session, model, snapshot)
+
+        result = await session.execute(select(model).where(criteria()))
+        instance = result.scalar_one_or_none()
+        if instance is not None:
+            cache.set(key, _snapshot(instance))
+        return instance
+
+    async def get_user(self, session: AsyncSession, user_id: int) -> Optional[User]:
+        """The active user ``user_id``, or None."""
+        return await self.get_cached(
+            session, self.users, user_id, User,
+            lambda: and_(User.id == user_id, User.is_active == True),
+        )
+
+    async def get_organization(self, session: AsyncSession, org_id: int) -> Optional[Organization]:
+        """The active organization ``org_id``, or None."""
+        return await self.get_cached(
+            session, self.organizations, org_id, Organization,
+            lambda: and_(Organization.id == org_id, Organization.is_active == True),
+        )
+
+    async def get_membership(
+        self, session: AsyncSession, user_id: int, org_id: int
+    ) -> Optional[OrganizationMembership]:
+        """The user's active membership in ``org_id``, or None."""
+        return await self.get_cached(
+            session, self.memberships, (user_id, org_id), OrganizationMembership,
+            lambda: and_(
+                OrganizationMembership.user_id == user_id,
+                OrganizationMembership.organization_id == org_id,
+                OrganizationMembership.is_active == True,
+            ),
+        )
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget a user and their memberships (deactivated, role or profile changed)."""
+        self.users.pop(user_id)
+        self.invalidate_memberships(user_id=user_id)
+
+    def invalidate_organization(self, org_id: int) -> None:
+        """Forget an organization and its memberships."""
+        self.organizations.pop(org_id)
+        self.invalidate_memberships(org_id=org_id)
+
+    def invalidate_memberships(self, user_id: Optional[int] = None, org_id: Optional[int] = None) -> None:
+        """Forget memberships of a user and/or organization (all when neither is given)."""
+        for key in self.memberships.keys():
+            if (user_id is None or key[0] == user_id) and (org_id is None or key[1] == org_id):
+                self.memberships.pop(key)
+
+    def clear(self) -> None:
+        self.users.clear()
+        self.organizations.clear()
+        self.memberships.clear()
+        _tokens.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "tokens": _tokens.stats(),
+            "users": self.users.stats(),
+            "organizations": self.organizations.stats(),
+            "memberships": self.memberships.stats(),
+        }
+
+
+principal_cache = PrincipalCache(ttl=settings.principal_cache_ttl_seconds, maxsize=settings.principal_cache_size)